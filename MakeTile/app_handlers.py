@@ -1,12 +1,14 @@
 import os
-import json
 import bpy
 from bpy.app.handlers import persistent
-from .utils.registration import get_prefs, get_path
+from .utils.registration import get_prefs
 from .materials.materials import (
     get_blend_filenames,
     load_materials)
 from .lib.utils.file_handling import absolute_file_paths
+from .lib.utils.tile_defaults import tile_defaults_registry
+from .lib.utils.collections import invalidate_collection_index
+from .lib.utils.utils import get_copy_plan
 
 
 def create_properties_on_activation(dummy):
@@ -71,34 +73,66 @@ def load_default_materials(context):
         return False
 
 
+# pointer of the active object the last time update_mt_scene_props_handler ran
+_last_active_object = None
+
+
+def selection_updated(depsgraph):
+    """Return True if a depsgraph update could include a change of selection or active object.
+
+    Selecting or activating an object tags the scene so updates that only contain
+    objects, e.g. every step of a transform, are skipped.
+    """
+    if not isinstance(depsgraph, bpy.types.Depsgraph):
+        return True
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Scene):
+            return True
+    return False
+
+
 @persistent
-def update_mt_scene_props_handler(dummy):
+def update_mt_scene_props_handler(scene, depsgraph=None):
     """Updates mt_scene_props based on mt_tile_props of selected object.
 
     This means that when the user selects an existing tile they can easily
-    create one with the same properties.
+    create one with the same properties. Only does any work when the active
+    object has changed.
     """
+    global _last_active_object
+
+    if not selection_updated(depsgraph):
+        return
+
+    context = bpy.context
+    obj = context.object
+    pointer = obj.as_pointer() if obj is not None else None
+    if pointer == _last_active_object:
+        return
+    _last_active_object = pointer
+
     try:
-        context = bpy.context
-        obj = context.object
         scene_props = context.scene.mt_scene_props
         obj_props = obj.mt_object_props
-        tile_props = bpy.data.collections[obj.mt_object_props.tile_name].mt_tile_props
 
-        if obj != scene_props.mt_last_selected and not obj_props.is_converted and obj_props.is_mt_object:
-            scene_props.tile_x = tile_props.tile_size[0]
-            scene_props.tile_y = tile_props.tile_size[1]
-            scene_props.tile_z = tile_props.tile_size[2]
+        if obj == scene_props.mt_last_selected or obj_props.is_converted or not obj_props.is_mt_object:
+            return
+
+        tile_props = bpy.data.collections[obj_props.tile_name].mt_tile_props
 
-            scene_props.base_x = tile_props.base_size[0]
-            scene_props.base_y = tile_props.base_size[1]
-            scene_props.base_z = tile_props.base_size[2]
+        scene_props.tile_x = tile_props.tile_size[0]
+        scene_props.tile_y = tile_props.tile_size[1]
+        scene_props.tile_z = tile_props.tile_size[2]
 
-            for key, value in tile_props.items():
-                for k in scene_props.keys():
-                    if k == key:
-                        scene_props[k] = value
-            scene_props.mt_last_selected = obj
+        scene_props.base_x = tile_props.base_size[0]
+        scene_props.base_y = tile_props.base_size[1]
+        scene_props.base_z = tile_props.base_size[2]
+
+        # assign id properties directly so update callbacks aren't triggered
+        for key in get_copy_plan(type(tile_props), type(scene_props)):
+            if key in tile_props and key in scene_props:
+                scene_props[key] = tile_props[key]
+        scene_props.mt_last_selected = obj
 
     except KeyError:
         pass
@@ -107,19 +141,12 @@ def update_mt_scene_props_handler(dummy):
 
 
 def load_tile_defaults(context):
-    """Load tile defaults into memory."""
-    addon_path = get_path()
-    json_path = os.path.join(
-        addon_path,
-        "assets",
-        "data",
-        "tile_defaults.json"
-    )
-
-    if os.path.exists(json_path):
-        with open(json_path) as json_file:
-            tile_defaults = json.load(json_file)
-            return tile_defaults
+    """Return tile defaults. The file is only read again if it has changed.
+
+    See lib.utils.tile_defaults.TileDefaultsRegistry.
+    """
+    if tile_defaults_registry.refresh():
+        return tile_defaults_registry.get_all()
     return False
 
 
@@ -127,32 +154,29 @@ def initialise_scene_props(context):
     prefs = get_prefs()
     scene_props = context.scene.mt_scene_props
     scene_props.tile_type = prefs.default_tile_type
-    tile_defaults = load_tile_defaults(context)
-
-    for tile in tile_defaults:
-        if tile['type'] == scene_props.tile_type:
-            defaults = tile['defaults']
-            for key, value in defaults.items():
-                setattr(scene_props, key, value)
-
-            base_blueprint = scene_props.base_blueprint
-            base_defaults = defaults['base_defaults']
-            for key, value in base_defaults.items():
-                if key == base_blueprint:
-                    for k, v in value.items():
-                        setattr(scene_props, k, v)
-                    break
-
-            main_part_blueprint = scene_props.main_part_blueprint
-            main_part_defaults = defaults['tile_defaults']
-            for key, value in main_part_defaults.items():
-                if key == main_part_blueprint:
-                    for k, v in value.items():
-                        setattr(scene_props, k, v)
-                    break
-            break
+    tile_type = scene_props.tile_type
+
+    if tile_defaults_registry.get(tile_type) is None:
+        return
+
+    for key, value in tile_defaults_registry.get_defaults(tile_type).items():
+        setattr(scene_props, key, value)
+
+    base_defaults = tile_defaults_registry.get_blueprint_defaults(
+        tile_type, 'base_defaults', scene_props.base_blueprint)
+    for key, value in base_defaults.items():
+        setattr(scene_props, key, value)
+
+    main_part_defaults = tile_defaults_registry.get_blueprint_defaults(
+        tile_type, 'tile_defaults', scene_props.main_part_blueprint)
+    for key, value in main_part_defaults.items():
+        setattr(scene_props, key, value)
 
 
 bpy.app.handlers.depsgraph_update_pre.append(create_properties_on_activation)
 bpy.app.handlers.load_post.append(create_properties_on_load)
 bpy.app.handlers.depsgraph_update_post.append(update_mt_scene_props_handler)
+bpy.app.handlers.depsgraph_update_post.append(invalidate_collection_index)
+bpy.app.handlers.undo_post.append(invalidate_collection_index)
+bpy.app.handlers.redo_post.append(invalidate_collection_index)
+bpy.app.handlers.load_post.append(invalidate_collection_index)
@@ -72,6 +72,21 @@ view_mode = [
     ("SOLID", "Solid", "")
 ]
 
+clip_cutter_modes = [
+    ("ARRAY", "Array", "Give each side of the base its own clip cutter with an array modifier", 1),
+    ("JOINED", "Joined", "Bake all clip cutters into one mesh so the base only has one boolean. Sides can't be toggled separately", 2)
+]
+
+displacement_modes = [
+    ("MODIFIER", "Modifiers", "Keep the subsurf and displacement modifiers live", 1),
+    ("MESH", "Mesh", "Subdivide and displace the mesh once when making 3D so nothing has to be re-evaluated", 2)
+]
+
+displacement_engines = [
+    ("NUMPY", "NumPy", "Evaluate MakeTile materials directly. Falls back to Cycles for unsupported nodes", 1),
+    ("CYCLES", "Cycles", "Bake displacement maps with Cycles", 2)
+]
+
 material_mapping = [
     ("WRAP_AROUND", "Wrap around", "", 1),
     ("TRIPLANAR", "Triplanar", "", 2),
@@ -41,43 +41,53 @@ def create_turtle(name, vert_groups=None):
     return bm, obj
 
 
-def add_vert(bm):
+def add_vert(bm, turtle=None):
     """Add a vertice at the turtle location
 
     Args:
         bm (bmesh): bmesh
+        turtle (Turtle, optional): Turtle. If None the 3D cursor is used. Defaults to None.
     """
-    turtle = bpy.context.scene.cursor
+    if turtle is None:
+        turtle = bpy.context.scene.cursor
     vert = bmesh.ops.create_vert(bm, co=turtle.location)
     vert['vert'][0].select = True
 
 
-def pu(bm):
+def pu(bm, turtle=None):
     """Pen Up.
     Deselect all verts and set bmesh owning object's penstate property to 'False'
 
     Args:
         bm (bmesh): bmesh
+        turtle (Turtle, optional): Turtle. If None the active object's penstate is set. Defaults to None.
     """
     for v in bm.verts:
         v.select_set(False)
     bm.select_flush(False)
 
-    bpy.context.view_layer.objects.active.mt_object_props.penstate = False
+    if turtle is None:
+        bpy.context.view_layer.objects.active.mt_object_props.penstate = False
+    else:
+        turtle.penstate = False
     # bpy.context.view_layer.objects.active['penstate'] = False
 
 
-def pd(bm):
+def pd(bm, turtle=None):
     """Pen Down.
     Deselect all verts and set bmesh owning object's penstate property to 'True'
 
     Args:
         bm (bmesh): bmesh
+        turtle (Turtle, optional): Turtle. If None the active object's penstate is set. Defaults to None.
     """
-    bpy.context.view_layer.objects.active.mt_object_props.penstate = True
+    if turtle is None:
+        bpy.context.view_layer.objects.active.mt_object_props.penstate = True
+    else:
+        turtle.penstate = True
 
 
-def fd(bm, distance, del_original=True):
+def fd(bm, distance, del_original=True, turtle=None):
     """Move Forward.
     Moves turtle forward along its positive local y axis. If object's penstate is down (True) then also extrudes
     any selected vaerts / edges / faces
@@ -86,11 +96,12 @@ def fd(bm, distance, del_original=True):
         bm (bmesh): bmesh
         distance (float): distance
         del_original (bool, optional): Whether to delete original faces when extruding. Defaults to True.
+        turtle (Turtle, optional): Turtle. If None the 3D cursor is used. Defaults to None.
     """
-    extrude_translate(bm, (0.0, distance, 0.0), del_original)
+    extrude_translate(bm, (0.0, distance, 0.0), del_original, turtle=turtle)
 
 
-def bk(bm, distance, del_original=True):
+def bk(bm, distance, del_original=True, turtle=None):
     """Move Backward.
     Moves turtle backward along its negative local y axis. If object's penstate is down (True) then also extrudes
     any selected vaerts / edges / faces
@@ -99,11 +110,12 @@ def bk(bm, distance, del_original=True):
         bm (bmesh): bmesh
         distance (float): distance
         del_original (bool, optional): Whether to delete original faces when extruding. Defaults to True.
+        turtle (Turtle, optional): Turtle. If None the 3D cursor is used. Defaults to None.
     """
-    extrude_translate(bm, (0.0, -distance, 0.0), del_original)
+    extrude_translate(bm, (0.0, -distance, 0.0), del_original, turtle=turtle)
 
 
-def up(bm, distance, del_original=True):
+def up(bm, distance, del_original=True, turtle=None):
     """Move Up.
     Moves turtle up along its positive local z axis. If object's penstate is down (True) then also extrudes
     any selected vaerts / edges / faces
@@ -112,11 +124,12 @@ def up(bm, distance, del_original=True):
         bm (bmesh): bmesh
         distance (float): distance
         del_original (bool, optional): Whether to delete original faces when extruding. Defaults to True.
+        turtle (Turtle, optional): Turtle. If None the 3D cursor is used. Defaults to None.
     """
-    extrude_translate(bm, (0.0, 0.0, distance), del_original)
+    extrude_translate(bm, (0.0, 0.0, distance), del_original, turtle=turtle)
 
 
-def dn(bm, distance, del_original=True):
+def dn(bm, distance, del_original=True, turtle=None):
     """Move Down.
     Moves turtle down along its negative local z axis. If object's penstate is down (True) then also extrudes
     any selected vaerts / edges / faces
@@ -125,11 +138,12 @@ def dn(bm, distance, del_original=True):
         bm (bmesh): bmesh
         distance (float): distance
         del_original (bool, optional): Whether to delete original faces when extruding. Defaults to True.
+        turtle (Turtle, optional): Turtle. If None the 3D cursor is used. Defaults to None.
     """
-    extrude_translate(bm, (0.0, 0.0, -distance), del_original)
+    extrude_translate(bm, (0.0, 0.0, -distance), del_original, turtle=turtle)
 
 
-def ri(bm, distance, del_original=True):
+def ri(bm, distance, del_original=True, turtle=None):
     """Move Right.
     Moves turtle right along its positive local x axis. If object's penstate is down (True) then also extrudes
     any selected vaerts / edges / faces
@@ -138,11 +152,12 @@ def ri(bm, distance, del_original=True):
         bm (bmesh): bmesh
         distance (float): distance
         del_original (bool, optional): Whether to delete original faces when extruding. Defaults to True.
+        turtle (Turtle, optional): Turtle. If None the 3D cursor is used. Defaults to None.
     """
-    extrude_translate(bm, (distance, 0.0, 0.0), del_original)
+    extrude_translate(bm, (distance, 0.0, 0.0), del_original, turtle=turtle)
 
 
-def lf(bm, distance, del_original=True):
+def lf(bm, distance, del_original=True, turtle=None):
     """Move Left.
     Moves turtle left along its negative local x axis. If object's penstate is down (True) then also extrudes
     any selected vaerts / edges / faces
@@ -151,27 +166,33 @@ def lf(bm, distance, del_original=True):
         bm (bmesh): bmesh
         distance (float): distance
         del_original (bool, optional): Whether to delete original faces when extruding. Defaults to True.
+        turtle (Turtle, optional): Turtle. If None the 3D cursor is used. Defaults to None.
     """
-    extrude_translate(bm, (-distance, 0.0, 0.0), del_original)
+    extrude_translate(bm, (-distance, 0.0, 0.0), del_original, turtle=turtle)
 
 
-def ylf(degrees):
+def ylf(degrees, turtle=None):
     """Yaw Left.
     Rotates the turtlke around the y axis.
 
     Args:
         degrees ([type]): [description]
+        turtle (Turtle, optional): Turtle. If None the 3D cursor is used. Defaults to None.
     """
-    yri(-degrees)
+    yri(-degrees, turtle)
 
 
-def yri(degrees):
+def yri(degrees, turtle=None):
     """Yaw Right.
     Rotates the turtle around the y axis.
 
     Args:
         degrees ([type]): [description]
+        turtle (Turtle, optional): Turtle. If None the 3D cursor is used. Defaults to None.
     """
+    if turtle is not None:
+        turtle.rotate(y=radians(degrees))
+        return
     turtle = bpy.context.scene.cursor
     turtle.rotation_euler = (
         turtle.rotation_euler[0],
@@ -179,35 +200,44 @@ def yri(degrees):
         turtle.rotation_euler[2])
 
 
-def ptu(degrees):
+def ptu(degrees, turtle=None):
     """Pitch Up.
     Rotates the turtle around the X axis.
 
     Args:
         degrees (float): degrees
+        turtle (Turtle, optional): Turtle. If None the 3D cursor is used. Defaults to None.
     """
+    if turtle is not None:
+        turtle.rotate(x=radians(degrees))
+        return
     turtle = bpy.context.scene.cursor
     turtle.rotation_euler = (
         turtle.rotation_euler[0] + radians(degrees),
         turtle.rotation_euler[1],
         turtle.rotation_euler[2])
 
-def ptd(degrees):
+def ptd(degrees, turtle=None):
     """Pitch Up.
     Rotates the turtle around the Y axis.
 
     Args:
         degrees (float): degrees
+        turtle (Turtle, optional): Turtle. If None the 3D cursor is used. Defaults to None.
     """
-    ptu(-degrees)
+    ptu(-degrees, turtle)
 
-def lt(degrees):
+def lt(degrees, turtle=None):
     """Left turn.
     Rotates the turtle left around its Z axis
 
     Args:
         degrees (float): degrees
+        turtle (Turtle, optional): Turtle. If None the 3D cursor is used. Defaults to None.
     """
+    if turtle is not None:
+        turtle.rotate(z=radians(degrees))
+        return
     turtle = bpy.context.scene.cursor
     turtle.rotation_euler = (
         turtle.rotation_euler[0],
@@ -215,61 +245,68 @@ def lt(degrees):
         turtle.rotation_euler[2] + radians(degrees))
 
 
-def rt(degrees):
+def rt(degrees, turtle=None):
     """Right turn.
     Rotates the turtle right around its Z axis
 
     Args:
         degrees (float): degrees
+        turtle (Turtle, optional): Turtle. If None the 3D cursor is used. Defaults to None.
     """
-    lt(-degrees)
+    lt(-degrees, turtle)
 
 
-def arc(bm, radius, degrees, segments):
+def arc(bm, radius, degrees, segments, turtle=None):
     """Draw and arc centered on the turtle.
 
     Args:
         radius (float): radius
         degrees (float): degrees of arc to draw
         segments (int): number of segments to draw
+        turtle (Turtle, optional): Turtle. If None the 3D cursor is used. Defaults to None.
     """
     circ = 2 * pi * radius
     seg_length = circ / ((360 / degrees) * segments)
     rotation = degrees / segments
 
-    turtle = bpy.context.scene.cursor
-    start_loc = turtle.location.copy()
-    start_rot = turtle.rotation_euler.copy()
+    if turtle is None:
+        state = bpy.context.scene.cursor
+    else:
+        state = turtle
+    start_loc = state.location.copy()
+    start_rot = state.rotation_euler.copy()
 
-    pu(bm)
+    pu(bm, turtle)
     edges = [e for e in bm.edges]
-    fd(bm, radius)
-    add_vert(bm)
-    pd(bm)
-    rt(90)
-    rt(rotation / 2)
+    fd(bm, radius, turtle=turtle)
+    add_vert(bm, turtle)
+    pd(bm, turtle)
+    rt(90, turtle)
+    rt(rotation / 2, turtle)
 
     i = 0
     while i < segments:
-        fd(bm, seg_length)
-        rt(rotation)
+        fd(bm, seg_length, turtle=turtle)
+        rt(rotation, turtle)
 
         i += 1
 
-    pu(bm)
+    pu(bm, turtle)
 
-    turtle.location = start_loc
-    turtle.rotation_euler = start_rot
+    state.location = start_loc
+    state.rotation_euler = start_rot
     return [e for e in bm.edges if e not in edges]
 
-def home(obj):
+def home(obj, turtle=None):
     """Home turtle.
     Returns the turtle to its parent object's origin
 
     Args:
         obj (bpy.types.Object): parent object
+        turtle (Turtle, optional): Turtle. If None the 3D cursor is used. Defaults to None.
     """
-    turtle = bpy.context.scene.cursor
+    if turtle is None:
+        turtle = bpy.context.scene.cursor
     turtle.location = obj.location
     turtle.rotation_euler = obj.rotation_euler
 
@@ -0,0 +1,240 @@
+"""Direct builders for subdivided cuboid cores.
+
+These produce the same topology and vertex groups as draw_straight_wall_core and
+draw_rectangular_floor_core in scripts.py but calculate the vertex grid, faces and vertex
+group membership up front with numpy and create the mesh in a single foreach_set pass
+rather than through hundreds of incremental bmesh extrusions and bounding box scans.
+"""
+import numpy as np
+import bpy
+from .turtle import Turtle
+from ..utils.selection import coords_in_bbox, transform_coords
+
+
+def build_straight_wall_core(dims, subdivs, margin=0.001):
+    """Build a Straight Wall Core and assign Verts to appropriate groups.
+
+    Equivalent to scripts.draw_straight_wall_core.
+
+    Args:
+        dims (tuple[3]): X, Y, Z Dimensions
+        subdivs (tuple[3]): How many times to subdivide each face
+        margin (float, optional): Margin to leave around textured areas to correct for displacement distortion.
+        Defaults to 0.001.
+
+    Returns:
+        bpy.types.Object: Wall Core
+    """
+    vert_groups = ['Left', 'Right', 'Front', 'Back', 'Top', 'Bottom']
+    coords, lattice, faces = cuboid_grid(dims, subdivs, margin)
+    k = lattice[2]
+    nz = subdivs[2] + 3
+    buffer = margin / 2
+
+    top = k == nz - 1
+    bottom = k == 0
+    not_top_or_bottom = ~(top | bottom)
+
+    left = coords_in_bbox(coords, (0, 0, 0), (0, dims[1], dims[2]), buffer)
+    right = coords_in_bbox(coords, (dims[0], 0, 0), dims, buffer)
+
+    groups = {
+        'Left': left & not_top_or_bottom,
+        'Right': right & not_top_or_bottom,
+        'Front': coords_in_bbox(
+            coords,
+            (margin, 0, margin),
+            (dims[0] - margin, 0, dims[2] - margin),
+            buffer),
+        'Back': coords_in_bbox(
+            coords,
+            (margin, dims[1], margin),
+            (dims[0] - margin, dims[1], dims[2] - margin),
+            buffer),
+        'Top': top & ~(left | right),
+        'Bottom': bottom}
+
+    return create_core_object('Straight Wall', coords, faces, vert_groups, groups)
+
+
+def build_rectangular_floor_core(dims, subdivs, margin=0.001, offset=0):
+    """Build a rectangular floor core and assign Verts to appropriate groups.
+
+    Equivalent to scripts.draw_rectangular_floor_core.
+
+    Args:
+        dims (tuple[3]): Dimensions
+        subdivs (tuple[3]): How many times to subdivide each face
+        margin (float, optional): Margin to leave around textured areas
+        to correct for displacement distortion.
+        Defaults to 0.001.
+        offset (float): Used for L Walls
+
+    Returns:
+        bpy.types.Object: Floor Core
+    """
+    orig_loc = bpy.context.scene.cursor.location.copy()
+    vert_groups = ['Left', 'Right', 'Front', 'Back', 'Top', 'Bottom']
+    coords, lattice, faces = cuboid_grid(dims, subdivs, margin)
+    k = lattice[2]
+    nz = subdivs[2] + 3
+    buffer = margin / 2
+
+    left = coords_in_bbox(
+        coords,
+        orig_loc,
+        (orig_loc[0], dims[1] + offset, dims[2]),
+        buffer)
+    right = coords_in_bbox(
+        coords,
+        (dims[0] + offset, orig_loc[1], orig_loc[2]),
+        (dims[0] + offset, dims[1] + offset, dims[2]),
+        buffer)
+    front = coords_in_bbox(
+        coords,
+        orig_loc,
+        (dims[0] + offset, orig_loc[1], dims[2]),
+        buffer)
+    back = coords_in_bbox(
+        coords,
+        (orig_loc[0], dims[1] + offset, orig_loc[2]),
+        (dims[0] + offset, dims[1] + offset, dims[2]),
+        buffer)
+
+    sides = left | right | front | back
+    top = (k == nz - 1) & ~sides
+
+    groups = {
+        'Left': left,
+        'Right': right,
+        'Front': front,
+        'Back': back,
+        'Top': top,
+        'Bottom': ~(sides | top)}
+
+    return create_core_object('Rectangular Floor', coords, faces, vert_groups, groups)
+
+
+def grid_steps(length, subdivs, margin):
+    """Return the positions of grid lines along one axis of a core.
+
+    Args:
+        length (float): length of axis
+        subdivs (int): number of subdivisions between margins
+        margin (float): margin at each end
+
+    Returns:
+        numpy.ndarray: (subdivs + 3,) array of positions
+    """
+    inner = np.linspace(margin, length - margin, subdivs + 1)
+    return np.concatenate(([0.0], inner, [length]))
+
+
+def cuboid_grid(dims, subdivs, margin=0.001):
+    """Calculate the verts and faces of a cuboid with subdivided faces.
+
+    Each axis is split into a margin at each end with subdivs[n] equal divisions between.
+    Verts are positioned relative to the 3D cursor.
+
+    Args:
+        dims (tuple[3]): X, Y, Z Dimensions
+        subdivs (tuple[3]): How many times to subdivide each face
+        margin (float, optional): Margin. Defaults to 0.001.
+
+    Returns:
+        numpy.ndarray: (n, 3) vert coordinates
+        tuple(numpy.ndarray[3]): x, y and z grid indexes of each vert
+        numpy.ndarray: (f, 4) vert indices of each quad, wound so normals face outwards
+    """
+    steps = [grid_steps(dims[n], subdivs[n], margin) for n in range(3)]
+    shape = tuple(len(s) for s in steps)
+
+    # only verts on the surface of the lattice are part of the mesh
+    i, j, k = np.indices(shape)
+    surface = (
+        (i == 0) | (i == shape[0] - 1) |
+        (j == 0) | (j == shape[1] - 1) |
+        (k == 0) | (k == shape[2] - 1))
+
+    index = np.full(shape, -1, dtype=np.int64)
+    lattice = (i[surface], j[surface], k[surface])
+    index[lattice] = np.arange(len(lattice[0]))
+
+    coords = np.column_stack([steps[n][lattice[n]] for n in range(3)])
+    matrix = Turtle.from_cursor().matrix
+    coords = transform_coords(coords, matrix)
+
+    faces = np.concatenate((
+        grid_quads(index[:, :, 0], flip=True),    # bottom
+        grid_quads(index[:, :, -1], flip=False),  # top
+        grid_quads(index[:, 0, :], flip=False),   # front
+        grid_quads(index[:, -1, :], flip=True),   # back
+        grid_quads(index[0, :, :], flip=True),    # left
+        grid_quads(index[-1, :, :], flip=False)))  # right
+
+    return coords, lattice, faces
+
+
+def grid_quads(grid, flip=False):
+    """Return quads covering a 2D grid of vert indices.
+
+    Quads are wound so their normal is the cross product of the grid's first and second axis.
+
+    Args:
+        grid (numpy.ndarray): (u, v) array of vert indices
+        flip (bool, optional): Reverse winding. Defaults to False.
+
+    Returns:
+        numpy.ndarray: (f, 4) vert indices
+    """
+    a = grid[:-1, :-1]
+    b = grid[1:, :-1]
+    c = grid[1:, 1:]
+    d = grid[:-1, 1:]
+    if flip:
+        quads = (a, d, c, b)
+    else:
+        quads = (a, b, c, d)
+    return np.stack(quads, axis=-1).reshape(-1, 4)
+
+
+def create_core_object(name, coords, faces, vert_groups, groups):
+    """Create a mesh object from quads and assign verts to vertex groups.
+
+    Args:
+        name (str): Object name
+        coords (numpy.ndarray): (n, 3) vert coordinates
+        faces (numpy.ndarray): (f, 4) vert indices
+        vert_groups (list[str]): Names of vertex groups to create
+        groups (dict{str: numpy.ndarray}): boolean mask of verts in each vertex group
+
+    Returns:
+        bpy.types.Object: object
+    """
+    mesh = bpy.data.meshes.new("mesh")
+    mesh.vertices.add(len(coords))
+    mesh.vertices.foreach_set('co', coords.astype(np.float32).ravel())
+
+    face_count = len(faces)
+    mesh.loops.add(face_count * 4)
+    mesh.loops.foreach_set('vertex_index', faces.astype(np.int32).ravel())
+    mesh.polygons.add(face_count)
+    mesh.polygons.foreach_set(
+        'loop_start', np.arange(0, face_count * 4, 4, dtype=np.int32))
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set(
+            'loop_total', np.full(face_count, 4, dtype=np.int32))
+    mesh.update(calc_edges=True)
+
+    obj = bpy.data.objects.new(name, mesh)
+    for group_name in vert_groups:
+        group = obj.vertex_groups.new(name=group_name)
+        indices = np.flatnonzero(groups[group_name])
+        if len(indices):
+            group.add(indices.tolist(), 1, 'ADD')
+
+    # link object to active collection and make active to match create_turtle
+    bpy.context.layer_collection.collection.objects.link(obj)
+    bpy.context.view_layer.objects.active = obj
+
+    return obj
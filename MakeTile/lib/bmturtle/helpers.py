@@ -1,9 +1,15 @@
 from math import inf, tan, radians, acos, pi, modf
+from itertools import compress
+from heapq import heappush, heappop
 import bmesh
 import bpy
 from mathutils import Vector, geometry
 from mathutils.bvhtree import BVHTree
-from ..utils.selection import in_bbox
+from ..utils.selection import (
+    coords_in_bbox,
+    bm_verts_in_bbox,
+    bm_edges_in_bbox,
+    set_select_from_mask)
 
 def bmesh_array(
     source_obj=None,
@@ -136,7 +142,7 @@ def bm_deselect_all(bm):
     bm.select_flush(False)
 
 
-def select_verts_in_bounds(lbound, ubound, buffer, bm):
+def select_verts_in_bounds(lbound, ubound, buffer, bm, coords=None):
     """Select vertices within cubical boundary.
 
     Args:
@@ -144,25 +150,33 @@ def select_verts_in_bounds(lbound, ubound, buffer, bm):
         ubound (tuble[3]): Upper left corner of bounds
         buffer (float): Buffer around bbox
         bm (bmesh): bmesh
+        coords (numpy.ndarray, optional): Vert coordinates from get_bm_vert_coords. Pass these in
+        when making several selections on unchanged geometry. Defaults to None.
 
     Returns:
         list[bmesh.verts]: List of verts
     """
-    vert_coords = [v.co.to_tuple() for v in bm.verts]
-    to_select = [in_bbox(lbound, ubound, v, buffer) for v in vert_coords]
+    if coords is None:
+        mask = bm_verts_in_bbox(bm, lbound, ubound, buffer)
+    else:
+        mask = coords_in_bbox(coords, lbound, ubound, buffer)
+    set_select_from_mask(bm.verts, mask)
+    return list(compress(bm.verts, mask.tolist()))
 
-    for vert, select in zip(bm.verts, to_select):
-        vert.select = select
+def select_edges_in_bounds(lbound, ubound, buffer, bm):
+    """Select edges wholly within cubical boundary.
 
-    return [v for v in bm.verts if v.select]
+    Args:
+        lbound (tuple[3]): Lower left corner of bounds
+        ubound (tuble[3]): Upper left corner of bounds
+        buffer (float): Buffer around bbox
+        bm (bmesh): bmesh
 
-def select_edges_in_bounds(lbound, ubound, buffer, bm):
-    vert_coords = []
-    [vert_coords.append([v.co.to_tuple()for v in e.verts]) for e in bm.edges]
-    to_select = []
-    [to_select.append(all(in_bbox(lbound, ubound, v, buffer)for v in e)) for e in vert_coords]
-    for edge_obj, select in zip(bm.edges, to_select):
-        edge_obj.select = select
+    Returns:
+        list[bmesh.edges]: List of edges
+    """
+    mask = bm_edges_in_bbox(bm, lbound, ubound, buffer)
+    set_select_from_mask(bm.edges, mask)
     return [e for e in bm.edges if e.select]
 
 def points_are_inside_bmesh(coords, bm):
@@ -208,23 +222,30 @@ def assign_verts_to_group(verts, obj, deform_groups, group_name):
             groups = v[deform_groups]
             groups[group_index] = 1
 
-def extrude_translate(bm, local_trans, del_original=True, extrude=True):
+def extrude_translate(bm, local_trans, del_original=True, extrude=True, turtle=None):
     """Extrudes and translates selected verts, edges or faces
 
     Args:
         bm (bmesh): bmesh
         local_trans (Vector[3]): Local transform vector
         del_original (bool, optional): Whether to delete original faces. Defaults to True.
+        turtle (Turtle, optional): Turtle to move. If None the 3D cursor is used as the turtle
+        and the pen state is read from the active object. Defaults to None.
     """
-    # use cursor as turtle
-    turtle = bpy.context.scene.cursor
-
-    # work out transform in turtle's local space and convert to global
-    local_trans = Vector(local_trans)
-    world_trans = turtle.matrix.to_3x3() @ local_trans
-    turtle.location = turtle.matrix.translation + world_trans
+    if turtle is None:
+        # use cursor as turtle
+        cursor = bpy.context.scene.cursor
+
+        # work out transform in turtle's local space and convert to global
+        local_trans = Vector(local_trans)
+        world_trans = cursor.matrix.to_3x3() @ local_trans
+        cursor.location = cursor.matrix.translation + world_trans
+        penstate = bpy.context.view_layer.objects.active.mt_object_props.penstate
+    else:
+        world_trans = turtle.move(local_trans)
+        penstate = turtle.penstate
 
-    if bpy.context.view_layer.objects.active.mt_object_props.penstate is True:
+    if penstate is True:
         if bm.select_mode == {'VERT'}:
             bm.select_flush(True)
             # get selected verts
@@ -304,65 +325,98 @@ def extrude_translate(bm, local_trans, del_original=True, extrude=True):
             else:
                 bmesh.ops.translate(bm, vec=(world_trans), verts=[v for v in bm.verts if v.select])
 
-# https://blender.stackexchange.com/questions/186067/what-is-the-bmesh-equivalent-to-bpy-ops-mesh-shortest-path-select
 class Node:
-    """Return a node object that contains list of edges \
-     that make up shortest path between two verts.
+    """A vert reached by bm_shortest_path.
 
-    Returns:
-        dict{vert: BMVert, length: float, shortest_path: list[BMEdge]}: Dict giving shortest path \
-        between two verts
+    Stores the length of the shortest path found to the vert and the edge it was reached
+    by, so the path is only assembled when it is asked for.
     """
-    @property
-    def edges(self):
-        return (e for e in self.vert.link_edges if not e.tag)
 
-    def __init__(self, v):
+    def __init__(self, v, length=inf, edge=None, parent=None):
         self.vert = v
-        self.length = inf
-        self.shortest_path = []
+        self.length = length
+        self.edge = edge
+        self.parent = parent
+
+    @property
+    def shortest_path(self):
+        """list[BMEdge]: edges making up the shortest path from the start vert to this vert."""
+        path = []
+        node = self
+        while node.parent is not None:
+            path.append(node.edge)
+            node = node.parent
+        path.reverse()
+        return path
 
 
 def bm_shortest_path(bm, v_start, v_target=None):
     """Return shortest path between two verts.
 
+    Dijkstra's algorithm with a heap. Nodes are only created for verts that are reached and
+    the search stops as soon as v_target is reached.
+
     Args:
         bm (bmesh): bmesh
         v_start (bmesh.vert): start vert
-        v_target (bmesh.vert, optional): end vert. Defaults to None.
+        v_target (bmesh.vert, optional): end vert. Defaults to None, which finds paths to
+        all verts connected to v_start.
 
     Returns:
-        dict{BMVert: Node}: Nodes
+        dict{BMVert: Node}: Nodes of reached verts. v_target is always included and has an
+        empty path and infinite length if it can't be reached.
     """
-    for e in bm.edges:
-        e.tag = False
-
-    d = {v : Node(v) for v in bm.verts}
-    node = d[v_start]
-    node.length = 0
-
-    visiting = [node]
-
-    while visiting:
-        node = visiting.pop(0)
+    nodes = {v_start: Node(v_start, 0)}
+    visited = set()
+    # the counter breaks ties between equal lengths without comparing verts
+    heap = [(0, 0, v_start)]
+    counter = 1
+
+    while heap:
+        length, _, v = heappop(heap)
+        if v in visited:
+            continue
+        if v is v_target:
+            return nodes
+        visited.add(v)
+        node = nodes[v]
+
+        for e in v.link_edges:
+            other = e.other_vert(v)
+            if other in visited:
+                continue
+            new_length = length + e.calc_length()
+            other_node = nodes.get(other)
+            if other_node is None:
+                nodes[other] = Node(other, new_length, e, node)
+            elif new_length < other_node.length:
+                other_node.length = new_length
+                other_node.edge = e
+                other_node.parent = node
+            else:
+                continue
+            heappush(heap, (new_length, counter, other))
+            counter += 1
 
-        if node.vert is v_target:
-            return d
+    if v_target is not None and v_target not in nodes:
+        nodes[v_target] = Node(v_target)
+    return nodes
 
-        for e in node.edges:
-            e.tag = True
-            length = node.length + e.calc_length()
-            v = e.other_vert(node.vert)
 
-            visit = d[v]
-            visiting.append(visit)
-            if visit.length > length:
-                visit.length = length
-                visit.shortest_path = node.shortest_path + [e]
+def bm_path_edges(bm, v_start, v_target):
+    """Return the edges and length of the shortest path between two verts.
 
-        visiting.sort(key=lambda n: n.length)
+    Args:
+        bm (bmesh): bmesh
+        v_start (bmesh.vert): start vert
+        v_target (bmesh.vert): end vert
 
-    return d
+    Returns:
+        tuple(list[BMEdge], float): edges in order from v_start to v_target and total length.
+        ([], inf) if there is no path.
+    """
+    node = bm_shortest_path(bm, v_start, v_target)[v_target]
+    return node.shortest_path, node.length
 
 
 def add_vertex_to_intersection(bm, edges):
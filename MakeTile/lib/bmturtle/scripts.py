@@ -21,7 +21,9 @@ from .helpers import (
     bm_deselect_all,
     assign_verts_to_group,
     select_verts_in_bounds,
-    bm_shortest_path)
+    bm_path_edges)
+from .turtle import Turtle
+from ..utils.selection import get_bm_vert_coords
 '''
 from line_profiler import LineProfiler
 from os.path import splitext
@@ -39,18 +41,19 @@ def draw_cuboid(dimensions):
         obj: bpy.types.Object
     """
     bm, obj = create_turtle(name='cuboid')
-    add_vert(bm)
+    turtle = Turtle.from_cursor()
+    add_vert(bm, turtle)
     bm.select_mode = {'VERT'}
-    fd(bm, dimensions[1])
+    fd(bm, dimensions[1], turtle=turtle)
     bm.select_mode = {'EDGE'}
     bm_select_all(bm)
-    ri(bm, dimensions[0])
+    ri(bm, dimensions[0], turtle=turtle)
     bm.select_mode = {'FACE'}
     bm_select_all(bm)
-    up(bm, dimensions[2], False)
-    pu(bm)
+    up(bm, dimensions[2], False, turtle=turtle)
+    pu(bm, turtle)
 
-    home(obj)
+    home(obj, turtle)
     finalise_turtle(bm, obj)
 
     return obj
@@ -387,6 +390,7 @@ def draw_straight_wall_core(dims, subdivs, margin=0.001):
     vert_groups = ['Left', 'Right', 'Front', 'Back', 'Top', 'Bottom']
 
     bm, obj = create_turtle('Straight Wall', vert_groups)
+    turtle = Turtle.from_cursor()
 
     # create vertex group layer
     bm.verts.layers.deform.verify()
@@ -397,35 +401,35 @@ def draw_straight_wall_core(dims, subdivs, margin=0.001):
     top_verts = []
 
     # Start drawing wall
-    pd(bm)
-    add_vert(bm)
+    pd(bm, turtle)
+    add_vert(bm, turtle)
     bm.select_mode = {'VERT'}
 
     # Draw front bottom edges
-    ri(bm, margin)
+    ri(bm, margin, turtle=turtle)
 
     subdiv_x_dist = (dims[0] - (margin * 2)) / subdivs[0]
 
     i = 0
     while i < subdivs[0]:
-        ri(bm, subdiv_x_dist)
+        ri(bm, subdiv_x_dist, turtle=turtle)
         i += 1
 
-    ri(bm, margin)
+    ri(bm, margin, turtle=turtle)
 
     # Select edge and extrude to create bottom
     bm.select_mode = {'EDGE'}
     bm_select_all(bm)
-    fd(bm, margin)
+    fd(bm, margin, turtle=turtle)
 
     subdiv_y_dist = (dims[1] - (margin * 2)) / subdivs[1]
 
     i = 0
     while i < subdivs[1]:
-        fd(bm, subdiv_y_dist)
+        fd(bm, subdiv_y_dist, turtle=turtle)
         i += 1
 
-    fd(bm, margin)
+    fd(bm, margin, turtle=turtle)
 
     # Save verts to add to bottom vert group
     for v in bm.verts:
@@ -434,16 +438,16 @@ def draw_straight_wall_core(dims, subdivs, margin=0.001):
     # select bottom and extrude up
     bm.select_mode = {'FACE'}
     bm_select_all(bm)
-    up(bm, margin, False)
+    up(bm, margin, False, turtle=turtle)
 
     subdiv_z_dist = (dims[2] - (margin * 2)) / subdivs[2]
 
     i = 0
     while i < subdivs[2]:
-        up(bm, subdiv_z_dist)
+        up(bm, subdiv_z_dist, turtle=turtle)
         i += 1
 
-    up(bm, margin)
+    up(bm, margin, turtle=turtle)
 
     # Save top verts to add to top vertex group
     top_verts = [v for v in bm.verts if v.select]
@@ -452,18 +456,19 @@ def draw_straight_wall_core(dims, subdivs, margin=0.001):
     assign_verts_to_group(bottom_verts, obj, deform_groups, 'Bottom')
 
     # home turtle
-    pu(bm)
+    pu(bm, turtle)
 
-    home(obj)
+    home(obj, turtle)
 
     # select left side and assign to vert group
     lbound = (0, 0, 0)
     ubound = (0, dims[1], dims[2])
     buffer = margin / 2
 
+    top_and_bottom = set(top_verts).union(bottom_verts)
     left_verts_orig = select_verts_in_bounds(lbound, ubound, buffer, bm)
     left_verts = [
-        v for v in left_verts_orig if v not in top_verts and v not in bottom_verts]
+        v for v in left_verts_orig if v not in top_and_bottom]
     assign_verts_to_group(left_verts, obj, deform_groups, 'Left')
 
     # select right side and assign to vert group
@@ -473,16 +478,17 @@ def draw_straight_wall_core(dims, subdivs, margin=0.001):
 
     right_verts_orig = select_verts_in_bounds(lbound, ubound, buffer, bm)
     right_verts = [
-        v for v in right_verts_orig if v not in top_verts and v not in bottom_verts]
+        v for v in right_verts_orig if v not in top_and_bottom]
     assign_verts_to_group(right_verts, obj, deform_groups, 'Right')
 
     # make sure top and bottom verts don't contain any verts from ends
+    ends = set(left_verts_orig).union(right_verts_orig)
     top_verts = [
-        v for v in top_verts if v not in left_verts_orig and v not in right_verts_orig]
+        v for v in top_verts if v not in ends]
     assign_verts_to_group(top_verts, obj, deform_groups, 'Top')
 
     bottom_verts = [
-        v for v in bottom_verts if v not in left_verts_orig and v not in right_verts_orig]
+        v for v in bottom_verts if v not in ends]
     assign_verts_to_group(bottom_verts, obj, deform_groups, 'Bottom')
 
     # select front side and assign to vert group
@@ -549,7 +555,7 @@ def draw_corner_core(
     base_height = dimensions['base_height']
     height = dimensions['height']
 
-    turtle = bpy.context.scene.cursor
+    turtle = Turtle.from_cursor()
     turtle_start_loc = turtle.location.copy()
     vert_groups = [
         'Leg 1 End',
@@ -576,24 +582,24 @@ def draw_corner_core(
 
     # move turtle to core start loc
     orig_rot = turtle.rotation_euler.copy()
-    pu(bm)
-    up(bm, base_height)
-    rt(angle)
-    fd(bm, triangles_1['a_adj'])
-    lt(90)
-    fd(bm, thickness_diff / 2)
-    lt(90)
-    fd(bm, triangles_1['b_adj'])
+    pu(bm, turtle)
+    up(bm, base_height, turtle=turtle)
+    rt(angle, turtle)
+    fd(bm, triangles_1['a_adj'], turtle=turtle)
+    lt(90, turtle)
+    fd(bm, thickness_diff / 2, turtle=turtle)
+    lt(90, turtle)
+    fd(bm, triangles_1['b_adj'], turtle=turtle)
     turtle.rotation_euler = orig_rot
     turtle_start_loc = turtle.location.copy()
-    pd(bm)
+    pd(bm, turtle)
     # draw leg 1
     # outer edge
     subdiv_dist = (triangles_2['a_adj'] - margin) / \
         native_subdivisions['leg 1']
 
-    add_vert(bm)
-    rt(angle)
+    add_vert(bm, turtle)
+    rt(angle, turtle)
     bm.verts.ensure_lookup_table()
     leg_1_outer_vert_locs.append(verts[-1].co.copy())
 
@@ -601,9 +607,9 @@ def draw_corner_core(
     bm.verts.ensure_lookup_table()
     start_index = verts[-1].index
     while i < native_subdivisions['leg 1']:
-        fd(bm, subdiv_dist)
+        fd(bm, subdiv_dist, turtle=turtle)
         i += 1
-    fd(bm, margin)
+    fd(bm, margin, turtle=turtle)
 
     i = start_index
     bm.verts.ensure_lookup_table()
@@ -617,24 +623,24 @@ def draw_corner_core(
     # end
     # we're going to bridge between inner and outer side
     # so we don't draw end edge
-    pu(bm)
-    lt(90)
-    fd(bm, thickness)
-    pd(bm)
-    add_vert(bm)
+    pu(bm, turtle)
+    lt(90, turtle)
+    fd(bm, thickness, turtle=turtle)
+    pd(bm, turtle)
+    add_vert(bm, turtle)
     bm.verts.ensure_lookup_table()
     leg_1_end_vert_locs.append(verts[-1].co.copy())
-    lt(90)
+    lt(90, turtle)
 
     # inner
     subdiv_dist = (triangles_2['b_adj'] - margin) / \
         native_subdivisions['leg 1']
     bm.verts.ensure_lookup_table()
     start_index = verts[-1].index
-    fd(bm, margin)
+    fd(bm, margin, turtle=turtle)
     i = 0
     while i < native_subdivisions['leg 1']:
-        fd(bm, subdiv_dist)
+        fd(bm, subdiv_dist, turtle=turtle)
         i += 1
 
     i = start_index
@@ -644,10 +650,10 @@ def draw_corner_core(
         i += 1
 
     # home
-    pu(bm)
-    home(obj)
+    pu(bm, turtle)
+    home(obj, turtle)
     turtle.location = turtle_start_loc
-    pd(bm)
+    pd(bm, turtle)
 
     # draw leg 2 #
     leg_2_outer_vert_locs = []
@@ -657,16 +663,16 @@ def draw_corner_core(
         native_subdivisions['leg 2']
 
     # outer
-    add_vert(bm)
+    add_vert(bm, turtle)
     bm.verts.ensure_lookup_table()
     leg_2_outer_vert_locs.append(verts[-1].co.copy())
     start_index = verts[-1].index
 
     i = 0
     while i < native_subdivisions['leg 2']:
-        fd(bm, subdiv_dist)
+        fd(bm, subdiv_dist, turtle=turtle)
         i += 1
-    fd(bm, margin)
+    fd(bm, margin, turtle=turtle)
 
     bm.verts.ensure_lookup_table()
     i = start_index + 1
@@ -675,27 +681,27 @@ def draw_corner_core(
         i += 1
 
     # end
-    pu(bm)
-    rt(90)
+    pu(bm, turtle)
+    rt(90, turtle)
 
     bm.verts.ensure_lookup_table()
     leg_2_end_vert_locs.append(verts[-1].co.copy())
-    fd(bm, thickness)
-    pd(bm)
-    add_vert(bm)
+    fd(bm, thickness, turtle=turtle)
+    pd(bm, turtle)
+    add_vert(bm, turtle)
     bm.verts.ensure_lookup_table()
     leg_2_end_vert_locs.append(verts[-1].co.copy())
-    rt(90)
+    rt(90, turtle)
 
     # inner
     subdiv_dist = (triangles_2['d_adj'] - margin) / \
         native_subdivisions['leg 2']
     bm.verts.ensure_lookup_table()
     start_index = verts[-1].index
-    fd(bm, margin)
+    fd(bm, margin, turtle=turtle)
     i = 0
     while i < native_subdivisions['leg 2']:
-        fd(bm, subdiv_dist)
+        fd(bm, subdiv_dist, turtle=turtle)
         i += 1
 
     i = start_index
@@ -721,15 +727,15 @@ def draw_corner_core(
     bm_select_all(bm)
     bm.select_mode = {'FACE'}
 
-    up(bm, margin, False)
+    up(bm, margin, False, turtle=turtle)
 
     i = 0
     while i < native_subdivisions['height']:
-        up(bm, subdiv_dist)
+        up(bm, subdiv_dist, turtle=turtle)
         i += 1
-    up(bm, margin)
+    up(bm, margin, turtle=turtle)
 
-    home(obj)
+    home(obj, turtle)
 
     vert_locs = {
         'Leg 1 Inner': leg_1_inner_vert_locs,
@@ -941,6 +947,9 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
 
     kd.balance()
 
+    # geometry doesn't change while we build the groups so only fetch coords once
+    coords = get_bm_vert_coords(bm.verts)
+
     for key, value in sides.items():
         vert_group = []
         for loc in value:
@@ -950,7 +959,8 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
                 ubound=(bottom_vert_co[0], bottom_vert_co[1],
                         bottom_vert_co[2] + height),
                 buffer=margin / 2,
-                bm=bm)
+                bm=bm,
+                coords=coords)
             vert_group.extend(verts)
         vert_groups[key] = vert_group
 
@@ -970,10 +980,9 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
         v2 = bm.verts[v2_index]
 
         # select shortest path
-        nodes = bm_shortest_path(bm, v1, v2)
-        node = nodes[v2]
+        path, _ = bm_path_edges(bm, v1, v2)
 
-        for e in node.shortest_path:
+        for e in path:
             e.select_set(True)
         bm.select_flush(True)
 
@@ -982,7 +991,7 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
 
         for v in verts:
             selected = select_verts_in_bounds(
-                v.co, (v.co[0], v.co[1], v.co[2] + height), margin / 2, bm)
+                v.co, (v.co[0], v.co[1], v.co[2] + height), margin / 2, bm, coords)
             selected_verts.extend(selected)
 
         vert_groups[key] = selected_verts
@@ -1003,10 +1012,9 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
         v1 = bm.verts[v1_index]
         v2 = bm.verts[v2_index]
 
-        nodes = bm_shortest_path(bm, v1, v2)
-        node = nodes[v2]
+        path, _ = bm_path_edges(bm, v1, v2)
 
-        for e in node.shortest_path:
+        for e in path:
             e.select_set(True)
         bm.select_flush(True)
 
@@ -1031,10 +1039,9 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
         v1 = bm.verts[v1_index]
         v2 = bm.verts[v2_index]
 
-        nodes = bm_shortest_path(bm, v1, v2)
-        node = nodes[v2]
+        path, _ = bm_path_edges(bm, v1, v2)
 
-        for e in node.shortest_path:
+        for e in path:
             e.select_set(True)
         bm.select_flush(True)
 
@@ -1060,7 +1067,8 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
              inner_locs[i][1],
              inner_locs[i][2] + height),
             margin / 2,
-            bm)
+            bm,
+            coords)
         v2 = select_verts_in_bounds(
             (outer_locs[i][0],
              outer_locs[i][1],
@@ -1069,12 +1077,12 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
              outer_locs[i][1],
              outer_locs[i][2] + height),
             margin / 2,
-            bm)
+            bm,
+            coords)
 
-        nodes = bm_shortest_path(bm, v1[0], v2[0])
-        node = nodes[v2[0]]
+        path, _ = bm_path_edges(bm, v1[0], v2[0])
 
-        for e in node.shortest_path:
+        for e in path:
             e.select_set(True)
         bm.select_flush(True)
 
@@ -1099,7 +1107,8 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
              inner_locs[i][1],
              inner_locs[i][2] + height),
             margin / 2,
-            bm)
+            bm,
+            coords)
         v2 = select_verts_in_bounds(
             (outer_locs[i][0],
              outer_locs[i][1],
@@ -1108,12 +1117,12 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
              outer_locs[i][1],
              outer_locs[i][2] + height),
             margin / 2,
-            bm)
+            bm,
+            coords)
 
-        nodes = bm_shortest_path(bm, v1[0], v2[0])
-        node = nodes[v2[0]]
+        path, _ = bm_path_edges(bm, v1[0], v2[0])
 
-        for e in node.shortest_path:
+        for e in path:
             e.select_set(True)
         bm.select_flush(True)
 
@@ -1322,16 +1331,17 @@ def draw_curved_cuboid(name, radius, segments, deg, height, width):
         bpy.types.Object: Object
     """
     bm, obj = create_turtle(name)
+    turtle = Turtle.from_cursor()
     bm.select_mode = {'VERT'}
-    arc(bm, radius, deg, segments)
+    arc(bm, radius, deg, segments, turtle)
     bm_deselect_all(bm)
-    arc(bm, radius + width, deg, segments)
+    arc(bm, radius + width, deg, segments, turtle)
     bmesh.ops.bridge_loops(bm, edges=bm.edges)
     bm.select_mode = {'FACE'}
     bm_select_all(bm)
-    pd(bm)
-    up(bm, height, False)
-    home(obj)
+    pd(bm, turtle)
+    up(bm, height, False, turtle=turtle)
+    home(obj, turtle)
     finalise_turtle(bm, obj)
 
     return obj
@@ -1351,7 +1361,7 @@ def draw_rectangular_floor_core(dims, subdivs, margin=0.001, offset=0):
     Returns:
         bpy.types.Object: Floor Core
     """
-    turtle = bpy.context.scene.cursor
+    turtle = Turtle.from_cursor()
     orig_loc = turtle.location.copy()
 
     vert_groups = ['Left', 'Right', 'Front', 'Back', 'Top', 'Bottom']
@@ -1363,49 +1373,49 @@ def draw_rectangular_floor_core(dims, subdivs, margin=0.001, offset=0):
     bm.select_mode = {'VERT'}
 
     # Start drawing core
-    pd(bm)
-    add_vert(bm)
+    pd(bm, turtle)
+    add_vert(bm, turtle)
     bm.select_mode = {'VERT'}
 
     # Draw front bottom edges
-    ri(bm, margin)
+    ri(bm, margin, turtle=turtle)
 
     subdiv_x_dist = (dims[0] - (margin * 2)) / subdivs[0]
 
     i = 0
     while i < subdivs[0]:
-        ri(bm, subdiv_x_dist)
+        ri(bm, subdiv_x_dist, turtle=turtle)
         i += 1
 
-    ri(bm, margin)
+    ri(bm, margin, turtle=turtle)
 
     # Select edge and extrude to create bottom
     bm.select_mode = {'EDGE'}
     bm_select_all(bm)
-    fd(bm, margin)
+    fd(bm, margin, turtle=turtle)
 
     subdiv_y_dist = (dims[1] - (margin * 2)) / subdivs[1]
 
     i = 0
     while i < subdivs[1]:
-        fd(bm, subdiv_y_dist)
+        fd(bm, subdiv_y_dist, turtle=turtle)
         i += 1
 
-    fd(bm, margin)
+    fd(bm, margin, turtle=turtle)
 
     # select bottom and extrude up
     bm.select_mode = {'FACE'}
     bm_select_all(bm)
-    up(bm, margin, False)
+    up(bm, margin, False, turtle=turtle)
 
     subdiv_z_dist = (dims[2] - (margin * 2)) / subdivs[2]
 
     i = 0
     while i < subdivs[2]:
-        up(bm, subdiv_z_dist)
+        up(bm, subdiv_z_dist, turtle=turtle)
         i += 1
 
-    up(bm, margin)
+    up(bm, margin, turtle=turtle)
 
     top_verts = {v for v in bm.verts if v.select}
 
@@ -1456,8 +1466,8 @@ def draw_rectangular_floor_core(dims, subdivs, margin=0.001, offset=0):
     assign_verts_to_group(bottom_verts, obj, deform_groups, 'Bottom')
 
     # home turtle
-    pu(bm)
-    home(obj)
+    pu(bm, turtle)
+    home(obj, turtle)
 
     # finalise turtle and release bmesh
     finalise_turtle(bm, obj)
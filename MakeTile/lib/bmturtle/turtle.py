@@ -0,0 +1,114 @@
+from mathutils import Vector, Euler, Matrix
+import bpy
+
+
+class Turtle:
+    """Pure python turtle state for use with bmturtle commands.
+
+    Mirrors the parts of the 3D cursor API that bmturtle uses (location,
+    rotation_euler and matrix) and also stores the pen state, so commands that are
+    passed a Turtle never touch bpy.context.scene.cursor or the active object.
+    """
+
+    def __init__(self, location=(0, 0, 0), rotation_euler=(0, 0, 0), penstate=True):
+        """Initialise turtle.
+
+        Args:
+            location (Vector[3], optional): Start location. Defaults to (0, 0, 0).
+            rotation_euler (Euler, optional): Start rotation. Defaults to (0, 0, 0).
+            penstate (bool, optional): If True turtle draws on move. Defaults to True.
+        """
+        self._location = Vector(location)
+        self._rotation_euler = Euler(rotation_euler)
+        self._basis = None
+        self.penstate = penstate
+
+    @classmethod
+    def from_cursor(cls, penstate=True):
+        """Return a turtle located and rotated to match the 3D cursor.
+
+        Args:
+            penstate (bool, optional): If True turtle draws on move. Defaults to True.
+
+        Returns:
+            Turtle: turtle
+        """
+        cursor = bpy.context.scene.cursor
+        return cls(cursor.location, cursor.rotation_euler, penstate)
+
+    def to_cursor(self):
+        """Move the 3D cursor to the turtle's location and rotation."""
+        cursor = bpy.context.scene.cursor
+        cursor.location = self._location
+        cursor.rotation_euler = self._rotation_euler
+
+    @property
+    def location(self):
+        return self._location
+
+    @location.setter
+    def location(self, value):
+        self._location = Vector(value)
+
+    @property
+    def rotation_euler(self):
+        return self._rotation_euler
+
+    @rotation_euler.setter
+    def rotation_euler(self, value):
+        self._rotation_euler = Euler(value)
+        self._basis = None
+
+    @property
+    def basis(self):
+        """Rotation part of the turtle's matrix.
+
+        Returns:
+            Matrix[3][3]: rotation matrix
+        """
+        if self._basis is None:
+            self._basis = self._rotation_euler.to_matrix()
+        return self._basis
+
+    @property
+    def matrix(self):
+        """World matrix of the turtle.
+
+        Returns:
+            Matrix[4][4]: matrix
+        """
+        matrix = self.basis.to_4x4()
+        matrix.translation = self._location
+        return matrix
+
+    @matrix.setter
+    def matrix(self, value):
+        value = Matrix(value)
+        self._location = value.translation.copy()
+        self._rotation_euler = value.to_euler('XYZ')
+        self._basis = None
+
+    def move(self, local_trans):
+        """Move the turtle along its local axes.
+
+        Args:
+            local_trans (Vector[3]): Translation in turtle's local space
+
+        Returns:
+            Vector[3]: Translation in world space
+        """
+        world_trans = self.basis @ Vector(local_trans)
+        self._location = self._location + world_trans
+        return world_trans
+
+    def rotate(self, x=0, y=0, z=0):
+        """Rotate the turtle around its euler axes.
+
+        Args:
+            x (float, optional): radians. Defaults to 0.
+            y (float, optional): radians. Defaults to 0.
+            z (float, optional): radians. Defaults to 0.
+        """
+        rot = self._rotation_euler
+        self._rotation_euler = Euler((rot[0] + x, rot[1] + y, rot[2] + z))
+        self._basis = None
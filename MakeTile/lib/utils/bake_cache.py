@@ -0,0 +1,296 @@
+import os
+import hashlib
+import numpy as np
+import bpy
+from ...utils.registration import get_prefs
+
+# increment if the way maps are baked changes so old entries are no longer used
+BAKE_CACHE_VERSION = 3
+
+# properties every node has that don't affect what it outputs
+IGNORED_NODE_PROPS = {prop.identifier for prop in bpy.types.ShaderNode.bl_rna.properties}
+
+# modifier properties that don't affect the evaluated mesh
+IGNORED_MODIFIER_PROPS = {'name', 'show_expanded', 'show_in_editmode', 'show_on_cage', 'is_active', 'is_override_data'}
+
+
+class BakeCache:
+    """Content addressed cache of baked displacement maps on disk.
+
+    Maps are saved as PNGs named after a hash of everything that affects the bake, so
+    an unchanged tile loads its map instead of being baked again. Images loaded from the
+    cache reference the file rather than being packed into the .blend.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+
+    def get_directory(self):
+        if self.directory is not None:
+            return self.directory
+        return bpy.path.abspath(get_prefs().bake_cache_path)
+
+    def get_filepath(self, key):
+        return os.path.join(self.get_directory(), key + '.png')
+
+    def load(self, key):
+        """Return the cached map for key.
+
+        Args:
+            key (str): key. See displacement_bake_key
+
+        Returns:
+            bpy.types.Image: image or None if key isn't in the cache
+        """
+        filepath = self.get_filepath(key)
+        if not os.path.isfile(filepath):
+            return None
+        image = bpy.data.images.load(filepath, check_existing=True)
+        image.colorspace_settings.is_data = True
+        return image
+
+    def get_height_map_filepath(self, key):
+        """Return the path of the height map saved by a tiled bake.
+
+        Args:
+            key (str): key
+
+        Returns:
+            str: path to .npy file. None if key has no height map. See lib.utils.height_map
+        """
+        filepath = os.path.join(self.get_directory(), key + '.npy')
+        if os.path.isfile(filepath):
+            return filepath
+        return None
+
+    def save(self, key, image):
+        """Save a baked map to the cache and point the image at the saved file.
+
+        The file is written under a temporary name and then renamed so a map saved by
+        another Blender instance at the same time is never read half written.
+
+        Args:
+            key (str): key
+            image (bpy.types.Image): image
+
+        Returns:
+            bool: False if the map couldn't be saved
+        """
+        filepath = self.get_filepath(key)
+        temp_filepath = filepath + '.' + str(os.getpid()) + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            image.filepath_raw = temp_filepath
+            image.file_format = 'PNG'
+            image.save()
+            os.replace(temp_filepath, filepath)
+        except (RuntimeError, OSError) as err:
+            print('Could not add ' + image.name + ' to bake cache. ' + str(err))
+            image.filepath_raw = ''
+            return False
+        image.filepath_raw = filepath
+        return True
+
+    def clear(self):
+        """Delete all cached maps.
+
+        Returns:
+            int: number of files deleted
+        """
+        directory = self.get_directory()
+        if not os.path.isdir(directory):
+            return 0
+        removed = 0
+        for filename in os.listdir(directory):
+            if filename.endswith(('.png', '.npy', '.tmp')):
+                os.remove(os.path.join(directory, filename))
+                removed += 1
+        return removed
+
+
+bake_cache = BakeCache()
+
+
+def hash_value(hasher, value):
+    """Add a property value to hasher."""
+    if hasattr(value, '__len__') and not isinstance(value, str):
+        value = tuple(value)
+    hasher.update(repr(value).encode())
+
+
+def hash_color_ramp(hasher, ramp):
+    """Add the settings and elements of a color ramp to hasher."""
+    hash_value(hasher, (ramp.color_mode, ramp.interpolation))
+    for element in ramp.elements:
+        hash_value(hasher, (element.position, tuple(element.color)))
+
+
+def hash_settings(hasher, settings):
+    """Add the settings of a struct such as a texture node's texture_mapping to hasher."""
+    for prop in settings.bl_rna.properties:
+        if prop.identifier == 'rna_type' or prop.type == 'COLLECTION':
+            continue
+        value = getattr(settings, prop.identifier)
+        if prop.type != 'POINTER':
+            hash_value(hasher, value)
+        elif isinstance(value, bpy.types.ColorRamp):
+            hash_color_ramp(hasher, value)
+
+
+def hash_node_tree(hasher, tree, seen=None):
+    """Add the nodes, settings and links of a node tree to hasher.
+
+    Node groups and images used by the tree are included. Settings that only
+    affect how nodes are drawn, such as their location, are ignored.
+
+    Args:
+        hasher (hashlib hash): hash object
+        tree (bpy.types.NodeTree): node tree
+        seen (set, optional): node groups already hashed. Defaults to None.
+    """
+    if seen is None:
+        seen = set()
+    seen.add(tree.name)
+
+    for node in sorted(tree.nodes, key=lambda n: n.name):
+        # the node MakeTile bakes to. Holds the previous map which doesn't affect the bake
+        if node.name == 'disp_texture_node':
+            continue
+        hasher.update(node.name.encode())
+        hasher.update(node.bl_idname.encode())
+
+        for prop in node.bl_rna.properties:
+            if prop.identifier in IGNORED_NODE_PROPS:
+                continue
+            value = getattr(node, prop.identifier)
+            if prop.type == 'POINTER':
+                if value is None:
+                    hasher.update(b'None')
+                elif isinstance(value, bpy.types.NodeTree):
+                    if value.name not in seen:
+                        hash_node_tree(hasher, value, seen)
+                elif isinstance(value, bpy.types.Image):
+                    hash_value(hasher, (value.name, value.filepath, tuple(value.size)))
+                elif isinstance(value, bpy.types.ColorRamp):
+                    hash_color_ramp(hasher, value)
+                elif isinstance(value, (bpy.types.TexMapping, bpy.types.ColorMapping)):
+                    hash_settings(hasher, value)
+            elif prop.type != 'COLLECTION':
+                hash_value(hasher, value)
+
+        # output values matter for nodes like Value, which holds the Seed
+        for socket in list(node.inputs) + list(node.outputs):
+            if hasattr(socket, 'default_value'):
+                hasher.update(socket.identifier.encode())
+                hash_value(hasher, socket.default_value)
+
+    links = sorted(
+        (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+        for link in tree.links if not link.is_muted)
+    hash_value(hasher, links)
+
+
+def hash_mesh(hasher, mesh):
+    """Add the vert coordinates, faces and face materials of a mesh to hasher."""
+    arrays = (
+        ('co', mesh.vertices, 3, np.float32),
+        ('vertex_index', mesh.loops, 1, np.int32),
+        ('loop_start', mesh.polygons, 1, np.int32),
+        ('material_index', mesh.polygons, 1, np.int32))
+    for attribute, collection, size, dtype in arrays:
+        values = np.empty(len(collection) * size, dtype=dtype)
+        collection.foreach_get(attribute, values)
+        hasher.update(values.tobytes())
+
+
+def hash_operand(hasher, obj, seen):
+    """Add the transform and mesh of an object used by a modifier, such as a boolean cutter, to hasher."""
+    hasher.update(obj.name.encode())
+    hasher.update(np.array(obj.matrix_world, dtype=np.float32).tobytes())
+    if obj.type == 'MESH' and obj.name not in seen:
+        hash_mesh(hasher, obj.data)
+        # cutters can have modifiers of their own
+        hash_modifiers(hasher, obj, seen=seen)
+
+
+def hash_modifiers(hasher, obj, ignored=(), seen=None):
+    """Add the enabled modifiers of an object and their settings to hasher.
+
+    Bakes use the viewport evaluated mesh, so modifiers hidden in the viewport, such as
+    cutters switched off in the UI, are left out. Objects and collections a modifier
+    uses, such as boolean cutters, are included.
+
+    Args:
+        hasher (hashlib hash): hash object
+        obj (bpy.types.Object): object
+        ignored (iterable[str], optional): names of modifiers to leave out. Defaults to ().
+        seen (set, optional): objects already hashed. Defaults to None.
+    """
+    if seen is None:
+        seen = set()
+    seen.add(obj.name)
+
+    for mod in obj.modifiers:
+        if mod.name in ignored or not mod.show_viewport:
+            continue
+        hasher.update(mod.type.encode())
+
+        for prop in mod.bl_rna.properties:
+            if prop.identifier in IGNORED_MODIFIER_PROPS or prop.type == 'COLLECTION':
+                continue
+            value = getattr(mod, prop.identifier)
+            if prop.type != 'POINTER':
+                hash_value(hasher, value)
+            elif value is None:
+                hasher.update(b'None')
+            elif isinstance(value, bpy.types.Object):
+                hash_operand(hasher, value, seen)
+            elif isinstance(value, bpy.types.Collection):
+                for operand in sorted(value.all_objects, key=lambda o: o.name):
+                    hash_operand(hasher, operand, seen)
+            elif isinstance(value, bpy.types.ID):
+                hasher.update(value.name.encode())
+
+
+def displacement_bake_key(obj, resolution, margin, bit_depth=8, engine='CYCLES'):
+    """Return a cache key for the displacement map of an object.
+
+    The key is a hash of the displacement materials, the mesh, its UVs and the
+    material assigned to each face, plus the resolution, margin, bit depth and bake
+    engine of the map.
+    As the bake uses the evaluated mesh the object's modifiers are included, along with
+    the transforms and meshes of their operands, so moving a boolean cutter changes the
+    key. The displacement modifier is left out as it is switched off while baking.
+
+    Args:
+        obj (bpy.types.Object): object
+        resolution (int): width and height of the map in pixels
+        margin (int): bake margin in pixels
+        bit_depth (int, optional): bits per channel of the map. Defaults to 8.
+        engine (str, optional): displacement_engine enum item. Defaults to 'CYCLES'.
+
+    Returns:
+        str: key
+    """
+    hasher = hashlib.sha1()
+    hash_value(hasher, (BAKE_CACHE_VERSION, resolution, margin, bit_depth, engine))
+
+    for slot in obj.material_slots:
+        material = slot.material
+        if material is not None and material.node_tree is not None and 'disp_emission' in material.node_tree.nodes:
+            hash_node_tree(hasher, material.node_tree)
+        else:
+            hasher.update(b'None')
+
+    mesh = obj.data
+    hash_mesh(hasher, mesh)
+    hash_modifiers(hasher, obj, ignored=(obj.mt_object_props.disp_mod_name,))
+
+    if mesh.uv_layers.active is not None:
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        mesh.uv_layers.active.data.foreach_get('uv', uvs)
+        hasher.update(uvs.tobytes())
+
+    hasher.update(np.array(obj.matrix_world, dtype=np.float32).tobytes())
+    hash_value(hasher, (tuple(mesh.texspace_location), tuple(mesh.texspace_size)))
+    return hasher.hexdigest()
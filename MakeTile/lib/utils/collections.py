@@ -1,4 +1,88 @@
 import bpy
+from bpy.app.handlers import persistent
+
+
+class CollectionIndex:
+    """Reverse index from objects to the collections they are linked to.
+
+    Built lazily the first time it is queried after being invalidated. It is invalidated
+    by depsgraph updates that touch collections, and by undo, redo and file load.
+    Entries are checked when they are read and the index is rebuilt if any are stale, so
+    a missed invalidation can't return a collection the object has been unlinked from.
+    Objects without an entry, e.g. ones linked with collection.objects.link since the
+    index was built, are looked up through obj.users_collection and added to the index.
+
+    Objects are keyed by pointer so renaming them doesn't invalidate the index. Collections
+    are stored by name so removed collections are never referenced.
+    """
+
+    def __init__(self):
+        self._index = None
+
+    def invalidate(self):
+        self._index = None
+
+    def build(self):
+        index = {}
+        for collection in bpy.data.collections:
+            for obj in collection.objects:
+                index.setdefault(obj.as_pointer(), []).append(collection.name)
+        self._index = index
+
+    def get(self, obj):
+        """Return the collections an object is linked to.
+
+        Args:
+            obj (bpy.types.Object): object
+
+        Returns:
+            list[bpy.types.Collection]: collections
+        """
+        if self._index is None:
+            self.build()
+
+        collections = self._lookup(obj)
+        if collections is None:
+            self.build()
+            collections = self._lookup(obj)
+        if not collections:
+            collections = self._lookup_users(obj)
+        return collections
+
+    def _lookup(self, obj):
+        collections = []
+        for name in self._index.get(obj.as_pointer(), ()):
+            collection = bpy.data.collections.get(name)
+            if collection is None or collection.objects.get(obj.name) != obj:
+                return None
+            collections.append(collection)
+        return collections
+
+    def _lookup_users(self, obj):
+        # scene master collections aren't in bpy.data.collections so aren't indexed
+        collections = [
+            collection for collection in obj.users_collection
+            if bpy.data.collections.get(collection.name) == collection]
+        if collections:
+            self._index[obj.as_pointer()] = [collection.name for collection in collections]
+        return collections
+
+    def add(self, obj, collection):
+        """Record that an object has been linked to a collection."""
+        if self._index is not None:
+            names = self._index.setdefault(obj.as_pointer(), [])
+            if collection.name not in names:
+                names.append(collection.name)
+
+
+collection_index = CollectionIndex()
+
+
+@persistent
+def invalidate_collection_index(scene, depsgraph=None):
+    """Invalidate collection_index when collections may have changed."""
+    if not isinstance(depsgraph, bpy.types.Depsgraph) or depsgraph.id_type_updated('COLLECTION'):
+        collection_index.invalidate()
 
 
 def create_collection(collection_name, collection_parent):
@@ -15,8 +99,10 @@ def add_object_to_collection(obj, collection_name):
     """Adds an object to a collection, checking to see if
     obj is already in collection
     """
-    if not (obj.name, obj) in bpy.data.collections[collection_name].objects.items():
-        bpy.data.collections[collection_name].objects.link(obj)
+    collection = bpy.data.collections[collection_name]
+    if collection.objects.get(obj.name) != obj:
+        collection.objects.link(obj)
+        collection_index.add(obj, collection)
     return {'FINISHED'}
 
 
@@ -47,16 +133,15 @@ def activate_collection(collection_name):
 def get_objects_owning_collections(object_name):
     """Return a list of collections the object is a member of.
 
+    Uses collection_index rather than searching every collection.
+
     Args:
         object_name (str): object_name
 
     Returns:
         list(bpy.types.Collection): list of collections
     """
-    collections = []
-
-    for coll in bpy.data.collections:
-        if object_name in coll.objects:
-            collections.append(coll)
-
-    return collections
+    obj = bpy.data.objects.get(object_name)
+    if obj is None:
+        return []
+    return collection_index.get(obj)
@@ -0,0 +1,217 @@
+import os
+import hashlib
+import numpy as np
+import bpy
+from .mesh_arrays import MeshGroupArrays
+from .height_map import open_height_map, sample_height_map
+
+
+def get_image_height_map(image):
+    """Return the heights stored in a displacement map as a 16 bit height map.
+
+    Maps from a tiled bake have their height map memory mapped from the bake cache,
+    or from the temporary file in the image's height_map property if the map was packed,
+    instead of reading the image's pixels.
+
+    Args:
+        image (bpy.types.Image): displacement map
+
+    Returns:
+        numpy.ndarray: (h, w) uint16 height map. See lib.utils.height_map
+    """
+    width, height = image.size
+    height_map_paths = [image.get('height_map')]
+    if image.packed_file is None and image.filepath:
+        height_map_paths.append(os.path.splitext(bpy.path.abspath(image.filepath))[0] + '.npy')
+    for height_map_path in height_map_paths:
+        if height_map_path and os.path.isfile(height_map_path):
+            height_map = open_height_map(height_map_path)
+            # the temporary file may have been removed or replaced since the map was baked
+            if height_map.shape == (height, width):
+                return height_map
+
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    # Displace modifiers use the average of the RGB channels
+    heights = pixels.reshape(height, width, 4)[..., :3].mean(axis=-1)
+    return np.round(np.clip(heights, 0.0, 1.0) * 65535).astype(np.uint16)
+
+
+def displaced_mesh_key(obj, image, levels):
+    """Return a key identifying the displaced mesh write_displaced_mesh would create.
+
+    Args:
+        obj (bpy.types.Object): object in preview mode
+        image (bpy.types.Image): displacement map
+        levels (int): subdivision levels
+
+    Returns:
+        str: key
+    """
+    props = obj.mt_object_props
+    disp_mod = obj.modifiers[props.disp_mod_name]
+    hasher = hashlib.sha1()
+    hasher.update(repr((
+        image.name,
+        image.filepath,
+        tuple(image.size),
+        disp_mod.strength,
+        disp_mod.mid_level,
+        disp_mod.vertex_group,
+        levels)).encode())
+    coords = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
+    obj.data.vertices.foreach_get('co', coords)
+    hasher.update(coords.tobytes())
+    return hasher.hexdigest()
+
+
+def write_displaced_mesh(obj, levels):
+    """Subdivide an object once and displace its vertices by its displacement map.
+
+    Does the work of the MakeTile subsurf and displacement modifiers a single time
+    and stores the result as the object's mesh, so the modifiers no longer have to be
+    evaluated on every scene update. The preview mesh is stored in preview_mesh and
+    restored by restore_preview_mesh. The displaced mesh is kept in displaced_mesh and
+    reused if nothing has changed the next time the object is made 3D.
+
+    Args:
+        obj (bpy.types.Object): object in preview mode whose displacement modifier has a baked map
+        levels (int): subdivision levels
+    """
+    props = obj.mt_object_props
+    disp_mod = obj.modifiers[props.disp_mod_name]
+    subsurf_mod = obj.modifiers[props.subsurf_mod_name]
+    image = disp_mod.texture.image
+    key = displaced_mesh_key(obj, image, levels)
+
+    if props.displaced_mesh is not None and props.displaced_mesh_key == key:
+        displaced = props.displaced_mesh
+    else:
+        displaced = subdivide_mesh(obj, subsurf_mod, levels)
+        displaced.name = obj.data.name + '.displaced'
+        displace_vertices(obj, displaced, disp_mod, image)
+        old_mesh = props.displaced_mesh
+        props.displaced_mesh = displaced
+        props.displaced_mesh_key = key
+        if old_mesh is not None and old_mesh.users == 0:
+            bpy.data.meshes.remove(old_mesh)
+
+    for mod in (disp_mod, subsurf_mod):
+        mod.show_viewport = False
+        mod.show_render = False
+
+    props.preview_mesh = obj.data
+    obj.data = displaced
+    props.displacement_applied = True
+
+
+def subdivide_mesh(obj, subsurf_mod, levels):
+    """Return a new mesh of obj subdivided by its subsurf modifier.
+
+    Args:
+        obj (bpy.types.Object): object
+        subsurf_mod (bpy.types.SubsurfModifier): subsurf modifier
+        levels (int): subdivision levels
+
+    Returns:
+        bpy.types.Mesh: subdivided mesh with all the data layers of obj's mesh
+    """
+    visibility = [(mod, mod.show_viewport) for mod in obj.modifiers]
+    orig_levels = subsurf_mod.levels
+    for mod in obj.modifiers:
+        mod.show_viewport = mod == subsurf_mod
+    subsurf_mod.levels = levels
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    depsgraph.update()
+    mesh = bpy.data.meshes.new_from_object(
+        obj.evaluated_get(depsgraph),
+        preserve_all_data_layers=True,
+        depsgraph=depsgraph)
+
+    subsurf_mod.levels = orig_levels
+    for mod, show_viewport in visibility:
+        mod.show_viewport = show_viewport
+    return mesh
+
+
+def displace_vertices(obj, mesh, disp_mod, image):
+    """Move the vertices of mesh along their normals in the same way as a Displace modifier.
+
+    The map is sampled with bilinear interpolation at each vertex's UV coordinate.
+
+    Args:
+        obj (bpy.types.Object): object owning disp_mod. Its vertex groups are used for mesh
+        mesh (bpy.types.Mesh): mesh to displace
+        disp_mod (bpy.types.DisplaceModifier): modifier whose strength, mid level and vertex group are used
+        image (bpy.types.Image): displacement map
+    """
+    vert_count = len(mesh.vertices)
+    coords = np.empty(vert_count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', coords)
+    normals = np.empty(vert_count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('normal', normals)
+
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get('vertex_index', loop_verts)
+    loop_uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+    mesh.uv_layers.active.data.foreach_get('uv', loop_uvs)
+    # verts on UV seams use the UV of one of their loops, as the Displace modifier does
+    vert_uvs = np.zeros((vert_count, 2), dtype=np.float32)
+    vert_uvs[loop_verts] = loop_uvs.reshape(-1, 2)
+
+    heights = sample_height_map(get_image_height_map(image), vert_uvs)
+    offsets = (heights - disp_mod.mid_level) * disp_mod.strength
+
+    if disp_mod.vertex_group in obj.vertex_groups:
+        group_index = obj.vertex_groups[disp_mod.vertex_group].index
+        offsets *= MeshGroupArrays(obj, mesh).weights[:, group_index]
+
+    coords = coords.reshape(-1, 3) + normals.reshape(-1, 3) * offsets[:, None]
+    mesh.vertices.foreach_set('co', coords.ravel())
+    mesh.update()
+
+
+def update_displaced_mesh(obj):
+    """Write the displaced mesh of an object again, e.g. after its displacement strength has changed.
+
+    Args:
+        obj (bpy.types.Object): object
+
+    Returns:
+        bool: False if the object's displacement hadn't been written to its mesh
+    """
+    props = obj.mt_object_props
+    if not props.displacement_applied:
+        return False
+    levels = obj.modifiers[props.subsurf_mod_name].levels
+    restore_preview_mesh(obj)
+    write_displaced_mesh(obj, levels)
+    return True
+
+
+def restore_preview_mesh(obj):
+    """Switch an object whose displacement has been written to its mesh back to its preview mesh.
+
+    The displaced mesh is kept in displaced_mesh for reuse.
+
+    Args:
+        obj (bpy.types.Object): object
+
+    Returns:
+        bool: False if the object's displacement hadn't been written to its mesh
+    """
+    props = obj.mt_object_props
+    if not props.displacement_applied:
+        return False
+
+    if props.preview_mesh is not None:
+        obj.data = props.preview_mesh
+    props.preview_mesh = None
+    props.displacement_applied = False
+
+    for mod_name in (props.disp_mod_name, props.subsurf_mod_name):
+        if mod_name in obj.modifiers:
+            obj.modifiers[mod_name].show_viewport = True
+            obj.modifiers[mod_name].show_render = True
+    return True
@@ -0,0 +1,100 @@
+"""16 bit height maps streamed to and from disk."""
+
+import struct
+import zlib
+import numpy as np
+
+# rows compressed at once by write_png16
+PNG_ROWS_PER_CHUNK = 256
+
+
+def create_height_map(filepath, width, height):
+    """Create a memory mapped height map on disk.
+
+    Rows are in the same bottom to top order as Blender image pixels.
+
+    Args:
+        filepath (str): path of .npy file to create
+        width (int): width in pixels
+        height (int): height in pixels
+
+    Returns:
+        numpy.memmap: (height, width) uint16 height map
+    """
+    return np.lib.format.open_memmap(filepath, mode='w+', dtype=np.uint16, shape=(height, width))
+
+
+def open_height_map(filepath):
+    """Open a height map created by create_height_map without reading it into memory.
+
+    Args:
+        filepath (str): path to .npy file
+
+    Returns:
+        numpy.memmap: (height, width) uint16 height map
+    """
+    return np.load(filepath, mmap_mode='r')
+
+
+def sample_height_map(height_map, uvs):
+    """Bilinearly sample a height map at UV coordinates.
+
+    Only the pixels needed are read so memory mapped maps are never loaded whole.
+
+    Args:
+        height_map (numpy.ndarray): (h, w) uint16 height map
+        uvs (numpy.ndarray): (n, 2) uv coordinates
+
+    Returns:
+        numpy.ndarray: (n,) heights between 0 and 1
+    """
+    height, width = height_map.shape
+    # pixel centres are at integer coordinates
+    x = np.clip(uvs[:, 0] * width - 0.5, 0, width - 1)
+    y = np.clip(uvs[:, 1] * height - 0.5, 0, height - 1)
+    x0 = np.floor(x).astype(np.int64)
+    y0 = np.floor(y).astype(np.int64)
+    x1 = np.minimum(x0 + 1, width - 1)
+    y1 = np.minimum(y0 + 1, height - 1)
+    fx = (x - x0).astype(np.float32)
+    fy = (y - y0).astype(np.float32)
+
+    def read(rows, cols):
+        return height_map[rows, cols].astype(np.float32)
+
+    bottom = read(y0, x0) * (1 - fx) + read(y0, x1) * fx
+    top = read(y1, x0) * (1 - fx) + read(y1, x1) * fx
+    return (bottom * (1 - fy) + top * fy) / 65535
+
+
+def write_png16(filepath, height_map):
+    """Write a height map to a 16 bit greyscale PNG a few rows at a time.
+
+    Args:
+        filepath (str): path to write to
+        height_map (numpy.ndarray): (h, w) uint16 height map in Blender's bottom to top row order
+    """
+    height, width = height_map.shape
+
+    def chunk(chunk_type, data):
+        return (struct.pack('>I', len(data)) + chunk_type + data
+                + struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff))
+
+    compressor = zlib.compressobj()
+    with open(filepath, 'wb') as png:
+        png.write(b'\x89PNG\r\n\x1a\n')
+        png.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 16, 0, 0, 0, 0)))
+
+        # PNG rows run from top to bottom
+        for end in range(height, 0, -PNG_ROWS_PER_CHUNK):
+            start = max(0, end - PNG_ROWS_PER_CHUNK)
+            rows = np.ascontiguousarray(height_map[start:end][::-1], dtype='>u2')
+            # each row starts with a filter type byte. 0 = no filter
+            scanlines = np.zeros((len(rows), 1 + width * 2), dtype=np.uint8)
+            scanlines[:, 1:] = rows.view(np.uint8).reshape(len(rows), width * 2)
+            data = compressor.compress(scanlines.tobytes())
+            if data:
+                png.write(chunk(b'IDAT', data))
+
+        png.write(chunk(b'IDAT', compressor.flush()))
+        png.write(chunk(b'IEND', b''))
@@ -0,0 +1,169 @@
+import os
+import bpy
+from ...utils.registration import get_prefs
+
+# custom property used to recognise cached source datablocks
+SOURCE_PROP = 'mt_library_source'
+
+
+class LibraryCache:
+    """Cache of datablocks appended from .blend asset libraries.
+
+    Each datablock is appended once and kept as an unlinked source in bpy.data.
+    Callers either read the sources directly or take copies of them which share the
+    source's mesh, so generating many tiles doesn't re-read the .blend file and fill
+    the file with duplicate cutter meshes.
+
+    Only datablock names are stored, never references, so entries whose datablocks have
+    been removed, e.g. by an undo or by loading a new file, are reloaded on next use.
+    The cache is cleared if the assets_path preference or the .blend file changes.
+    """
+
+    def __init__(self):
+        self.assets_path = None
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, data_type, filepath, names):
+        """Return source datablocks, appending any that aren't already cached.
+
+        Args:
+            data_type (str): name of bpy.data collection e.g. 'objects', 'meshes'
+            filepath (str): path to .blend file
+            names (list[str]): names of datablocks in .blend file
+
+        Returns:
+            list[bpy.types.ID]: source datablocks, None for names not found in file
+        """
+        self.validate()
+        filepath = os.path.normpath(filepath)
+        mtime = os.path.getmtime(filepath)
+        datablocks = getattr(bpy.data, data_type)
+
+        sources = {}
+        missing = []
+        for name in names:
+            key = (data_type, filepath, name)
+            source = None
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == mtime:
+                source = datablocks.get(entry[0])
+                if source is not None and source.get(SOURCE_PROP) != source_tag(key):
+                    source = None
+            if source is None:
+                missing.append(name)
+            else:
+                sources[name] = source
+
+        if missing:
+            with bpy.data.libraries.load(filepath) as (data_from, data_to):
+                setattr(data_to, data_type, missing)
+
+            for name, source in zip(missing, getattr(data_to, data_type)):
+                if source is None:
+                    continue
+                key = (data_type, filepath, name)
+                source[SOURCE_PROP] = source_tag(key)
+                self._entries[key] = (source.name, mtime)
+                sources[name] = source
+
+        return [sources.get(name) for name in names]
+
+    def validate(self):
+        """Clear the cache if the assets_path preference has changed."""
+        assets_path = get_prefs().assets_path
+        if assets_path != self.assets_path:
+            self.clear()
+            self.assets_path = assets_path
+
+    def clear(self):
+        """Remove all entries and any source datablocks nothing else is using."""
+        for (data_type, filepath, name), (source_name, mtime) in self._entries.items():
+            datablocks = getattr(bpy.data, data_type)
+            source = datablocks.get(source_name)
+            if source is not None and source.users == 0 and SOURCE_PROP in source:
+                datablocks.remove(source)
+        self._entries.clear()
+
+
+library_cache = LibraryCache()
+
+
+def source_tag(key):
+    """Return the value of SOURCE_PROP for a cache key."""
+    return '|'.join(key)
+
+
+def get_library_objects(filepath, names):
+    """Return cached source objects from a .blend file.
+
+    Source objects are not linked to the scene and must not be edited or removed.
+    Use them as read only templates, e.g. as the source_obj of bmesh_array.
+
+    Args:
+        filepath (str): path to .blend file
+        names (list[str]): object names
+
+    Returns:
+        list[bpy.types.Object]: source objects
+    """
+    return library_cache.get('objects', filepath, names)
+
+
+def get_library_meshes(filepath, names):
+    """Return cached source meshes from a .blend file.
+
+    Source meshes must not be edited or removed. Copy them before use.
+
+    Args:
+        filepath (str): path to .blend file
+        names (list[str]): mesh names
+
+    Returns:
+        list[bpy.types.Mesh]: source meshes
+    """
+    return library_cache.get('meshes', filepath, names)
+
+
+def copy_library_objects(filepath, names, single_user=False):
+    """Return new copies of objects from a .blend file.
+
+    Copies share their mesh with the cached source object in the same way as a linked
+    duplicate. Object references between the copied objects, e.g. an array modifier's
+    start and end caps or parenting, are remapped to point at the copies.
+    The copies are not linked to a collection.
+
+    Args:
+        filepath (str): path to .blend file
+        names (list[str]): object names
+        single_user (bool, optional): Give each copy its own copy of the mesh. Use this if
+        the mesh is going to be edited. Defaults to False.
+
+    Returns:
+        list[bpy.types.Object]: copies
+    """
+    sources = get_library_objects(filepath, names)
+    copies = {}
+    for source in sources:
+        if source is None or source in copies:
+            continue
+        obj = source.copy()
+        del obj[SOURCE_PROP]
+        if single_user and obj.data:
+            obj.data = obj.data.copy()
+        copies[source] = obj
+
+    for obj in copies.values():
+        if obj.parent in copies:
+            obj.parent = copies[obj.parent]
+        for mod in obj.modifiers:
+            for prop in mod.bl_rna.properties:
+                if prop.type != 'POINTER' or prop.is_readonly:
+                    continue
+                value = getattr(mod, prop.identifier)
+                if value in copies:
+                    setattr(mod, prop.identifier, copies[value])
+
+    return [copies.get(source) for source in sources]
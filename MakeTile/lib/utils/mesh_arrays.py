@@ -0,0 +1,143 @@
+"""Vertex group and polygon data of mesh objects as NumPy arrays."""
+
+import numpy as np
+
+
+class MeshGroupArrays:
+    """Vertex group weights and polygon vertex indices of a mesh object.
+
+    The mesh is read once so any number of groups can then be queried with array
+    operations. By default the object's own mesh is read but any mesh sharing its
+    vertex groups can be passed in. Vertex groups aren't exposed to foreach_get so their
+    weights are gathered in a single pass over the vertices. Build a new instance if the
+    mesh's geometry or vertex groups change. Material indices are always read from the mesh.
+    """
+
+    def __init__(self, obj, mesh=None):
+        self.obj = obj
+        if mesh is None:
+            mesh = obj.data
+        self.mesh = mesh
+        vert_count = len(mesh.vertices)
+        group_count = len(obj.vertex_groups)
+
+        rows, cols, weights = [], [], []
+        for v in mesh.vertices:
+            for g in v.groups:
+                rows.append(v.index)
+                cols.append(g.group)
+                weights.append(g.weight)
+
+        rows = np.array(rows, dtype=np.int64)
+        cols = np.array(cols, dtype=np.int64)
+        valid = cols < group_count
+        # (vert, group) weights. Members is needed as verts can be in a group with 0 weight
+        self.weights = np.zeros((vert_count, group_count), dtype=np.float32)
+        self.weights[rows[valid], cols[valid]] = np.array(weights, dtype=np.float32)[valid]
+        self.members = np.zeros((vert_count, group_count), dtype=bool)
+        self.members[rows[valid], cols[valid]] = True
+
+        poly_count = len(mesh.polygons)
+        loop_start = np.empty(poly_count, dtype=np.int64)
+        loop_total = np.empty(poly_count, dtype=np.int64)
+        mesh.polygons.foreach_get('loop_start', loop_start)
+        mesh.polygons.foreach_get('loop_total', loop_total)
+        loop_verts = np.empty(len(mesh.loops), dtype=np.int64)
+        mesh.loops.foreach_get('vertex_index', loop_verts)
+
+        # vertex index of each polygon corner and the polygon it belongs to
+        offsets = np.arange(loop_total.sum()) - np.repeat(np.cumsum(loop_total) - loop_total, loop_total)
+        self.poly_verts = loop_verts[np.repeat(loop_start, loop_total) + offsets]
+        self.poly_of_corner = np.repeat(np.arange(poly_count), loop_total)
+        self.loop_total = loop_total
+
+    def get_group_index(self, vert_group_name):
+        return self.obj.vertex_groups[vert_group_name].index
+
+    def get_vert_mask(self, vert_group_names):
+        """Return which verts are in any of the vertex groups.
+
+        Args:
+            vert_group_names (str or list[str]): vertex group name or names
+
+        Returns:
+            numpy.ndarray: (v,) bool
+        """
+        if isinstance(vert_group_names, str):
+            vert_group_names = [vert_group_names]
+        groups = [self.get_group_index(name) for name in vert_group_names]
+        return self.members[:, groups].any(axis=1)
+
+    def get_vert_indices(self, vert_group_names):
+        """Return the indices of the verts in any of the vertex groups.
+
+        Args:
+            vert_group_names (str or list[str]): vertex group name or names
+
+        Returns:
+            numpy.ndarray: (n,) vert indices
+        """
+        return np.flatnonzero(self.get_vert_mask(vert_group_names))
+
+    def get_face_mask(self, vert_group_name):
+        """Return which polygons have all their verts in a vertex group.
+
+        Args:
+            vert_group_name (str): vertex group name
+
+        Returns:
+            numpy.ndarray: (p,) bool
+        """
+        vert_mask = self.get_vert_mask(vert_group_name)
+        in_group = np.bincount(
+            self.poly_of_corner,
+            weights=vert_mask[self.poly_verts],
+            minlength=len(self.loop_total))
+        return in_group == self.loop_total
+
+    def get_material_indices(self):
+        """Return the current material index of each polygon.
+
+        Returns:
+            numpy.ndarray: (p,) material indices
+        """
+        material_indices = np.empty(len(self.loop_total), dtype=np.int32)
+        self.mesh.polygons.foreach_get('material_index', material_indices)
+        return material_indices
+
+    def set_face_material_index(self, vert_group_name, material_index):
+        """Set the material index of every polygon with all its verts in a vertex group.
+
+        Args:
+            vert_group_name (str): vertex group name
+            material_index (int): material index
+        """
+        material_indices = self.get_material_indices()
+        material_indices[self.get_face_mask(vert_group_name)] = material_index
+        self.mesh.polygons.foreach_set('material_index', material_indices)
+
+    def get_group_material_index(self, vert_group_name):
+        """Return the material index of the first polygon with all its verts in a vertex group.
+
+        Args:
+            vert_group_name (str): vertex group name
+
+        Returns:
+            int: material index. None if no polygons are in the group.
+        """
+        faces = np.flatnonzero(self.get_face_mask(vert_group_name))
+        if len(faces) == 0:
+            return None
+        return int(self.get_material_indices()[faces[0]])
+
+    def get_verts_with_material_index(self, material_index):
+        """Return the indices of verts which belong to polygons with a material index.
+
+        Args:
+            material_index (int): material index
+
+        Returns:
+            numpy.ndarray: (n,) vert indices
+        """
+        face_mask = self.get_material_indices() == material_index
+        return np.unique(self.poly_verts[face_mask[self.poly_of_corner]])
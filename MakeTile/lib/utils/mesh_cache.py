@@ -0,0 +1,319 @@
+from collections import OrderedDict
+import numpy as np
+import bpy
+from ...utils.registration import get_prefs
+
+# mt_tile_props that affect the geometry of tile cores and bases
+CORE_KEY_PROPS = (
+    'tile_size',
+    'main_part_blueprint',
+    'subdivision_density',
+    'texture_margin')
+
+BASE_KEY_PROPS = (
+    'base_size',
+    'base_blueprint',
+    'subdivision_density',
+    'base_socket_type')
+
+# number of components and foreach_get property of each attribute data type
+ATTRIBUTE_LAYOUTS = {
+    'FLOAT': (1, 'value', np.float32),
+    'INT': (1, 'value', np.int32),
+    'INT8': (1, 'value', np.int32),
+    'BOOLEAN': (1, 'value', bool),
+    'FLOAT2': (2, 'vector', np.float32),
+    'FLOAT_VECTOR': (3, 'vector', np.float32),
+    'FLOAT_COLOR': (4, 'color', np.float32),
+    'BYTE_COLOR': (4, 'color', np.float32)}
+
+# attributes that are already stored as vertex, edge, loop or polygon arrays
+SKIPPED_ATTRIBUTES = {'position'}
+
+
+class MeshData:
+    """Geometry, vertex groups, UV layers and attributes of a mesh object stored as numpy arrays.
+
+    Stored outside of bpy.data so it survives the undo step Blender performs
+    before re-executing an operator from the redo panel.
+    """
+
+    def __init__(self, name, coords, edges, loop_starts, loop_totals, loop_verts,
+                 vert_groups, uv_layers=(), attributes=()):
+        self.name = name
+        self.coords = coords
+        self.edges = edges
+        self.loop_starts = loop_starts
+        self.loop_totals = loop_totals
+        self.loop_verts = loop_verts
+        self.vert_groups = vert_groups
+        self.uv_layers = list(uv_layers)
+        self.attributes = list(attributes)
+
+    @classmethod
+    def from_object(cls, obj):
+        """Copy the geometry, vertex groups, UV layers and attributes of a mesh object.
+
+        Args:
+            obj (bpy.types.Object): object
+
+        Returns:
+            MeshData: mesh data
+        """
+        mesh = obj.data
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', coords)
+        edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+        mesh.edges.foreach_get('vertices', edges)
+        loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get('loop_start', loop_starts)
+        loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get('loop_total', loop_totals)
+        loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get('vertex_index', loop_verts)
+
+        vert_groups = cls._get_vert_groups(obj)
+
+        uv_layers = []
+        for layer in mesh.uv_layers:
+            uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+            layer.data.foreach_get('uv', uvs)
+            uv_layers.append((layer.name, uvs, layer.active_render))
+
+        attributes = []
+        uv_names = {layer.name for layer in mesh.uv_layers}
+        for attribute in mesh.attributes:
+            if (attribute.name in SKIPPED_ATTRIBUTES
+                    or attribute.name in uv_names
+                    or attribute.name.startswith('.')
+                    or attribute.data_type not in ATTRIBUTE_LAYOUTS):
+                continue
+            size, prop, dtype = ATTRIBUTE_LAYOUTS[attribute.data_type]
+            values = np.empty(len(attribute.data) * size, dtype=dtype)
+            attribute.data.foreach_get(prop, values)
+            attributes.append((attribute.name, attribute.domain, attribute.data_type, values))
+
+        return cls(
+            obj.name, coords, edges, loop_starts, loop_totals, loop_verts,
+            vert_groups, uv_layers, attributes)
+
+    @staticmethod
+    def _get_vert_groups(obj):
+        """Return the members and weights of each vertex group of an object.
+
+        Deform weights have no bulk accessor so they are gathered in a single pass
+        and split into groups with numpy.
+
+        Args:
+            obj (bpy.types.Object): object
+
+        Returns:
+            list[tuple(str, np.ndarray, np.ndarray)]: group name, vertex indices and weights
+        """
+        if not obj.vertex_groups:
+            return []
+
+        members = [
+            (v.index, g.group, g.weight)
+            for v in obj.data.vertices if v.groups
+            for g in v.groups]
+        members = np.array(members, dtype=np.float64).reshape(-1, 3)
+        vert_indices = members[:, 0].astype(np.int32)
+        group_indices = members[:, 1].astype(np.int32)
+        weights = members[:, 2].astype(np.float32)
+
+        order = np.argsort(group_indices, kind='stable')
+        bounds = np.searchsorted(
+            group_indices[order], np.arange(len(obj.vertex_groups) + 1))
+
+        vert_groups = []
+        for group in obj.vertex_groups:
+            in_group = order[bounds[group.index]:bounds[group.index + 1]]
+            vert_groups.append((group.name, vert_indices[in_group], weights[in_group]))
+        return vert_groups
+
+    @property
+    def nbytes(self):
+        """Approximate memory used by the stored arrays."""
+        size = (self.coords.nbytes + self.edges.nbytes + self.loop_starts.nbytes
+                + self.loop_totals.nbytes + self.loop_verts.nbytes)
+        for _, indices, weights in self.vert_groups:
+            size += indices.nbytes + weights.nbytes
+        for _, uvs, _ in self.uv_layers:
+            size += uvs.nbytes
+        for _, _, _, values in self.attributes:
+            size += values.nbytes
+        return size
+
+    def to_object(self):
+        """Create a new mesh object from the stored data.
+
+        The object is linked to the active collection and made active in the same way as
+        bmturtle.commands.create_turtle.
+
+        Returns:
+            bpy.types.Object: object
+        """
+        mesh = bpy.data.meshes.new("mesh")
+        mesh.vertices.add(len(self.coords) // 3)
+        mesh.vertices.foreach_set('co', self.coords)
+        mesh.edges.add(len(self.edges) // 2)
+        mesh.edges.foreach_set('vertices', self.edges)
+        mesh.loops.add(len(self.loop_verts))
+        mesh.loops.foreach_set('vertex_index', self.loop_verts)
+        mesh.polygons.add(len(self.loop_starts))
+        mesh.polygons.foreach_set('loop_start', self.loop_starts)
+        if bpy.app.version < (4, 0, 0):
+            mesh.polygons.foreach_set('loop_total', self.loop_totals)
+
+        for name, uvs, active_render in self.uv_layers:
+            layer = mesh.uv_layers.new(name=name, do_init=False)
+            layer.data.foreach_set('uv', uvs)
+            layer.active_render = active_render
+
+        for name, domain, data_type, values in self.attributes:
+            attribute = mesh.attributes.get(name)
+            if attribute is None:
+                attribute = mesh.attributes.new(name, data_type, domain)
+            _, prop, _ = ATTRIBUTE_LAYOUTS[data_type]
+            attribute.data.foreach_set(prop, values)
+
+        mesh.update()
+
+        obj = bpy.data.objects.new(self.name, mesh)
+        for group_name, indices, weights in self.vert_groups:
+            group = obj.vertex_groups.new(name=group_name)
+            # vertex_groups.add takes a single weight so add verts in batches of equal weight
+            for weight in np.unique(weights):
+                batch = indices[weights == weight]
+                group.add(batch.tolist(), float(weight), 'REPLACE')
+
+        bpy.context.layer_collection.collection.objects.link(obj)
+        bpy.context.view_layer.objects.active = obj
+
+        return obj
+
+
+class MeshCache:
+    """Least recently used cache of MeshData with a memory cap."""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return cached MeshData and mark it as most recently used.
+
+        Args:
+            key (hashable): key
+
+        Returns:
+            MeshData: mesh data or None
+        """
+        try:
+            data = self._entries[key]
+        except KeyError:
+            return None
+        self._entries.move_to_end(key)
+        return data
+
+    def put(self, key, data):
+        """Add MeshData to the cache, evicting least recently used entries if over the cap.
+
+        Args:
+            key (hashable): key
+            data (MeshData): mesh data
+        """
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key).nbytes
+        if data.nbytes > self.max_bytes:
+            return
+        self._entries[key] = data
+        self.nbytes += data.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def clear(self):
+        """Remove all entries."""
+        self._entries.clear()
+        self.nbytes = 0
+
+
+mesh_cache = MeshCache()
+
+
+def freeze(value):
+    """Return a hashable version of value for use in cache keys."""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    try:
+        return tuple(freeze(v) for v in value)
+    except TypeError:
+        return repr(value)
+
+
+def tile_geometry_key(part, tile_props, *args, key_props=CORE_KEY_PROPS):
+    """Return a cache key for a part of a tile.
+
+    The key is made from the tile properties that affect the part plus the arguments
+    passed to the part's builder, so only parts whose inputs have changed are rebuilt.
+
+    Args:
+        part (str): Name of the tile part e.g. 'WALL_CORE'
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+        *args: Arguments passed to the part's builder
+        key_props (tuple[str], optional): Names of tile_props to include in key.
+        Defaults to CORE_KEY_PROPS.
+
+    Returns:
+        tuple: key
+    """
+    cursor = bpy.context.scene.cursor
+    props = tuple(
+        (name, freeze(getattr(tile_props, name)))
+        for name in key_props if hasattr(tile_props, name))
+    return (
+        part,
+        props,
+        freeze(args),
+        freeze(cursor.location),
+        freeze(cursor.rotation_euler))
+
+
+def cached_mesh_object(key, builder, *args, **kwargs):
+    """Return a mesh object built by builder, reusing cached geometry where possible.
+
+    On a cache hit the object is recreated directly from the cached data instead of
+    calling builder.
+
+    Args:
+        key (hashable): cache key. See tile_geometry_key
+        builder (function): function returning a new mesh object
+        *args: arguments passed to builder
+        **kwargs: keyword arguments passed to builder
+
+    Returns:
+        bpy.types.Object: object
+    """
+    prefs = get_prefs()
+    mesh_cache.max_bytes = prefs.geometry_cache_size * 1024 * 1024
+    if mesh_cache.max_bytes == 0:
+        return builder(*args, **kwargs)
+
+    data = mesh_cache.get(key)
+    if data is not None:
+        return data.to_object()
+
+    obj = builder(*args, **kwargs)
+    mesh_cache.put(key, MeshData.from_object(obj))
+    return obj
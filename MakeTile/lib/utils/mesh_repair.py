@@ -0,0 +1,260 @@
+"""Prepare meshes for export without bpy.ops.
+
+Finds and repairs non-manifold geometry with NumPy and bmesh and voxel remeshes meshes
+and triangle arrays, without changing the selection or needing any add-ons.
+"""
+
+import numpy as np
+import bmesh
+import bpy
+
+# distance below which verts are merged when repairing meshes
+MERGE_DISTANCE = 1e-5
+
+# maximum passes repair_non_manifold makes over a mesh
+MAX_REPAIR_ITERATIONS = 5
+
+
+def mesh_from_triangles(coords, tris, name='MakeTile'):
+    """Create a mesh from triangle arrays.
+
+    Args:
+        coords (numpy.ndarray): (n, 3) vert coordinates
+        tris (numpy.ndarray): (t, 3) vert indices of each triangle
+        name (str, optional): mesh name. Defaults to 'MakeTile'.
+
+    Returns:
+        bpy.types.Mesh: mesh
+    """
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(coords))
+    mesh.vertices.foreach_set('co', np.ascontiguousarray(coords, dtype=np.float32).ravel())
+    mesh.loops.add(len(tris) * 3)
+    mesh.loops.foreach_set('vertex_index', np.ascontiguousarray(tris, dtype=np.int32).ravel())
+    mesh.polygons.add(len(tris))
+    mesh.polygons.foreach_set('loop_start', np.arange(0, len(tris) * 3, 3, dtype=np.int32))
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set('loop_total', np.full(len(tris), 3, dtype=np.int32))
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+def mesh_to_triangles(mesh):
+    """Return the triangulated geometry of a mesh.
+
+    Args:
+        mesh (bpy.types.Mesh): mesh
+
+    Returns:
+        numpy.ndarray: (n, 3) float32 vert coordinates
+        numpy.ndarray: (t, 3) int32 vert indices of each triangle
+    """
+    mesh.calc_loop_triangles()
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', coords)
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get('vertices', tris)
+    return coords.reshape(-1, 3), tris.reshape(-1, 3)
+
+
+def weld_vertices(coords, tris, distance=MERGE_DISTANCE):
+    """Merge verts that lie in the same cell of a grid with cells of size distance.
+
+    Args:
+        coords (numpy.ndarray): (n, 3) vert coordinates
+        tris (numpy.ndarray): (t, 3) vert indices of each triangle
+        distance (float, optional): merge distance. Defaults to MERGE_DISTANCE.
+
+    Returns:
+        numpy.ndarray: (m, 3) vert coordinates
+        numpy.ndarray: (t, 3) vert indices of each triangle
+    """
+    cells = np.round(coords / distance).astype(np.int64)
+    _, first, inverse = np.unique(cells, axis=0, return_index=True, return_inverse=True)
+    return coords[first], inverse.reshape(-1)[tris]
+
+
+def remove_bad_triangles(tris):
+    """Remove triangles that use a vert more than once and triangles that repeat another triangle.
+
+    Args:
+        tris (numpy.ndarray): (t, 3) vert indices of each triangle
+
+    Returns:
+        numpy.ndarray: (u, 3) vert indices of each triangle
+    """
+    degenerate = (tris[:, 0] == tris[:, 1]) | (tris[:, 1] == tris[:, 2]) | (tris[:, 2] == tris[:, 0])
+    tris = tris[~degenerate]
+    _, first = np.unique(np.sort(tris, axis=1), axis=0, return_index=True)
+    return tris[np.sort(first)]
+
+
+def get_edge_face_counts(tris):
+    """Return every edge of a triangle mesh and the number of triangles using it.
+
+    Args:
+        tris (numpy.ndarray): (t, 3) vert indices of each triangle
+
+    Returns:
+        numpy.ndarray: (e, 2) vert indices of each edge, lowest first
+        numpy.ndarray: (e,) number of triangles using each edge
+    """
+    edges = np.concatenate((tris[:, (0, 1)], tris[:, (1, 2)], tris[:, (2, 0)]))
+    edges.sort(axis=1)
+    return np.unique(edges, axis=0, return_counts=True)
+
+
+def count_non_manifold_edges(tris):
+    """Return the number of boundary edges and edges used by more than two triangles.
+
+    A closed printable mesh has neither. Verts should be welded first.
+
+    Args:
+        tris (numpy.ndarray): (t, 3) vert indices of each triangle
+
+    Returns:
+        int: boundary edges
+        int: edges used by more than two triangles
+    """
+    _, counts = get_edge_face_counts(tris)
+    return int(np.count_nonzero(counts == 1)), int(np.count_nonzero(counts > 2))
+
+
+def repair_non_manifold(bm, merge_distance=MERGE_DISTANCE, max_iterations=MAX_REPAIR_ITERATIONS):
+    """Make a bmesh manifold.
+
+    Merges doubles, then repeatedly dissolves degenerate geometry, deletes loose
+    geometry, removes the faces around edges and verts that can't be made manifold and
+    fills the holes left. Finally makes normals consistent.
+
+    Args:
+        bm (bmesh.types.BMesh): bmesh
+        merge_distance (float, optional): merge distance. Defaults to MERGE_DISTANCE.
+        max_iterations (int, optional): passes to make. Defaults to MAX_REPAIR_ITERATIONS.
+
+    Returns:
+        bool: True if the bmesh is now manifold
+    """
+    bmesh.ops.remove_doubles(bm, verts=bm.verts[:], dist=merge_distance)
+    manifold = False
+
+    for i in range(max_iterations):
+        bmesh.ops.dissolve_degenerate(bm, dist=merge_distance, edges=bm.edges[:])
+
+        loose = [e for e in bm.edges if not e.link_faces]
+        if loose:
+            bmesh.ops.delete(bm, geom=loose, context='EDGES')
+        loose = [v for v in bm.verts if not v.link_faces]
+        if loose:
+            bmesh.ops.delete(bm, geom=loose, context='VERTS')
+
+        # faces around edges shared by more than two faces are removed and refilled
+        bad_faces = {f for e in bm.edges if len(e.link_faces) > 2 for f in e.link_faces}
+        if bad_faces:
+            bmesh.ops.delete(bm, geom=list(bad_faces), context='FACES_ONLY')
+            loose = [v for v in bm.verts if not v.link_edges]
+            if loose:
+                bmesh.ops.delete(bm, geom=loose, context='VERTS')
+
+        boundary = [e for e in bm.edges if e.is_boundary]
+        if boundary:
+            bmesh.ops.holes_fill(bm, edges=boundary, sides=0)
+
+        # verts still not manifold join separate fans of faces or border holes that couldn't be filled
+        bad_verts = [v for v in bm.verts if not v.is_manifold]
+        if not bad_verts and all(e.is_manifold for e in bm.edges):
+            manifold = True
+            break
+        bad_faces = {f for v in bad_verts for f in v.link_faces}
+        bmesh.ops.delete(bm, geom=list(bad_faces), context='FACES_ONLY')
+
+    bmesh.ops.recalc_face_normals(bm, faces=bm.faces[:])
+    return manifold
+
+
+def make_mesh_manifold(mesh, merge_distance=MERGE_DISTANCE):
+    """Repair the non-manifold geometry of a mesh in place.
+
+    Meshes that are already manifold, with no verts that need merging, are left alone.
+
+    Args:
+        mesh (bpy.types.Mesh): mesh
+        merge_distance (float, optional): merge distance. Defaults to MERGE_DISTANCE.
+
+    Returns:
+        bool: True if the mesh is manifold
+    """
+    coords, tris = mesh_to_triangles(mesh)
+    if len(tris) > 0:
+        welded_coords, tris = weld_vertices(coords, tris, merge_distance)
+        # if any verts were welded the mesh itself still has to be merged by the bmesh repair
+        if (len(welded_coords) == len(coords)
+                and len(remove_bad_triangles(tris)) == len(tris)
+                and count_non_manifold_edges(tris) == (0, 0)):
+            return True
+
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(mesh)
+        manifold = repair_non_manifold(bm, merge_distance)
+        bm.to_mesh(mesh)
+    finally:
+        bm.free()
+    mesh.update()
+    return manifold
+
+
+def voxel_remesh_mesh(mesh, voxel_size, adaptivity=0):
+    """Return a voxel remeshed copy of a mesh.
+
+    Uses a Remesh modifier on a temporary object, which runs the same remesher as
+    bpy.ops.object.voxel_remesh but doesn't need an operator context, so it works in
+    background mode and doesn't change the selection.
+
+    Args:
+        mesh (bpy.types.Mesh): mesh
+        voxel_size (float): voxel size
+        adaptivity (float, optional): amount to simplify flat areas by. Defaults to 0.
+
+    Returns:
+        bpy.types.Mesh: new mesh
+    """
+    obj = bpy.data.objects.new('MT Voxel Remesh', mesh)
+    scene = bpy.context.scene
+    scene.collection.objects.link(obj)
+    try:
+        mod = obj.modifiers.new('MT Voxel Remesh', 'REMESH')
+        mod.mode = 'VOXEL'
+        mod.voxel_size = voxel_size
+        mod.adaptivity = adaptivity
+
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        depsgraph.update()
+        remeshed = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph), depsgraph=depsgraph)
+    finally:
+        bpy.data.objects.remove(obj, do_unlink=True)
+    return remeshed
+
+
+def voxel_remesh_triangles(coords, tris, voxel_size, adaptivity=0):
+    """Voxel remesh triangle arrays, e.g. from lib.utils.stl.get_evaluated_triangles.
+
+    Args:
+        coords (numpy.ndarray): (n, 3) vert coordinates
+        tris (numpy.ndarray): (t, 3) vert indices of each triangle
+        voxel_size (float): voxel size
+        adaptivity (float, optional): amount to simplify flat areas by. Defaults to 0.
+
+    Returns:
+        numpy.ndarray: (m, 3) vert coordinates
+        numpy.ndarray: (u, 3) vert indices of each triangle
+    """
+    mesh = mesh_from_triangles(coords, tris)
+    try:
+        remeshed = voxel_remesh_mesh(mesh, voxel_size, adaptivity)
+    finally:
+        bpy.data.meshes.remove(mesh)
+    try:
+        return mesh_to_triangles(remeshed)
+    finally:
+        bpy.data.meshes.remove(remeshed)
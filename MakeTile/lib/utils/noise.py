@@ -0,0 +1,344 @@
+"""NumPy ports of the Cycles noise and voronoi textures.
+
+Functions take arrays of points and return arrays so a texture can be evaluated at
+millions of points at once. The hashes and gradients match Cycles so the results are
+the same as baking the equivalent shader nodes.
+"""
+
+import numpy as np
+
+U32 = np.uint32
+
+
+def _rot(x, k):
+    return (x << U32(k)) | (x >> U32(32 - k))
+
+
+def _final(a, b, c):
+    c ^= b
+    c -= _rot(b, 14)
+    a ^= c
+    a -= _rot(c, 11)
+    b ^= a
+    b -= _rot(a, 25)
+    c ^= b
+    c -= _rot(b, 16)
+    a ^= c
+    a -= _rot(c, 4)
+    b ^= a
+    b -= _rot(a, 14)
+    c ^= b
+    c -= _rot(b, 24)
+    return c
+
+
+def _mix(a, b, c):
+    a -= c
+    a ^= _rot(c, 4)
+    c += b
+    b -= a
+    b ^= _rot(a, 6)
+    a += c
+    c -= b
+    c ^= _rot(b, 8)
+    b += a
+    a -= c
+    a ^= _rot(c, 16)
+    c += b
+    b -= a
+    b ^= _rot(a, 19)
+    a += c
+    c -= b
+    c ^= _rot(b, 4)
+    b += a
+    return a, b, c
+
+
+def _init(keys, shape):
+    value = U32(0xdeadbeef + (keys << 2) + 13)
+    return (np.full(shape, value, dtype=U32) for i in range(3))
+
+
+def hash_uint(kx):
+    """Jenkins lookup3 hash of one uint32 array."""
+    kx = np.asarray(kx, dtype=U32)
+    a, b, c = _init(1, kx.shape)
+    a += kx
+    return _final(a, b, c)
+
+
+def hash_uint2(kx, ky):
+    """Jenkins lookup3 hash of two uint32 arrays."""
+    kx, ky = np.broadcast_arrays(np.asarray(kx, dtype=U32), np.asarray(ky, dtype=U32))
+    a, b, c = _init(2, kx.shape)
+    b += ky
+    a += kx
+    return _final(a, b, c)
+
+
+def hash_uint3(kx, ky, kz):
+    """Jenkins lookup3 hash of three uint32 arrays."""
+    kx, ky, kz = np.broadcast_arrays(
+        np.asarray(kx, dtype=U32), np.asarray(ky, dtype=U32), np.asarray(kz, dtype=U32))
+    a, b, c = _init(3, kx.shape)
+    c += kz
+    b += ky
+    a += kx
+    return _final(a, b, c)
+
+
+def hash_uint4(kx, ky, kz, kw):
+    """Jenkins lookup3 hash of four uint32 arrays."""
+    kx, ky, kz, kw = np.broadcast_arrays(
+        np.asarray(kx, dtype=U32), np.asarray(ky, dtype=U32),
+        np.asarray(kz, dtype=U32), np.asarray(kw, dtype=U32))
+    a, b, c = _init(4, kx.shape)
+    a += kx
+    b += ky
+    c += kz
+    a, b, c = _mix(a, b, c)
+    a += kw
+    return _final(a, b, c)
+
+
+def hash_uint_to_float(k):
+    return (k / 0xFFFFFFFF).astype(np.float32)
+
+
+def float_as_uint(f):
+    return np.ascontiguousarray(f, dtype=np.float32).view(U32)
+
+
+def hash_float_to_float(k):
+    return hash_uint_to_float(hash_uint(float_as_uint(k)))
+
+
+def hash_float2_to_float(kx, ky):
+    return hash_uint_to_float(hash_uint2(float_as_uint(kx), float_as_uint(ky)))
+
+
+def hash_float3_to_float(k):
+    """Hash (n, 3) float points to (n,) floats between 0 and 1."""
+    k = np.asarray(k, dtype=np.float32)
+    return hash_uint_to_float(hash_uint3(
+        float_as_uint(k[..., 0]), float_as_uint(k[..., 1]), float_as_uint(k[..., 2])))
+
+
+def hash_float4_to_float(k, w):
+    k = np.asarray(k, dtype=np.float32)
+    w = np.full(k.shape[:-1], w, dtype=np.float32)
+    return hash_uint_to_float(hash_uint4(
+        float_as_uint(k[..., 0]), float_as_uint(k[..., 1]),
+        float_as_uint(k[..., 2]), float_as_uint(w)))
+
+
+def hash_float3_to_float3(k):
+    """Hash (n, 3) float points to (n, 3) floats between 0 and 1."""
+    return np.stack((
+        hash_float3_to_float(k),
+        hash_float4_to_float(k, 1.0),
+        hash_float4_to_float(k, 2.0)), axis=-1)
+
+
+def random_float3_offset(seed):
+    """Offset used to decorrelate the channels of noise textures."""
+    offset = hash_float2_to_float(np.full(3, seed, dtype=np.float32), np.arange(3, dtype=np.float32))
+    return (100.0 + offset * 100.0).astype(np.float32)
+
+
+def _fade(t):
+    return t * t * t * (t * (t * 6.0 - 15.0) + 10.0)
+
+
+def _negate_if(value, condition):
+    return np.where(condition != 0, -value, value)
+
+
+def _grad3(hash_value, x, y, z):
+    h = hash_value & U32(15)
+    u = np.where(h < 8, x, y)
+    vt = np.where((h == 12) | (h == 14), x, z)
+    v = np.where(h < 4, y, vt)
+    return _negate_if(u, h & U32(1)) + _negate_if(v, h & U32(2))
+
+
+def perlin(points):
+    """Signed 3D Perlin noise of (n, 3) points. Roughly between -1 and 1."""
+    points = np.asarray(points, dtype=np.float32)
+    cell = np.floor(points)
+    f = points - cell
+    cell = cell.astype(np.int64).astype(U32)
+    X, Y, Z = cell[..., 0], cell[..., 1], cell[..., 2]
+    fx, fy, fz = f[..., 0], f[..., 1], f[..., 2]
+    u, v, w = _fade(fx), _fade(fy), _fade(fz)
+
+    def corner(dx, dy, dz):
+        return _grad3(
+            hash_uint3(X + U32(dx), Y + U32(dy), Z + U32(dz)),
+            fx - dx, fy - dy, fz - dz)
+
+    x1 = _lerp(corner(0, 0, 0), corner(1, 0, 0), u)
+    x2 = _lerp(corner(0, 1, 0), corner(1, 1, 0), u)
+    x3 = _lerp(corner(0, 0, 1), corner(1, 0, 1), u)
+    x4 = _lerp(corner(0, 1, 1), corner(1, 1, 1), u)
+    y1 = _lerp(x1, x2, v)
+    y2 = _lerp(x3, x4, v)
+    return _lerp(y1, y2, w)
+
+
+def _lerp(a, b, t):
+    return (1.0 - t) * a + t * b
+
+
+def snoise(points):
+    """Scaled signed Perlin noise as used by the noise texture."""
+    result = perlin(points) * np.float32(0.9820)
+    return np.where(np.isfinite(result), result, 0.0).astype(np.float32)
+
+
+def fractal_noise(points, detail, roughness):
+    """Fractal Brownian motion noise between 0 and 1.
+
+    Args:
+        points (numpy.ndarray): (n, 3) points
+        detail (float): number of octaves. Fractional detail blends in the last octave
+        roughness (float): amplitude multiplier of each octave
+
+    Returns:
+        numpy.ndarray: (n,) noise
+    """
+    fscale = 1.0
+    amp = 1.0
+    maxamp = 0.0
+    total = np.zeros(points.shape[:-1], dtype=np.float32)
+    octaves = min(max(detail, 0.0), 15.0)
+    roughness = min(max(roughness, 0.0), 1.0)
+
+    for i in range(int(octaves) + 1):
+        total += snoise(fscale * points) * amp
+        maxamp += amp
+        amp *= roughness
+        fscale *= 2.0
+
+    remainder = octaves - np.floor(octaves)
+    if remainder != 0.0:
+        total2 = total + snoise(fscale * points) * amp
+        value = 0.5 * total / maxamp + 0.5
+        value2 = 0.5 * total2 / (maxamp + amp) + 0.5
+        return ((1.0 - remainder) * value + remainder * value2).astype(np.float32)
+    return (0.5 * total / maxamp + 0.5).astype(np.float32)
+
+
+def noise_texture(points, detail=2.0, roughness=0.5, distortion=0.0, color=True):
+    """3D Noise Texture node.
+
+    Args:
+        points (numpy.ndarray): (n, 3) points already multiplied by scale
+        detail (float, optional): Defaults to 2.0.
+        roughness (float, optional): Defaults to 0.5.
+        distortion (float, optional): Defaults to 0.0.
+        color (bool, optional): Calculate colour output. Defaults to True.
+
+    Returns:
+        numpy.ndarray: (n,) Fac
+        numpy.ndarray: (n, 3) Color or None
+    """
+    points = np.asarray(points, dtype=np.float32)
+    if distortion != 0.0:
+        points = points + np.stack([
+            snoise(points + random_float3_offset(seed)) * distortion
+            for seed in range(3)], axis=-1)
+
+    value = fractal_noise(points, detail, roughness)
+    if not color:
+        return value, None
+
+    return value, np.stack((
+        value,
+        fractal_noise(points + random_float3_offset(3), detail, roughness),
+        fractal_noise(points + random_float3_offset(4), detail, roughness)), axis=-1)
+
+
+def white_noise(points):
+    """3D White Noise Texture node.
+
+    Returns:
+        numpy.ndarray: (n,) Value
+        numpy.ndarray: (n, 3) Color
+    """
+    points = np.asarray(points, dtype=np.float32)
+    return hash_float3_to_float(points), hash_float3_to_float3(points)
+
+
+def voronoi_distance(a, b, metric='EUCLIDEAN', exponent=0.5):
+    difference = a - b
+    if metric == 'EUCLIDEAN':
+        return np.sqrt(np.sum(difference * difference, axis=-1))
+    if metric == 'MANHATTAN':
+        return np.sum(np.abs(difference), axis=-1)
+    if metric == 'CHEBYCHEV':
+        return np.max(np.abs(difference), axis=-1)
+    if metric == 'MINKOWSKI':
+        return np.power(np.sum(np.power(np.abs(difference), exponent), axis=-1), 1.0 / exponent)
+    raise ValueError('Unknown voronoi metric ' + metric)
+
+
+def voronoi(points, feature='F1', metric='EUCLIDEAN', exponent=0.5, randomness=1.0):
+    """3D Voronoi Texture node for the F1 and F2 features.
+
+    Args:
+        points (numpy.ndarray): (n, 3) points already multiplied by scale
+        feature (str, optional): 'F1' or 'F2'. Defaults to 'F1'.
+        metric (str, optional): distance metric. Defaults to 'EUCLIDEAN'.
+        exponent (float, optional): Minkowski exponent. Defaults to 0.5.
+        randomness (float, optional): Defaults to 1.0.
+
+    Returns:
+        numpy.ndarray: (n,) Distance
+        numpy.ndarray: (n, 3) Color
+        numpy.ndarray: (n, 3) Position, in scaled space
+    """
+    points = np.asarray(points, dtype=np.float32)
+    cell = np.floor(points)
+    local = points - cell
+    randomness = min(max(randomness, 0.0), 1.0)
+    shape = points.shape[:-1]
+
+    distance_f1 = np.full(shape, 8.0, dtype=np.float32)
+    distance_f2 = np.full(shape, 8.0, dtype=np.float32)
+    offset_f1 = np.zeros(points.shape, dtype=np.float32)
+    offset_f2 = np.zeros(points.shape, dtype=np.float32)
+    position_f1 = np.zeros(points.shape, dtype=np.float32)
+    position_f2 = np.zeros(points.shape, dtype=np.float32)
+
+    for k in (-1, 0, 1):
+        for j in (-1, 0, 1):
+            for i in (-1, 0, 1):
+                cell_offset = np.array((i, j, k), dtype=np.float32)
+                point_position = cell_offset + hash_float3_to_float3(cell + cell_offset) * randomness
+                distance = voronoi_distance(point_position, local, metric, exponent)
+
+                closer_f1 = distance < distance_f1
+                closer_f2 = ~closer_f1 & (distance < distance_f2)
+
+                # old F1 becomes F2
+                distance_f2 = np.where(closer_f1, distance_f1, distance_f2)
+                offset_f2 = np.where(closer_f1[..., None], offset_f1, offset_f2)
+                position_f2 = np.where(closer_f1[..., None], position_f1, position_f2)
+
+                distance_f1 = np.where(closer_f1, distance, distance_f1)
+                offset_f1 = np.where(closer_f1[..., None], cell_offset, offset_f1)
+                position_f1 = np.where(closer_f1[..., None], point_position, position_f1)
+
+                distance_f2 = np.where(closer_f2, distance, distance_f2)
+                offset_f2 = np.where(closer_f2[..., None], cell_offset, offset_f2)
+                position_f2 = np.where(closer_f2[..., None], point_position, position_f2)
+
+    if feature == 'F1':
+        distance, offset, position = distance_f1, offset_f1, position_f1
+    elif feature == 'F2':
+        distance, offset, position = distance_f2, offset_f2, position_f2
+    else:
+        raise ValueError('Unsupported voronoi feature ' + feature)
+
+    return distance, hash_float3_to_float3(cell + offset), position + cell
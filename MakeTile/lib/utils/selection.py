@@ -1,3 +1,5 @@
+from itertools import chain
+import numpy as np
 import bpy
 import bmesh
 from mathutils import Vector
@@ -73,186 +75,227 @@ def in_bbox(lbound, ubound, vert, buffer=0.001):
         lbound[2] - buffer <= vert[2] <= ubound[2] + buffer
 
 
-def select_by_loc(
-        lbound=(0, 0, 0),
-        ubound=(0, 0, 0),
-        select_mode='VERT',
-        coords='GLOBAL',
-        buffer=0.001,
-        additive=False):
-    """select faces, edges or verts by location that are wholly
-    within a bounding cuboid
+def coords_in_bbox(coords, lbound, ubound, buffer=0.001):
+    """Vectorised version of in_bbox.
 
-    Keyword arguments:
+    Args:
+        coords (numpy.ndarray): (n, 3) array of coordinates
+        lbound (Vector[3]): lower left of cuboid
+        ubound (Vector[3]): upper right of cuboid
+        buffer (float, optional): buffer distance to add to cuboid. Defaults to 0.001.
 
-    lbound -- lower left bound of bounding box
-    ubound -- upper right bound of bounding box
-    select_mode -- default 'VERT'
-    coords -- default 'GLOBAL'
-    buffer - buffer around selection default = 0.001
+    Returns:
+        numpy.ndarray: (n,) boolean mask, True where coord is within cuboid
     """
+    lower = np.asarray(lbound[:3], dtype=np.float64) - buffer
+    upper = np.asarray(ubound[:3], dtype=np.float64) + buffer
+    return np.all((coords >= lower) & (coords <= upper), axis=-1)
 
-    # set selection mode
-    bpy.ops.mesh.select_mode(type=select_mode)
-    # grab the transformation matrix
-    world = bpy.context.object.matrix_world
 
-    # instantiate a bmesh object and ensure lookup table (bm.faces.ensure... works for all)
-    bm = bmesh.from_edit_mesh(bpy.context.object.data)
-    bm.faces.ensure_lookup_table()
+def get_bm_vert_coords(verts, matrix=None):
+    """Return the coordinates of bmesh verts as an array.
 
-    # initialise list of verts and parts to be selected
-    verts = []
-    to_select = []
+    Args:
+        verts (sequence[BMVert]): verts e.g. bm.verts
+        matrix (Matrix[4][4], optional): matrix to transform coordinates by. Defaults to None.
 
-    # for VERT, EDGE or FACE
-    # grab list of global or local coords
-    # test if the piece is entirely within the rectangular
-    # prism defined by lbound and ubound
-    # select each piece that returned TRUE and deselect each piece that returned FALSE
+    Returns:
+        numpy.ndarray: (n, 3) array of coordinates
+    """
+    count = len(verts)
+    coords = np.fromiter(
+        chain.from_iterable(v.co for v in verts),
+        dtype=np.float64,
+        count=count * 3).reshape(count, 3)
+    if matrix is not None:
+        coords = transform_coords(coords, matrix)
+    return coords
 
-    if select_mode == 'VERT':
-        if coords == 'GLOBAL':
-            [verts.append((world @ v.co).to_tuple())for v in bm.verts]
-        elif coords == 'LOCAL':
-            [verts.append(v.co.to_tuple())for v in bm.verts]
 
-        [to_select.append(in_bbox(lbound, ubound, v, buffer))for v in verts]
+def get_mesh_vert_coords(mesh, matrix=None):
+    """Return the coordinates of mesh vertices as an array using foreach_get.
 
-        for vert_obj, select in zip(bm.verts, to_select):
-            if additive:
-                vert_obj.select |= select
-            else:
-                vert_obj.select = select
+    Args:
+        mesh (bpy.types.Mesh): mesh
+        matrix (Matrix[4][4], optional): matrix to transform coordinates by. Defaults to None.
 
-    if select_mode == 'EDGE':
-        if coords == 'GLOBAL':
-            [verts.append([(world @ v.co).to_tuple() for v in e.verts]) for e in bm.edges]
-        elif coords == 'LOCAL':
-            [verts.append([v.co.to_tuple()for v in e.verts]) for e in bm.edges]
+    Returns:
+        numpy.ndarray: (n, 3) array of coordinates
+    """
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', coords)
+    coords = coords.reshape(-1, 3).astype(np.float64)
+    if matrix is not None:
+        coords = transform_coords(coords, matrix)
+    return coords
 
-        [to_select.append(all(in_bbox(lbound, ubound, v, buffer)for v in e)) for e in verts]
 
-        for edge_obj, select in zip(bm.edges, to_select):
-            if additive:
-                edge_obj.select |= select
-            else:
-                edge_obj.select = select
+def transform_coords(coords, matrix):
+    """Transform an array of coordinates by a 4x4 matrix.
 
-    if select_mode == 'FACE':
-        if coords == 'GLOBAL':
-            [verts.append([(world @ v.co).to_tuple() for v in f.verts])for f in bm.faces]
-        elif coords == 'LOCAL':
-            [verts.append([v.co.to_tuple()for v in f.verts]) for f in bm.faces]
+    Args:
+        coords (numpy.ndarray): (n, 3) array of coordinates
+        matrix (Matrix[4][4]): matrix
 
-        [to_select.append(all(in_bbox(lbound, ubound, v, buffer) for v in f))for f in verts]
+    Returns:
+        numpy.ndarray: (n, 3) array of transformed coordinates
+    """
+    mat = np.array(matrix, dtype=np.float64)
+    return coords @ mat[:3, :3].T + mat[:3, 3]
 
-        for face_obj, select in zip(bm.faces, to_select):
-            if additive:
-                face_obj.select |= select
-            else:
-                face_obj.select = select
 
-    # update the edit mesh so we get live highlighting
-    bmesh.update_edit_mesh(bpy.context.object.data)
+def bm_verts_in_bbox(bm, lbound, ubound, buffer=0.001, matrix=None):
+    """Return a mask of the bmesh verts that are within a bounding cuboid.
 
+    Args:
+        bm (bmesh): bmesh
+        lbound (Vector[3]): lower left of cuboid
+        ubound (Vector[3]): upper right of cuboid
+        buffer (float, optional): buffer distance to add to cuboid. Defaults to 0.001.
+        matrix (Matrix[4][4], optional): matrix to transform coordinates by. Defaults to None.
 
-def select_inverse_by_loc(
-        lbound=(0, 0, 0),
-        ubound=(0, 0, 0),
-        select_mode='VERT',
-        coords='GLOBAL',
-        buffer=0.001,
-        additive=False):
-    """selects faces, edges or verts by location that are not within
-    a bounding cuboid
+    Returns:
+        numpy.ndarray: (len(bm.verts),) boolean mask
+    """
+    coords = get_bm_vert_coords(bm.verts, matrix)
+    return coords_in_bbox(coords, lbound, ubound, buffer)
 
-    Keyword arguments:
 
-    lbound -- lower left bound of bounding box
-    ubound -- upper right bound of bounding box
-    select_mode -- default 'VERT'
-    coords -- default 'GLOBAL'
-    buffer - buffer around selection default = 0.001
+def bm_edges_in_bbox(bm, lbound, ubound, buffer=0.001, matrix=None):
+    """Return a mask of the bmesh edges that are wholly within a bounding cuboid.
+
+    Args:
+        bm (bmesh): bmesh
+        lbound (Vector[3]): lower left of cuboid
+        ubound (Vector[3]): upper right of cuboid
+        buffer (float, optional): buffer distance to add to cuboid. Defaults to 0.001.
+        matrix (Matrix[4][4], optional): matrix to transform coordinates by. Defaults to None.
+
+    Returns:
+        numpy.ndarray: (len(bm.edges),) boolean mask
     """
+    edge_verts = list(chain.from_iterable(e.verts for e in bm.edges))
+    coords = get_bm_vert_coords(edge_verts, matrix).reshape(-1, 2, 3)
+    return np.all(coords_in_bbox(coords, lbound, ubound, buffer), axis=1)
+
 
+def bm_faces_in_bbox(bm, lbound, ubound, buffer=0.001, matrix=None):
+    """Return a mask of the bmesh faces that are wholly within a bounding cuboid.
+
+    Args:
+        bm (bmesh): bmesh
+        lbound (Vector[3]): lower left of cuboid
+        ubound (Vector[3]): upper right of cuboid
+        buffer (float, optional): buffer distance to add to cuboid. Defaults to 0.001.
+        matrix (Matrix[4][4], optional): matrix to transform coordinates by. Defaults to None.
+
+    Returns:
+        numpy.ndarray: (len(bm.faces),) boolean mask
+    """
+    if not bm.faces:
+        return np.zeros(0, dtype=bool)
+    face_lens = np.fromiter((len(f.verts) for f in bm.faces), dtype=np.int64, count=len(bm.faces))
+    face_verts = list(chain.from_iterable(f.verts for f in bm.faces))
+    coords = get_bm_vert_coords(face_verts, matrix)
+    in_bounds = coords_in_bbox(coords, lbound, ubound, buffer)
+    starts = np.concatenate(([0], np.cumsum(face_lens)[:-1]))
+    return np.logical_and.reduceat(in_bounds, starts)
+
+
+def set_select_from_mask(elems, mask, additive=False, invert=False):
+    """Set the selection state of bmesh elements from a boolean mask.
+
+    Args:
+        elems (sequence[BMVert | BMEdge | BMFace]): elements e.g. bm.verts
+        mask (numpy.ndarray): boolean mask, one entry per element
+        additive (bool, optional): add to current selection. Defaults to False.
+        invert (bool, optional): select elements where mask is False. Defaults to False.
+    """
+    if invert:
+        mask = ~mask
+    if additive:
+        for elem, select in zip(elems, mask.tolist()):
+            if select:
+                elem.select = True
+    else:
+        for elem, select in zip(elems, mask.tolist()):
+            elem.select = select
+
+
+def _select_by_loc(lbound, ubound, select_mode, coords, buffer, additive, invert):
+    """Select bmesh elements of the object in edit mode by location.
+
+    See select_by_loc and select_inverse_by_loc.
+    """
     # set selection mode
     bpy.ops.mesh.select_mode(type=select_mode)
     # grab the transformation matrix
-    world = bpy.context.object.matrix_world
+    world = None
+    if coords == 'GLOBAL':
+        world = bpy.context.object.matrix_world
 
     # instantiate a bmesh object and ensure lookup table (bm.faces.ensure... works for all)
     bm = bmesh.from_edit_mesh(bpy.context.object.data)
     bm.faces.ensure_lookup_table()
 
-    # initialise list of verts and parts to be selected
-    verts = []
-    to_select = []
-
     # for VERT, EDGE or FACE
-    # grab list of global or local coords
+    # grab array of global or local coords
     # test if the piece is entirely within the rectangular
     # prism defined by lbound and ubound
     # select each piece that returned TRUE and deselect each piece that returned FALSE
-
     if select_mode == 'VERT':
-        if coords == 'GLOBAL':
-            [verts.append((world @ v.co).to_tuple())for v in bm.verts]
-        elif coords == 'LOCAL':
-            [verts.append(v.co.to_tuple())for v in bm.verts]
-
-        [to_select.append(in_bbox(lbound, ubound, v, buffer))for v in verts]
-
-        for vert_obj, select in zip(bm.verts, to_select):
-            if select is True:
-                select = False
-            else:
-                select = True
-
-            if additive:
-                vert_obj.select |= select
-            else:
-                vert_obj.select = select
+        mask = bm_verts_in_bbox(bm, lbound, ubound, buffer, world)
+        set_select_from_mask(bm.verts, mask, additive, invert)
 
     if select_mode == 'EDGE':
-        if coords == 'GLOBAL':
-            [verts.append([(world @ v.co).to_tuple() for v in e.verts]) for e in bm.edges]
-        elif coords == 'LOCAL':
-            [verts.append([v.co.to_tuple()for v in e.verts]) for e in bm.edges]
+        mask = bm_edges_in_bbox(bm, lbound, ubound, buffer, world)
+        set_select_from_mask(bm.edges, mask, additive, invert)
 
-        [to_select.append(all(in_bbox(lbound, ubound, v, buffer)for v in e)) for e in verts]
+    if select_mode == 'FACE':
+        mask = bm_faces_in_bbox(bm, lbound, ubound, buffer, world)
+        set_select_from_mask(bm.faces, mask, additive, invert)
 
-        for edge_obj, select in zip(bm.edges, to_select):
+    # update the edit mesh so we get live highlighting
+    bmesh.update_edit_mesh(bpy.context.object.data)
 
-            if select is True:
-                select = False
-            else:
-                select = True
 
-            if additive:
-                edge_obj.select |= select
-            else:
-                edge_obj.select = select
+def select_by_loc(
+        lbound=(0, 0, 0),
+        ubound=(0, 0, 0),
+        select_mode='VERT',
+        coords='GLOBAL',
+        buffer=0.001,
+        additive=False):
+    """select faces, edges or verts by location that are wholly
+    within a bounding cuboid
 
-    if select_mode == 'FACE':
-        if coords == 'GLOBAL':
-            [verts.append([(world @ v.co).to_tuple() for v in f.verts])for f in bm.faces]
-        elif coords == 'LOCAL':
-            [verts.append([v.co.to_tuple()for v in f.verts]) for f in bm.faces]
+    Keyword arguments:
 
-        [to_select.append(all(in_bbox(lbound, ubound, v, buffer) for v in f))for f in verts]
+    lbound -- lower left bound of bounding box
+    ubound -- upper right bound of bounding box
+    select_mode -- default 'VERT'
+    coords -- default 'GLOBAL'
+    buffer - buffer around selection default = 0.001
+    """
+    _select_by_loc(lbound, ubound, select_mode, coords, buffer, additive, invert=False)
 
-        for face_obj, select in zip(bm.faces, to_select):
 
-            if select is True:
-                select = False
-            else:
-                select = True
+def select_inverse_by_loc(
+        lbound=(0, 0, 0),
+        ubound=(0, 0, 0),
+        select_mode='VERT',
+        coords='GLOBAL',
+        buffer=0.001,
+        additive=False):
+    """selects faces, edges or verts by location that are not within
+    a bounding cuboid
 
-            if additive:
-                face_obj.select |= select
-            else:
-                face_obj.select = select
+    Keyword arguments:
 
-    # update the edit mesh so we get live highlighting
-    bmesh.update_edit_mesh(bpy.context.object.data)
+    lbound -- lower left bound of bounding box
+    ubound -- upper right bound of bounding box
+    select_mode -- default 'VERT'
+    coords -- default 'GLOBAL'
+    buffer - buffer around selection default = 0.001
+    """
+    _select_by_loc(lbound, ubound, select_mode, coords, buffer, additive, invert=True)
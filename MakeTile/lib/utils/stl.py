@@ -0,0 +1,181 @@
+import struct
+import numpy as np
+
+# binary STL triangle record. 12 float32 (normal and 3 verts) followed by a uint16
+STL_TRIANGLE = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('verts', '<f4', (3, 3)),
+    ('attr', '<u2')])
+
+# number of triangles to convert and write at a time to limit peak memory
+CHUNK_SIZE = 1000000
+
+
+def get_evaluated_triangles(obj, depsgraph, scale=1):
+    """Return the triangulated evaluated mesh of an object in world space.
+
+    Args:
+        obj (bpy.types.Object): object
+        depsgraph (bpy.types.Depsgraph): evaluated depsgraph
+        scale (float, optional): Multiplier applied after transforming to world space. Defaults to 1.
+
+    Returns:
+        numpy.ndarray: (n, 3) float32 vert coordinates
+        numpy.ndarray: (t, 3) int32 vert indices of each triangle
+    """
+    object_eval = obj.evaluated_get(depsgraph)
+    mesh = object_eval.to_mesh()
+    try:
+        mesh.calc_loop_triangles()
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', coords)
+        tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get('vertices', tris)
+        matrix = np.array(object_eval.matrix_world, dtype=np.float32)
+    finally:
+        object_eval.to_mesh_clear()
+
+    coords = coords.reshape(-1, 3)
+    coords = coords @ matrix[:3, :3].T + matrix[:3, 3]
+    if scale != 1:
+        coords *= scale
+    return coords, tris.reshape(-1, 3)
+
+
+def triangle_records(coords, tris):
+    """Return binary STL records for triangles.
+
+    Args:
+        coords (numpy.ndarray): (n, 3) vert coordinates
+        tris (numpy.ndarray): (t, 3) vert indices of each triangle
+
+    Returns:
+        numpy.ndarray: (t,) STL_TRIANGLE records
+    """
+    verts = coords[tris]
+    normals = np.cross(verts[:, 1] - verts[:, 0], verts[:, 2] - verts[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+
+    records = np.zeros(len(tris), dtype=STL_TRIANGLE)
+    records['normal'] = normals
+    records['verts'] = verts
+    return records
+
+
+def write_stl_header(stl_file, num_triangles, name='MakeTile'):
+    """Write the 80 byte header and triangle count of a binary STL.
+
+    Args:
+        stl_file (file): file opened for binary writing
+        num_triangles (int): number of triangles that will be written
+        name (str, optional): text written in header. Defaults to 'MakeTile'.
+    """
+    header = name.encode('ascii', 'replace')[:80].ljust(80, b' ')
+    stl_file.write(header)
+    stl_file.write(struct.pack('<I', num_triangles))
+
+
+def write_stl_triangles(stl_file, coords, tris):
+    """Write triangles to a binary STL in chunks.
+
+    Args:
+        stl_file (file): file opened for binary writing
+        coords (numpy.ndarray): (n, 3) vert coordinates
+        tris (numpy.ndarray): (t, 3) vert indices of each triangle
+    """
+    for start in range(0, len(tris), CHUNK_SIZE):
+        triangle_records(coords, tris[start:start + CHUNK_SIZE]).tofile(stl_file)
+
+
+def write_binary_stl(filepath, coords, tris, name='MakeTile'):
+    """Write a mesh to a binary STL file.
+
+    Args:
+        filepath (str): path of file to write
+        coords (numpy.ndarray): (n, 3) vert coordinates
+        tris (numpy.ndarray): (t, 3) vert indices of each triangle
+        name (str, optional): text written in header. Defaults to 'MakeTile'.
+    """
+    with open(filepath, 'wb') as stl_file:
+        write_stl_header(stl_file, len(tris), name)
+        write_stl_triangles(stl_file, coords, tris)
+
+
+def export_object_stl(filepath, obj, depsgraph, scale=1):
+    """Export the evaluated mesh of an object in world space to a binary STL file.
+
+    Equivalent to bpy.ops.export_mesh.stl with use_selection=True,
+    use_mesh_modifiers=True and global_scale=scale for a single selected object but
+    doesn't need an operator context or the STL add-on.
+
+    Args:
+        filepath (str): path of file to write
+        obj (bpy.types.Object): object
+        depsgraph (bpy.types.Depsgraph): evaluated depsgraph
+        scale (float, optional): Multiplier applied to world space coordinates. Defaults to 1.
+    """
+    coords, tris = get_evaluated_triangles(obj, depsgraph, scale)
+    write_binary_stl(filepath, coords, tris, obj.name)
+
+
+def export_objects_stl(filepath, objects, depsgraph, scale=1, center=True, name='MakeTile'):
+    """Export the evaluated meshes of several objects to a single binary STL file.
+
+    Each object is evaluated, written and freed before the next, so only one object's
+    triangles are held in memory at a time. The objects don't need to be joined first
+    and the scene isn't changed.
+
+    Args:
+        filepath (str): path of file to write
+        objects (list[bpy.types.Object]): objects
+        depsgraph (bpy.types.Depsgraph): evaluated depsgraph
+        scale (float, optional): Multiplier applied to world space coordinates. Defaults to 1.
+        center (bool, optional): Move the center of the combined bounds of the objects to
+        the origin. Defaults to True.
+        name (str, optional): text written in header. Defaults to 'MakeTile'.
+    """
+    offset = None
+    if center:
+        bounds = get_world_bounds(objects, depsgraph)
+        if bounds is not None:
+            offset = ((bounds[0] + bounds[1]) / 2 * scale).astype(np.float32)
+
+    with open(filepath, 'wb') as stl_file:
+        # the triangle count isn't known until every object has been evaluated
+        write_stl_header(stl_file, 0, name)
+        num_triangles = 0
+        for obj in objects:
+            coords, tris = get_evaluated_triangles(obj, depsgraph, scale)
+            if offset is not None:
+                coords -= offset
+            write_stl_triangles(stl_file, coords, tris)
+            num_triangles += len(tris)
+            del coords, tris
+
+        stl_file.seek(80)
+        stl_file.write(struct.pack('<I', num_triangles))
+
+
+def get_world_bounds(objects, depsgraph):
+    """Return the world space bounds of the evaluated objects.
+
+    Uses the corners of each object's bounding box so no meshes are evaluated.
+
+    Args:
+        objects (list[bpy.types.Object]): objects
+        depsgraph (bpy.types.Depsgraph): evaluated depsgraph
+
+    Returns:
+        tuple(numpy.ndarray, numpy.ndarray): minimum and maximum coordinates. None if there are no objects
+    """
+    corners = []
+    for obj in objects:
+        object_eval = obj.evaluated_get(depsgraph)
+        matrix = np.array(object_eval.matrix_world, dtype=np.float64)
+        local = np.array(object_eval.bound_box, dtype=np.float64)
+        corners.append(local @ matrix[:3, :3].T + matrix[:3, 3])
+    if not corners:
+        return None
+    corners = np.concatenate(corners)
+    return corners.min(axis=0), corners.max(axis=0)
@@ -0,0 +1,122 @@
+import os
+import json
+from ...utils.registration import get_path
+
+
+class TileDefaultsRegistry:
+    """In memory index of assets/data/tile_defaults.json.
+
+    The file is parsed once and indexed by tile type. It is only re-read if its
+    modification time changes. Enum item lists are cached as well so dynamic enum
+    callbacks, which Blender calls on every redraw, don't have to rebuild them. This also
+    keeps the item strings referenced for as long as Blender needs them.
+    """
+
+    def __init__(self, filepath=None):
+        self.filepath = filepath
+        self.mtime = None
+        self.tile_defaults = []
+        self.tiles = {}
+        self._enum_items = {}
+
+    def get_filepath(self):
+        if self.filepath is not None:
+            return self.filepath
+        return os.path.join(get_path(), "assets", "data", "tile_defaults.json")
+
+    def refresh(self):
+        """Load the file if it hasn't been loaded or has changed since it was.
+
+        Returns:
+            bool: False if the file doesn't exist
+        """
+        filepath = self.get_filepath()
+        try:
+            mtime = os.path.getmtime(filepath)
+        except OSError:
+            self.clear()
+            return False
+
+        if mtime != self.mtime:
+            with open(filepath) as json_file:
+                tile_defaults = json.load(json_file)
+            self.tile_defaults = tile_defaults
+            self.tiles = {tile['type']: tile for tile in tile_defaults}
+            self._enum_items = {}
+            self.mtime = mtime
+        return True
+
+    def clear(self):
+        self.mtime = None
+        self.tile_defaults = []
+        self.tiles = {}
+        self._enum_items = {}
+
+    def get_all(self):
+        """Return the tile defaults of every tile type.
+
+        Returns:
+            list[dict]: tile defaults. Don't modify.
+        """
+        self.refresh()
+        return self.tile_defaults
+
+    def get(self, tile_type):
+        """Return the entry of a tile type.
+
+        Args:
+            tile_type (str): tile type e.g. 'STRAIGHT_WALL'
+
+        Returns:
+            dict: tile entry containing type, bl_idname, defaults etc. None if tile_type isn't found. Don't modify.
+        """
+        self.refresh()
+        return self.tiles.get(tile_type)
+
+    def get_defaults(self, tile_type):
+        """Return the default property values of a tile type.
+
+        Args:
+            tile_type (str): tile type
+
+        Returns:
+            dict: defaults. Empty if tile_type isn't found. Don't modify.
+        """
+        tile = self.get(tile_type)
+        if tile is None:
+            return {}
+        return tile['defaults']
+
+    def get_blueprint_defaults(self, tile_type, part, blueprint):
+        """Return the default property values of a blueprint.
+
+        Args:
+            tile_type (str): tile type
+            part (str): 'base_defaults' or 'tile_defaults'
+            blueprint (str): blueprint e.g. 'OPENLOCK'
+
+        Returns:
+            dict: defaults. Empty if tile type has no defaults for the blueprint. Don't modify.
+        """
+        return self.get_defaults(tile_type).get(part, {}).get(blueprint, {})
+
+    def get_enum_items(self, tile_type, key):
+        """Return sorted enum items for a dict of a tile type's entry.
+
+        Args:
+            tile_type (str): tile type
+            key (str): 'base_blueprints', 'main_part_blueprints' or 'wall_positions'
+
+        Returns:
+            list[tuple(str, str, str)]: enum items. Empty if tile type doesn't have key.
+        """
+        self.refresh()
+        cache_key = (tile_type, key)
+        if cache_key not in self._enum_items:
+            tile = self.tiles.get(tile_type, {})
+            self._enum_items[cache_key] = sorted(
+                (identifier, name, "") for identifier, name in tile.get(key, {}).items())
+        return self._enum_items[cache_key]
+
+
+tile_defaults_registry = TileDefaultsRegistry()
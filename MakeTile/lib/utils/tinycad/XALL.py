@@ -53,9 +53,50 @@ def remove_permutations_that_share_a_vertex(bm, permutations):
     return final_permutations
 
 
+def get_overlapping_pairs(bm, edge_indices):
+    ''' Broad phase. Returns the pairs of edges whose bounding boxes overlap
+    in the same order itertools.permutations would produce them.
+
+    Edges are put into every cell of a uniform grid their bounding box touches
+    so only edges sharing a cell are compared. '''
+    # an intersection can be up to VTX_PRECISION away from either edge
+    pad = cm.CAD_prefs.VTX_PRECISION * 2
+    boxes = {}
+    for idx in edge_indices:
+        v1, v2 = (v.co for v in bm.edges[idx].verts)
+        boxes[idx] = (
+            [min(a, b) - pad for a, b in zip(v1, v2)],
+            [max(a, b) + pad for a, b in zip(v1, v2)])
+
+    if len(boxes) < 2:
+        return []
+
+    # size cells to the average edge so most edges only touch a few cells, but
+    # keep cells large enough that very long edges don't fill thousands of them
+    extents = [max(hi[i] - lo[i] for i in range(3)) for lo, hi in boxes.values()]
+    cell_size = max(sum(extents) / len(extents), max(extents) / 32)
+
+    grid = defaultdict(list)
+    for idx, (lo, hi) in boxes.items():
+        start = [int(c // cell_size) for c in lo]
+        end = [int(c // cell_size) for c in hi]
+        for cell in itertools.product(*(range(s, e + 1) for s, e in zip(start, end))):
+            grid[cell].append(idx)
+
+    pairs = set()
+    for cell_edges in grid.values():
+        for a, b in itertools.combinations(cell_edges, 2):
+            lo_a, hi_a = boxes[a]
+            lo_b, hi_b = boxes[b]
+            if all(lo_a[i] <= hi_b[i] and lo_b[i] <= hi_a[i] for i in range(3)):
+                pairs.add((a, b) if a < b else (b, a))
+
+    position = {idx: i for i, idx in reversed(list(enumerate(edge_indices)))}
+    return sorted(pairs, key=lambda pair: (position[pair[0]], position[pair[1]]))
+
+
 def get_valid_permutations(bm, edge_indices):
-    raw_permutations = itertools.permutations(edge_indices, 2)
-    permutations = [r for r in raw_permutations if r[0] < r[1]]
+    permutations = get_overlapping_pairs(bm, edge_indices)
     return remove_permutations_that_share_a_vertex(bm, permutations)
 
 
@@ -20,20 +20,107 @@ def set_origin(obj, target_coords=Vector()):
     mw.translation = target_coords
 
 
+# annotations of each class including parent classes, keyed by class
+_annotations = {}
+
+# names of properties that can be copied between two classes, keyed by (source, target) class
+_copy_plans = {}
+
+# pairs of different property types whose values can be assigned from one to the other
+COMPATIBLE_PROPERTY_TYPES = {
+    (bpy.props.IntProperty, bpy.props.FloatProperty),
+    (bpy.props.BoolProperty, bpy.props.IntProperty)}
+
+
 def get_annotations(cls):
     """Return all annotations of a class including from parent class.
 
+    The annotations are only collected from the class' MRO the first time a class is passed in.
+
     Returns:
-        dict: dict of annotations
+        dict: dict of annotations. Don't modify.
+    """
+    if cls not in _annotations:
+        all_annotations = {}
+        for c in cls.mro():
+            try:
+                all_annotations.update(**c.__annotations__)
+            except AttributeError:
+                # object, at least, has no __annotations__ attribute.
+                pass
+        _annotations[cls] = all_annotations
+    return _annotations[cls]
+
+
+def props_are_compatible(source_prop, target_prop):
+    """Return True if the value of source_prop can be assigned to target_prop.
+
+    Args:
+        source_prop (bpy.props._PropertyDeferred): property annotation
+        target_prop (bpy.props._PropertyDeferred): property annotation
+
+    Returns:
+        bool: True if compatible
+    """
+    source_type = getattr(source_prop, 'function', None)
+    target_type = getattr(target_prop, 'function', None)
+    if source_type is None or target_type is None:
+        # can't tell so let setattr decide
+        return True
+    if source_type is target_type:
+        return source_prop.keywords.get('size', 3) == target_prop.keywords.get('size', 3)
+    return (source_type, target_type) in COMPATIBLE_PROPERTY_TYPES
+
+
+def create_copy_plan(source_annotations, target_annotations):
+    """Return the names of properties in both sets of annotations with compatible types.
+
+    Args:
+        source_annotations (dict): annotations to copy from
+        target_annotations (dict): annotations to copy to
+
+    Returns:
+        tuple[str]: property names
+    """
+    return tuple(
+        key for key, prop in source_annotations.items()
+        if key in target_annotations and props_are_compatible(prop, target_annotations[key]))
+
+
+def get_copy_plan(source_cls, target_cls):
+    """Return the names of properties that can be copied from source_cls to target_cls.
+
+    Calculated once for each pair of classes.
+
+    Args:
+        source_cls (class): class with property annotations e.g. a PropertyGroup or Operator
+        target_cls (class): class with property annotations
+
+    Returns:
+        tuple[str]: property names
+    """
+    key = (source_cls, target_cls)
+    if key not in _copy_plans:
+        _copy_plans[key] = create_copy_plan(get_annotations(source_cls), get_annotations(target_cls))
+    return _copy_plans[key]
+
+
+def apply_copy_plan(plan, source_props, target_props):
+    """Set the properties named in plan on target_props to their values on source_props.
+
+    Properties whose value isn't valid on target_props, e.g. an enum item that doesn't
+    exist on the target, are skipped.
+
+    Args:
+        plan (tuple[str]): property names. See get_copy_plan
+        source_props (bpy_struct): object to copy from
+        target_props (bpy_struct): object to copy to
     """
-    all_annotations = {}
-    for c in cls.mro():
+    for key in plan:
         try:
-            all_annotations.update(**c.__annotations__)
-        except AttributeError:
-            # object, at least, has no __annotations__ attribute.
+            setattr(target_props, key, getattr(source_props, key))
+        except TypeError:
             pass
-    return all_annotations
 
 
 def mode(mode_name):
@@ -0,0 +1,126 @@
+"""Rasterise mesh triangles into UV space with NumPy."""
+
+import numpy as np
+
+# maximum number of candidate texels tested at once
+RASTER_BUDGET = 4000000
+
+
+def rasterise_uv_triangles(uvs, width, height):
+    """Find the texels whose centres lie inside each UV triangle.
+
+    Where triangles overlap in UV space each texel is only returned once.
+
+    Args:
+        uvs (numpy.ndarray): (t, 3, 2) uv coordinates of each triangle's corners
+        width (int): image width
+        height (int): image height
+
+    Returns:
+        numpy.ndarray: (m,) index of each texel in the flattened image
+        numpy.ndarray: (m,) index of the triangle containing each texel
+        numpy.ndarray: (m, 3) barycentric coordinates of each texel in its triangle
+    """
+    # texel centres are at integer coordinates
+    points = uvs * np.array((width, height), dtype=np.float32) - 0.5
+    a, b, c = points[:, 0], points[:, 1], points[:, 2]
+    denominator = (b[:, 1] - c[:, 1]) * (a[:, 0] - c[:, 0]) + (c[:, 0] - b[:, 0]) * (a[:, 1] - c[:, 1])
+
+    lower = np.clip(np.ceil(points.min(axis=1)), 0, (width - 1, height - 1)).astype(np.int64)
+    upper = np.clip(np.floor(points.max(axis=1)), -1, (width - 1, height - 1)).astype(np.int64)
+    sizes = upper - lower + 1
+    valid = np.all(sizes > 0, axis=1) & (np.abs(denominator) > 1e-12)
+    valid &= np.all(points.max(axis=1) >= 0, axis=1)
+
+    triangles = np.flatnonzero(valid)
+    areas = sizes[triangles, 0] * sizes[triangles, 1]
+    triangles = triangles[np.argsort(areas, kind='stable')]
+
+    texels, owners, weights = [], [], []
+    start = 0
+    while start < len(triangles):
+        # group triangles of a similar size so padding to the largest bounding box is cheap
+        end = start + 1
+        box = sizes[triangles[start]].copy()
+        while end < len(triangles):
+            new_box = np.maximum(box, sizes[triangles[end]])
+            if (end - start + 1) * new_box[0] * new_box[1] > RASTER_BUDGET:
+                break
+            box = new_box
+            end += 1
+
+        batch = triangles[start:end]
+        start = end
+
+        grid_x, grid_y = np.meshgrid(np.arange(box[0]), np.arange(box[1]))
+        x = lower[batch, 0, None] + grid_x.ravel()
+        y = lower[batch, 1, None] + grid_y.ravel()
+        inside_box = (x <= upper[batch, 0, None]) & (y <= upper[batch, 1, None])
+
+        ta, tb, tc = a[batch], b[batch], c[batch]
+        d = denominator[batch, None]
+        px = x - tc[:, 0, None]
+        py = y - tc[:, 1, None]
+        w0 = ((tb[:, 1, None] - tc[:, 1, None]) * px + (tc[:, 0, None] - tb[:, 0, None]) * py) / d
+        w1 = ((tc[:, 1, None] - ta[:, 1, None]) * px + (ta[:, 0, None] - tc[:, 0, None]) * py) / d
+        w2 = 1.0 - w0 - w1
+
+        epsilon = -1e-6
+        inside = inside_box & (w0 >= epsilon) & (w1 >= epsilon) & (w2 >= epsilon)
+        rows, cols = np.nonzero(inside)
+
+        texels.append(y[rows, cols] * width + x[rows, cols])
+        owners.append(batch[rows])
+        weights.append(np.stack((w0[rows, cols], w1[rows, cols], w2[rows, cols]), axis=-1))
+
+    if not texels:
+        return (
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.int64),
+            np.empty((0, 3), dtype=np.float32))
+
+    texels = np.concatenate(texels)
+    owners = np.concatenate(owners)
+    weights = np.concatenate(weights).astype(np.float32)
+
+    texels, first = np.unique(texels, return_index=True)
+    return texels, owners[first], weights[first]
+
+
+def dilate(values, mask, iterations):
+    """Extend values into empty texels by averaging their filled neighbours.
+
+    Equivalent to the margin added by Blender when baking.
+
+    Args:
+        values (numpy.ndarray): (h, w, c) image
+        mask (numpy.ndarray): (h, w) bool, True where values are filled
+        iterations (int): margin in texels
+
+    Returns:
+        numpy.ndarray: (h, w, c) dilated image
+    """
+    values = np.where(mask[..., None], values, 0.0)
+    mask = mask.copy()
+    height, width = mask.shape
+
+    for i in range(iterations):
+        if mask.all():
+            break
+        padded_values = np.pad(values, ((1, 1), (1, 1), (0, 0)))
+        padded_mask = np.pad(mask, 1).astype(np.float32)
+
+        total = np.zeros(values.shape, dtype=np.float32)
+        count = np.zeros(mask.shape, dtype=np.float32)
+        for dy in (0, 1, 2):
+            for dx in (0, 1, 2):
+                if dx == 1 and dy == 1:
+                    continue
+                total += padded_values[dy:dy + height, dx:dx + width]
+                count += padded_mask[dy:dy + height, dx:dx + width]
+
+        grow = ~mask & (count > 0)
+        values[grow] = total[grow] / count[grow][..., None]
+        mask |= grow
+
+    return values
@@ -6,6 +6,7 @@ from . selection import (
     deselect_all,
     select)
 from . utils import mode, view3d_find
+from . mesh_arrays import MeshGroupArrays
 
 
 def clear_vert_group(vert_group, obj):
@@ -13,31 +14,23 @@ def clear_vert_group(vert_group, obj):
     vert_group.remove(indexes)
 
 
-def get_verts_with_material(obj, material_name):
-    '''Returns a list of vert objects which belong to polys that have a material applied'''
-    verts = set()
+def get_verts_with_material(obj, material_name, mesh_arrays=None):
+    '''Returns a set of vert indices which belong to polys that have a material applied'''
+    if mesh_arrays is None:
+        mesh_arrays = MeshGroupArrays(obj)
     mat_index = obj.material_slots.find(material_name)
-    polys = obj.data.polygons
-
-    for poly in polys:
-        if poly.material_index == mat_index:
-            verts = set(poly.vertices) | verts
-
-    return verts
+    return set(mesh_arrays.get_verts_with_material_index(mat_index).tolist())
 
 
 def get_vert_indexes_in_vert_group(vert_group_name, obj):
     '''returns a list of vert indexes in a vert group'''
-    vg_index = obj.vertex_groups[vert_group_name].index
-    vert_indices = [v.index for v in obj.data.vertices if vg_index in [vg.group for vg in v.groups]]
-    return vert_indices
+    return MeshGroupArrays(obj).get_vert_indices(vert_group_name).tolist()
 
 
 def get_verts_in_vert_group(vert_group_name, obj):
     '''return a list of vert objects in a vert group'''
-    vg_index = obj.vertex_groups[vert_group_name].index
-    verts = [v for v in obj.data.vertices if vg_index in [vg.group for vg in v.groups]]
-    return verts
+    vertices = obj.data.vertices
+    return [vertices[i] for i in get_vert_indexes_in_vert_group(vert_group_name, obj)]
 
 
 def remove_verts_from_group(vert_group_name, obj, vert_indices):
@@ -92,14 +85,12 @@ def construct_displacement_mod_vert_group(obj, textured_vert_group_names):
     '''Constructs a vertex group from the passed in group names for use by displacement modifier.
     This ensures that only correct vertices are being displaced.'''
 
-    disp_mod_vert_group = obj.vertex_groups.new(name='disp_mod_vert_group')
-    all_vert_groups = obj.vertex_groups
+    group_names = [name for name in textured_vert_group_names if name in obj.vertex_groups]
+    indices = MeshGroupArrays(obj).get_vert_indices(group_names).tolist()
 
-    for group in all_vert_groups:
-        if group.name in textured_vert_group_names:
-            verts = get_verts_in_vert_group(group.name, obj)
-            indices = [i.index for i in verts]
-            disp_mod_vert_group.add(index=indices, weight=1, type='ADD')
+    disp_mod_vert_group = obj.vertex_groups.new(name='disp_mod_vert_group')
+    if indices:
+        disp_mod_vert_group.add(index=indices, weight=1, type='ADD')
     return disp_mod_vert_group.name
 
 
@@ -4,9 +4,7 @@ from pathlib import Path
 from .. utils.registration import get_prefs
 from ..lib.utils.utils import slugify
 from ..lib.utils.file_handling import find_and_rename
-from .. lib.utils.vertex_groups import (
-    get_verts_in_vert_group,
-    get_vert_indexes_in_vert_group)
+from .. lib.utils.mesh_arrays import MeshGroupArrays
 
 
 def load_materials(filepath):
@@ -49,43 +47,38 @@ def get_material_index(obj, material):
     return material_index
 
 
-def assign_mat_to_vert_group(vert_group, obj, material):
+def assign_mat_to_vert_group(vert_group, obj, material, mesh_arrays=None):
     """Assign the passed in material to the passed in vertex group.
 
     Args:
-        vert_group (bpy.types.VertexGroup): vertex group
+        vert_group (str): vertex group name
         obj (bpy.types.Object): Owning object
         material (bpy.types.Material): material
+        mesh_arrays (MeshGroupArrays, optional): arrays of obj to reuse when assigning
+        materials to several groups. Defaults to None.
     """
-    vert_group = get_vert_indexes_in_vert_group(vert_group, obj)
+    if mesh_arrays is None:
+        mesh_arrays = MeshGroupArrays(obj)
     material_index = get_material_index(obj, material)
-    for poly in obj.data.polygons:
-        count = 0
-        for vert in poly.vertices:
-            if vert in vert_group:
-                count += 1
-        if count == len(poly.vertices):
-            poly.material_index = material_index
+    mesh_arrays.set_face_material_index(vert_group, material_index)
 
 
-def get_vert_group_material(vert_group, obj):
+def get_vert_group_material(vert_group, obj, mesh_arrays=None):
     """Return the material assigned to the passed in vertex group.
 
     Args:
         vert_group (bpy.types.VertexGroup): vertex group
         obj (bpy.types.Object): Owning object
+        mesh_arrays (MeshGroupArrays, optional): arrays of obj to reuse. Defaults to None.
 
     Returns:
         bpy.types.Material: material
     """
-    vert_group = get_vert_indexes_in_vert_group(vert_group.name, obj)
-    for poly in obj.data.polygons:
-        count = 0
-        for vert in poly.vertices:
-            if vert in vert_group:
-                count += 1
-        if count == len(poly.vertices):
-            return obj.material_slots[poly.material_index].material
+    if mesh_arrays is None:
+        mesh_arrays = MeshGroupArrays(obj)
+    material_index = mesh_arrays.get_group_material_index(vert_group.name)
+    if material_index is not None:
+        return obj.material_slots[material_index].material
 
 
 def add_preview_mesh_subsurf(obj):
@@ -113,9 +106,10 @@ def update_preview_material_2(obj, primary_material_name):
     obj.data.materials.append(primary_material)
 
     # for some reason the bools stored in our dict have been converted to ints /\0/\
+    mesh_arrays = MeshGroupArrays(obj)
     for key, value in textured_groups.items():
         if value == 1 or value is True:
-            assign_mat_to_vert_group(key, obj, primary_material)
+            assign_mat_to_vert_group(key, obj, primary_material, mesh_arrays)
 
 
 def assign_displacement_materials(obj, vert_group='None'):
@@ -156,8 +150,9 @@ def assign_preview_materials(obj, primary_material, secondary_material, textured
     if primary_material.name not in obj.data.materials:
         obj.data.materials.append(primary_material)
 
+    mesh_arrays = MeshGroupArrays(obj)
     for group in textured_vertex_groups:
-        assign_mat_to_vert_group(group, obj, primary_material)
+        assign_mat_to_vert_group(group, obj, primary_material, mesh_arrays)
 
 
 def assign_texture_to_areas(obj, primary_material, secondary_material):
@@ -174,13 +169,14 @@ def assign_texture_to_areas(obj, primary_material, secondary_material):
     if primary_material not in material_slots:
         obj.data.materials.append(bpy.data.materials[primary_material])
 
+    mesh_arrays = MeshGroupArrays(obj)
     for group in textured_vert_groups:
         if group.value is False:
             assign_mat_to_vert_group(
-                group.name, obj, bpy.data.materials[secondary_material])
+                group.name, obj, bpy.data.materials[secondary_material], mesh_arrays)
         else:
             assign_mat_to_vert_group(
-                group.name, obj, bpy.data.materials[primary_material])
+                group.name, obj, bpy.data.materials[primary_material], mesh_arrays)
 
 # TODO Ensure this works for custom image material. I think we also need
 # to check whether image is unique otherwise it won't work
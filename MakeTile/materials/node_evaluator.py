@@ -0,0 +1,673 @@
+"""Evaluate shader node trees with NumPy.
+
+Supports the subset of Cycles shader nodes used by the MakeTile displacement materials.
+Evaluating a tree that contains any other node raises UnsupportedNodeError so the
+caller can fall back to baking with Cycles.
+"""
+
+import math
+import numpy as np
+from ..lib.utils import noise
+
+# Rec. 709 luminance coefficients used by Cycles when converting colour to float
+LUMINANCE = np.array((0.2126729, 0.7151522, 0.0721750), dtype=np.float32)
+
+SCALAR_SOCKETS = {'VALUE', 'INT', 'BOOLEAN'}
+VECTOR_SOCKETS = {'VECTOR', 'RGBA'}
+
+
+class UnsupportedNodeError(NotImplementedError):
+    """Raised when a node tree contains a node the evaluator can't evaluate."""
+
+    def __init__(self, node, detail=''):
+        message = 'Unsupported node ' + node.bl_idname + ' "' + node.name + '"'
+        if detail:
+            message += ' ' + detail
+        super().__init__(message)
+
+
+def safe_divide(a, b):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(b != 0, a / np.where(b != 0, b, 1), 0.0)
+
+
+def safe_power(a, b):
+    valid = (a >= 0) | (b == np.floor(b))
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        return np.where(valid, np.power(np.where(valid, a, 1), b), 0.0)
+
+
+def safe_modulo(a, b):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(b != 0, np.fmod(a, np.where(b != 0, b, 1)), 0.0)
+
+
+def safe_sqrt(a):
+    return np.sqrt(np.maximum(a, 0.0))
+
+
+def safe_log(a, b):
+    valid = (a > 0) & (b > 0) & (b != 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(valid, np.log(np.where(valid, a, 1)) / np.log(np.where(valid, b, 2)), 0.0)
+
+
+def wrap(value, maximum, minimum):
+    value_range = maximum - minimum
+    return np.where(
+        value_range != 0,
+        value - value_range * np.floor(safe_divide(value - minimum, value_range)),
+        minimum)
+
+
+def pingpong(a, b):
+    fraction = safe_divide(a - b, b * 2)
+    return np.where(b != 0, np.abs((fraction - np.floor(fraction)) * b * 2 - b), 0.0)
+
+
+def smooth_min(a, b, c):
+    h = safe_divide(np.maximum(c - np.abs(a - b), 0.0), c)
+    return np.where(c != 0, np.minimum(a, b) - h * h * h * c * (1.0 / 6.0), np.minimum(a, b))
+
+
+def smoothstep(edge0, edge1, x):
+    t = np.clip(safe_divide(x - edge0, edge1 - edge0), 0.0, 1.0)
+    return np.where(x < edge0, 0.0, np.where(x >= edge1, 1.0, (3.0 - 2.0 * t) * t * t))
+
+
+MATH_OPERATIONS = {
+    'ADD': lambda a, b, c: a + b,
+    'SUBTRACT': lambda a, b, c: a - b,
+    'MULTIPLY': lambda a, b, c: a * b,
+    'DIVIDE': lambda a, b, c: safe_divide(a, b),
+    'MULTIPLY_ADD': lambda a, b, c: a * b + c,
+    'POWER': lambda a, b, c: safe_power(a, b),
+    'LOGARITHM': lambda a, b, c: safe_log(a, b),
+    'SQRT': lambda a, b, c: safe_sqrt(a),
+    'INVERSE_SQRT': lambda a, b, c: safe_divide(1.0, safe_sqrt(a)),
+    'ABSOLUTE': lambda a, b, c: np.abs(a),
+    'EXPONENT': lambda a, b, c: np.exp(a),
+    'MINIMUM': lambda a, b, c: np.minimum(a, b),
+    'MAXIMUM': lambda a, b, c: np.maximum(a, b),
+    'LESS_THAN': lambda a, b, c: (a < b).astype(np.float32),
+    'GREATER_THAN': lambda a, b, c: (a > b).astype(np.float32),
+    'SIGN': lambda a, b, c: np.sign(a),
+    'COMPARE': lambda a, b, c: (np.abs(a - b) <= np.maximum(c, 1e-5)).astype(np.float32),
+    'SMOOTH_MIN': lambda a, b, c: smooth_min(a, b, c),
+    'SMOOTH_MAX': lambda a, b, c: -smooth_min(-a, -b, c),
+    'ROUND': lambda a, b, c: np.floor(a + 0.5),
+    'FLOOR': lambda a, b, c: np.floor(a),
+    'CEIL': lambda a, b, c: np.ceil(a),
+    'TRUNC': lambda a, b, c: np.trunc(a),
+    'FRACT': lambda a, b, c: a - np.floor(a),
+    'MODULO': lambda a, b, c: safe_modulo(a, b),
+    'WRAP': lambda a, b, c: wrap(a, b, c),
+    'SNAP': lambda a, b, c: np.floor(safe_divide(a, b)) * b,
+    'PINGPONG': lambda a, b, c: pingpong(a, b),
+    'SINE': lambda a, b, c: np.sin(a),
+    'COSINE': lambda a, b, c: np.cos(a),
+    'TANGENT': lambda a, b, c: np.tan(a),
+    'ARCSINE': lambda a, b, c: np.arcsin(np.clip(a, -1.0, 1.0)),
+    'ARCCOSINE': lambda a, b, c: np.arccos(np.clip(a, -1.0, 1.0)),
+    'ARCTANGENT': lambda a, b, c: np.arctan(a),
+    'ARCTAN2': lambda a, b, c: np.arctan2(a, b),
+    'SINH': lambda a, b, c: np.sinh(a),
+    'COSH': lambda a, b, c: np.cosh(a),
+    'TANH': lambda a, b, c: np.tanh(a),
+    'RADIANS': lambda a, b, c: np.radians(a),
+    'DEGREES': lambda a, b, c: np.degrees(a)}
+
+
+def dot(a, b):
+    return np.sum(a * b, axis=-1)
+
+
+def normalize(a):
+    length = np.linalg.norm(a, axis=-1, keepdims=True)
+    return safe_divide(a, length)
+
+
+# vector math operations return a vector or a value
+VECTOR_MATH_OPERATIONS = {
+    'ADD': lambda a, b, c, s: a + b,
+    'SUBTRACT': lambda a, b, c, s: a - b,
+    'MULTIPLY': lambda a, b, c, s: a * b,
+    'DIVIDE': lambda a, b, c, s: safe_divide(a, b),
+    'MULTIPLY_ADD': lambda a, b, c, s: a * b + c,
+    'CROSS_PRODUCT': lambda a, b, c, s: np.cross(a, b),
+    'SCALE': lambda a, b, c, s: a * s[..., None],
+    'NORMALIZE': lambda a, b, c, s: normalize(a),
+    'ABSOLUTE': lambda a, b, c, s: np.abs(a),
+    'MINIMUM': lambda a, b, c, s: np.minimum(a, b),
+    'MAXIMUM': lambda a, b, c, s: np.maximum(a, b),
+    'FLOOR': lambda a, b, c, s: np.floor(a),
+    'CEIL': lambda a, b, c, s: np.ceil(a),
+    'FRACTION': lambda a, b, c, s: a - np.floor(a),
+    'MODULO': lambda a, b, c, s: safe_modulo(a, b),
+    'WRAP': lambda a, b, c, s: wrap(a, b, c),
+    'SNAP': lambda a, b, c, s: np.floor(safe_divide(a, b)) * b,
+    'SINE': lambda a, b, c, s: np.sin(a),
+    'COSINE': lambda a, b, c, s: np.cos(a),
+    'TANGENT': lambda a, b, c, s: np.tan(a),
+    'DOT_PRODUCT': lambda a, b, c, s: dot(a, b),
+    'DISTANCE': lambda a, b, c, s: np.linalg.norm(a - b, axis=-1),
+    'LENGTH': lambda a, b, c, s: np.linalg.norm(a, axis=-1)}
+
+
+def blend_overlay(fac, a, b):
+    return np.where(
+        a < 0.5,
+        a * ((1.0 - fac) + 2.0 * fac * b),
+        1.0 - ((1.0 - fac) + 2.0 * fac * (1.0 - b)) * (1.0 - a))
+
+
+MIX_OPERATIONS = {
+    'MIX': lambda t, a, b: (1.0 - t) * a + t * b,
+    'ADD': lambda t, a, b: a + t * b,
+    'MULTIPLY': lambda t, a, b: a * ((1.0 - t) + t * b),
+    'SUBTRACT': lambda t, a, b: a - t * b,
+    'SCREEN': lambda t, a, b: 1.0 - ((1.0 - t) + t * (1.0 - b)) * (1.0 - a),
+    'DIVIDE': lambda t, a, b: (1.0 - t) * a + t * safe_divide(a, b),
+    'DIFFERENCE': lambda t, a, b: (1.0 - t) * a + t * np.abs(a - b),
+    'DARKEN': lambda t, a, b: (1.0 - t) * a + t * np.minimum(a, b),
+    'LIGHTEN': lambda t, a, b: (1.0 - t) * a + t * np.maximum(a, b),
+    'OVERLAY': blend_overlay,
+    'LINEAR_LIGHT': lambda t, a, b: a + t * (2.0 * b - 1.0)}
+
+
+def euler_to_matrix(euler):
+    """Rotation matrix of an XYZ euler rotation."""
+    x, y, z = euler
+    cx, cy, cz = math.cos(x), math.cos(y), math.cos(z)
+    sx, sy, sz = math.sin(x), math.sin(y), math.sin(z)
+    return np.array((
+        (cy * cz, sy * sx * cz - cx * sz, sy * cx * cz + sx * sz),
+        (cy * sz, sy * sx * sz + cx * cz, sy * cx * sz - sx * cz),
+        (-sy, cy * sx, cy * cx)), dtype=np.float32)
+
+
+def srgb_to_linear(color):
+    return np.where(
+        color < 0.04045,
+        np.maximum(color, 0.0) / 12.92,
+        np.power((np.maximum(color, 0.0) + 0.055) / 1.055, 2.4))
+
+
+def brick_noise(n):
+    n = (n + np.uint32(1013)) & np.uint32(0x7fffffff)
+    n = (n >> np.uint32(13)) ^ n
+    nn = (n * (n * n * np.uint32(60493) + np.uint32(19990303)) + np.uint32(1376312589)) & np.uint32(0x7fffffff)
+    return 0.5 * nn.astype(np.float32) / 1073741824.0
+
+
+class NodeEvaluator:
+    """Evaluates shader node trees at arrays of surface points.
+
+    Args:
+        geometry (dict): surface points to evaluate at containing
+        position (numpy.ndarray): (n, 3) object space positions
+        normal (numpy.ndarray): (n, 3) object space normals
+        uv (numpy.ndarray): (n, 2) uv coordinates
+        generated (numpy.ndarray): (n, 3) generated texture coordinates
+        matrix_world (numpy.ndarray): (4, 4) world matrix of object
+        images (dict, optional): cache of image pixels shared between evaluators. Defaults to None.
+    """
+
+    def __init__(self, geometry, images=None):
+        self.geometry = geometry
+        self.size = len(geometry['position'])
+        self.images = {} if images is None else images
+        self.outputs = {}
+
+    def evaluate_emission(self, node):
+        """Return the emitted colour of an Emission node.
+
+        Args:
+            node (bpy.types.ShaderNodeEmission): node
+
+        Returns:
+            numpy.ndarray: (n, 3) colour
+        """
+        color = self.vector(node.inputs['Color'], ())
+        strength = self.value(node.inputs['Strength'], ())
+        return color * strength[..., None]
+
+    def value(self, socket, stack):
+        return self.convert(self.evaluate_input(socket, stack), 'VALUE')
+
+    def vector(self, socket, stack):
+        return self.convert(self.evaluate_input(socket, stack), 'VECTOR')
+
+    def color(self, socket, stack):
+        return self.convert(self.evaluate_input(socket, stack), 'RGBA')
+
+    def uniform(self, socket, stack):
+        """Return the value of a float input which must be the same at every point."""
+        value = self.value(socket, stack)
+        if value.size and np.any(value != value.flat[0]):
+            raise UnsupportedNodeError(socket.node, 'with varying ' + socket.name)
+        return float(value.flat[0]) if value.size else 0.0
+
+    def texture_vector(self, node, stack, default='generated'):
+        """Return the vector input of a texture node, defaulting to generated coordinates."""
+        socket = node.inputs['Vector']
+        if socket.is_linked:
+            return self.vector(socket, stack)
+        return self.geometry[default]
+
+    def full(self, value):
+        """Broadcast a constant socket value to every point."""
+        if isinstance(value, (float, int, bool)):
+            return np.full(self.size, value, dtype=np.float32)
+        return np.broadcast_to(np.array(value[:3], dtype=np.float32), (self.size, 3))
+
+    def convert(self, value, socket_type):
+        """Convert a value to the type of a socket.
+
+        Floats become greys, colours become luminance and vectors become their average.
+        """
+        if socket_type in SCALAR_SOCKETS:
+            if value.ndim == 1:
+                return value
+            return np.mean(value, axis=-1)
+        if value.ndim == 1:
+            return np.repeat(value[..., None], 3, axis=-1)
+        return value
+
+    def evaluate_input(self, socket, stack):
+        """Evaluate an input socket.
+
+        Args:
+            socket (bpy.types.NodeSocket): input socket
+            stack (tuple(bpy.types.ShaderNodeGroup)): group nodes we are inside
+
+        Returns:
+            numpy.ndarray: (n,) for float sockets or (n, 3) for vector and colour sockets
+        """
+        links = [link for link in socket.links if not link.is_muted]
+        if not links:
+            if socket.type in SCALAR_SOCKETS | VECTOR_SOCKETS:
+                return self.full(socket.default_value)
+            raise UnsupportedNodeError(socket.node, 'with unlinked ' + socket.type + ' input')
+
+        from_socket = links[0].from_socket
+        value = self.evaluate_output(from_socket, stack)
+        if from_socket.type == 'RGBA' and socket.type in SCALAR_SOCKETS:
+            return value @ LUMINANCE
+        return self.convert(value, socket.type)
+
+    def evaluate_output(self, socket, stack):
+        """Evaluate an output socket. Nodes are evaluated once per evaluator."""
+        node = socket.node
+        key = tuple(group.as_pointer() for group in stack) + (node.as_pointer(),)
+        if key not in self.outputs:
+            self.outputs[key] = self.evaluate_node(node, stack)
+        outputs = self.outputs[key]
+
+        if socket.identifier in outputs:
+            return outputs[socket.identifier]
+        if socket.name in outputs:
+            return outputs[socket.name]
+        raise UnsupportedNodeError(node, 'output ' + socket.name)
+
+    def evaluate_node(self, node, stack):
+        if node.mute:
+            outputs = {}
+            for link in node.internal_links:
+                outputs[link.to_socket.identifier] = self.evaluate_input(link.from_socket, stack)
+            for output in node.outputs:
+                if output.identifier not in outputs:
+                    outputs[output.identifier] = self.full(0.0)
+            return outputs
+
+        handler = NODE_HANDLERS.get(node.bl_idname)
+        if handler is None:
+            raise UnsupportedNodeError(node)
+        return handler(self, node, stack)
+
+    def group(self, node, stack):
+        tree = node.node_tree
+        if tree is None:
+            raise UnsupportedNodeError(node, 'without node tree')
+        outputs = [n for n in tree.nodes if n.bl_idname == 'NodeGroupOutput']
+        active = [n for n in outputs if n.is_active_output] or outputs
+        if not active:
+            return {}
+        return {
+            socket.identifier: self.evaluate_input(socket, stack + (node,))
+            for socket in active[0].inputs if socket.type != 'CUSTOM'}
+
+    def group_input(self, node, stack):
+        if not stack:
+            raise UnsupportedNodeError(node, 'outside of group')
+        group_node = stack[-1]
+        return {
+            socket.identifier: self.evaluate_input(socket, stack[:-1])
+            for socket in group_node.inputs}
+
+    def reroute(self, node, stack):
+        return {'Output': self.evaluate_input(node.inputs[0], stack)}
+
+    def value_node(self, node, stack):
+        return {'Value': self.full(node.outputs[0].default_value)}
+
+    def rgb_node(self, node, stack):
+        return {'Color': self.full(node.outputs[0].default_value)}
+
+    def texture_coordinate(self, node, stack):
+        geometry = self.geometry
+        position = geometry['position']
+        if node.object is not None:
+            matrix = np.array(node.object.matrix_world.inverted(), dtype=np.float32) @ geometry['matrix_world']
+            position = position @ matrix[:3, :3].T + matrix[:3, 3]
+        uv = geometry['uv']
+        return {
+            'Generated': geometry['generated'],
+            'Normal': geometry['normal'],
+            'UV': np.concatenate((uv, np.zeros((len(uv), 1), dtype=np.float32)), axis=-1),
+            'Object': position}
+
+    def geometry_node(self, node, stack):
+        matrix = self.geometry['matrix_world']
+        normal = normalize(self.geometry['normal'] @ np.linalg.inv(matrix[:3, :3]))
+        return {
+            'Position': self.geometry['position'] @ matrix[:3, :3].T + matrix[:3, 3],
+            'Normal': normal,
+            'True Normal': normal}
+
+    def mapping(self, node, stack):
+        vector = self.vector(node.inputs['Vector'], stack)
+        if node.inputs['Rotation'].is_linked:
+            raise UnsupportedNodeError(node, 'with linked rotation')
+        rotation = euler_to_matrix(node.inputs['Rotation'].default_value)
+        scale = self.vector(node.inputs['Scale'], stack)
+
+        if node.vector_type == 'POINT':
+            result = (vector * scale) @ rotation.T + self.vector(node.inputs['Location'], stack)
+        elif node.vector_type == 'TEXTURE':
+            location = self.vector(node.inputs['Location'], stack)
+            result = safe_divide((vector - location) @ rotation, scale)
+        elif node.vector_type == 'VECTOR':
+            result = (vector * scale) @ rotation.T
+        else:
+            result = normalize(safe_divide(vector, scale) @ rotation.T)
+        return {'Vector': result}
+
+    def separate(self, node, stack):
+        vector = self.evaluate_input(node.inputs[0], stack)
+        vector = self.convert(vector, 'VECTOR')
+        names = [socket.identifier for socket in node.outputs]
+        return {name: vector[..., i] for i, name in enumerate(names[:3])}
+
+    def combine(self, node, stack):
+        vector = np.stack([self.value(socket, stack) for socket in node.inputs[:3]], axis=-1)
+        return {node.outputs[0].identifier: vector}
+
+    def math(self, node, stack):
+        operation = MATH_OPERATIONS.get(node.operation)
+        if operation is None:
+            raise UnsupportedNodeError(node, node.operation)
+        a, b, c = (self.value(socket, stack) for socket in node.inputs[:3])
+        with np.errstate(all='ignore'):
+            result = operation(a, b, c).astype(np.float32)
+        if node.use_clamp:
+            result = np.clip(result, 0.0, 1.0)
+        return {'Value': result}
+
+    def vector_math(self, node, stack):
+        operation = VECTOR_MATH_OPERATIONS.get(node.operation)
+        if operation is None:
+            raise UnsupportedNodeError(node, node.operation)
+        a, b, c = (self.vector(socket, stack) for socket in node.inputs[:3])
+        scale = self.value(node.inputs[3], stack)
+        with np.errstate(all='ignore'):
+            result = operation(a, b, c, scale).astype(np.float32)
+        if result.ndim == 1:
+            return {'Value': result, 'Vector': self.convert(result, 'VECTOR')}
+        return {'Value': self.full(0.0), 'Vector': result}
+
+    def clamp(self, node, stack):
+        value, minimum, maximum = (self.value(node.inputs[name], stack) for name in ('Value', 'Min', 'Max'))
+        if node.clamp_type == 'RANGE':
+            minimum, maximum = np.minimum(minimum, maximum), np.maximum(minimum, maximum)
+        return {'Result': np.minimum(np.maximum(value, minimum), maximum)}
+
+    def map_range(self, node, stack):
+        if getattr(node, 'data_type', 'FLOAT') != 'FLOAT':
+            raise UnsupportedNodeError(node, node.data_type)
+        value, from_min, from_max, to_min, to_max = (
+            self.value(node.inputs[name], stack)
+            for name in ('Value', 'From Min', 'From Max', 'To Min', 'To Max'))
+        factor = safe_divide(value - from_min, from_max - from_min)
+
+        if node.interpolation_type == 'STEPPED':
+            steps = self.value(node.inputs['Steps'], stack)
+            factor = np.where(steps > 0, np.floor(factor * (steps + 1.0)) / np.where(steps > 0, steps, 1), 0.0)
+        elif node.interpolation_type == 'SMOOTHSTEP':
+            factor = np.clip(factor, 0.0, 1.0)
+            factor = (3.0 - 2.0 * factor) * factor * factor
+        elif node.interpolation_type == 'SMOOTHERSTEP':
+            factor = np.clip(factor, 0.0, 1.0)
+            factor = factor * factor * factor * (factor * (factor * 6.0 - 15.0) + 10.0)
+
+        result = to_min + factor * (to_max - to_min)
+        if node.clamp and node.interpolation_type in ('LINEAR', 'STEPPED'):
+            result = np.clip(result, np.minimum(to_min, to_max), np.maximum(to_min, to_max))
+        return {'Result': result.astype(np.float32)}
+
+    def color_ramp(self, node, stack):
+        # sample the ramp into a lookup table in the same way as Cycles
+        ramp = node.color_ramp
+        table = np.array([ramp.evaluate(i / 255) for i in range(256)], dtype=np.float32)
+        factor = np.clip(self.value(node.inputs['Fac'], stack), 0.0, 1.0) * 255
+        if ramp.interpolation == 'CONSTANT':
+            # Cycles doesn't interpolate between table entries for constant ramps
+            result = table[factor.astype(np.int32)]
+            return {'Color': result[..., :3], 'Alpha': result[..., 3]}
+        index = np.minimum(factor.astype(np.int32), 254)
+        t = (factor - index)[..., None]
+        result = (1.0 - t) * table[index] + t * table[index + 1]
+        return {'Color': result[..., :3], 'Alpha': result[..., 3]}
+
+    def mix_rgb(self, node, stack):
+        operation = MIX_OPERATIONS.get(node.blend_type)
+        if operation is None:
+            raise UnsupportedNodeError(node, node.blend_type)
+        t = np.clip(self.value(node.inputs['Fac'], stack), 0.0, 1.0)[..., None]
+        result = operation(t, self.color(node.inputs['Color1'], stack), self.color(node.inputs['Color2'], stack))
+        if node.use_clamp:
+            result = np.clip(result, 0.0, 1.0)
+        return {'Color': result.astype(np.float32)}
+
+    def rgb_to_bw(self, node, stack):
+        return {'Val': self.color(node.inputs['Color'], stack) @ LUMINANCE}
+
+    def invert(self, node, stack):
+        factor = self.value(node.inputs['Fac'], stack)[..., None]
+        color = self.color(node.inputs['Color'], stack)
+        return {'Color': (1.0 - factor) * color + factor * (1.0 - color)}
+
+    def gamma(self, node, stack):
+        color = self.color(node.inputs['Color'], stack)
+        gamma = self.value(node.inputs['Gamma'], stack)[..., None]
+        return {'Color': np.where(color > 0, np.power(np.maximum(color, 0.0), gamma), color)}
+
+    def noise_texture(self, node, stack):
+        if node.noise_dimensions != '3D':
+            raise UnsupportedNodeError(node, node.noise_dimensions)
+        points = self.texture_vector(node, stack) * self.value(node.inputs['Scale'], stack)[..., None]
+        value, color = noise.noise_texture(
+            points,
+            self.uniform(node.inputs['Detail'], stack),
+            self.uniform(node.inputs['Roughness'], stack),
+            self.uniform(node.inputs['Distortion'], stack),
+            color=node.outputs['Color'].is_linked)
+        return {'Fac': value, 'Color': color if color is not None else self.full(0.0)}
+
+    def white_noise_texture(self, node, stack):
+        if node.noise_dimensions != '3D':
+            raise UnsupportedNodeError(node, node.noise_dimensions)
+        value, color = noise.white_noise(self.texture_vector(node, stack))
+        return {'Value': value, 'Color': color}
+
+    def voronoi_texture(self, node, stack):
+        if node.voronoi_dimensions != '3D':
+            raise UnsupportedNodeError(node, node.voronoi_dimensions)
+        if node.feature not in ('F1', 'F2'):
+            raise UnsupportedNodeError(node, node.feature)
+        scale = self.value(node.inputs['Scale'], stack)[..., None]
+        points = self.texture_vector(node, stack) * scale
+        distance, color, position = noise.voronoi(
+            points,
+            node.feature,
+            node.distance,
+            self.uniform(node.inputs['Exponent'], stack),
+            self.uniform(node.inputs['Randomness'], stack))
+        return {'Distance': distance, 'Color': color, 'Position': safe_divide(position, scale)}
+
+    def gradient_texture(self, node, stack):
+        vector = self.texture_vector(node, stack)
+        x, y, z = vector[..., 0], vector[..., 1], vector[..., 2]
+        gradient_type = node.gradient_type
+        if gradient_type == 'LINEAR':
+            value = x
+        elif gradient_type == 'QUADRATIC':
+            value = np.maximum(x, 0.0) ** 2
+        elif gradient_type == 'EASING':
+            r = np.clip(x, 0.0, 1.0)
+            value = (3.0 - 2.0 * r) * r * r
+        elif gradient_type == 'DIAGONAL':
+            value = (x + y) * 0.5
+        elif gradient_type == 'RADIAL':
+            value = np.arctan2(y, x) / (2.0 * math.pi) + 0.5
+        else:
+            r = np.maximum(0.999999 - np.sqrt(x * x + y * y + z * z), 0.0)
+            value = r * r if gradient_type == 'QUADRATIC_SPHERE' else r
+        value = np.clip(value, 0.0, 1.0).astype(np.float32)
+        return {'Fac': value, 'Color': self.convert(value, 'RGBA')}
+
+    def brick_texture(self, node, stack):
+        points = self.texture_vector(node, stack) * self.value(node.inputs['Scale'], stack)[..., None]
+        mortar_size = self.value(node.inputs['Mortar Size'], stack)
+        mortar_smooth = self.value(node.inputs['Mortar Smooth'], stack)
+        bias = self.value(node.inputs['Bias'], stack)
+        brick_width = self.value(node.inputs['Brick Width'], stack)
+        row_height = self.value(node.inputs['Row Height'], stack)
+
+        x, y = points[..., 0], points[..., 1]
+        row = np.floor(safe_divide(y, row_height)).astype(np.int64)
+        offset = 0.0
+        if node.offset_frequency and node.squash_frequency:
+            brick_width = np.where(row % node.squash_frequency != 0, brick_width, brick_width * node.squash)
+            offset = np.where(row % node.offset_frequency != 0, 0.0, brick_width * node.offset)
+
+        brick = np.floor(safe_divide(x + offset, brick_width)).astype(np.int64)
+        x = (x + offset) - brick_width * brick
+        y = y - row_height * row
+
+        seed = ((row << 16) + (brick & 0xFFFF)).astype(np.uint32)
+        tint = np.clip(brick_noise(seed) + bias, 0.0, 1.0)
+        min_dist = np.minimum(np.minimum(x, y), np.minimum(brick_width - x, row_height - y))
+        smooth_dist = 1.0 - safe_divide(min_dist, mortar_size)
+        mortar = np.where(
+            min_dist >= mortar_size,
+            0.0,
+            np.where(mortar_smooth == 0.0, 1.0, smoothstep(0.0, mortar_smooth, smooth_dist)))
+
+        color1 = self.color(node.inputs['Color1'], stack)
+        color2 = self.color(node.inputs['Color2'], stack)
+        mortar_color = self.color(node.inputs['Mortar'], stack)
+        tint = tint[..., None]
+        fac = mortar[..., None]
+        color = (1.0 - tint) * color1 + tint * color2
+        color = np.where(fac != 1.0, color, color1)
+        return {
+            'Color': ((1.0 - fac) * color + fac * mortar_color).astype(np.float32),
+            'Fac': mortar.astype(np.float32)}
+
+    def image_texture(self, node, stack):
+        image = node.image
+        if image is None:
+            color = np.broadcast_to(np.array((1.0, 0.0, 1.0), dtype=np.float32), (self.size, 3))
+            return {'Color': color, 'Alpha': self.full(1.0)}
+        if node.projection != 'FLAT':
+            raise UnsupportedNodeError(node, node.projection)
+
+        pixels = self.image_pixels(image)
+        height, width = pixels.shape[:2]
+        vector = self.texture_vector(node, stack, default='uv')
+        x = vector[..., 0] * width
+        y = vector[..., 1] * height
+
+        if node.interpolation == 'Closest':
+            color = self.image_lookup(pixels, np.floor(x), np.floor(y), node.extension)
+        else:
+            x = x - 0.5
+            y = y - 0.5
+            x0 = np.floor(x)
+            y0 = np.floor(y)
+            tx = (x - x0)[..., None]
+            ty = (y - y0)[..., None]
+            extension = node.extension
+            color = (
+                (1.0 - ty) * ((1.0 - tx) * self.image_lookup(pixels, x0, y0, extension)
+                              + tx * self.image_lookup(pixels, x0 + 1, y0, extension))
+                + ty * ((1.0 - tx) * self.image_lookup(pixels, x0, y0 + 1, extension)
+                        + tx * self.image_lookup(pixels, x0 + 1, y0 + 1, extension)))
+
+        return {'Color': color[..., :3], 'Alpha': color[..., 3]}
+
+    def image_pixels(self, image):
+        key = image.as_pointer()
+        if key not in self.images:
+            width, height = image.size
+            pixels = np.empty(width * height * 4, dtype=np.float32)
+            image.pixels.foreach_get(pixels)
+            pixels = pixels.reshape(height, width, 4)
+            if not image.is_float and image.colorspace_settings.name == 'sRGB':
+                pixels[..., :3] = srgb_to_linear(pixels[..., :3])
+            self.images[key] = pixels
+        return self.images[key]
+
+    @staticmethod
+    def image_lookup(pixels, x, y, extension):
+        height, width = pixels.shape[:2]
+        x = x.astype(np.int64)
+        y = y.astype(np.int64)
+        if extension == 'REPEAT':
+            return pixels[y % height, x % width]
+        inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        color = pixels[np.clip(y, 0, height - 1), np.clip(x, 0, width - 1)]
+        if extension == 'CLIP':
+            color = np.where(inside[..., None], color, 0.0)
+        return color
+
+
+NODE_HANDLERS = {
+    'ShaderNodeGroup': NodeEvaluator.group,
+    'NodeGroupInput': NodeEvaluator.group_input,
+    'NodeReroute': NodeEvaluator.reroute,
+    'ShaderNodeValue': NodeEvaluator.value_node,
+    'ShaderNodeRGB': NodeEvaluator.rgb_node,
+    'ShaderNodeTexCoord': NodeEvaluator.texture_coordinate,
+    'ShaderNodeNewGeometry': NodeEvaluator.geometry_node,
+    'ShaderNodeMapping': NodeEvaluator.mapping,
+    'ShaderNodeSeparateXYZ': NodeEvaluator.separate,
+    'ShaderNodeSeparateRGB': NodeEvaluator.separate,
+    'ShaderNodeCombineXYZ': NodeEvaluator.combine,
+    'ShaderNodeCombineRGB': NodeEvaluator.combine,
+    'ShaderNodeMath': NodeEvaluator.math,
+    'ShaderNodeVectorMath': NodeEvaluator.vector_math,
+    'ShaderNodeClamp': NodeEvaluator.clamp,
+    'ShaderNodeMapRange': NodeEvaluator.map_range,
+    'ShaderNodeValToRGB': NodeEvaluator.color_ramp,
+    'ShaderNodeMixRGB': NodeEvaluator.mix_rgb,
+    'ShaderNodeRGBToBW': NodeEvaluator.rgb_to_bw,
+    'ShaderNodeInvert': NodeEvaluator.invert,
+    'ShaderNodeGamma': NodeEvaluator.gamma,
+    'ShaderNodeTexNoise': NodeEvaluator.noise_texture,
+    'ShaderNodeTexWhiteNoise': NodeEvaluator.white_noise_texture,
+    'ShaderNodeTexVoronoi': NodeEvaluator.voronoi_texture,
+    'ShaderNodeTexGradient': NodeEvaluator.gradient_texture,
+    'ShaderNodeTexBrick': NodeEvaluator.brick_texture,
+    'ShaderNodeTexImage': NodeEvaluator.image_texture}
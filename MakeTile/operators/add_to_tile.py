@@ -1,6 +1,8 @@
 import bpy
 from bpy.props import BoolProperty, EnumProperty
-from .. lib.utils.collections import get_objects_owning_collections
+from .. lib.utils.collections import (
+    get_objects_owning_collections,
+    add_object_to_collection)
 from ..tile_creation.create_tile import (
     set_bool_props)
 
@@ -87,7 +89,7 @@ class MT_OT_Add_Collection_To_Tile(bpy.types.Operator):
         # unreliable and/or slow currently. Instead we deal with boolean unions by voxelisation on export
         for obj in operands:
             if obj.name not in tile_collection.objects:
-                tile_collection.objects.link(obj)
+                add_object_to_collection(obj, tile_collection.name)
                 # we now parent any 'BASE' operands to tile collection 'BASE' so our architectural
                 # element will move with the tile
                 if obj.mt_object_props.geometry_type == 'BASE':
@@ -166,7 +168,7 @@ class MT_OT_Add_Object_To_Tile(bpy.types.Operator):
                     coll.objects.unlink(obj)
 
                 # add to new tile collection
-                tile_collection.objects.link(obj)
+                add_object_to_collection(obj, tile_collection.name)
 
         # apply modifiers if necessary
         if self.apply_modifiers is True:
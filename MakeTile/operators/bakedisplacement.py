@@ -1,4 +1,8 @@
 '''contains operator class for baking displacement maps to tiles'''
+import os
+import tempfile
+from math import ceil, sqrt
+import numpy as np
 import bpy
 from .. materials.materials import (
     assign_mat_to_vert_group,
@@ -7,8 +11,26 @@ from .. materials.materials import (
 from .. lib.utils.vertex_groups import (
     get_verts_with_material,
     clear_vert_group)
+from .. lib.utils.mesh_arrays import MeshGroupArrays
 from .. utils.registration import get_prefs
 from ..lib.utils.selection import deselect_all, select, activate
+from ..lib.utils.uv_raster import rasterise_uv_triangles, dilate
+from ..materials.node_evaluator import NodeEvaluator, UnsupportedNodeError
+from ..lib.utils.bake_cache import bake_cache, displacement_bake_key
+from ..lib.utils.height_map import create_height_map, write_png16
+from ..lib.utils.displaced_mesh import write_displaced_mesh
+
+# margin in pixels added around UV islands when baking
+BAKE_MARGIN = 10
+
+# number of texels evaluated at once by bake_displacement_numpy
+EVALUATION_CHUNK_SIZE = 1000000
+
+# maximum width and height of the images bake_displacement_atlas bakes to
+ATLAS_MAX_SIZE = 8192
+
+# width and height of the tiles bake_displacement_numpy_tiled evaluates at once
+BAKE_TILE_SIZE = 1024
 
 class MT_OT_Assign_Material_To_Vert_Group(bpy.types.Operator):
     """Assigns the active material to the selected vertex group"""
@@ -39,13 +61,14 @@ class MT_OT_Assign_Material_To_Vert_Group(bpy.types.Operator):
             vert_groups = obj.vertex_groups
             if vert_group_name in vert_groups:
                 # obj_props = obj.mt_object_props
+                mesh_arrays = MeshGroupArrays(obj)
                 assign_mat_to_vert_group(
-                    vert_group_name, obj, primary_material)
+                    vert_group_name, obj, primary_material, mesh_arrays)
                 textured_verts = set()
 
                 for key, value in obj.material_slots.items():
                     if key != secondary_material.name:
-                        verts = get_verts_with_material(obj, key)
+                        verts = get_verts_with_material(obj, key, mesh_arrays)
                         textured_verts = verts | textured_verts
 
                 if 'disp_mod_vert_group' in obj.vertex_groups:
@@ -88,13 +111,14 @@ class MT_OT_Remove_Material_From_Vert_Group(bpy.types.Operator):
             vert_groups = obj.vertex_groups
             if vert_group_name in vert_groups:
                 # obj_props = obj.mt_object_props
+                mesh_arrays = MeshGroupArrays(obj)
                 assign_mat_to_vert_group(
-                    vert_group_name, obj, secondary_material)
+                    vert_group_name, obj, secondary_material, mesh_arrays)
                 textured_verts = set()
 
                 for key, value in obj.material_slots.items():
                     if key != secondary_material.name:
-                        verts = get_verts_with_material(obj, key)
+                        verts = get_verts_with_material(obj, key, mesh_arrays)
                         textured_verts = verts | textured_verts
 
                 if 'disp_mod_vert_group' in obj.vertex_groups:
@@ -128,24 +152,29 @@ class MT_OT_Make_3D(bpy.types.Operator):
         selected_objects = context.selected_objects
         orig_render_settings = set_cycles_to_bake_mode()
 
-        for obj in selected_objects:
-            obj_props = obj.mt_object_props
+        objects = [obj for obj in selected_objects
+                   if obj.mt_object_props.is_displacement and not obj.mt_object_props.is_displaced]
+        disp_images = bake_displacement_maps(objects, context.scene.mt_scene_props.bake_atlas)
 
-            # if obj_props.geometry_type == 'PREVIEW':
-            if obj_props.is_displacement and not obj_props.is_displaced:
-                # tile = bpy.data.collections[obj_props.tile_name]
-                disp_strength = obj_props.displacement_strength
-                # disp_strength = context.scene.mt_scene_props.displacement_strength
-
-                disp_image = bake_displacement_map(obj)
-
-                disp_texture = obj_props.disp_texture
-                disp_texture.image = disp_image
-                disp_mod = obj.modifiers[obj_props.disp_mod_name]
-                disp_mod.texture = disp_texture
-                disp_mod.strength = disp_strength
-                subsurf_mod = obj.modifiers[obj_props.subsurf_mod_name]
-                #subsurf_mod.levels = bpy.context.scene.mt_scene_props.subdivisions
+        for obj in objects:
+            obj_props = obj.mt_object_props
+            # tile = bpy.data.collections[obj_props.tile_name]
+            disp_strength = obj_props.displacement_strength
+            # disp_strength = context.scene.mt_scene_props.displacement_strength
+
+            disp_image = disp_images[obj]
+
+            disp_texture = obj_props.disp_texture
+            disp_texture.image = disp_image
+            disp_mod = obj.modifiers[obj_props.disp_mod_name]
+            disp_mod.texture = disp_texture
+            disp_mod.strength = disp_strength
+            subsurf_mod = obj.modifiers[obj_props.subsurf_mod_name]
+            #subsurf_mod.levels = bpy.context.scene.mt_scene_props.subdivisions
+
+            if context.scene.mt_scene_props.displacement_mode == 'MESH':
+                write_displaced_mesh(obj, subsurf_mod.levels)
+            else:
                 subsurf_mod.show_viewport = True
 
                 ctx = {
@@ -156,8 +185,8 @@ class MT_OT_Make_3D(bpy.types.Operator):
                 bpy.ops.object.modifier_move_to_index(
                     ctx, modifier=subsurf_mod.name, index=0)
 
-                # obj_props.geometry_type = 'DISPLACEMENT'
-                obj_props.is_displaced = True
+            # obj_props.geometry_type = 'DISPLACEMENT'
+            obj_props.is_displaced = True
 
         reset_renderer_from_bake(orig_render_settings)
         return {'FINISHED'}
@@ -207,67 +236,106 @@ def bake_displacement_map(obj):
     Returns:
         bpy.types.image: Displacement Map
     """
-    hide_render = obj.hide_render
-    obj.hide_render = False
-    context = bpy.context
-    prefs = get_prefs()
-    image_resolution = context.scene.mt_scene_props.tile_resolution
-    disp_image = bpy.data.images.new(
-        obj.name + '.image',
-        width=image_resolution,
-        height=image_resolution,
-        alpha=True,
-        float_buffer=False,
-        is_data=True
-    )
-    disp_image.file_format = 'PNG'
+    return bake_displacement_maps([obj])[obj]
 
-    disp_materials = []
-    mat_set = set()
-    for item in obj.material_slots.items():
-        if item[0]:
-            material = bpy.data.materials[item[0]]
-            tree = material.node_tree
-
-            if 'disp_emission' in tree.nodes and material not in mat_set:
-                # plug emission node into output for baking
-                disp_materials.append(material)
-                mat_set.add(material)
-                displacement_emission_node = tree.nodes['disp_emission']
-                mat_output_node = tree.nodes['Material Output']
-
-                tree.links.new(
-                    displacement_emission_node.outputs['Emission'],
-                    mat_output_node.inputs['Surface'])
-
-                # sever displacement node link because otherwise it screws up baking
-                displacement_node = tree.nodes['final_disp']
-                link = displacement_node.outputs[0].links[0]
-                tree.links.remove(link)
-
-                # save displacement strength
-                strength_node = tree.nodes['Strength']
-
-                # assign image to image node
-                texture_node = tree.nodes['disp_texture_node']
-                texture_node.image = disp_image
 
-    context.scene.render.bake_type = 'DISPLACEMENT'
-    context.scene.render.bake_margin = 10
+def bake_displacement_maps(objects, use_atlas=False):
+    """Bake displacement maps for objects with MakeTile displacement materials.
 
-    ctx = {
-        'selected_objects': [obj],
-        'selected_editable_objects': [obj],
-        'selectable_objects': [obj],
-        'active_object': obj,
-        'object': obj,
-        'visible_objects': [obj],
-        'editable_objects': [obj],
-        'objects_in_mode': [obj]
-    }
+    Maps are loaded from the bake cache where possible. Otherwise, if the displacement
+    engine is 'NUMPY', objects are baked with bake_displacement_numpy or, if tiled_bake
+    is on, bake_displacement_tiled. Objects that can't be baked with NumPy are baked with
+    Cycles, either one at a time or, if use_atlas is True, together in as few Cycles
+    bakes as possible with bake_displacement_atlas.
 
+    Args:
+        objects (list[bpy.types.Object]): objects
+        use_atlas (bool, optional): Bake objects with Cycles in atlases. Defaults to False.
 
-    # check to see if there is a UV layer and if not make one. Can't get context override to work.
+    Returns:
+        dict{bpy.types.Object: bpy.types.Image}: Displacement map of each object
+    """
+    context = bpy.context
+    prefs = get_prefs()
+    scene_props = context.scene.mt_scene_props
+    image_resolution = scene_props.tile_resolution
+
+    tiled = scene_props.tiled_bake and scene_props.displacement_engine == 'NUMPY'
+
+    images = {}
+    cache_keys = {}
+    baked = []
+    cycles_objects = []
+    for obj in objects:
+        add_uv_layer(obj)
+
+        # reuse the map from the bake cache if nothing affecting it has changed
+        if prefs.use_bake_cache:
+            cache_keys[obj] = displacement_bake_key(
+                obj,
+                image_resolution,
+                BAKE_MARGIN,
+                16 if tiled else 8,
+                scene_props.displacement_engine)
+            disp_image = bake_cache.load(cache_keys[obj])
+            if disp_image is not None:
+                images[obj] = disp_image
+                continue
+
+        use_numpy = scene_props.displacement_engine == 'NUMPY'
+        if tiled:
+            try:
+                images[obj] = bake_displacement_tiled(obj, image_resolution, cache_keys.get(obj))
+                continue
+            except UnsupportedNodeError as err:
+                print(str(err) + '. Baking ' + obj.name + ' with Cycles instead.')
+                use_numpy = False
+
+        disp_image = bpy.data.images.new(
+            obj.name + '.image',
+            width=image_resolution,
+            height=image_resolution,
+            alpha=True,
+            float_buffer=False,
+            is_data=True
+        )
+        disp_image.file_format = 'PNG'
+        images[obj] = disp_image
+        baked.append(obj)
+
+        if use_numpy:
+            try:
+                bake_displacement_numpy(obj, disp_image)
+                continue
+            except UnsupportedNodeError as err:
+                print(str(err) + '. Baking ' + obj.name + ' with Cycles instead.')
+        cycles_objects.append(obj)
+
+    if use_atlas and len(cycles_objects) > 1:
+        bake_displacement_atlas(cycles_objects, images)
+    else:
+        for obj in cycles_objects:
+            bake_displacement_cycles([obj], images[obj])
+
+    for obj in baked:
+        # cached maps are referenced from the cache so only pack the image if it isn't cached
+        disp_image = images[obj]
+        if obj not in cache_keys or not bake_cache.save(cache_keys[obj], disp_image):
+            disp_image.pack()
+
+    for obj in objects:
+        assign_secondary_material_after_bake(obj)
+
+    return images
+
+
+def add_uv_layer(obj):
+    """Add a UV layer to an object with smart project if it doesn't have one.
+
+    Args:
+        obj (bpy.types.Object): object
+    """
+    # Can't get context override to work.
     if len(obj.data.uv_layers) == 0:
         deselect_all()
         select(obj.name)
@@ -280,31 +348,23 @@ def bake_displacement_map(obj):
         bpy.ops.mesh.select_all(action='DESELECT')
         bpy.ops.object.editmode_toggle()
 
-    # bake
-    bpy.ops.object.bake(ctx, type='EMIT')
-
-    # pack image
-    disp_image.pack()
 
-    # reset shaders
-    for material in disp_materials:
-        tree = material.node_tree
-        surface_shader_node = tree.nodes['surface_shader']
-        displacement_node = tree.nodes['final_disp']
-        mat_output_node = tree.nodes['Material Output']
-        tree.links.new(
-            surface_shader_node.outputs['BSDF'], mat_output_node.inputs['Surface'])
-        tree.links.new(
-            displacement_node.outputs['Displacement'], mat_output_node.inputs['Displacement'])
+def assign_secondary_material_after_bake(obj):
+    """Store which material is assigned to each vertex group and assign the secondary material to the whole mesh.
 
+    Args:
+        obj (bpy.types.Object): object
+    """
+    prefs = get_prefs()
     preview_materials = obj.mt_object_props.preview_materials
     preview_materials.clear()
 
     # store which material is assigned to which vertex group
+    mesh_arrays = MeshGroupArrays(obj)
     for group in obj.vertex_groups:
         mat = preview_materials.add()
         mat.vertex_group = group.name
-        mat.material = get_vert_group_material(group, obj)
+        mat.material = get_vert_group_material(group, obj, mesh_arrays)
 
     # assign secondary material to entire mesh
     # We do this because when the mesh is being displaced we want to see what the actual geometry is without any texture
@@ -321,5 +381,402 @@ def bake_displacement_map(obj):
     for poly in obj.data.polygons:
         poly.material_index = sec_mat_index
 
-    obj.hide_render = hide_render
+
+def get_atlas_layout(count, resolution):
+    """Return how to lay out maps of a resolution in atlases no larger than ATLAS_MAX_SIZE.
+
+    Args:
+        count (int): number of maps
+        resolution (int): width and height of each map
+
+    Returns:
+        list[tuple(int, int, int)]: for each atlas the number of maps in it and its
+        number of columns and rows of maps.
+    """
+    per_side = max(1, ATLAS_MAX_SIZE // resolution)
+    per_atlas = per_side * per_side
+    layout = []
+    for start in range(0, count, per_atlas):
+        batch = min(per_atlas, count - start)
+        columns = min(per_side, ceil(sqrt(batch)))
+        rows = ceil(batch / columns)
+        layout.append((batch, columns, rows))
+    return layout
+
+
+def bake_displacement_atlas(objects, images):
+    """Bake the displacement maps of several objects with as few Cycles bakes as possible.
+
+    Each object's UVs are temporarily moved into its own cell of an atlas image so a
+    batch of objects is baked with a single Cycles bake. Each cell is then copied to the
+    object's displacement map.
+
+    Args:
+        objects (list[bpy.types.Object]): objects
+        images (dict{bpy.types.Object: bpy.types.Image}): map to bake each object to. All maps must be the same size
+    """
+    resolution = images[objects[0]].size[0]
+    start = 0
+    for count, columns, rows in get_atlas_layout(len(objects), resolution):
+        batch = objects[start:start + count]
+        start += count
+
+        atlas = bpy.data.images.new(
+            'MakeTile.atlas',
+            width=columns * resolution,
+            height=rows * resolution,
+            alpha=True,
+            float_buffer=False,
+            is_data=True)
+        cells = {obj: (i % columns, i // columns) for i, obj in enumerate(batch)}
+
+        original_uvs = {}
+        for obj, cell in cells.items():
+            uv_data = obj.data.uv_layers.active.data
+            uvs = np.empty(len(uv_data) * 2, dtype=np.float32)
+            uv_data.foreach_get('uv', uvs)
+            original_uvs[obj] = uvs
+            moved = (uvs.reshape(-1, 2) + cell) / (columns, rows)
+            uv_data.foreach_set('uv', moved.astype(np.float32).ravel())
+
+        try:
+            bake_displacement_cycles(batch, atlas)
+        finally:
+            for obj, uvs in original_uvs.items():
+                obj.data.uv_layers.active.data.foreach_set('uv', uvs)
+
+        pixels = np.empty(atlas.size[0] * atlas.size[1] * 4, dtype=np.float32)
+        atlas.pixels.foreach_get(pixels)
+        pixels = pixels.reshape(rows * resolution, columns * resolution, 4)
+        for obj, (column, row) in cells.items():
+            cell_pixels = pixels[
+                row * resolution:(row + 1) * resolution,
+                column * resolution:(column + 1) * resolution]
+            images[obj].pixels.foreach_set(cell_pixels.ravel())
+            images[obj].update()
+
+        bpy.data.images.remove(atlas)
+
+
+def bake_displacement_cycles(objects, disp_image):
+    """Bake the displacement materials of objects to an image with a single Cycles EMIT bake.
+
+    Args:
+        objects (list[bpy.types.Object]): objects. Their UVs must not overlap if there is more than one
+        disp_image (bpy.types.Image): image to bake to
+    """
+    hide_render = {obj: obj.hide_render for obj in objects}
+    for obj in objects:
+        obj.hide_render = False
+    context = bpy.context
+
+    disp_materials = []
+    mat_set = set()
+    for obj in objects:
+        for item in obj.material_slots.items():
+            if item[0]:
+                material = bpy.data.materials[item[0]]
+                tree = material.node_tree
+
+                if 'disp_emission' in tree.nodes and material not in mat_set:
+                    # plug emission node into output for baking
+                    disp_materials.append(material)
+                    mat_set.add(material)
+                    displacement_emission_node = tree.nodes['disp_emission']
+                    mat_output_node = tree.nodes['Material Output']
+
+                    tree.links.new(
+                        displacement_emission_node.outputs['Emission'],
+                        mat_output_node.inputs['Surface'])
+
+                    # sever displacement node link because otherwise it screws up baking
+                    displacement_node = tree.nodes['final_disp']
+                    link = displacement_node.outputs[0].links[0]
+                    tree.links.remove(link)
+
+                    # assign image to image node
+                    texture_node = tree.nodes['disp_texture_node']
+                    texture_node.image = disp_image
+
+    context.scene.render.bake_type = 'DISPLACEMENT'
+    context.scene.render.bake_margin = BAKE_MARGIN
+
+    ctx = {
+        'selected_objects': objects,
+        'selected_editable_objects': objects,
+        'selectable_objects': objects,
+        'active_object': objects[0],
+        'object': objects[0],
+        'visible_objects': objects,
+        'editable_objects': objects,
+        'objects_in_mode': objects
+    }
+
+    # bake
+    bpy.ops.object.bake(ctx, type='EMIT')
+
+    # reset shaders
+    for material in disp_materials:
+        tree = material.node_tree
+        surface_shader_node = tree.nodes['surface_shader']
+        displacement_node = tree.nodes['final_disp']
+        mat_output_node = tree.nodes['Material Output']
+        tree.links.new(
+            surface_shader_node.outputs['BSDF'], mat_output_node.inputs['Surface'])
+        tree.links.new(
+            displacement_node.outputs['Displacement'], mat_output_node.inputs['Displacement'])
+
+    for obj in objects:
+        obj.hide_render = hide_render[obj]
+
+
+def bake_displacement_numpy(obj, disp_image):
+    """Evaluate the displacement materials of an object with NumPy and write them to an image.
+
+    Produces the same map as bake_displacement_cycles without needing Cycles. The disp_emission
+    node of each material is evaluated at the centre of every texel covered by the
+    object's UVs. Texels of faces without a displacement material are black.
+
+    Args:
+        obj (bpy.types.Object): object
+        disp_image (bpy.types.Image): image to write to
+
+    Raises:
+        UnsupportedNodeError: if a displacement material contains a node NodeEvaluator can't evaluate
+    """
+    bake_data = get_numpy_bake_data(obj)
+
+    width, height = disp_image.size
+    texels, owners, weights = rasterise_uv_triangles(bake_data['uvs'], width, height)
+    colors = np.zeros((width * height, 3), dtype=np.float32)
+    colors[texels] = evaluate_displacement(bake_data, owners, weights)
+
+    mask = np.zeros(width * height, dtype=bool)
+    mask[texels] = True
+    colors = dilate(colors.reshape(height, width, 3), mask.reshape(height, width), BAKE_MARGIN)
+
+    pixels = np.ones((height, width, 4), dtype=np.float32)
+    pixels[..., :3] = np.clip(colors, 0.0, 1.0)
+    disp_image.pixels.foreach_set(pixels.ravel())
+    disp_image.update()
+
+
+def bake_displacement_numpy_tiled(obj, height_map, tile_size=BAKE_TILE_SIZE):
+    """Evaluate the displacement materials of an object with NumPy one tile at a time.
+
+    Each tile is evaluated with a border as wide as the bake margin so it can be dilated
+    on its own, then written to height_map. Memory used doesn't depend on the size of
+    the map so height_map can be memory mapped. See lib.utils.height_map.
+
+    Args:
+        obj (bpy.types.Object): object
+        height_map (numpy.ndarray): (h, w) uint16 height map to write to
+        tile_size (int, optional): width and height of tiles. Defaults to BAKE_TILE_SIZE.
+
+    Raises:
+        UnsupportedNodeError: if a displacement material contains a node NodeEvaluator can't evaluate
+    """
+    bake_data = get_numpy_bake_data(obj)
+    uvs = bake_data['uvs']
+    height, width = height_map.shape
+    size = np.array((width, height), dtype=np.float32)
+    points = uvs * size - 0.5
+    tri_min = points.min(axis=1)
+    tri_max = points.max(axis=1)
+
+    for y_start in range(0, height, tile_size):
+        for x_start in range(0, width, tile_size):
+            x_end = min(x_start + tile_size, width)
+            y_end = min(y_start + tile_size, height)
+
+            # tile plus margin
+            left = max(0, x_start - BAKE_MARGIN)
+            bottom = max(0, y_start - BAKE_MARGIN)
+            right = min(width, x_end + BAKE_MARGIN)
+            top = min(height, y_end + BAKE_MARGIN)
+            tile_width = right - left
+            tile_height = top - bottom
+
+            colors = np.zeros((tile_height * tile_width, 3), dtype=np.float32)
+            mask = np.zeros(tile_height * tile_width, dtype=bool)
+
+            tris = np.flatnonzero(
+                (tri_max[:, 0] >= left) & (tri_min[:, 0] <= right - 1)
+                & (tri_max[:, 1] >= bottom) & (tri_min[:, 1] <= top - 1))
+            if len(tris) > 0:
+                tile_uvs = (uvs[tris] * size - (left, bottom)) / (tile_width, tile_height)
+                texels, owners, weights = rasterise_uv_triangles(tile_uvs, tile_width, tile_height)
+                colors[texels] = evaluate_displacement(bake_data, tris[owners], weights)
+                mask[texels] = True
+
+            colors = dilate(
+                colors.reshape(tile_height, tile_width, 3),
+                mask.reshape(tile_height, tile_width),
+                BAKE_MARGIN)
+            tile = colors[y_start - bottom:y_end - bottom, x_start - left:x_end - left]
+            height_map[y_start:y_end, x_start:x_end] = np.round(
+                np.clip(tile.mean(axis=-1), 0.0, 1.0) * 65535).astype(np.uint16)
+
+
+def bake_displacement_tiled(obj, resolution, cache_key=None):
+    """Bake a 16 bit displacement map for an object with bake_displacement_numpy_tiled.
+
+    The map is streamed to a memory mapped height map and then to a 16 bit PNG which is
+    loaded as the displacement image, so the whole map is never held in memory by MakeTile.
+    With a cache_key the PNG and height map are kept in the bake cache. Otherwise the
+    image is packed, the PNG is deleted and the height map is moved to a temporary file
+    whose path is stored in the image's height_map property.
+
+    Args:
+        obj (bpy.types.Object): object
+        resolution (int): width and height of map
+        cache_key (str, optional): bake cache key. Defaults to None.
+
+    Returns:
+        bpy.types.Image: Displacement map
+
+    Raises:
+        UnsupportedNodeError: if a displacement material contains a node NodeEvaluator can't evaluate
+    """
+    if cache_key is not None:
+        filepath = bake_cache.get_filepath(cache_key)
+    else:
+        filepath = os.path.join(tempfile.gettempdir(), bpy.path.clean_name(obj.name) + '.png')
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+    # write to temporary files so maps saved by other Blender instances are never read half written
+    temp_suffix = '.' + str(os.getpid()) + '.tmp'
+    height_map_path = os.path.splitext(filepath)[0] + '.npy'
+    height_map = create_height_map(height_map_path + temp_suffix, resolution, resolution)
+    try:
+        bake_displacement_numpy_tiled(obj, height_map)
+        height_map.flush()
+        write_png16(filepath + temp_suffix, height_map)
+    except BaseException:
+        del height_map
+        for path in (height_map_path, filepath):
+            if os.path.exists(path + temp_suffix):
+                os.remove(path + temp_suffix)
+        raise
+    del height_map
+    os.replace(filepath + temp_suffix, filepath)
+
+    if cache_key is not None:
+        os.replace(height_map_path + temp_suffix, height_map_path)
+        return bake_cache.load(cache_key)
+
+    # keep the height map so Mesh mode can memory map it instead of reading the packed pixels
+    handle, kept_path = tempfile.mkstemp(
+        prefix=bpy.path.clean_name(obj.name) + '.', suffix='.npy')
+    os.close(handle)
+    os.replace(height_map_path + temp_suffix, kept_path)
+    disp_image = bpy.data.images.load(filepath)
+    disp_image.name = obj.name + '.image'
+    disp_image.colorspace_settings.is_data = True
+    disp_image.pack()
+    disp_image['height_map'] = kept_path
+    os.remove(filepath)
     return disp_image
+
+
+def get_numpy_bake_data(obj):
+    """Return the displacement materials and UV triangles of an object for evaluating with NumPy.
+
+    Args:
+        obj (bpy.types.Object): object
+
+    Returns:
+        dict: materials, triangle corners, uvs, normals and material indices of obj
+
+    Raises:
+        UnsupportedNodeError: if a displacement material contains a node NodeEvaluator can't evaluate
+    """
+    matrix = np.array(obj.matrix_world, dtype=np.float32)
+    images = {}
+
+    # find displacement materials and check we can evaluate them before doing any work
+    materials = {}
+    probe = {
+        'position': np.zeros((1, 3), dtype=np.float32),
+        'normal': np.array(((0, 0, 1),), dtype=np.float32),
+        'uv': np.zeros((1, 2), dtype=np.float32),
+        'generated': np.zeros((1, 3), dtype=np.float32),
+        'matrix_world': matrix}
+    for index, slot in enumerate(obj.material_slots):
+        material = slot.material
+        if material is not None and material.node_tree is not None and 'disp_emission' in material.node_tree.nodes:
+            emission = material.node_tree.nodes['disp_emission']
+            NodeEvaluator(probe, images).evaluate_emission(emission)
+            materials[index] = emission
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    object_eval = obj.evaluated_get(depsgraph)
+    mesh = object_eval.to_mesh()
+    try:
+        mesh.calc_loop_triangles()
+        num_tris = len(mesh.loop_triangles)
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', coords)
+        tri_verts = np.empty(num_tris * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get('vertices', tri_verts)
+        tri_loops = np.empty(num_tris * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get('loops', tri_loops)
+        normals = np.empty(num_tris * 3, dtype=np.float32)
+        mesh.loop_triangles.foreach_get('normal', normals)
+        material_indices = np.empty(num_tris, dtype=np.int32)
+        mesh.loop_triangles.foreach_get('material_index', material_indices)
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        mesh.uv_layers.active.data.foreach_get('uv', uvs)
+    finally:
+        object_eval.to_mesh_clear()
+
+    # generated coordinates map the mesh's texture space to 0 - 1
+    texspace_location = np.array(obj.data.texspace_location, dtype=np.float32)
+    texspace_size = np.array(obj.data.texspace_size, dtype=np.float32)
+    texspace_size[texspace_size == 0] = 1
+
+    return {
+        'materials': materials,
+        'images': images,
+        'matrix_world': matrix,
+        'corners': coords.reshape(-1, 3)[tri_verts.reshape(-1, 3)],
+        'uvs': uvs.reshape(-1, 2)[tri_loops.reshape(-1, 3)],
+        'normals': normals.reshape(-1, 3),
+        'material_indices': material_indices,
+        'texspace_location': texspace_location,
+        'texspace_size': texspace_size}
+
+
+def evaluate_displacement(bake_data, owners, weights):
+    """Evaluate the displacement materials of an object at points on its triangles.
+
+    Args:
+        bake_data (dict): see get_numpy_bake_data
+        owners (numpy.ndarray): (n,) triangle each point lies on
+        weights (numpy.ndarray): (n, 3) barycentric coordinates of each point
+
+    Returns:
+        numpy.ndarray: (n, 3) colors. Black for triangles without a displacement material
+    """
+    corners = bake_data['corners']
+    uvs = bake_data['uvs']
+    texspace_location = bake_data['texspace_location']
+    texspace_size = bake_data['texspace_size']
+    colors = np.zeros((len(owners), 3), dtype=np.float32)
+
+    owner_materials = bake_data['material_indices'][owners]
+    for index, emission in bake_data['materials'].items():
+        selected = np.flatnonzero(owner_materials == index)
+        for start in range(0, len(selected), EVALUATION_CHUNK_SIZE):
+            chunk = selected[start:start + EVALUATION_CHUNK_SIZE]
+            tris = owners[chunk]
+            tri_weights = weights[chunk][..., None]
+            position = np.sum(corners[tris] * tri_weights, axis=1)
+            geometry = {
+                'position': position,
+                'normal': bake_data['normals'][tris],
+                'uv': np.sum(uvs[tris] * tri_weights, axis=1),
+                'generated': (position - texspace_location + texspace_size) / (2 * texspace_size),
+                'matrix_world': bake_data['matrix_world']}
+            colors[chunk] = NodeEvaluator(geometry, bake_data['images']).evaluate_emission(emission)
+    return colors
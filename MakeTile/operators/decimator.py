@@ -79,8 +79,7 @@ def decimate(context, obj):
     object_eval = obj.evaluated_get(depsgraph)
     mesh_from_eval = bpy.data.meshes.new_from_object(object_eval)
     obj.modifiers.clear()
-
-    obj.data = mesh_from_eval
+    replace_mesh(obj, mesh_from_eval)
     if props.planar_decimation:
         mod = obj.modifiers.new('Decimation 2', 'DECIMATE')
         mod.decimate_type = 'DISSOLVE'
@@ -90,4 +89,12 @@ def decimate(context, obj):
     object_eval = obj.evaluated_get(depsgraph)
     mesh_from_eval = bpy.data.meshes.new_from_object(object_eval)
     obj.modifiers.clear()
-    obj.data = mesh_from_eval
+    replace_mesh(obj, mesh_from_eval)
+
+
+def replace_mesh(obj, mesh):
+    """Set an object's mesh and remove the one it replaces if nothing else uses it."""
+    old_mesh = obj.data
+    obj.data = mesh
+    if old_mesh.users == 0:
+        bpy.data.meshes.remove(old_mesh)
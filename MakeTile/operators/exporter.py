@@ -1,8 +1,7 @@
 import os
-import textwrap
 from random import random
+import numpy as np
 import bpy
-import addon_utils
 from bpy.types import Panel, PropertyGroup
 from bpy.props import BoolProperty, StringProperty, EnumProperty
 from bpy_extras.io_utils import ExportHelper
@@ -10,11 +9,15 @@ from .. utils.registration import get_prefs
 from .voxeliser import voxelise, make_manifold
 from .decimator import decimate
 from .. lib.utils.collections import get_objects_owning_collections
+from .. lib.utils.stl import export_object_stl, export_objects_stl, get_evaluated_triangles
+from .. lib.utils.mesh_repair import mesh_from_triangles, voxel_remesh_triangles
 from . bakedisplacement import (
     set_cycles_to_bake_mode,
     reset_renderer_from_bake,
     bake_displacement_map)
 from . return_to_preview import set_to_preview
+from .. lib.utils.displaced_mesh import write_displaced_mesh
+from .sharded_export import export_sharded
 from ..enums.enums import units
 
 # TODO: Currently if you select an architectural element rather than a tile the exporter fails.
@@ -37,21 +40,6 @@ class MT_PT_Export_Panel(Panel):
         scene_props = scene.mt_scene_props
         obj = context.object
         prefs = get_prefs()
-
-        char_width = 9  # TODO find a way of actually getting this rather than guessing
-        print_tools_txt = "For more options please enable the 3D print Tools addon included with blender."
-
-        # get panel width so we can line wrap print_tools_txt
-        tool_shelf = None
-        area = bpy.context.area
-
-        for region in area.regions:
-            if region.type == 'UI':
-                tool_shelf = region
-
-        width = tool_shelf.width / char_width
-        wrapped = textwrap.wrap(print_tools_txt, width)
-
         layout = self.layout
 
         layout.operator('scene.mt_export_tile', text='Export Tile')
@@ -70,16 +58,12 @@ class MT_PT_Export_Panel(Panel):
         layout.prop(scene_props, 'randomise_on_export')
         layout.prop(scene_props, 'decimate_on_export')
         layout.prop(scene_props, 'export_subdivs')
+        layout.prop(scene_props, 'export_workers')
 
         if scene_props.randomise_on_export is True:
             layout.prop(scene_props, 'num_variants')
 
-        if addon_utils.check("object_print3d_utils") == (True, True):
-            layout.prop(scene_props, 'fix_non_manifold')
-        else:
-            for line in wrapped:
-                row = layout.row()
-                row.label(text=line)
+        layout.prop(scene_props, 'fix_non_manifold')
 
 
 class MT_OT_Export_Object(bpy.types.Operator, ExportHelper):
@@ -131,13 +115,7 @@ class MT_OT_Export_Object(bpy.types.Operator, ExportHelper):
         fix_non_manifold = self.make_manifold
 
         # Controls if we rescale on export
-        blend_units = self.export_units
-        if blend_units == 'CM':
-            unit_multiplier = 10
-        elif blend_units == 'INCHES':
-            unit_multiplier = 25.4
-        else:
-            unit_multiplier = 1
+        unit_multiplier = get_unit_multiplier(self.export_units)
 
         # The object to export
         obj = context.active_object
@@ -160,40 +138,19 @@ class MT_OT_Export_Object(bpy.types.Operator, ExportHelper):
             if fix_non_manifold:
                 make_manifold(context, dup_obj)
 
-            ctx = {
-                'object': dup_obj,
-                'active_object': dup_obj,
-                'selected_objects': [dup_obj],
-                'selected_editable_objects': [dup_obj]}
-
             # export our object
-            bpy.ops.export_mesh.stl(
-                ctx,
-                filepath=self.filepath,
-                check_existing=True,
-                filter_glob="*.stl",
-                use_selection=True,
-                global_scale=unit_multiplier,
-                use_mesh_modifiers=True)
+            depsgraph = context.evaluated_depsgraph_get()
+            export_object_stl(self.filepath, dup_obj, depsgraph, unit_multiplier)
 
+            mesh = dup_obj.data
             bpy.data.objects.remove(dup_obj, do_unlink=True)
+            if mesh.users == 0:
+                bpy.data.meshes.remove(mesh)
 
         else:
-            ctx = {
-                'object': obj,
-                'active_object': obj,
-                'selected_objects': [obj],
-                'selected_editable_objects': [obj]}
-
             # export our object
-            bpy.ops.export_mesh.stl(
-                ctx,
-                filepath=self.filepath,
-                check_existing=True,
-                filter_glob="*.stl",
-                use_selection=True,
-                global_scale=unit_multiplier,
-                use_mesh_modifiers=True)
+            depsgraph = context.evaluated_depsgraph_get()
+            export_object_stl(self.filepath, obj, depsgraph, unit_multiplier)
 
         self.report({'INFO'}, f'{obj.name} exported to {self.filepath}')
 
@@ -221,32 +178,11 @@ class MT_OT_Export_Tile_Variants(bpy.types.Operator):
         else:
             num_variants = 1
 
-        # set cycles to bake mode and store original settings
-        orig_settings = set_cycles_to_bake_mode()
-
-        # voxelise options
-        voxelise_on_export = scene_props.voxelise_on_export
-
-        # decimate options
-        decimate_on_export = scene_props.decimate_on_export
-
         # ensure export path exists
         export_path = prefs.default_export_path
         if not os.path.exists(export_path):
             os.mkdir(export_path)
 
-        # Controls if we rescale on export
-        blend_units = scene_props.export_units
-        if blend_units == 'CM':
-            unit_multiplier = 10
-        elif blend_units == 'INCHES':
-            unit_multiplier = 25.4
-        else:
-            unit_multiplier = 1
-
-        objects = bpy.data.objects
-        visible_objects = []
-
         # get list of tile collections our selected objects are in. We export
         # all visible objects in the collections
         tile_collections = set()
@@ -258,142 +194,226 @@ class MT_OT_Export_Tile_Variants(bpy.types.Operator):
                 if collection.mt_tile_props.is_mt_collection is True:
                     tile_collections.add(collection)
 
-        for collection in tile_collections:
-            visible_objects = []
-
-            for obj in collection.objects:
-                if obj.type == 'MESH' and obj.visible_get() is True and obj.display_type in ['SOLID', 'TEXTURED']:
-                    visible_objects.append(obj)
-
-            #generate variants of displacement obs equal to num_variants
-            displacement_obs = []
-            for obj in visible_objects:
-                if obj.mt_object_props.is_displacement:
-                    displacement_obs.append((obj, obj.mt_object_props.is_displaced))
-
-            i = 0
-            while i < num_variants:
-                # construct a random name for our variant
-                file_path = os.path.join(
-                    export_path,
-                    collection.name + '.' + str(random()) + '.stl')
-
-                for ob in displacement_obs:
-                    obj = ob[0]
-                    obj_props = obj.mt_object_props
-
-                    # check if displacement modifier exists. If it doesn't user has removed it.
-                    if obj_props.disp_mod_name in obj.modifiers:
-
-                        if obj_props.is_displacement and obj_props.is_displaced and scene_props.randomise_on_export:
-                            set_to_preview(obj)
-
-                        if obj_props.is_displacement and not obj_props.is_displaced:
-                            ctx = {
-                                'selected_objects': [obj],
-                                'selected_editable_objects': [obj],
-                                'active_object': obj,
-                                'object': obj}
-
-                            for item in obj.material_slots.items():
-                                if item[0]:
-                                    material = bpy.data.materials[item[0]]
-                                    tree = material.node_tree
-
-                                    # generate a random variant for each displacement object
-                                    if scene_props.randomise_on_export:
-                                        if num_variants == 1:
-                                            if 'Seed' in tree.nodes:
-                                                rand = random()
-                                                seed_node = tree.nodes['Seed']
-                                                seed_node.outputs[0].default_value = rand * 1000
-                                        else:
-                                            # only generate a random variant on second iteration
-                                            if i > 0:
-                                                if 'Seed' in tree.nodes:
-                                                    rand = random()
-                                                    seed_node = tree.nodes['Seed']
-                                                    seed_node.outputs[0].default_value = rand * 1000
-
-                            disp_image = bake_displacement_map(obj)
-                            disp_strength = obj_props.displacement_strength
-                            disp_texture = obj_props.disp_texture
-
-                            disp_texture.image = disp_image
-                            disp_mod = obj.modifiers[obj_props.disp_mod_name]
-                            disp_mod.texture = disp_texture
-                            disp_mod.mid_level = 0
-                            disp_mod.strength = disp_strength
-                            subsurf_mod = obj.modifiers[obj_props.subsurf_mod_name]
-                            subsurf_mod.levels = scene_props.export_subdivs
-                            subsurf_mod.show_viewport = True
-                            bpy.ops.object.modifier_move_to_index(ctx, modifier=subsurf_mod.name, index=0)
-                            obj_props.is_displaced = True
-
-                depsgraph = context.evaluated_depsgraph_get()
-                dupes = []
-
-                for obj in visible_objects:
-                    object_eval = obj.evaluated_get(depsgraph)
-                    mesh_from_eval = bpy.data.meshes.new_from_object(object_eval)
-                    dup_obj = bpy.data.objects.new('dupe', mesh_from_eval)
-                    dup_obj.data.transform(obj.matrix_world)
-                    collection.objects.link(dup_obj)
-                    dupes.append(dup_obj)
-
-                context.view_layer.update()
-                # join dupes together
-                if len(dupes) > 0:
-                    ctx = {
-                        'object': dupes[0],
-                        'active_object': dupes[0],
-                        'selected_objects': dupes,
-                        'selected_editable_objects': dupes}
-                    bpy.ops.object.join(ctx)
-
-                    if voxelise_on_export:
-                        voxelise(context, dupes[0])
-                    if decimate_on_export:
-                        decimate(context, dupes[0])
-                    if scene_props.fix_non_manifold:
-                        make_manifold(context, dupes[0])
+        if scene_props.export_workers > 1:
+            jobs = [
+                {'collection': collection.name, 'num_variants': num_variants}
+                for collection in tile_collections]
+            results = export_sharded(context, jobs, export_path, scene_props.export_workers)
+            failed = [result for result in results if result['error']]
+            if failed:
+                self.report(
+                    {'WARNING'},
+                    f'{len(failed)} of {len(results)} tile variants failed to export. See console for details.')
+                return {'FINISHED'}
+        else:
+            # set cycles to bake mode and store original settings
+            orig_settings = set_cycles_to_bake_mode()
 
-                    ctx = {
-                        'object': dupes[0],
-                        'active_object': dupes[0],
-                        'selected_objects': [dupes[0]],
-                        'selected_editable_objects': [dupes[0]]}
-
-                    # set origin to center
-                    bpy.ops.object.origin_set(ctx, type='ORIGIN_GEOMETRY')
-                    dupes[0].location = (0, 0, 0)
-
-                    # export our object
-                    bpy.ops.export_mesh.stl(
-                        ctx,
-                        filepath=file_path,
-                        check_existing=True,
-                        filter_glob="*.stl",
-                        use_selection=True,
-                        global_scale=unit_multiplier,
-                        use_mesh_modifiers=True)
-
-                    objects.remove(dupes[0], do_unlink=True)
-
-                    # clean up orphaned meshes
-                    for mesh in bpy.data.meshes:
-                        if mesh.users == 0:
-                            bpy.data.meshes.remove(mesh)
-                    i += 1
-
-            # reset displacement obs
-            for ob in displacement_obs:
-                obj, is_displaced = ob
-                if is_displaced is False:
-                    set_to_preview(obj)
+            for collection in tile_collections:
+                export_tile_variants(context, collection, export_path, num_variants)
 
-        reset_renderer_from_bake(orig_settings)
+            reset_renderer_from_bake(orig_settings)
 
         self.report({'INFO'}, f'{num_variants * len(tile_collections)} tiles exported to {prefs.default_export_path}.')
 
         return {'FINISHED'}
+
+
+def get_unit_multiplier(blend_units):
+    """Return the amount to scale by on export to convert blender units to mm.
+
+    Args:
+        blend_units (enum in {'INCHES', 'CM'}): units
+
+    Returns:
+        float: unit multiplier
+    """
+    if blend_units == 'CM':
+        return 10
+    elif blend_units == 'INCHES':
+        return 25.4
+    return 1
+
+
+def export_tile_variants(context, collection, export_path, num_variants=1, file_name=None, variants=None):
+    """Export variants of a tile collection to STL using the export options in mt_scene_props.
+
+    All visible mesh objects in the collection are joined and exported as one file per variant.
+    Cycles must already be in bake mode. See bakedisplacement.set_cycles_to_bake_mode.
+
+    Args:
+        context (bpy.context): context
+        collection (bpy.types.Collection): tile collection
+        export_path (str): folder to export to
+        num_variants (int, optional): number of variants to export. Defaults to 1.
+        file_name (str, optional): file name without extension. Defaults to the collection name
+        followed by a random number. Variants after the first are numbered.
+        variants (iterable[int], optional): indices of the variants to export if only some
+        of the num_variants are wanted, e.g. when sharding an export. Defaults to all.
+
+    Returns:
+        list[str]: paths of exported files
+    """
+    scene_props = context.scene.mt_scene_props
+
+    # voxelise options
+    voxelise_on_export = scene_props.voxelise_on_export
+
+    # decimate options
+    decimate_on_export = scene_props.decimate_on_export
+
+    # Controls if we rescale on export
+    unit_multiplier = get_unit_multiplier(scene_props.export_units)
+
+    visible_objects = []
+
+    for obj in collection.objects:
+        if obj.type == 'MESH' and obj.visible_get() is True and obj.display_type in ['SOLID', 'TEXTURED']:
+            visible_objects.append(obj)
+
+    #generate variants of displacement obs equal to num_variants
+    displacement_obs = []
+    for obj in visible_objects:
+        if obj.mt_object_props.is_displacement:
+            displacement_obs.append((obj, obj.mt_object_props.is_displaced))
+
+    if variants is None:
+        variants = range(num_variants)
+
+    file_paths = []
+    for i in variants:
+        # construct a random name for our variant
+        if file_name is None:
+            file_path = os.path.join(
+                export_path,
+                collection.name + '.' + str(random()) + '.stl')
+        elif i == 0:
+            file_path = os.path.join(export_path, file_name + '.stl')
+        else:
+            file_path = os.path.join(export_path, file_name + '.' + str(i) + '.stl')
+
+        for ob in displacement_obs:
+            obj = ob[0]
+            obj_props = obj.mt_object_props
+
+            # check if displacement modifier exists. If it doesn't user has removed it.
+            if obj_props.disp_mod_name in obj.modifiers:
+
+                if obj_props.is_displacement and obj_props.is_displaced and scene_props.randomise_on_export:
+                    set_to_preview(obj)
+
+                if obj_props.is_displacement and not obj_props.is_displaced:
+                    ctx = {
+                        'selected_objects': [obj],
+                        'selected_editable_objects': [obj],
+                        'active_object': obj,
+                        'object': obj}
+
+                    for item in obj.material_slots.items():
+                        if item[0]:
+                            material = bpy.data.materials[item[0]]
+                            tree = material.node_tree
+
+                            # generate a random variant for each displacement object
+                            if scene_props.randomise_on_export:
+                                if num_variants == 1:
+                                    if 'Seed' in tree.nodes:
+                                        rand = random()
+                                        seed_node = tree.nodes['Seed']
+                                        seed_node.outputs[0].default_value = rand * 1000
+                                else:
+                                    # only generate a random variant on second iteration
+                                    if i > 0:
+                                        if 'Seed' in tree.nodes:
+                                            rand = random()
+                                            seed_node = tree.nodes['Seed']
+                                            seed_node.outputs[0].default_value = rand * 1000
+
+                    disp_image = bake_displacement_map(obj)
+                    disp_strength = obj_props.displacement_strength
+                    disp_texture = obj_props.disp_texture
+
+                    disp_texture.image = disp_image
+                    disp_mod = obj.modifiers[obj_props.disp_mod_name]
+                    disp_mod.texture = disp_texture
+                    disp_mod.mid_level = 0
+                    disp_mod.strength = disp_strength
+                    subsurf_mod = obj.modifiers[obj_props.subsurf_mod_name]
+                    subsurf_mod.levels = scene_props.export_subdivs
+                    if scene_props.displacement_mode == 'MESH':
+                        write_displaced_mesh(obj, subsurf_mod.levels)
+                    else:
+                        subsurf_mod.show_viewport = True
+                        bpy.ops.object.modifier_move_to_index(ctx, modifier=subsurf_mod.name, index=0)
+                    obj_props.is_displaced = True
+
+        if not visible_objects:
+            continue
+
+        if voxelise_on_export or decimate_on_export or scene_props.fix_non_manifold:
+            # these operate on a single object so we need to join the tile first
+            export_joined_objects(context, visible_objects, collection, file_path, unit_multiplier)
+        else:
+            # stream the triangles of each object straight to file
+            depsgraph = context.evaluated_depsgraph_get()
+            export_objects_stl(file_path, visible_objects, depsgraph, unit_multiplier)
+        file_paths.append(file_path)
+
+    # reset displacement obs
+    for ob in displacement_obs:
+        obj, is_displaced = ob
+        if is_displaced is False:
+            set_to_preview(obj)
+
+    return file_paths
+
+
+def export_joined_objects(context, objects, collection, file_path, unit_multiplier):
+    """Join the evaluated triangles of objects, apply export options and export them as one STL.
+
+    Used when voxelise, decimate or make manifold is enabled as these need a single mesh.
+    The triangles are joined as arrays so no operators are run and the selection isn't changed.
+
+    Args:
+        context (bpy.context): context
+        objects (list[bpy.types.Object]): objects to export
+        collection (bpy.types.Collection): collection to temporarily link the joined object to
+        file_path (str): path of file to write
+        unit_multiplier (float): amount to scale by. See get_unit_multiplier
+    """
+    scene_props = context.scene.mt_scene_props
+    depsgraph = context.evaluated_depsgraph_get()
+    all_coords, all_tris = [], []
+    num_verts = 0
+
+    for obj in objects:
+        coords, tris = get_evaluated_triangles(obj, depsgraph)
+        all_coords.append(coords)
+        all_tris.append(tris + num_verts)
+        num_verts += len(coords)
+
+    coords, tris = np.concatenate(all_coords), np.concatenate(all_tris)
+    del all_coords, all_tris
+    if scene_props.voxelise_on_export:
+        coords, tris = voxel_remesh_triangles(
+            coords, tris, scene_props.voxel_size, scene_props.voxel_adaptivity)
+
+    mesh = mesh_from_triangles(coords, tris, 'joined')
+    del coords, tris
+    joined = bpy.data.objects.new('joined', mesh)
+    collection.objects.link(joined)
+
+    if scene_props.decimate_on_export:
+        decimate(context, joined)
+    if scene_props.fix_non_manifold:
+        make_manifold(context, joined)
+
+    # export our object centered on the origin
+    depsgraph = context.evaluated_depsgraph_get()
+    export_objects_stl(file_path, [joined], depsgraph, unit_multiplier, center=True, name=joined.name)
+
+    # decimate removes the meshes it replaces so only the final mesh is left
+    mesh = joined.data
+    bpy.data.objects.remove(joined, do_unlink=True)
+    if mesh.users == 0:
+        bpy.data.meshes.remove(mesh)
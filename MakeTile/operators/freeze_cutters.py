@@ -0,0 +1,196 @@
+import bpy
+from .. lib.utils.collections import get_objects_owning_collections
+from .. lib.utils.displaced_mesh import restore_preview_mesh, write_displaced_mesh
+
+
+class MT_OT_Freeze_Cutters(bpy.types.Operator):
+    """Bake the booleans of the selected tiles into their meshes so they don't have to be
+    re-evaluated on every scene update. Cutters can still be toggled and unfrozen"""
+
+    bl_idname = "object.mt_freeze_cutters"
+    bl_label = "Freeze Cutters"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        return obj is not None and obj.mode == 'OBJECT'
+
+    def execute(self, context):
+        objects = [obj for obj in get_tile_objects(context.selected_objects)
+                   if not obj.mt_object_props.cutters_frozen]
+        frozen = freeze_cutters(context, objects)
+        self.report({'INFO'}, "Froze cutters on " + str(len(frozen)) + " objects")
+        return {'FINISHED'}
+
+
+class MT_OT_Unfreeze_Cutters(bpy.types.Operator):
+    """Restore the original meshes and live booleans of the selected tiles"""
+
+    bl_idname = "object.mt_unfreeze_cutters"
+    bl_label = "Unfreeze Cutters"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        return obj is not None and obj.mode == 'OBJECT'
+
+    def execute(self, context):
+        for obj in get_tile_objects(context.selected_objects):
+            unfreeze_cutters(obj)
+        return {'FINISHED'}
+
+
+def get_tile_objects(objects):
+    """Return the mesh objects with boolean modifiers in the tiles the objects belong to.
+
+    Args:
+        objects (list[bpy.types.Object]): objects
+
+    Returns:
+        list[bpy.types.Object]: objects with booleans
+    """
+    tile_objects = set()
+    for obj in objects:
+        tile_objects.add(obj)
+        if obj.mt_object_props.is_mt_object:
+            for collection in get_objects_owning_collections(obj.name):
+                tile_objects.update(collection.all_objects)
+
+    return [obj for obj in tile_objects
+            if obj.type == 'MESH'
+            and any(mod.type == 'BOOLEAN' for mod in obj.modifiers)]
+
+
+def cutter_enabled(obj, modifier):
+    """Return whether a boolean modifier's cutter is switched on in the object's cutters_collection.
+
+    Args:
+        obj (bpy.types.Object): object
+        modifier (bpy.types.BooleanModifier): boolean modifier
+
+    Returns:
+        bool: False if the cutter has been switched off. True if it is on or
+        the modifier isn't in cutters_collection.
+    """
+    for item in obj.mt_object_props.cutters_collection:
+        if item.name + '.bool' == modifier.name:
+            return item.value
+    return True
+
+
+def freeze_cutters(context, objects):
+    """Evaluate the boolean modifiers of objects once and store the result as mesh data.
+
+    Only the booleans are baked. Other modifiers, e.g. the MakeTile subsurf and
+    displacement modifiers, are switched off while baking and keep working on the frozen
+    mesh. The boolean modifiers are kept but hidden and the original mesh is stored in
+    unfrozen_mesh so the freeze can be undone. Frozen objects are re-baked from their
+    original mesh. Objects whose displacement has been written to their mesh are switched
+    back to their preview mesh while freezing and displaced again afterwards.
+
+    Args:
+        context (bpy.context): context
+        objects (list[bpy.types.Object]): mesh objects
+
+    Returns:
+        list[bpy.types.Object]: objects that have been frozen
+    """
+    objects = [obj for obj in objects
+               if any(mod.type == 'BOOLEAN' for mod in obj.modifiers)]
+    if not objects:
+        return []
+
+    # switch every object to its original mesh with only enabled booleans showing
+    # so the whole set is evaluated in a single depsgraph update
+    displaced = [obj for obj in objects if restore_preview_mesh(obj)]
+    visibility = {}
+    old_meshes = []
+    for obj in objects:
+        props = obj.mt_object_props
+        if props.cutters_frozen and props.unfrozen_mesh is not None:
+            old_meshes.append(obj.data)
+            obj.data = props.unfrozen_mesh
+
+        visibility[obj] = [(mod, mod.show_viewport) for mod in obj.modifiers]
+        for mod in obj.modifiers:
+            mod.show_viewport = mod.type == 'BOOLEAN' and cutter_enabled(obj, mod)
+
+    depsgraph = context.evaluated_depsgraph_get()
+    depsgraph.update()
+
+    for obj in objects:
+        props = obj.mt_object_props
+        original = obj.data
+        frozen = bpy.data.meshes.new_from_object(
+            obj.evaluated_get(depsgraph),
+            preserve_all_data_layers=True,
+            depsgraph=depsgraph)
+        frozen.name = original.name + '.frozen'
+
+        for mod, show_viewport in visibility[obj]:
+            if mod.type == 'BOOLEAN':
+                mod.show_viewport = False
+                mod.show_render = False
+            else:
+                mod.show_viewport = show_viewport
+
+        obj.data = frozen
+        props.unfrozen_mesh = original
+        props.cutters_frozen = True
+
+    for mesh in old_meshes:
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+    for obj in displaced:
+        redisplace(obj)
+
+    return objects
+
+
+def unfreeze_cutters(obj):
+    """Restore the original mesh and boolean modifiers of a frozen object.
+
+    If the object's displacement has been written to its mesh it is displaced again
+    from the original mesh.
+
+    Args:
+        obj (bpy.types.Object): object
+
+    Returns:
+        bool: False if object wasn't frozen
+    """
+    props = obj.mt_object_props
+    if not props.cutters_frozen:
+        return False
+
+    displaced = restore_preview_mesh(obj)
+    frozen = obj.data
+    if props.unfrozen_mesh is not None:
+        obj.data = props.unfrozen_mesh
+    props.unfrozen_mesh = None
+    props.cutters_frozen = False
+
+    for mod in obj.modifiers:
+        if mod.type == 'BOOLEAN':
+            mod.show_viewport = cutter_enabled(obj, mod)
+            mod.show_render = True
+
+    if frozen is not obj.data and frozen.users == 0:
+        bpy.data.meshes.remove(frozen)
+
+    if displaced:
+        redisplace(obj)
+    return True
+
+
+def redisplace(obj):
+    """Write the displacement of an object switched back to its preview mesh to its mesh again.
+
+    Args:
+        obj (bpy.types.Object): object
+    """
+    props = obj.mt_object_props
+    write_displaced_mesh(obj, obj.modifiers[props.subsurf_mod_name].levels)
@@ -1,5 +1,7 @@
 import bpy
 from ..materials.materials import assign_mat_to_vert_group
+from ..lib.utils.mesh_arrays import MeshGroupArrays
+from ..lib.utils.displaced_mesh import restore_preview_mesh
 from ..utils.registration import get_prefs
 from .. lib.utils.utils import view3d_find
 
@@ -36,6 +38,9 @@ def set_to_preview(obj):
     secondary_material = bpy.data.materials[prefs.secondary_material]
     props = obj.mt_object_props
 
+    # switch back from a mesh written by write_displaced_mesh
+    restore_preview_mesh(obj)
+
     # check if displacement modifier exists. If it doesn't user has removed it.
     if props.disp_mod_name in obj.modifiers:
         disp_mod = obj.modifiers[props.disp_mod_name]
@@ -43,14 +48,15 @@ def set_to_preview(obj):
 
         # reassign preview material to mesh. While in displacement mode we had assigned the secondary material
         # to the entire mesh so we only saw actual geometry.
-        assign_mat_to_vert_group('disp_mod_vert_group', obj, secondary_material)
+        mesh_arrays = MeshGroupArrays(obj)
+        assign_mat_to_vert_group('disp_mod_vert_group', obj, secondary_material, mesh_arrays)
 
         preview_materials = props.preview_materials
 
         for mat in preview_materials:
             if mat.vertex_group != 'disp_mod_vert_group':
                 if mat.material is not None:
-                    assign_mat_to_vert_group(mat.vertex_group, obj, mat.material)
+                    assign_mat_to_vert_group(mat.vertex_group, obj, mat.material, mesh_arrays)
 
     '''
     # check if subsurf modifier exists. If it doesn't user has removed it.
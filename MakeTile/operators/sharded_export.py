@@ -0,0 +1,227 @@
+"""Split tile exports across several background Blender processes.
+
+The coordinator saves a copy of the current .blend and starts worker processes which
+each open the copy and export a shard of the tile variants. Workers report progress
+as json lines on stdout which the coordinator merges into a single progress report.
+"""
+
+import os
+import sys
+import json
+import subprocess
+import tempfile
+import threading
+from queue import Queue
+from time import perf_counter
+import bpy
+from ..utils.registration import get_addon_name
+from .bakedisplacement import (
+    set_cycles_to_bake_mode,
+    reset_renderer_from_bake)
+
+# prefix of lines workers use to report progress
+PROGRESS_PREFIX = 'MT_PROGRESS '
+
+
+def create_work_items(jobs):
+    """Split export jobs into one work item per variant.
+
+    Args:
+        jobs (list[dict]): jobs containing collection (str), num_variants (int) and
+        optionally file_name (str)
+
+    Returns:
+        list[dict]: work items containing collection, num_variants, file_name and variant
+    """
+    items = []
+    for job in jobs:
+        for variant in range(job['num_variants']):
+            items.append({
+                'collection': job['collection'],
+                'num_variants': job['num_variants'],
+                'file_name': job.get('file_name'),
+                'variant': variant})
+    return items
+
+
+def shard_work_items(items, num_shards):
+    """Distribute work items between shards round robin.
+
+    Variants of the same tile are spread across shards so large tiles don't all end up
+    in the same worker.
+
+    Args:
+        items (list): work items
+        num_shards (int): number of shards
+
+    Returns:
+        list[list]: shards. Empty shards are not returned
+    """
+    shards = [items[i::num_shards] for i in range(num_shards)]
+    return [shard for shard in shards if shard]
+
+
+def export_sharded(context, jobs, export_path, num_workers):
+    """Export tile variants using num_workers background Blender processes.
+
+    Uses the export options in mt_scene_props. Blocks until all workers have finished.
+
+    Args:
+        context (bpy.context): context
+        jobs (list[dict]): jobs containing collection (str), num_variants (int) and
+        optionally file_name (str)
+        export_path (str): folder to export to
+        num_workers (int): maximum number of worker processes
+
+    Returns:
+        list[dict]: result for each work item containing collection, variant, files,
+        time and error
+    """
+    items = create_work_items(jobs)
+    shards = shard_work_items(items, num_workers)
+    if not shards:
+        return []
+
+    tmp_dir = tempfile.mkdtemp(prefix='maketile_export_')
+    blend_path = os.path.join(tmp_dir, 'export.blend')
+    bpy.ops.wm.save_as_mainfile(filepath=blend_path, copy=True, check_existing=False)
+
+    # share CPU threads between workers so bakes don't oversubscribe the machine
+    threads = max(1, (os.cpu_count() or 1) // len(shards))
+    expr = f'from {get_addon_name()}.operators.sharded_export import worker_main; worker_main()'
+
+    messages = Queue()
+    workers = []
+    for index, shard in enumerate(shards):
+        shard_path = os.path.join(tmp_dir, f'shard_{index}.json')
+        with open(shard_path, 'w') as shard_file:
+            json.dump({'export_path': export_path, 'items': shard}, shard_file)
+
+        process = subprocess.Popen(
+            [bpy.app.binary_path,
+             '--background',
+             '--threads', str(threads),
+             blend_path,
+             '--python-expr', expr,
+             '--', shard_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True)
+        reader = threading.Thread(
+            target=read_worker_output,
+            args=(index, process, messages),
+            daemon=True)
+        reader.start()
+        workers.append((process, reader, shard))
+
+    results = {}
+    finished = 0
+    total = len(items)
+    wm = context.window_manager
+    wm.progress_begin(0, total)
+    start = perf_counter()
+
+    while finished < len(workers):
+        index, message = messages.get()
+        if message is None:
+            finished += 1
+            continue
+        key = (message['collection'], message['variant'])
+        results[key] = message
+        wm.progress_update(len(results))
+        print_progress(len(results), total, index, message)
+
+    wm.progress_end()
+
+    # record items whose worker exited before reporting them
+    merged = []
+    for process, reader, shard in workers:
+        process.wait()
+        for item in shard:
+            key = (item['collection'], item['variant'])
+            merged.append(results.get(key, {
+                'collection': item['collection'],
+                'variant': item['variant'],
+                'files': [],
+                'time': 0.0,
+                'error': f'Worker exited with code {process.returncode}'}))
+
+    print(f'Exported {total} variants with {len(shards)} workers in {perf_counter() - start:.2f}s.')
+
+    try:
+        os.remove(blend_path)
+        for index in range(len(shards)):
+            os.remove(os.path.join(tmp_dir, f'shard_{index}.json'))
+        os.rmdir(tmp_dir)
+    except OSError:
+        pass
+
+    return merged
+
+
+def read_worker_output(index, process, messages):
+    """Read progress reports from a worker's output and put them on the messages queue.
+
+    Puts (index, None) on the queue once the worker's output closes.
+
+    Args:
+        index (int): worker index
+        process (subprocess.Popen): worker process
+        messages (queue.Queue): message queue
+    """
+    for line in process.stdout:
+        if line.startswith(PROGRESS_PREFIX):
+            messages.put((index, json.loads(line[len(PROGRESS_PREFIX):])))
+    process.stdout.close()
+    messages.put((index, None))
+
+
+def print_progress(done, total, index, message):
+    """Print the progress of a sharded export."""
+    if message['error']:
+        print(f"[{done}/{total}] worker {index}: {message['collection']} variant {message['variant']} failed: {message['error']}")
+    else:
+        print(f"[{done}/{total}] worker {index}: {message['collection']} variant {message['variant']} exported in {message['time']:.2f}s")
+
+
+def worker_main(argv=None):
+    """Entry point of worker processes. Exports the work items in a shard file.
+
+    Args:
+        argv (list[str], optional): arguments. Defaults to those after '--' in sys.argv.
+    """
+    # imported here as exporter imports this module
+    from .exporter import export_tile_variants
+
+    if argv is None:
+        argv = sys.argv[sys.argv.index('--') + 1:]
+
+    with open(argv[0]) as shard_file:
+        shard = json.load(shard_file)
+
+    context = bpy.context
+    orig_settings = set_cycles_to_bake_mode()
+
+    for item in shard['items']:
+        result = {
+            'collection': item['collection'],
+            'variant': item['variant'],
+            'files': [],
+            'time': 0.0,
+            'error': None}
+        start = perf_counter()
+        try:
+            collection = bpy.data.collections[item['collection']]
+            result['files'] = export_tile_variants(
+                context,
+                collection,
+                shard['export_path'],
+                item['num_variants'],
+                file_name=item['file_name'],
+                variants=[item['variant']])
+        except (RuntimeError, KeyError, ValueError) as err:
+            result['error'] = str(err)
+        result['time'] = perf_counter() - start
+        print(PROGRESS_PREFIX + json.dumps(result), flush=True)
+
+    reset_renderer_from_bake(orig_settings)
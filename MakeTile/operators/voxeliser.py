@@ -1,9 +1,6 @@
-import textwrap
 import bpy
-import addon_utils
 from bpy.types import Panel
-from .. lib.utils.collections import get_objects_owning_collections
-from ..lib.utils.selection import deselect_all, select, activate
+from .. lib.utils.mesh_repair import voxel_remesh_mesh, make_mesh_manifold
 
 class MT_PT_Voxelise_Panel(Panel):
     bl_order = 9
@@ -24,31 +21,11 @@ class MT_PT_Voxelise_Panel(Panel):
         scene_props = scene.mt_scene_props
         layout = self.layout
 
-        char_width = 9  # TODO find a way of actually getting this rather than guessing
-        print_tools_txt = "For more options please enable the 3D print Tools addon included with blender"
-
-        # get panel width so we can line wrap print_tools_txt
-        tool_shelf = None
-        area = bpy.context.area
-
-        for region in area.regions:
-            if region.type == 'UI':
-                tool_shelf = region
-
-        width = tool_shelf.width / char_width
-        wrapped = textwrap.wrap(print_tools_txt, width)
-
         layout.operator('scene.mt_voxelise_objects', text='Voxelise Objects')
         layout.prop(scene_props, 'voxel_size')
         layout.prop(scene_props, 'voxel_adaptivity')
         layout.prop(scene_props, 'voxel_merge')
-
-        if addon_utils.check("object_print3d_utils") == (True, True):
-            layout.prop(scene_props, 'fix_non_manifold')
-        else:
-            for line in wrapped:
-                row = layout.row()
-                row.label(text=line)
+        layout.prop(scene_props, 'fix_non_manifold')
 
 
 class MT_OT_Object_Voxeliser(bpy.types.Operator):
@@ -108,40 +85,32 @@ class MT_OT_Object_Voxeliser(bpy.types.Operator):
 def voxelise(context, obj):
     """Voxelise the passed in object.
 
+    Doesn't change the selection so can be used on objects that aren't in the view layer.
+
     Args:
         obj (bpy.types.Object): object to be voxelised
     """
     props = context.scene.mt_scene_props
+    old_mesh = obj.data
+    obj.data = voxel_remesh_mesh(old_mesh, props.voxel_size, props.voxel_adaptivity)
     obj.data.remesh_voxel_size = props.voxel_size
     obj.data.remesh_voxel_adaptivity = props.voxel_adaptivity
-
-    ctx = {
-        'object': obj,
-        'active_object': obj,
-        'selected_objects': [obj],
-        'selected_editable_objects': [obj]}
-
-    bpy.ops.object.voxel_remesh(ctx)
+    if old_mesh.users == 0:
+        bpy.data.meshes.remove(old_mesh)
     obj.mt_object_props.geometry_type = 'VOXELISED'
 
 
 def make_manifold(context, obj):
-    """Make the passed in object manifold using the 3dPrint toolkit addon
+    """Make the passed in object's mesh manifold.
+
+    Merges doubles, removes degenerate and loose geometry, fills holes and makes normals
+    consistent. See lib.utils.mesh_repair.
 
     Args:
         context (bpy.context): context
         obj (bpy.types.Object): object
+
+    Returns:
+        bool: True if the mesh is now manifold
     """
-    # TODO See if we can speed this up by calling the individual methods of the print3D toolkit
-    # check 3d print toolkit is installed and active
-    if addon_utils.check("object_print3d_utils") == (True, True):
-        selected = context.selected_objects
-        active = context.active_object
-        deselect_all()
-        select(obj.name)
-        activate(obj.name)
-        bpy.ops.mesh.print3d_clean_non_manifold()
-        deselect_all()
-        for obj in selected:
-            select(obj.name)
-        activate(active.name)
+    return make_mesh_manifold(obj.data)
@@ -19,6 +19,7 @@ from .tile_creation.create_tile import (
     create_main_part_blueprint_enums)
 from .utils.registration import get_prefs
 from .app_handlers import create_default_materials
+from .lib.utils.bake_cache import bake_cache
 
 
 class MT_DefaultMaterial(PropertyGroup):
@@ -108,6 +109,26 @@ class MT_MakeTilePreferences(bpy.types.AddonPreferences):
         name="Default Materials",
         type=MT_DefaultMaterial)
 
+    geometry_cache_size: IntProperty(
+        name="Geometry Cache Size (MB)",
+        description="Memory to use for caching generated tile geometry so unchanged parts are reused when redoing. 0 disables the cache",
+        default=256,
+        min=0
+    )
+
+    use_bake_cache: BoolProperty(
+        name="Cache Displacement Maps",
+        description="Save baked displacement maps to the bake cache folder and reuse them for unchanged tiles. Cached maps are referenced rather than packed into the .blend file",
+        default=True
+    )
+
+    bake_cache_path: StringProperty(
+        name="Bake Cache Folder",
+        subtype='DIR_PATH',
+        description="Folder to save cached displacement maps to",
+        default=os.path.join(user_path, 'MakeTile', 'bake_cache')
+    )
+
     default_mat_behaviour: EnumProperty(
         name="Default Material Behaviour",
         description="Append linked materials on tile generation?",
@@ -123,6 +144,11 @@ class MT_MakeTilePreferences(bpy.types.AddonPreferences):
         layout.prop(self, 'default_export_path')
         layout.prop(self, 'default_units')
         layout.prop(self, 'default_mat_behaviour')
+        layout.prop(self, 'geometry_cache_size')
+        layout.prop(self, 'use_bake_cache')
+        row = layout.row()
+        row.prop(self, 'bake_cache_path')
+        row.operator('addons.mt_clear_bake_cache')
         layout.label(text="Default Materials:")
         # Draw list of default materials
         i = 0
@@ -151,6 +177,17 @@ class MT_OT_Restore_Default_Materials(Operator):
         return {'FINISHED'}
 
 
+class MT_OT_Clear_Bake_Cache(Operator):
+    bl_idname = "addons.mt_clear_bake_cache"
+    bl_label = "Clear Bake Cache"
+    bl_description = "Delete all cached displacement maps. Objects using them will need to be baked again."
+
+    def execute(self, context):
+        removed = bake_cache.clear()
+        self.report({'INFO'}, str(removed) + " cached displacement maps deleted.")
+        return {'FINISHED'}
+
+
 class MT_OT_Add_Active_Material_To_Defaults(Operator):
     bl_idname = "addons.mt_add_active_mat_to_defaults"
     bl_label = "Add Active Material to Default List"
@@ -1,6 +1,7 @@
 import bpy
 from bpy.types import PropertyGroup
 from ..enums.enums import geometry_types, boolean_types
+from ..operators.freeze_cutters import freeze_cutters
 # A cutter item used by cutters_collection
 
 
@@ -8,8 +9,12 @@ class MT_Cutter_Item(PropertyGroup):
     def update_use_cutter(self, context):
         if self.parent != "":
             parent_obj = bpy.data.objects[self.parent]
-            bool_mod = parent_obj.modifiers[self.name + '.bool']
-            bool_mod.show_viewport = self.value
+            # frozen objects are re-baked with the new set of cutters
+            if parent_obj.mt_object_props.cutters_frozen:
+                freeze_cutters(context, [parent_obj])
+            else:
+                bool_mod = parent_obj.modifiers[self.name + '.bool']
+                bool_mod.show_viewport = self.value
 
     name: bpy.props.StringProperty(
         name="Cutter Name",
@@ -102,6 +107,41 @@ class MT_Object_Properties(PropertyGroup):
         description="Collection of booleans that can be turned on or off by MakeTile."
     )
 
+    cutters_frozen: bpy.props.BoolProperty(
+        name="Cutters Frozen",
+        default=False,
+        description="Whether this object's booleans have been baked into its mesh"
+    )
+
+    unfrozen_mesh: bpy.props.PointerProperty(
+        name="Unfrozen Mesh",
+        type=bpy.types.Mesh,
+        description="The mesh the object had before its booleans were frozen"
+    )
+
+    displacement_applied: bpy.props.BoolProperty(
+        name="Displacement Applied",
+        default=False,
+        description="Whether this object's displacement has been written to its mesh"
+    )
+
+    preview_mesh: bpy.props.PointerProperty(
+        name="Preview Mesh",
+        type=bpy.types.Mesh,
+        description="The mesh the object had before its displacement was written to its mesh"
+    )
+
+    displaced_mesh: bpy.props.PointerProperty(
+        name="Displaced Mesh",
+        type=bpy.types.Mesh,
+        description="The last displaced mesh written for this object. Reused if nothing has changed"
+    )
+
+    displaced_mesh_key: bpy.props.StringProperty(
+        name="Displaced Mesh Key",
+        default=""
+    )
+
     disp_mod_name: bpy.props.StringProperty(
         name="Displacement Modifier Name",
         default='MT Displacement'
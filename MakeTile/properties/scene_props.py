@@ -8,11 +8,14 @@ from bpy.props import (
     PointerProperty)
 from ..enums.enums import (
     units,
-    material_mapping)
+    material_mapping,
+    displacement_engines,
+    displacement_modes)
 from ..tile_creation.create_tile import MT_Tile_Generator
 from ..lib.utils.utils import get_all_subclasses, get_annotations
 from ..tile_creation.create_tile import create_tile_type_enums
-from ..app_handlers import load_tile_defaults
+from ..lib.utils.tile_defaults import tile_defaults_registry
+from ..lib.utils.displaced_mesh import update_displaced_mesh
 
 def update_disp_strength(self, context):
     """Update the displacement strength of the maketile displacement modifier on active object.
@@ -28,6 +31,8 @@ def update_disp_strength(self, context):
             obj.modifiers[obj_props.disp_mod_name].strength = context.scene.mt_scene_props.displacement_strength
         except KeyError:
             pass
+        else:
+            update_displaced_mesh(obj)
 
 
 def update_disp_subdivisions(self, context):
@@ -40,6 +45,8 @@ def update_disp_subdivisions(self, context):
             obj.modifiers[obj_props.subsurf_mod_name].levels = context.scene.mt_scene_props.subdivisions
         except KeyError:
             pass
+        else:
+            update_displaced_mesh(obj)
 
 
 def update_material_mapping(self, context):
@@ -83,40 +90,26 @@ def reset_part_defaults(self, context):
     tile_type = self.tile_type
     base_blueprint = self.base_blueprint
     main_part_blueprint = self.main_part_blueprint
-    tile_defaults = load_tile_defaults(context)
-    for tile in tile_defaults:
-        if tile['type'] == tile_type:
-            defaults = tile['defaults']
-            base_defaults = defaults['base_defaults']
-            for key, value in base_defaults.items():
-                if key == base_blueprint:
-                    for k, v in value.items():
-                        setattr(self, k, v)
-                    break
-            try:
-                main_part_defaults = defaults['tile_defaults']
-                for key, value in main_part_defaults.items():
-                    if key == main_part_blueprint:
-                        for k, v in value.items():
-                            setattr(self, k, v)
-                        break
-            # Some tiles like mini bases don;t have main parts
-            except KeyError:
-                pass
+
+    base_defaults = tile_defaults_registry.get_blueprint_defaults(
+        tile_type, 'base_defaults', base_blueprint)
+    for key, value in base_defaults.items():
+        setattr(self, key, value)
+
+    # Some tiles like mini bases don't have main parts
+    main_part_defaults = tile_defaults_registry.get_blueprint_defaults(
+        tile_type, 'tile_defaults', main_part_blueprint)
+    for key, value in main_part_defaults.items():
+        setattr(self, key, value)
 
 def update_scene_defaults(self, context):
     tile_type = self.tile_type
-    tile_defaults = load_tile_defaults(context)
-    for tile in tile_defaults:
-        if tile['type'] == tile_type:
-            defaults = tile['defaults']
-            for key, value in defaults.items():
-                if hasattr(self, key):
-                    try:
-                        setattr(self, key, value)
-                    except TypeError:
-                        pass
-            break
+    for key, value in tile_defaults_registry.get_defaults(tile_type).items():
+        if hasattr(self, key):
+            try:
+                setattr(self, key, value)
+            except TypeError:
+                pass
     reset_part_defaults(self, context)
 
 def create_scene_props():
@@ -154,6 +147,24 @@ def create_scene_props():
             min=1024,
             max=8192,
             step=1024),
+        "displacement_engine": EnumProperty(
+            name="Bake Engine",
+            items=displacement_engines,
+            description="How displacement maps are created when making a tile 3D or exporting. NumPy is faster but only supports some material nodes",
+            default='CYCLES'),
+        "displacement_mode": EnumProperty(
+            name="Displacement Mode",
+            items=displacement_modes,
+            description="How to displace tiles once their displacement maps have been baked",
+            default='MODIFIER'),
+        "tiled_bake": BoolProperty(
+            name="Tiled Bake",
+            description="Bake displacement maps in tiles straight to a 16 bit image on disk so memory use doesn't grow with resolution. NumPy bake engine only",
+            default=False),
+        "bake_atlas": BoolProperty(
+            name="Atlas Bake",
+            description="When making several tiles 3D bake every map Cycles has to bake in one atlas image with a single bake instead of one bake per tile",
+            default=False),
         "voxel_size": FloatProperty(
             name="Voxel Size",
             description="Quality of the voxelisation. Smaller = Better",
@@ -200,6 +211,12 @@ def create_scene_props():
             name="Variants",
             description="Number of variants of tile to export",
             default=1),
+        "export_workers": IntProperty(
+            name="Export Processes",
+            description="Number of background Blender processes to split exports between. 1 exports in this process",
+            default=1,
+            min=1,
+            soft_max=32),
         "randomise_on_export": BoolProperty(
             name="Randomise",
             description="Create random variant on export?",
@@ -11,8 +11,14 @@ from .. lib.utils.utils import get_all_subclasses
 from .. lib.utils.selection import activate
 from .. lib.utils.collections import (
     add_object_to_collection)
+from .. lib.utils.library_cache import (
+    get_library_meshes,
+    copy_library_objects)
 from .create_tile import (
     spawn_empty_base,
+    spawn_no_prefab,
+    spawn_tile_parts,
+    prefab_registry,
     convert_to_displacement_core,
     set_bool_obj_props,
     set_bool_props,
@@ -82,6 +88,7 @@ class MT_PT_Connecting_Column_Panel(Panel):
 
         if scene_props.base_blueprint not in ('PLAIN', 'NONE'):
             layout.prop(scene_props, 'base_socket_type')
+            layout.prop(scene_props, 'clip_cutter_mode')
 
         layout.label(text="Material")
         layout.prop(scene_props, 'column_material')
@@ -152,31 +159,6 @@ class MT_OT_Make_Connecting_Column_Tile(Operator, MT_Tile_Generator):
         items=create_material_enums,
         name="Column Material")
 
-    # @profile
-    def exec(self, context):
-        base_blueprint = self.base_blueprint
-        core_blueprint = self.main_part_blueprint
-        tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-
-        if base_blueprint == 'NONE':
-            base = spawn_empty_base(tile_props)
-        elif base_blueprint == 'OPENLOCK':
-            base = spawn_openlock_base(self, tile_props)
-        elif base_blueprint == 'PLAIN':
-            base = spawn_plain_base(tile_props)
-
-        if core_blueprint == 'NONE':
-            core = None
-        elif core_blueprint == 'OPENLOCK':
-            core = spawn_openlock_connecting_column_core(
-                self, tile_props, base)
-        elif core_blueprint == 'PLAIN':
-            core = spawn_plain_connecting_column_core(self, tile_props)
-
-        self.finalise_tile(context, base, core)
-        #profile.dump_stats(splitext(__file__)[0] + '.prof')
-        return {'FINISHED'}
-
     def execute(self, context):
         """Execute the operator."""
         super().execute(context)
@@ -184,14 +166,6 @@ class MT_OT_Make_Connecting_Column_Tile(Operator, MT_Tile_Generator):
             return {'PASS_THROUGH'}
         return self.exec(context)
 
-    def init(self, context):
-        super().init(context)
-        tile_collection = bpy.data.collections[self.tile_name]
-        tile_props = tile_collection.mt_tile_props
-        tile_props.collection_type = "TILE"
-        tile_props.tile_size = (self.tile_x, self.tile_y, self.tile_z)
-        tile_props.base_size = (self.base_x, self.base_y, self.base_z)
-
     def draw(self, context):
         super().draw(context)
         layout = self.layout
@@ -202,6 +176,7 @@ class MT_OT_Make_Connecting_Column_Tile(Operator, MT_Tile_Generator):
         layout.prop(self, 'column_socket_style')
         if self.base_blueprint not in ('PLAIN', 'NONE'):
             layout.prop(self, 'base_socket_type')
+            layout.prop(self, 'clip_cutter_mode')
 
         layout.prop(self, 'displacement_thickness')
 
@@ -242,7 +217,7 @@ class MT_OT_Make_Openlock_Connecting_Column_Base(MT_Tile_Generator, Operator):
     def execute(self, context):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_openlock_base(self, tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
         return{'FINISHED'}
 
 
@@ -258,7 +233,7 @@ class MT_OT_Make_Plain_Connecting_Column_Base(MT_Tile_Generator, Operator):
     def execute(self, context):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_plain_base(tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
         return{'FINISHED'}
 
 
@@ -274,7 +249,7 @@ class MT_OT_Make_Empty_Connecting_Column_Base(MT_Tile_Generator, Operator):
     def execute(self, context):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_empty_base(tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
         return{'FINISHED'}
 
 
@@ -291,7 +266,7 @@ class MT_OT_Make_Plain_Connecting_Column_Core(MT_Tile_Generator, Operator):
     def execute(self, context):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_plain_connecting_column_core(self, tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
         return{'FINISHED'}
 
 
@@ -310,7 +285,7 @@ class MT_OT_Make_Openlock_Connecting_Column_Core(MT_Tile_Generator, Operator):
         """Execute the operator."""
         base = bpy.data.objects[self.base_name]
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_openlock_connecting_column_core(self, tile_props, base)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint, base=base)
         return{'FINISHED'}
 
 
@@ -328,6 +303,7 @@ class MT_OT_Make_Empty_Connecting_Column_Core(MT_Tile_Generator, Operator):
         return {'PASS_THROUGH'}
 
 
+@prefab_registry.register('CONNECTING_COLUMN_BASE', 'PLAIN')
 def spawn_plain_base(tile_props):
     """Spawn a plain base into the scene.
 
@@ -354,11 +330,13 @@ def spawn_plain_base(tile_props):
     return base
 
 
-def spawn_plain_connecting_column_core(self, tile_props):
+@prefab_registry.register('CONNECTING_COLUMN_CORE', 'PLAIN')
+def spawn_plain_connecting_column_core(tile_props, base=None):
     """Return the column core.
 
     Args:
         tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+        base (bpy.types.Object, optional): tile base. Unused. Defaults to None.
 
     Returns:
         bpy.types.Object: core
@@ -366,23 +344,23 @@ def spawn_plain_connecting_column_core(self, tile_props):
     column_type = tile_props.column_type
     socket_style = tile_props.column_socket_style
     if socket_style == 'TEXTURED':
-        core = spawn_generic_core(self, tile_props)
+        core = spawn_generic_core(tile_props)
         textured_vertex_groups = ['Front', 'Back', 'Left', 'Right']
     else:
         if column_type == 'I':
-            core = spawn_I_core(self, tile_props)
+            core = spawn_I_core(tile_props)
             textured_vertex_groups = ['Front', 'Back']
         elif column_type == 'L':
-            core = spawn_L_core(self, tile_props)
+            core = spawn_L_core(tile_props)
             textured_vertex_groups = ['Front', 'Left']
         elif column_type == 'O':
-            core = spawn_O_core(self, tile_props)
+            core = spawn_O_core(tile_props)
             textured_vertex_groups = ['Front', 'Back', 'Left']
         elif column_type == 'T':
-            core = spawn_T_core(self, tile_props)
+            core = spawn_T_core(tile_props)
             textured_vertex_groups = ['Front']
         elif column_type == 'X':
-            core = spawn_X_core(self, tile_props)
+            core = spawn_X_core(tile_props)
             textured_vertex_groups = []
 
     subsurf = add_subsurf_modifier(core)
@@ -398,7 +376,8 @@ def spawn_plain_connecting_column_core(self, tile_props):
 # @profile
 
 
-def spawn_openlock_connecting_column_core(self, tile_props, base):
+@prefab_registry.register('CONNECTING_COLUMN_CORE', 'OPENLOCK')
+def spawn_openlock_connecting_column_core(tile_props, base):
     """Return the column core.
 
     Args:
@@ -415,9 +394,9 @@ def spawn_openlock_connecting_column_core(self, tile_props, base):
 
     if column_type == 'I':
         if socket_style == 'TEXTURED':
-            core = spawn_generic_core(self, tile_props)
+            core = spawn_generic_core(tile_props)
         else:
-            core = spawn_I_core(self, tile_props)
+            core = spawn_I_core(tile_props)
             textured_vertex_groups = ['Front', 'Back']
         subsurf = add_subsurf_modifier(core)
         cutters = spawn_openlock_I_cutters(
@@ -425,9 +404,9 @@ def spawn_openlock_connecting_column_core(self, tile_props, base):
             tile_props)
     elif column_type == 'L':
         if socket_style == 'TEXTURED':
-            core = spawn_generic_core(self, tile_props)
+            core = spawn_generic_core(tile_props)
         else:
-            core = spawn_L_core(self, tile_props)
+            core = spawn_L_core(tile_props)
             textured_vertex_groups = ['Front', 'Left']
         subsurf = add_subsurf_modifier(core)
         cutters = spawn_openlock_L_cutters(
@@ -435,9 +414,9 @@ def spawn_openlock_connecting_column_core(self, tile_props, base):
             tile_props)
     elif column_type == 'O':
         if socket_style == 'TEXTURED':
-            core = spawn_generic_core(self, tile_props)
+            core = spawn_generic_core(tile_props)
         else:
-            core = spawn_O_core(self, tile_props)
+            core = spawn_O_core(tile_props)
             textured_vertex_groups = ['Front', 'Back', 'Left']
         subsurf = add_subsurf_modifier(core)
         cutters = spawn_openlock_O_cutters(
@@ -445,9 +424,9 @@ def spawn_openlock_connecting_column_core(self, tile_props, base):
             tile_props)
     elif column_type == 'T':
         if socket_style == 'TEXTURED':
-            core = spawn_generic_core(self, tile_props)
+            core = spawn_generic_core(tile_props)
         else:
-            core = spawn_T_core(self, tile_props)
+            core = spawn_T_core(tile_props)
             textured_vertex_groups = ['Front']
         subsurf = add_subsurf_modifier(core)
         cutters = spawn_openlock_T_cutters(
@@ -455,9 +434,9 @@ def spawn_openlock_connecting_column_core(self, tile_props, base):
             tile_props)
     elif column_type == 'X':
         if socket_style == 'TEXTURED':
-            core = spawn_generic_core(self, tile_props)
+            core = spawn_generic_core(tile_props)
         else:
-            core = spawn_X_core(self, tile_props)
+            core = spawn_X_core(tile_props)
             textured_vertex_groups = []
         subsurf = add_subsurf_modifier(core)
         cutters = spawn_openlock_X_cutters(
@@ -507,10 +486,8 @@ def spawn_openlock_L_cutters(base, tile_props):
         "openlock.blend")
 
     # load side cutter and add to collection
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
-
-    bottom_right_cutter = data_to.objects[0].copy()
+    bottom_right_cutter = copy_library_objects(
+        booleans_path, ['openlock.wall.cutter.side'])[0]
     bottom_right_cutter.name = 'Right Bottom.' + tile_name
 
     add_object_to_collection(bottom_right_cutter, tile_name)
@@ -601,10 +578,8 @@ def spawn_openlock_T_cutters(base, tile_props):
         "openlock.blend")
 
     # load side cutter and add to collection
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
-
-    bottom_left_cutter = data_to.objects[0].copy()
+    bottom_left_cutter = copy_library_objects(
+        booleans_path, ['openlock.wall.cutter.side'])[0]
     bottom_left_cutter.name = 'Left Bottom.' + tile_name
 
     add_object_to_collection(bottom_left_cutter, tile_name)
@@ -722,10 +697,8 @@ def spawn_openlock_X_cutters(base, tile_props):
         "openlock.blend")
 
     # load side cutter and add to collection
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
-
-    bottom_left_cutter = data_to.objects[0].copy()
+    bottom_left_cutter = copy_library_objects(
+        booleans_path, ['openlock.wall.cutter.side'])[0]
     bottom_left_cutter.name = 'Left Bottom.' + tile_name
 
     add_object_to_collection(bottom_left_cutter, tile_name)
@@ -873,14 +846,13 @@ def spawn_socket_buffers(cutters, tile_props):
         "openlock.blend")
 
     # load buffer mesh
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.meshes = ['socket_buffer']
+    buffer_mesh = get_library_meshes(booleans_path, ['socket_buffer'])[0]
 
     buffers = []
 
     for cutter in cutters:
         buffer = cutter.copy()
-        buffer.data = data_to.meshes[0].copy()
+        buffer.data = buffer_mesh
         buffer.name = 'Buffer ' + cutter.name
         add_object_to_collection(buffer, tile_props.tile_name)
         buffers.append(buffer)
@@ -910,10 +882,8 @@ def spawn_openlock_I_cutters(base, tile_props):
         "openlock.blend")
 
     # load side cutter and add to collection
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
-
-    bottom_left_cutter = data_to.objects[0].copy()
+    bottom_left_cutter = copy_library_objects(
+        booleans_path, ['openlock.wall.cutter.side'])[0]
     bottom_left_cutter.name = 'Left Bottom.' + tile_name
 
     add_object_to_collection(bottom_left_cutter, tile_name)
@@ -994,10 +964,8 @@ def spawn_openlock_O_cutters(base, tile_props):
         "openlock.blend")
 
     # load side cutter and add to collection
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
-
-    bottom_cutter = data_to.objects[0].copy()
+    bottom_cutter = copy_library_objects(
+        booleans_path, ['openlock.wall.cutter.side'])[0]
     bottom_cutter.name = 'Bottom.' + tile_name
 
     add_object_to_collection(bottom_cutter, tile_name)
@@ -1036,7 +1004,7 @@ def spawn_openlock_O_cutters(base, tile_props):
     return cutters
 
 
-def spawn_generic_core(self, tile_props):
+def spawn_generic_core(tile_props):
     """Spawn column core.
 
     Args:
@@ -1085,7 +1053,7 @@ def spawn_generic_core(self, tile_props):
     return core
 
 
-def spawn_I_core(self, tile_props):
+def spawn_I_core(tile_props):
     """Spawn column core.
 
     Args:
@@ -1133,7 +1101,7 @@ def spawn_I_core(self, tile_props):
     return core
 
 
-def spawn_L_core(self, tile_props):
+def spawn_L_core(tile_props):
     """Spawn column core.
 
     Args:
@@ -1182,7 +1150,7 @@ def spawn_L_core(self, tile_props):
     return core
 
 
-def spawn_O_core(self, tile_props):
+def spawn_O_core(tile_props):
     """Spawn column core.
 
     Args:
@@ -1231,7 +1199,7 @@ def spawn_O_core(self, tile_props):
     return core
 
 
-def spawn_T_core(self, tile_props):
+def spawn_T_core(tile_props):
     """Spawn column core.
 
     Args:
@@ -1279,7 +1247,7 @@ def spawn_T_core(self, tile_props):
     return core
 
 
-def spawn_X_core(self, tile_props):
+def spawn_X_core(tile_props):
     """Spawn column core.
 
     Args:
@@ -1289,7 +1257,7 @@ def spawn_X_core(self, tile_props):
         bpy.types.Object: Core
     """
     # we only ever want texture on the top of our X column so use the rectangular floor core
-    core = spawn_floor_core(self, tile_props)
+    core = spawn_floor_core(tile_props)
 
     return core
 
@@ -1761,3 +1729,21 @@ def finalise_core(core, tile_props):
     obj_props = core.mt_object_props
     obj_props.is_mt_object = True
     obj_props.tile_name = tile_props.tile_name
+
+
+prefab_registry.register('CONNECTING_COLUMN_BASE', 'OPENLOCK', spawn_openlock_base)
+prefab_registry.register('CONNECTING_COLUMN_BASE', 'NONE', spawn_empty_base)
+prefab_registry.register('CONNECTING_COLUMN_CORE', 'NONE', spawn_no_prefab)
+
+
+@prefab_registry.register('CONNECTING_COLUMN', 'CUSTOM')
+def spawn_connecting_column_tile(tile_props):
+    """Spawn a connecting column tile.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base with the core parented to it
+    """
+    return spawn_tile_parts(tile_props, 'CONNECTING_COLUMN_BASE', 'CONNECTING_COLUMN_CORE')
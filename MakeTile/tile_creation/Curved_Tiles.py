@@ -12,16 +12,22 @@ from bpy.props import (
 
 from ..lib.utils.collections import (
     add_object_to_collection)
+from ..lib.utils.library_cache import copy_library_objects
 
 from ..utils.registration import get_prefs
 
-from ..lib.bmturtle.scripts import (
-    draw_straight_wall_core,
-    draw_rectangular_floor_core,
-    draw_curved_cuboid)
+from ..lib.bmturtle.scripts import draw_curved_cuboid
+
+from ..lib.bmturtle.grid_cores import (
+    build_straight_wall_core,
+    build_rectangular_floor_core)
 
 from ..lib.bmturtle.helpers import bmesh_array
 
+from ..lib.utils.mesh_cache import (
+    cached_mesh_object,
+    tile_geometry_key)
+
 from ..lib.utils.selection import (
     deselect_all,
     select,
@@ -30,6 +36,11 @@ from ..lib.utils.selection import (
 from .create_tile import (
     convert_to_displacement_core,
     spawn_empty_base,
+    spawn_no_prefab,
+    spawn_tile_parts,
+    prefab_registry,
+    parent_to_base,
+    get_base_socket_filename,
     set_bool_obj_props,
     set_bool_props,
     load_openlock_top_peg,
@@ -223,56 +234,13 @@ class MT_OT_Make_Curved_Wall_Tile(Operator, MT_Curved_Tile, MT_Tile_Generator):
         items=create_material_enums,
         name="Wall Material")
 
-    # @profile
-    def exec(self, context):
-        scene = context.scene
-        scene_props = scene.mt_scene_props
-        base_blueprint = self.base_blueprint
-        wall_blueprint = self.main_part_blueprint
-        tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        floor_core = None
-
-        if base_blueprint == 'NONE':
-            base = spawn_empty_base(tile_props)
-        elif base_blueprint in ['PLAIN']:
-            base = spawn_plain_base(self, tile_props)
-        elif base_blueprint in ['OPENLOCK']:
-            base = spawn_openlock_base(self, tile_props)
-        elif base_blueprint in ['PLAIN_S_WALL', 'OPENLOCK_S_WALL']:
-            base, floor_core = spawn_s_base(self, context, tile_props)
-        if not base:
-            self.delete_tile_collection(self.tile_name)
-            self.report({'INFO'}, "Could not generate base. Cancelling")
-            return {'CANCELLED'}
-
-        if wall_blueprint == 'NONE':
-            wall_core = None
-        elif wall_blueprint == 'PLAIN':
-            wall_core = spawn_plain_wall_cores(self, tile_props)
-        elif wall_blueprint == 'OPENLOCK':
-            wall_core = spawn_openlock_wall_cores(self, base, tile_props)
-
-
-        self.finalise_tile(context, base, wall_core, floor_core)
-
-        # profile.dump_stats(splitext(__file__)[0] + '.prof')
-        return {'FINISHED'}
-
     def execute(self, context):
         """Execute the operator."""
         super().execute(context)
         if not self.refresh:
-            return{'PASS_THROUGH'}
+            return {'PASS_THROUGH'}
         return self.exec(context)
 
-    def init(self, context):
-        super().init(context)
-        tile_collection = bpy.data.collections[self.tile_name]
-        tile_props = tile_collection.mt_tile_props
-        tile_props.collection_type = "TILE"
-        tile_props.tile_size = (self.tile_x, self.tile_y, self.tile_z)
-        tile_props.base_size = (self.base_x, self.base_y, self.base_z)
-
     def draw(self, context):
         super().draw(context)
         layout = self.layout
@@ -295,41 +263,13 @@ class MT_OT_Make_Curved_Floor_Tile(Operator, MT_Curved_Tile, MT_Tile_Generator):
         items=create_material_enums,
         name="Floor Material")
 
-    def exec(self, context):
-        base_blueprint = self.base_blueprint
-        core_blueprint = self.main_part_blueprint
-        tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-
-        if base_blueprint == 'NONE':
-            base = spawn_empty_base(tile_props)
-        elif base_blueprint == 'OPENLOCK':
-            base = spawn_openlock_base(self, tile_props)
-        elif base_blueprint == 'PLAIN':
-            base = spawn_plain_base(self, tile_props)
-
-        if core_blueprint == 'NONE':
-            core = None
-        else:
-            core = spawn_plain_floor_cores(self, tile_props)
-
-        self.finalise_tile(context, base, core)
-        return {'FINISHED'}
-
     def execute(self, context):
         """Execute the operator."""
         super().execute(context)
         if not self.refresh:
-            return{'PASS_THROUGH'}
+            return {'PASS_THROUGH'}
         return self.exec(context)
 
-    def init(self, context):
-        super().init(context)
-        tile_collection = bpy.data.collections[self.tile_name]
-        tile_props = tile_collection.mt_tile_props
-        tile_props.collection_type = "TILE"
-        tile_props.tile_size = (self.tile_x, self.tile_y, self.tile_z)
-        tile_props.base_size = (self.base_x, self.base_y, self.base_z)
-
     def draw(self, context):
         super().draw(context)
         layout = self.layout
@@ -338,12 +278,14 @@ class MT_OT_Make_Curved_Floor_Tile(Operator, MT_Curved_Tile, MT_Tile_Generator):
         redo_curved_tiles_panel(self, layout)
         redo_tile_panel_footer(self, layout)
 
-def spawn_plain_wall_cores(self, tile_props):
+
+@prefab_registry.register('CURVED_WALL_CORE', 'PLAIN')
+def spawn_plain_wall_cores(tile_props, base=None):
     """Spawn plain wall cores into scene.
 
     Args:
-        base (bpy.types.Object): tile base
         tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+        base (bpy.types.Object, optional): tile base. Unused. Defaults to None.
 
     Returns:
         (bpy.types.Object): core
@@ -351,7 +293,7 @@ def spawn_plain_wall_cores(self, tile_props):
     offset = (tile_props.base_size[1] - tile_props.tile_size[1]) / 2
     tile_props.core_radius = tile_props.base_radius + offset
     textured_vertex_groups = ['Front', 'Back']
-    core = spawn_wall_core(self, tile_props)
+    core = spawn_wall_core(tile_props)
     material = tile_props.wall_material
     subsurf = add_subsurf_modifier(core)
     convert_to_displacement_core(
@@ -363,12 +305,13 @@ def spawn_plain_wall_cores(self, tile_props):
     return core
 
 
-def spawn_openlock_wall_cores(self, base, tile_props):
+@prefab_registry.register('CURVED_WALL_CORE', 'OPENLOCK')
+def spawn_openlock_wall_cores(tile_props, base):
     """Spawn OpenLOCK wall cores into scene.
 
     Args:
-        base (bpy.types.Object): tile base
         tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+        base (bpy.types.Object): tile base
 
     Returns:
         (bpy.types.Object): preview_core
@@ -376,7 +319,7 @@ def spawn_openlock_wall_cores(self, base, tile_props):
     offset = (tile_props.base_size[1] - tile_props.tile_size[1]) / 2
     tile_props.core_radius = tile_props.base_radius + offset
 
-    core = spawn_wall_core(self, tile_props)
+    core = spawn_wall_core(tile_props)
     subsurf = add_subsurf_modifier(core)
     cutters = spawn_openlock_wall_cutters(tile_props)
 
@@ -515,14 +458,12 @@ def spawn_openlock_wall_cutters(tile_props):
         "booleans",
         "openlock.blend")
 
-    # load side cutter
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
-
     cutters = []
 
     # left side cutters
-    left_cutter_bottom = data_to.objects[0].copy()
+    # cutter meshes are edited in place below so each needs its own mesh
+    left_cutter_bottom = copy_library_objects(
+        booleans_path, ['openlock.wall.cutter.side'], single_user=True)[0]
     left_cutter_bottom.name = 'X Neg Bottom.' + tile_name
     add_object_to_collection(left_cutter_bottom, tile_props.tile_name)
 
@@ -604,7 +545,8 @@ def spawn_openlock_wall_cutters(tile_props):
     return cutters
 
 
-def spawn_plain_base(self, tile_props):
+@prefab_registry.register('CURVED_BASE', 'PLAIN')
+def spawn_plain_base(tile_props):
     """Spawn a plain base into the scene.
 
     Args:
@@ -637,7 +579,7 @@ def spawn_plain_base(self, tile_props):
     return base
 
 
-def spawn_openlock_base_slot_cutter(self, base, tile_props, offset=0.236):
+def spawn_openlock_base_slot_cutter(base, tile_props, offset=0.236):
     """Spawns an openlock base slot cutter into the scene and positions it correctly.
 
     Args:
@@ -687,29 +629,47 @@ def spawn_openlock_base_slot_cutter(self, base, tile_props, offset=0.236):
     return slot_cutter
 
 
-def spawn_s_base(self, context, tile_props):
+@prefab_registry.register('CURVED_BASE', 'PLAIN_S_WALL')
+@prefab_registry.register('CURVED_BASE', 'OPENLOCK_S_WALL')
+def spawn_s_wall_base(tile_props):
+    """Prefab builder for S Bases.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base with the floor core parented to it
+    """
+    base, floor_core = spawn_s_base(tile_props)
+    parent_to_base(base, floor_core)
+    return base
+
+
+def spawn_s_base(tile_props):
     orig_base_size = [dim for dim in tile_props.base_size]
     if tile_props.wall_position == 'EXTERIOR':
         tile_props.base_size[1] = tile_props.base_size[1] - 0.09
 
-    if self.base_blueprint == 'PLAIN_S_WALL':
-        base = spawn_plain_base(self, tile_props)
+    if tile_props.base_blueprint == 'PLAIN_S_WALL':
+        base = spawn_plain_base(tile_props)
     else:
-        base = spawn_openlock_base(self, tile_props)
+        base = spawn_openlock_base(tile_props)
     tile_props.base_size = orig_base_size
 
     orig_tile_size = [dim for dim in tile_props.tile_size]
     tile_props.tile_size = (
         tile_props.base_size[0],
         tile_props.base_size[1],
-        context.scene.mt_scene_props.base_z + self.floor_thickness)
+        tile_props.base_z + tile_props.floor_thickness)
     if tile_props.wall_position in ['EXTERIOR', 'SIDE']:
         tile_props.tile_size[1] = tile_props.base_size[1] - 0.09
-    floor_core = spawn_plain_floor_cores(self, tile_props)
+    floor_core = spawn_plain_floor_cores(tile_props)
     tile_props.tile_size = orig_tile_size
     return base, floor_core
 
-def spawn_openlock_base(self, tile_props):
+
+@prefab_registry.register('CURVED_BASE', 'OPENLOCK')
+def spawn_openlock_base(tile_props):
     """Spawn OpenLOCK base into scene.
 
     Args:
@@ -732,7 +692,7 @@ def spawn_openlock_base(self, tile_props):
         height,
         width)
 
-    slot_cutter = spawn_openlock_base_slot_cutter(self, base, tile_props)
+    slot_cutter = spawn_openlock_base_slot_cutter(base, tile_props)
     set_bool_obj_props(slot_cutter, base, tile_props, 'DIFFERENCE')
     set_bool_props(slot_cutter, base, 'DIFFERENCE')
 
@@ -742,14 +702,14 @@ def spawn_openlock_base(self, tile_props):
     obj_props.geometry_type = 'BASE'
     obj_props.tile_name = tile_props.tile_name
 
-    spawn_openlock_base_clip_cutter(self, base, tile_props)
+    spawn_openlock_base_clip_cutter(base, tile_props)
 
     bpy.context.view_layer.objects.active = base
 
     return base
 
 
-def spawn_openlock_base_clip_cutter(self, base, tile_props):
+def spawn_openlock_base_clip_cutter(base, tile_props):
     """Spawn base clip cutter into scene.
 
     Args:
@@ -765,7 +725,7 @@ def spawn_openlock_base_clip_cutter(self, base, tile_props):
 
     # load base cutter
     preferences = get_prefs()
-    cutter_file = self.get_base_socket_filename()
+    cutter_file = get_base_socket_filename(tile_props.base_socket_type)
 
     booleans_path = os.path.join(
         preferences.assets_path,
@@ -773,10 +733,10 @@ def spawn_openlock_base_clip_cutter(self, base, tile_props):
         "booleans",
         cutter_file)
 
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.base.cutter.clip_single']
-
-    clip_cutter = data_to.objects[0]
+    clip_cutter = copy_library_objects(
+        booleans_path,
+        ['openlock.wall.base.cutter.clip_single'],
+        single_user=True)[0]
     add_object_to_collection(clip_cutter, tile_props.tile_name)
     deselect_all()
     select(clip_cutter.name)
@@ -850,18 +810,21 @@ def spawn_openlock_base_clip_cutter(self, base, tile_props):
     return clip_cutter
 
 
-def spawn_plain_floor_cores(self, tile_props):
+@prefab_registry.register('CURVED_FLOOR_CORE', 'PLAIN')
+@prefab_registry.register('CURVED_FLOOR_CORE', 'OPENLOCK')
+def spawn_plain_floor_cores(tile_props, base=None):
     """Spawn preview and displacement cores into scene.
 
     Args:
         tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+        base (bpy.types.Object, optional): tile base. Unused. Defaults to None.
 
     Returns:
         bpy.types.Object: preview core
     """
     textured_vertex_groups = ['Top']
     tile_props.core_radius = tile_props.base_radius
-    core = spawn_floor_core(self, tile_props)
+    core = spawn_floor_core(tile_props)
     material = tile_props.floor_material
     subsurf = add_subsurf_modifier(core)
     convert_to_displacement_core(
@@ -873,7 +836,7 @@ def spawn_plain_floor_cores(self, tile_props):
     return core
 
 
-def spawn_floor_core(self, tile_props):
+def spawn_floor_core(tile_props):
     """Spawn core into scene.
 
     Args:
@@ -898,10 +861,11 @@ def spawn_floor_core(self, tile_props):
     # displacement texture by disabling it in render and thus being able to use
     # standard projections
 
-    core = draw_rectangular_floor_core(
-        (floor_length,
-         width,
-         height),
+    core_size = (floor_length, width, height)
+    core = cached_mesh_object(
+        tile_geometry_key('CURVED_FLOOR_CORE', tile_props, core_size, native_subdivisions),
+        build_rectangular_floor_core,
+        core_size,
         native_subdivisions)
 
     core.name = tile_name + '.core'
@@ -919,11 +883,9 @@ def spawn_floor_core(self, tile_props):
     mod.deform_axis = 'Z'
     mod.angle = radians(-angle)
 
-    scene_props = bpy.context.scene.mt_scene_props
-
     # this controls whether the texture follows the curvature of the tile on render.
     # Useful for decorative elements.
-    if scene_props.curve_texture:
+    if tile_props.curve_texture:
         mod.show_render = False
 
     core.name = tile_props.tile_name + '.floor_core'
@@ -935,7 +897,7 @@ def spawn_floor_core(self, tile_props):
     return core
 
 
-def spawn_wall_core(self, tile_props):
+def spawn_wall_core(tile_props):
     """Spawn core into scene.
 
     Args:
@@ -963,10 +925,11 @@ def spawn_wall_core(self, tile_props):
     # displacement texture by disabling it in render and thus being able to use
     # standard projections
 
-    core = draw_straight_wall_core(
-        (wall_length,
-         width,
-         height),
+    core_size = (wall_length, width, height)
+    core = cached_mesh_object(
+        tile_geometry_key('CURVED_WALL_CORE', tile_props, core_size, native_subdivisions),
+        build_straight_wall_core,
+        core_size,
         native_subdivisions)
 
     core.name = tile_name + '.core'
@@ -1015,3 +978,34 @@ def spawn_wall_core(self, tile_props):
     obj_props.tile_name = tile_props.tile_name
 
     return core
+
+
+prefab_registry.register('CURVED_BASE', 'NONE', spawn_empty_base)
+prefab_registry.register('CURVED_WALL_CORE', 'NONE', spawn_no_prefab)
+prefab_registry.register('CURVED_FLOOR_CORE', 'NONE', spawn_no_prefab)
+
+
+@prefab_registry.register('CURVED_WALL', 'CUSTOM')
+def spawn_curved_wall_tile(tile_props):
+    """Spawn a curved wall tile.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base with the cores parented to it
+    """
+    return spawn_tile_parts(tile_props, 'CURVED_BASE', 'CURVED_WALL_CORE')
+
+
+@prefab_registry.register('CURVED_FLOOR', 'CUSTOM')
+def spawn_curved_floor_tile(tile_props):
+    """Spawn a curved floor tile.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base with the core parented to it
+    """
+    return spawn_tile_parts(tile_props, 'CURVED_BASE', 'CURVED_FLOOR_CORE')
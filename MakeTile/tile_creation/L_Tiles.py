@@ -10,6 +10,12 @@ from bpy.props import (
 
 from ..lib.utils.collections import (
     add_object_to_collection)
+from ..lib.utils.library_cache import (
+    get_library_objects,
+    copy_library_objects)
+from ..lib.utils.mesh_cache import (
+    cached_mesh_object,
+    tile_geometry_key)
 
 from ..utils.registration import get_prefs
 from ..lib.utils.selection import (
@@ -28,6 +34,11 @@ from ..lib.bmturtle.helpers import (
 from .create_tile import (
     convert_to_displacement_core,
     spawn_empty_base,
+    spawn_no_prefab,
+    spawn_tile_parts,
+    prefab_registry,
+    parent_to_base,
+    get_base_socket_filename,
     set_bool_props,
     set_bool_obj_props,
     load_openlock_top_peg,
@@ -136,57 +147,12 @@ class MT_OT_Make_L_Wall_Tile(Operator, MT_Tile_Generator, MT_L_Tiles):
         items=create_material_enums,
         name="Wall Material")
 
-    def exec(self, context):
-        base_blueprint = self.base_blueprint
-        wall_blueprint = self.main_part_blueprint
-        tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        floor_core = None
-
-        ### Generate Bases ###
-        if base_blueprint == 'NONE':
-            base = spawn_empty_base(tile_props)
-        elif base_blueprint == 'PLAIN':
-            base = spawn_plain_base(tile_props)
-        elif base_blueprint == 'OPENLOCK':
-            base = spawn_openlock_base(self, tile_props)
-        elif base_blueprint in ['PLAIN_S_WALL', 'OPENLOCK_S_WALL']:
-            base, floor_core = spawn_s_base(self, context, tile_props, base_blueprint)
-        if not base:
-            self.delete_tile_collection(self.tile_name)
-            self.report({'INFO'}, "Could not generate base. Cancelling")
-            return {'CANCELLED'}
-
-        ### Generate Walls ###
-        if wall_blueprint == 'NONE':
-            wall_core = None
-        elif wall_blueprint == 'PLAIN':
-            wall_core = spawn_plain_wall_cores(self, base, tile_props)
-        elif wall_blueprint == 'OPENLOCK':
-            wall_core = spawn_openlock_wall_cores(self, tile_props, base)
-
-        if wall_blueprint != 'NONE' and wall_core == None:
-            self.delete_tile_collection(self.tile_name)
-            self.report({'INFO'}, "Could not generate wall core. Cancelling.")
-            return {'CANCELLED'}
-
-        self.finalise_tile(context, base, wall_core, floor_core)
-
     def execute(self, context):
         """Execute the operator."""
         super().execute(context)
         if not self.refresh:
             return {'PASS_THROUGH'}
-        self.exec(context)
-
-        return {'FINISHED'}
-
-    def init(self, context):
-        super().init(context)
-        tile_collection = bpy.data.collections[self.tile_name]
-        tile_props = tile_collection.mt_tile_props
-        tile_props.collection_type = "TILE"
-        tile_props.tile_size = (self.tile_x, self.tile_y, self.tile_z)
-        tile_props.base_size = (self.base_x, self.base_y, self.base_z)
+        return self.exec(context)
 
     def draw(self, context):
         super().draw(context)
@@ -206,43 +172,13 @@ class MT_OT_Make_L_Floor_Tile(Operator, MT_L_Tiles, MT_Tile_Generator):
     mt_blueprint = "CUSTOM"
     mt_type = "L_FLOOR"
 
-    def exec(self, context):
-        base_blueprint = self.base_blueprint
-        core_blueprint = self.main_part_blueprint
-        tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-
-        if base_blueprint == 'NONE':
-            base = spawn_empty_base(tile_props)
-        elif base_blueprint == 'OPENLOCK':
-            base = spawn_openlock_base(self, tile_props)
-        elif base_blueprint == 'PLAIN':
-            base = spawn_plain_base(tile_props)
-
-        if core_blueprint == 'NONE':
-            floor_core = None
-        else:
-            floor_core = spawn_plain_floor_cores(self, tile_props)
-
-        self.finalise_tile(context, base, floor_core)
-
-        return {'FINISHED'}
-
     def execute(self, context):
         """Execute the operator."""
         super().execute(context)
         if not self.refresh:
             return {'PASS_THROUGH'}
-
         return self.exec(context)
 
-    def init(self, context):
-        super().init(context)
-        tile_collection = bpy.data.collections[self.tile_name]
-        tile_props = tile_collection.mt_tile_props
-        tile_props.collection_type = "TILE"
-        tile_props.tile_size = (self.tile_x, self.tile_y, self.tile_z)
-        tile_props.base_size = (self.base_x, self.base_y, self.base_z)
-
     def draw(self, context):
         super().draw(context)
         layout = self.layout
@@ -252,16 +188,18 @@ class MT_OT_Make_L_Floor_Tile(Operator, MT_L_Tiles, MT_Tile_Generator):
         redo_tile_panel_footer(self, layout)
 
 
-def spawn_plain_wall_cores(self, base, tile_props):
+@prefab_registry.register('L_WALL_CORE', 'PLAIN')
+def spawn_plain_wall_cores(tile_props, base):
     """Spawn plain wall cores into scene.
 
     Args:
         tile_props (bpy.types.MT_Tile_Props): tile properties
+        base (bpy.types.Object): tile base
 
     Returns:
         (bpy.types.Object): preview_core
     """
-    core, _ = spawn_wall_core(self, tile_props)
+    core, _ = spawn_wall_core(tile_props)
     subsurf = add_subsurf_modifier(core)
 
     if tile_props.base_blueprint == 'OPENLOCK_S_WALL' and tile_props.wall_position == 'EXTERIOR':
@@ -281,17 +219,20 @@ def spawn_plain_wall_cores(self, base, tile_props):
     return core
 
 
-def spawn_plain_floor_cores(self, tile_props):
+@prefab_registry.register('L_FLOOR_CORE', 'PLAIN')
+@prefab_registry.register('L_FLOOR_CORE', 'OPENLOCK')
+def spawn_plain_floor_cores(tile_props, base=None):
     """Spawn plain floor cores into scene.
 
     Args:
         tile_props (bpy.types.MT_Tile_Props): tile properties
+        base (bpy.types.Object, optional): tile base. Unused. Defaults to None.
 
     Returns:
         (bpy.types.Object): preview_core
     """
     textured_vertex_groups = ['Leg 1 Top', 'Leg 2 Top']
-    core = spawn_floor_core(self, tile_props)
+    core = spawn_floor_core(tile_props)
     material = tile_props.floor_material
     subsurf = add_subsurf_modifier(core)
     convert_to_displacement_core(
@@ -303,7 +244,7 @@ def spawn_plain_floor_cores(self, tile_props):
     return core
 
 
-def spawn_floor_core(self, tile_props):
+def spawn_floor_core(tile_props):
     """Spawn core into scene.
 
     Args:
@@ -363,7 +304,11 @@ def spawn_floor_core(self, tile_props):
         'base_height': base_height,
         'height': floor_height - base_height}
 
-    core = draw_corner_floor_core(dimensions, native_subdivisions)
+    core = cached_mesh_object(
+        tile_geometry_key('L_FLOOR_CORE', tile_props, dimensions, native_subdivisions),
+        draw_corner_floor_core,
+        dimensions,
+        native_subdivisions)
 
     core.name = tile_props.tile_name + '.core'
     obj_props = core.mt_object_props
@@ -375,19 +320,20 @@ def spawn_floor_core(self, tile_props):
     return core
 
 
-def spawn_openlock_wall_cores(self, tile_props, base):
+@prefab_registry.register('L_WALL_CORE', 'OPENLOCK')
+def spawn_openlock_wall_cores(tile_props, base):
     """Spawn openlock wall cores into scene.
 
     Args:
-        base (bpy.types.Object): tile base
         tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+        base (bpy.types.Object): tile base
 
     Returns:
         (bpy.types.Object): core
     """
-    core, dimensions = spawn_wall_core(self, tile_props)
+    core, dimensions = spawn_wall_core(tile_props)
     subsurf = add_subsurf_modifier(core)
-    cutters = spawn_openlock_wall_cutters(self, core, tile_props)
+    cutters = spawn_openlock_wall_cutters(core, tile_props)
 
     if dimensions['triangles_2']['b_adj'] >= 1 or dimensions['triangles_2']['d_adj'] >= 1:
         top_pegs = spawn_openlock_top_pegs(
@@ -562,7 +508,7 @@ def spawn_openlock_top_pegs(core, tile_props):
     return pegs
 
 
-def spawn_openlock_wall_cutters(self, core, tile_props):
+def spawn_openlock_wall_cutters(core, tile_props):
     """Create the cutters for the wall and position them correctly.
 
     Args:
@@ -585,12 +531,11 @@ def spawn_openlock_wall_cutters(self, core, tile_props):
         "openlock.blend")
 
     # load side cutter
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
+    source_cutter = get_library_objects(
+        booleans_path, ['openlock.wall.cutter.side'])[0]
 
     cutters = []
-    cutter_mesh = data_to.objects[0].data.copy()
-    left_cutter_bottom = bpy.data.objects.new("cutter", cutter_mesh)
+    left_cutter_bottom = bpy.data.objects.new("cutter", source_cutter.data)
 
     # left side cutters
     left_cutter_bottom.name = 'Leg 2 Bottom.' + tile_name
@@ -629,7 +574,9 @@ def spawn_openlock_wall_cutters(self, core, tile_props):
 
     # right side cutters
 
-    right_cutter_bottom = data_to.objects[0].copy()
+    # right cutter mesh is edited in place below so needs its own mesh
+    right_cutter_bottom = copy_library_objects(
+        booleans_path, ['openlock.wall.cutter.side'], single_user=True)[0]
     right_cutter_bottom.name = 'Leg 1 Bottom.' + tile_name
 
     add_object_to_collection(right_cutter_bottom, tile_name)
@@ -642,15 +589,12 @@ def spawn_openlock_wall_cutters(self, core, tile_props):
     # rotate cutter 180 degrees around Z
     right_cutter_bottom.rotation_euler[2] = radians(180)
 
-    right_cutter_bottom.data = right_cutter_bottom.data.copy()
-    left_cutter_bottom.data = left_cutter_bottom.data.copy()
-
     me = right_cutter_bottom.data
     bm = bmesh.new()
     bm.from_mesh(me)
     loc = bpy.context.scene.cursor.location.copy()
 
-    if self.base_blueprint in ['PLAIN_S_WALL', 'OPENLOCK_S_WALL'] and tile_props.wall_position in ['SIDE', 'EXTERIOR']:
+    if tile_props.base_blueprint in ['PLAIN_S_WALL', 'OPENLOCK_S_WALL'] and tile_props.wall_position in ['SIDE', 'EXTERIOR']:
         bmesh.ops.translate(
             bm,
             vec=(-tile_props.leg_1_len,
@@ -718,7 +662,7 @@ def spawn_openlock_wall_cutters(self, core, tile_props):
     return cutters
 
 
-def spawn_wall_core(self, tile_props):
+def spawn_wall_core(tile_props):
     """Spawn core into scene.
 
     Args:
@@ -784,7 +728,11 @@ def spawn_wall_core(self, tile_props):
         dimensions['height'] = wall_height - base_height
         dimensions['base_height'] = base_height
 
-    core = draw_corner_wall_core(dimensions, native_subdivisions)
+    core = cached_mesh_object(
+        tile_geometry_key('L_WALL_CORE', tile_props, dimensions, native_subdivisions),
+        draw_corner_wall_core,
+        dimensions,
+        native_subdivisions)
 
     core.name = tile_props.tile_name + '.core'
     obj_props = core.mt_object_props
@@ -795,14 +743,30 @@ def spawn_wall_core(self, tile_props):
 
     return core, dimensions
 
-def spawn_s_base(self, context, tile_props, base_blueprint):
+
+@prefab_registry.register('L_BASE', 'PLAIN_S_WALL')
+@prefab_registry.register('L_BASE', 'OPENLOCK_S_WALL')
+def spawn_s_wall_base(tile_props):
+    """Prefab builder for S Bases.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base with the floor core parented to it
+    """
+    base, floor_core = spawn_s_base(tile_props)
+    parent_to_base(base, floor_core)
+    return base
+
+
+def spawn_s_base(tile_props):
     """Spawn a plain base for an S Wall.
 
     Treats 90 degree walls as a special case and creates a rectangular base
     for these tiles.
 
     Args:
-        context (bpy.types.Context): Context
         tile_props (mt_tile_props): Tile Props
 
     Returns:
@@ -811,17 +775,18 @@ def spawn_s_base(self, context, tile_props, base_blueprint):
     # list comprehension because we .copy behaves strangely on bpy props
     orig_tile_size = [dim for dim in tile_props.tile_size]
     orig_base_size = [dim for dim in tile_props.base_size]
-    cursor = context.scene.cursor
+    base_blueprint = tile_props.base_blueprint
+    cursor = bpy.context.scene.cursor
     orig_loc = cursor.location.copy()
 
-    if abs(self.angle) != 90:
+    if abs(tile_props.angle) != 90:
         if base_blueprint == 'PLAIN_S_WALL':
             base = spawn_plain_base(tile_props)
         else:
-            base = spawn_openlock_base(self, tile_props)
+            base = spawn_openlock_base(tile_props)
         tile_props.tile_size = tile_props.base_size
-        tile_props.tile_size[2] += self.floor_thickness
-        floor_core = spawn_plain_floor_cores(self, tile_props)
+        tile_props.tile_size[2] += tile_props.floor_thickness
+        floor_core = spawn_plain_floor_cores(tile_props)
     else:
         #### Special case for 90 degree L walls. ####
         # rewrite tile_props.base_size to use leg lengths
@@ -831,12 +796,12 @@ def spawn_s_base(self, context, tile_props, base_blueprint):
             tile_props.base_size[2]]
 
         tile_props.tile_size = tile_props.base_size
-        tile_props.tile_size[2] += self.floor_thickness
+        tile_props.tile_size[2] += tile_props.floor_thickness
 
         unadjusted_base_size = [dim for dim in tile_props.base_size]
 
         #### Even more special case for exterior walls ###
-        if self.wall_position == 'EXTERIOR':
+        if tile_props.wall_position == 'EXTERIOR':
             tile_props.base_size[0] -= 0.09
             tile_props.base_size[1] -= 0.09
             cursor.location = (
@@ -845,11 +810,11 @@ def spawn_s_base(self, context, tile_props, base_blueprint):
                 cursor.location[2])
 
         if base_blueprint == 'PLAIN_S_WALL':
-            base = spawn_plain_rect_base(self, tile_props)
+            base = spawn_plain_rect_base(tile_props)
         else:
-            base = spawn_openlock_rect_s_base(self, tile_props, unadjusted_base_size)
+            base = spawn_openlock_rect_s_base(tile_props, unadjusted_base_size)
 
-        if self.wall_position in ['SIDE', 'EXTERIOR']:
+        if tile_props.wall_position in ['SIDE', 'EXTERIOR']:
             orig_loc = cursor.location.copy()
 
             cursor.location = (
@@ -862,9 +827,9 @@ def spawn_s_base(self, context, tile_props, base_blueprint):
                 tile_props.tile_size[1] - 0.09,
                 tile_props.tile_size[2])
 
-            floor_core = create_plain_rect_floor_cores(self, tile_props, 0.09)
+            floor_core = create_plain_rect_floor_cores(tile_props, 0.09)
         else:
-            floor_core = create_plain_rect_floor_cores(self, tile_props)
+            floor_core = create_plain_rect_floor_cores(tile_props)
 
     cursor.location = orig_loc
     tile_props.tile_size = orig_tile_size
@@ -872,6 +837,7 @@ def spawn_s_base(self, context, tile_props, base_blueprint):
     return base, floor_core
 
 
+@prefab_registry.register('L_BASE', 'PLAIN')
 def spawn_plain_base(tile_props):
     """Spawn a plain base into the scene.
 
@@ -933,7 +899,8 @@ def spawn_plain_base(tile_props):
     return base
 
 
-def spawn_openlock_base(self, tile_props):
+@prefab_registry.register('L_BASE', 'OPENLOCK')
+def spawn_openlock_base(tile_props):
     """Spawn a plain base into the scene.
 
     Args:
@@ -963,23 +930,19 @@ def spawn_openlock_base(self, tile_props):
     leg_len = base_triangles['a_adj']
     corner_loc = base.location
     preferences = get_prefs()
-    cutter_file = self.get_base_socket_filename()
+    cutter_file = get_base_socket_filename(tile_props.base_socket_type)
     booleans_path = os.path.join(
         preferences.assets_path,
         "meshes",
         "booleans",
         cutter_file)
 
-    # load base cutters
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = [
-            'openlock.wall.base.cutter.clip.001',
-            'openlock.wall.base.cutter.clip.cap.start.001',
-            'openlock.wall.base.cutter.clip.cap.end.001']
-
-    clip_cutter = data_to.objects[0]
-    cutter_start_cap = data_to.objects[1]
-    cutter_end_cap = data_to.objects[2]
+    # load base cutters. These are only used as templates for bmesh_array
+    clip_cutter, cutter_start_cap, cutter_end_cap = get_library_objects(
+        booleans_path,
+        ['openlock.wall.base.cutter.clip.001',
+         'openlock.wall.base.cutter.clip.cap.start.001',
+         'openlock.wall.base.cutter.clip.cap.end.001'])
 
     # we copy the mesh from clip_cutter into a new object in bmesh array to
     # avoid having to update the view_layer before using bmesh.ops
@@ -1048,11 +1011,6 @@ def spawn_openlock_base(self, tile_props):
     bm.to_mesh(me)
     bm.free()
 
-    # remove source meshes
-    bpy.data.objects.remove(clip_cutter)
-    bpy.data.objects.remove(cutter_start_cap)
-    bpy.data.objects.remove(cutter_end_cap)
-
     for cutter in (clip_cutter_1, clip_cutter_2):
         set_bool_obj_props(cutter, base, tile_props, 'DIFFERENCE')
         set_bool_props(cutter, base, 'DIFFERENCE')
@@ -1110,3 +1068,34 @@ def create_openlock_base_slot_cutter(tile_props):
     cutter.name = 'Slot.' + tile_props.tile_name + '.base.cutter'
 
     return cutter
+
+
+prefab_registry.register('L_BASE', 'NONE', spawn_empty_base)
+prefab_registry.register('L_WALL_CORE', 'NONE', spawn_no_prefab)
+prefab_registry.register('L_FLOOR_CORE', 'NONE', spawn_no_prefab)
+
+
+@prefab_registry.register('L_WALL', 'CUSTOM')
+def spawn_l_wall_tile(tile_props):
+    """Spawn an L wall tile.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base with the cores parented to it
+    """
+    return spawn_tile_parts(tile_props, 'L_BASE', 'L_WALL_CORE')
+
+
+@prefab_registry.register('L_FLOOR', 'CUSTOM')
+def spawn_l_floor_tile(tile_props):
+    """Spawn an L floor tile.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base with the core parented to it
+    """
+    return spawn_tile_parts(tile_props, 'L_BASE', 'L_FLOOR_CORE')
@@ -28,6 +28,7 @@ from ..lib.utils.collections import add_object_to_collection
 
 from .create_tile import (
     convert_to_displacement_core,
+    prefab_registry,
     set_bool_obj_props,
     set_bool_props,
     MT_Tile_Generator,
@@ -164,39 +165,12 @@ class MT_OT_Make_Mini_Base(Operator, MT_Tile_Generator):
         description="Can help get rid of glitches on round bases.",
     )
 
-    def exec(self, context):
-        base_blueprint = self.base_blueprint
-        tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-
-        if base_blueprint in ["ROUND", "POLY"]:
-            base = spawn_poly_base(tile_props)
-        elif base_blueprint == "RECT":
-            base = spawn_rect_base(tile_props)
-        elif base_blueprint == "ROUNDED_RECT":
-            base = spawn_rounded_rect_base(tile_props)
-        elif base_blueprint == "OVAL":
-            base = spawn_oval_base(tile_props)
-        if not base:
-            self.delete_tile_collection(self.tile_name)
-            self.report({"INFO"}, "Could not generate base. Cancelling")
-            return {"CANCELLED"}
-
-        self.finalise_tile(context, base)
-        return {"FINISHED"}
-
     def execute(self, context):
         super().execute(context)
         if not self.refresh:
             return {"PASS_THROUGH"}
         return self.exec(context)
 
-    def init(self, context):
-        super().init(context)
-        tile_collection = bpy.data.collections[self.tile_name]
-        tile_props = tile_collection.mt_tile_props
-        tile_props.collection_type = "TILE"
-        tile_props.base_size = (self.base_x, self.base_y, self.base_z)
-
     def draw(self, context):
         super().draw(context)
         layout = self.layout
@@ -224,6 +198,8 @@ class MT_OT_Make_Mini_Base(Operator, MT_Tile_Generator):
         redo_tile_panel_footer(self, layout)
 
 
+@prefab_registry.register("MINI_BASE", "ROUND")
+@prefab_registry.register("MINI_BASE", "POLY")
 def spawn_poly_base(tile_props):
     """Spawn a polygonal base into the scene. Can also be used to create round or square bases.
 
@@ -291,6 +267,7 @@ def spawn_poly_base_cutter(tile_props):
     return hollow_bool
 
 
+@prefab_registry.register("MINI_BASE", "RECT")
 def spawn_rect_base(tile_props):
     """Spawn a rectangular base into the scene.
 
@@ -452,6 +429,7 @@ def draw_rect_base(tile_props):
     return base
 
 
+@prefab_registry.register("MINI_BASE", "ROUNDED_RECT")
 def spawn_rounded_rect_base(tile_props):
     """Spawn a rounded rectangular base into the scene.
 
@@ -512,6 +490,7 @@ def spawn_rounded_rect_base_cutter(tile_props):
     )
 
 
+@prefab_registry.register("MINI_BASE", "OVAL")
 def spawn_oval_base(tile_props):
     """Spawn an oval base into the scene
 
@@ -857,3 +836,16 @@ def generate_grid_base(base_template, tile_props):
     bm.free()
     home(base)
     return base
+
+
+@prefab_registry.register("MINI_BASE", "CUSTOM")
+def spawn_mini_base(tile_props):
+    """Spawn a mini base of the shape in tile_props.base_blueprint.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base
+    """
+    return prefab_registry.build(tile_props, "MINI_BASE", tile_props.base_blueprint)
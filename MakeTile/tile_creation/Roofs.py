@@ -11,11 +11,15 @@ from ..utils.registration import get_prefs
 
 from .. lib.utils.collections import (
     add_object_to_collection)
+from .. lib.utils.library_cache import copy_library_objects
 from .. lib.bmturtle.scripts import draw_cuboid
 
 from ..lib.utils.selection import activate
 from .create_tile import (
     spawn_empty_base,
+    spawn_no_prefab,
+    spawn_tile_parts,
+    prefab_registry,
     convert_to_displacement_core,
     set_bool_obj_props,
     set_bool_props,
@@ -215,38 +219,12 @@ class MT_OT_Make_Roof(Operator, MT_Tile_Generator):
         items=create_material_enums,
         name="Rooftop Material")
 
-    # @profile
-    def exec(self, context):
-        gable_blueprint = self.base_blueprint
-        rooftop_blueprint = self.main_part_blueprint
-        tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        if gable_blueprint == 'NONE':
-            gables = spawn_empty_base(tile_props)
-        elif gable_blueprint == 'PLAIN':
-            gables = spawn_base(self, tile_props)
-
-        if rooftop_blueprint == 'NONE':
-            rooftop = None
-        else:
-            rooftop = spawn_roof(self, tile_props)
-        self.finalise_tile(context, gables, rooftop)
-
     def execute(self, context):
         """Execute the Operator."""
         super().execute(context)
         if not self.refresh:
             return {'PASS_THROUGH'}
-        self.exec(context)
-        # profile.dump_stats(splitext(__file__)[0] + '.prof')
-        return {'FINISHED'}
-
-    def init(self, context):
-        super().init(context)
-        tile_collection = bpy.data.collections[self.tile_name]
-        tile_props = tile_collection.mt_tile_props
-        tile_props.collection_type = "TILE"
-        tile_props.tile_size = (self.tile_x, self.tile_y, self.tile_z)
-        tile_props.base_size = (self.base_x, self.base_y, self.base_z)
+        return self.exec(context)
 
     def draw(self, context):
         super().draw(context)
@@ -311,9 +289,8 @@ class MT_OT_Make_Roof_Base(MT_Tile_Generator, Operator):
 
     def execute(self, context):
         """Execute the operator."""
-        # roof_props = context.collection.mt_roof_tile_props
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_base(self, tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
         return{'FINISHED'}
 
 
@@ -329,7 +306,7 @@ class MT_OT_Make_Empty_Roof_Base(MT_Tile_Generator, Operator):
     def execute(self, context):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_empty_base(tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
         return{'FINISHED'}
 
 
@@ -345,7 +322,7 @@ class MT_OT_Make_Roof_Top(MT_Tile_Generator, Operator):
     def execute(self, context):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_roof(self, tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
         return{'FINISHED'}
 
 
@@ -363,13 +340,14 @@ class MT_OT_Make_Empty_Roof_Top(MT_Tile_Generator, Operator):
         return{'PASS_THROUGH'}
 
 
-def spawn_roof(self, tile_props):
+@prefab_registry.register('ROOF_TOP', 'PLAIN')
+def spawn_roof(tile_props, base=None):
     if tile_props.roof_type == 'APEX':
-        roof = draw_apex_roof_top(self, tile_props)
+        roof = draw_apex_roof_top(tile_props)
     elif tile_props.roof_type == 'SHED':
-        roof = draw_shed_roof_top(self, tile_props)
+        roof = draw_shed_roof_top(tile_props)
     elif tile_props.roof_type == 'BUTTERFLY':
-        roof = draw_butterfly_roof_top(self, tile_props)
+        roof = draw_butterfly_roof_top(tile_props)
 
     roof.name = tile_props.tile_name + '.roof'
     obj_props = roof.mt_object_props
@@ -390,13 +368,14 @@ def spawn_roof(self, tile_props):
 
 
 # @profile
-def spawn_base(self, tile_props):
+@prefab_registry.register('ROOF_BASE', 'PLAIN')
+def spawn_base(tile_props):
     if tile_props.roof_type == 'APEX':
-        base = draw_apex_base(self, tile_props)
+        base = draw_apex_base(tile_props)
     elif tile_props.roof_type == 'SHED':
-        base = draw_shed_base(self, tile_props)
+        base = draw_shed_base(tile_props)
     elif tile_props.roof_type == 'BUTTERFLY':
-        base = draw_butterfly_base(self, tile_props)
+        base = draw_butterfly_base(tile_props)
 
     base.name = tile_props.tile_name + '.base'
     obj_props = base.mt_object_props
@@ -478,28 +457,28 @@ def spawn_openlock_base_slot_cutter(base, tile_props, offset=0.236):
             "booleans",
             "rect_floor_slot_cutter.blend")
 
-        with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-            data_to.objects = [
-                'corner_xneg_yneg',
-                'corner_xneg_ypos',
-                'corner_xpos_yneg',
-                'corner_xpos_ypos',
-                'slot_cutter_a',
-                'slot_cutter_b',
-                'slot_cutter_c',
-                'base_slot_cutter_final']
-
-        for obj in data_to.objects:
+        cutters = copy_library_objects(
+            booleans_path,
+            ['corner_xneg_yneg',
+             'corner_xneg_ypos',
+             'corner_xpos_yneg',
+             'corner_xpos_ypos',
+             'slot_cutter_a',
+             'slot_cutter_b',
+             'slot_cutter_c',
+             'base_slot_cutter_final'])
+
+        for obj in cutters:
             add_object_to_collection(obj, tile_props.tile_name)
 
-        for obj in data_to.objects:
+        for obj in cutters:
             # obj.hide_set(True)
             obj.hide_viewport = True
 
-        cutter_a = data_to.objects[4]
-        cutter_b = data_to.objects[5]
-        cutter_c = data_to.objects[6]
-        cutter_d = data_to.objects[7]
+        cutter_a = cutters[4]
+        cutter_b = cutters[5]
+        cutter_c = cutters[6]
+        cutter_d = cutters[7]
 
         cutter_d.name = 'Base Slot Cutter.' + tile_props.tile_name
 
@@ -521,3 +500,20 @@ def spawn_openlock_base_slot_cutter(base, tile_props, offset=0.236):
             base_location[2] + 0.24)
 
         return cutter_d
+
+
+prefab_registry.register('ROOF_BASE', 'NONE', spawn_empty_base)
+prefab_registry.register('ROOF_TOP', 'NONE', spawn_no_prefab)
+
+
+@prefab_registry.register('ROOF', 'CUSTOM')
+def spawn_roof_tile(tile_props):
+    """Spawn a roof tile.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base with the core parented to it
+    """
+    return spawn_tile_parts(tile_props, 'ROOF_BASE', 'ROOF_TOP')
@@ -16,6 +16,10 @@ from bpy.props import (
 from . create_tile import (
     convert_to_displacement_core,
     spawn_empty_base,
+    spawn_no_prefab,
+    spawn_tile_parts,
+    prefab_registry,
+    get_base_socket_filename,
     set_bool_obj_props,
     set_bool_props,
     MT_Tile_Generator,
@@ -32,6 +36,7 @@ from .. lib.utils.utils import (
     calc_tri)
 from .. lib.utils.collections import (
     add_object_to_collection)
+from .. lib.utils.library_cache import get_library_objects
 from ..lib.bmturtle.helpers import (
     bm_select_all,
     bmesh_array,
@@ -153,28 +158,6 @@ class MT_OT_Make_Semi_Circ_Floor_Tile(Operator, MT_Tile_Generator):
         items=create_material_enums,
         name="Floor Material")
 
-    # @profile
-    def exec(self, context):
-        base_blueprint = self.base_blueprint
-        core_blueprint = self.main_part_blueprint
-        tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-
-        if base_blueprint == 'NONE':
-            base = spawn_empty_base(tile_props)
-        elif base_blueprint == 'OPENLOCK':
-            base = spawn_openlock_base(self, tile_props)
-        elif base_blueprint == 'PLAIN':
-            base = spawn_plain_base(self, tile_props)
-
-        if core_blueprint == 'NONE':
-            preview_core = None
-        else:
-            preview_core = spawn_plain_floor_cores(self, tile_props)
-
-        self.finalise_tile(context, base, preview_core)
-        # profile.dump_stats(splitext(__file__)[0] + '.prof')
-        return {'FINISHED'}
-
     def execute(self, context):
         """Execute the operator."""
         super().execute(context)
@@ -183,14 +166,6 @@ class MT_OT_Make_Semi_Circ_Floor_Tile(Operator, MT_Tile_Generator):
 
         return self.exec(context)
 
-    def init(self, context):
-        super().init(context)
-        tile_collection = bpy.data.collections[self.tile_name]
-        tile_props = tile_collection.mt_tile_props
-        tile_props.collection_type = "TILE"
-        tile_props.tile_size = (self.tile_x, self.tile_y, self.tile_z)
-        tile_props.base_size = (self.base_x, self.base_y, self.base_z)
-
     def draw(self, context):
         super().draw(context)
         layout = self.layout
@@ -233,7 +208,7 @@ class MT_OT_Make_Openlock_Semi_Circ_Base(MT_Tile_Generator, Operator):
     def execute(self, context):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_openlock_base(self, tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
         return{'FINISHED'}
 
 
@@ -249,7 +224,7 @@ class MT_OT_Make_Plain_Semi_Circ_Base(MT_Tile_Generator, Operator):
     def execute(self, context):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_plain_base(self, tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
         return{'FINISHED'}
 
 
@@ -265,7 +240,7 @@ class MT_OT_Make_Empty_Semi_Circular_Base(MT_Tile_Generator, Operator):
     def execute(self, context):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_empty_base(tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
         return{'FINISHED'}
 
 
@@ -282,7 +257,7 @@ class MT_OT_Make_Plain_Semi_Circ_Floor_Core(MT_Tile_Generator, Operator):
     def execute(self, context):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_plain_floor_cores(self, tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
         return{'FINISHED'}
 
 
@@ -299,7 +274,7 @@ class MT_OT_Make_Openlock_Semi_Circ_Floor_Core(MT_Tile_Generator, Operator):
     def execute(self, context):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_plain_floor_cores(self, tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
         return{'FINISHED'}
 
 
@@ -318,7 +293,8 @@ class MT_OT_Make_Empty_Semi_Circ_Floor_Core(MT_Tile_Generator, Operator):
         return {'PASS_THROUGH'}
 
 
-def spawn_plain_base(self, tile_props):
+@prefab_registry.register('SEMI_CIRC_BASE', 'PLAIN')
+def spawn_plain_base(tile_props):
     """Spawn a plain base into the scene.
 
     Args:
@@ -355,7 +331,8 @@ def spawn_plain_base(self, tile_props):
     return base
 
 
-def spawn_openlock_base(self, tile_props):
+@prefab_registry.register('SEMI_CIRC_BASE', 'OPENLOCK')
+def spawn_openlock_base(tile_props):
     """Spawn OpenLOCK base into scene.
 
     Args:
@@ -381,7 +358,7 @@ def spawn_openlock_base(self, tile_props):
         'arc': (angle / 360) * (2 * pi) * radius}
     subdivs = get_subdivs(tile_props.subdivision_density, subdivs)
 
-    base = spawn_plain_base(self, tile_props)
+    base = spawn_plain_base(tile_props)
 
     base.mt_object_props.geometry_type = 'BASE'
 
@@ -403,7 +380,7 @@ def spawn_openlock_base(self, tile_props):
         set_bool_obj_props(slot_cutter, base, tile_props, 'DIFFERENCE')
         set_bool_props(slot_cutter, base, 'DIFFERENCE')
 
-    cutters = create_openlock_base_clip_cutters(self, tile_props)
+    cutters = create_openlock_base_clip_cutters(tile_props)
 
     for clip_cutter in cutters:
         set_bool_obj_props(clip_cutter, base, tile_props, 'DIFFERENCE')
@@ -414,16 +391,19 @@ def spawn_openlock_base(self, tile_props):
     return base
 
 
-def spawn_plain_floor_cores(self, tile_props):
+@prefab_registry.register('SEMI_CIRC_FLOOR_CORE', 'PLAIN')
+@prefab_registry.register('SEMI_CIRC_FLOOR_CORE', 'OPENLOCK')
+def spawn_plain_floor_cores(tile_props, base=None):
     """Spawn preview and displacement cores into scene.
 
     Args:
         tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+        base (bpy.types.Object, optional): tile base. Unused. Defaults to None.
 
     Returns:
         bpy.types.Object: preview core
     """
-    core = spawn_core(self, tile_props)
+    core = spawn_core(tile_props)
     textured_vertex_groups = ['Top']
     material = tile_props.floor_material
     subsurf = add_subsurf_modifier(core)
@@ -437,7 +417,7 @@ def spawn_plain_floor_cores(self, tile_props):
     return core
 
 
-def spawn_core(self, tile_props):
+def spawn_core(tile_props):
     """Spawn core into scene.
 
     Args:
@@ -483,7 +463,7 @@ def spawn_core(self, tile_props):
     return core
 
 
-def create_openlock_base_clip_cutters(self, tile_props):
+def create_openlock_base_clip_cutters(tile_props):
     """Generate base clip cutters for semi circular tiles.
 
     Args:
@@ -503,7 +483,7 @@ def create_openlock_base_clip_cutters(self, tile_props):
     cutters = []
 
     preferences = get_prefs()
-    cutter_file = self.get_base_socket_filename()
+    cutter_file = get_base_socket_filename(tile_props.base_socket_type)
     booleans_path = os.path.join(
         preferences.assets_path,
         "meshes",
@@ -514,18 +494,12 @@ def create_openlock_base_clip_cutters(self, tile_props):
         radius = radius / 2
 
     if radius >= 1:
-        with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-            data_to.objects = [
-                'openlock.wall.base.cutter.clip.001',
-                'openlock.wall.base.cutter.clip.cap.start.001',
-                'openlock.wall.base.cutter.clip.cap.end.001']
-        '''
-        for obj in data_to.objects:
-            add_object_to_collection(obj, tile_props.tile_name)
-        '''
-        cutter = data_to.objects[0]
-        cutter_start_cap = data_to.objects[1]
-        cutter_end_cap = data_to.objects[2]
+        # source cutters are only used as templates for bmesh_array
+        cutter, cutter_start_cap, cutter_end_cap = get_library_objects(
+            booleans_path,
+            ['openlock.wall.base.cutter.clip.001',
+             'openlock.wall.base.cutter.clip.cap.start.001',
+             'openlock.wall.base.cutter.clip.cap.end.001'])
 
         clip_cutter_1 = bpy.data.objects.new(
             "Clip Cutter 1", cutter.data.copy())
@@ -624,14 +598,9 @@ def create_openlock_base_clip_cutters(self, tile_props):
         bm.free()
         cutters.append(clip_cutter_2)
 
-    bpy.data.objects.remove(cutter)
-    bpy.data.objects.remove(cutter_end_cap)
-    bpy.data.objects.remove(cutter_start_cap)
-
     if tile_props.curve_type == 'POS':
-        with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-            data_to.objects = ['openlock.wall.base.cutter.clip_single']
-        cutter = data_to.objects[0]
+        cutter = get_library_objects(
+            booleans_path, ['openlock.wall.base.cutter.clip_single'])[0]
 
         clip_cutter_3 = bpy.data.objects.new(
             "Clip Cutter 3", cutter.data.copy())
@@ -668,7 +637,6 @@ def create_openlock_base_clip_cutters(self, tile_props):
         bm.to_mesh(clip_cutter_3.data)
         bm.free()
         cutters.append(clip_cutter_3)
-        bpy.data.objects.remove(cutter)
 
     for cutter in cutters:
         props = cutter.mt_object_props
@@ -1359,3 +1327,20 @@ def draw_neg_curved_slot_cutter(dimensions):
     home(obj)
     finalise_turtle(bm, obj)
     return obj
+
+
+prefab_registry.register('SEMI_CIRC_BASE', 'NONE', spawn_empty_base)
+prefab_registry.register('SEMI_CIRC_FLOOR_CORE', 'NONE', spawn_no_prefab)
+
+
+@prefab_registry.register('SEMI_CIRC_FLOOR', 'CUSTOM')
+def spawn_semi_circ_floor_tile(tile_props):
+    """Spawn a semi circular floor tile.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base with the core parented to it
+    """
+    return spawn_tile_parts(tile_props, 'SEMI_CIRC_BASE', 'SEMI_CIRC_FLOOR_CORE')
@@ -2,6 +2,8 @@ import os
 from math import radians
 
 import bpy
+import bmesh
+from mathutils import Matrix, Vector
 from bpy.types import Operator, Panel
 from bpy.props import (
     FloatProperty,
@@ -11,14 +13,28 @@ from bpy.props import (
 from .. utils.registration import get_prefs
 from .. lib.utils.collections import (
     add_object_to_collection)
+from .. lib.utils.mesh_cache import (
+    cached_mesh_object,
+    tile_geometry_key,
+    BASE_KEY_PROPS)
+from .. lib.utils.library_cache import (
+    copy_library_objects,
+    get_library_objects)
 
-from ..lib.bmturtle.scripts import (
-    draw_straight_wall_core,
-    draw_cuboid,
-    draw_rectangular_floor_core)
+from ..lib.bmturtle.scripts import draw_cuboid
+from ..lib.bmturtle.helpers import bmesh_array
+
+from ..lib.bmturtle.grid_cores import (
+    build_straight_wall_core,
+    build_rectangular_floor_core)
 
 from .create_tile import (
     spawn_empty_base,
+    spawn_no_prefab,
+    spawn_tile_parts,
+    prefab_registry,
+    parent_to_base,
+    get_base_socket_filename,
     convert_to_displacement_core,
     set_bool_obj_props,
     set_bool_props,
@@ -42,6 +58,12 @@ from os.path import splitext
 profile = LineProfiler()
 '''
 
+# custom property used to recognise shared joined clip cutter meshes
+CLIP_CUTTER_PROP = 'mt_clip_cutter'
+
+# joined clip cutter mesh names keyed by booleans file and cutter layout
+_joined_clip_cutter_meshes = {}
+
 
 class MT_PT_Straight_Wall_Panel(Panel):
     """Draw a tile options panel in UI."""
@@ -74,6 +96,9 @@ class MT_PT_Straight_Wall_Panel(Panel):
         if 'base_blueprint' in blueprints and scene_props.base_blueprint not in ('PLAIN', 'NONE'):
             layout.prop(scene_props, 'base_socket_type')
 
+        if scene_props.base_blueprint == 'OPENLOCK':
+            layout.prop(scene_props, 'clip_cutter_mode')
+
         layout.label(text="Materials")
 
         layout.prop(scene_props, 'wall_material')
@@ -166,39 +191,6 @@ class MT_OT_Make_Straight_Wall_Tile(Operator, MT_Tile_Generator):
         items=create_material_enums,
         name="Wall Material")
 
-    def exec(self, context):
-        base_blueprint = self.base_blueprint
-        wall_blueprint = self.main_part_blueprint
-        tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        floor_core = None
-        if base_blueprint == 'NONE':
-            base = spawn_empty_base(tile_props)
-        elif base_blueprint == 'PLAIN':
-            base = spawn_plain_base(self, tile_props)
-        elif base_blueprint == 'OPENLOCK':
-            base = spawn_openlock_base(self, tile_props)
-        elif base_blueprint in ['PLAIN_S_WALL', 'OPENLOCK_S_WALL']:
-            base, floor_core = spawn_s_base(self, context, tile_props)
-        if not base:
-            self.delete_tile_collection(self.tile_name)
-            self.report({'INFO'}, "Could not generate base. Cancelling")
-            return {'CANCELLED'}
-
-        if wall_blueprint == 'PLAIN':
-            wall_core = spawn_plain_wall_cores(self, tile_props, base)
-        elif wall_blueprint == 'OPENLOCK':
-            wall_core = spawn_openlock_wall_cores(self, tile_props, base)
-        elif wall_blueprint == 'NONE':
-            wall_core = None
-
-        if wall_blueprint != 'NONE' and wall_core == None:
-            self.delete_tile_collection(self.tile_name)
-            self.report({'INFO'}, "Could not generate wall core. Cancelling.")
-            return {'CANCELLED'}
-
-        self.finalise_tile(context, base, wall_core, floor_core)
-        return {'FINISHED'}
-
     def execute(self, context):
         """Execute the operator."""
         super().execute(context)
@@ -206,14 +198,6 @@ class MT_OT_Make_Straight_Wall_Tile(Operator, MT_Tile_Generator):
             return {'PASS_THROUGH'}
         return self.exec(context)
 
-    def init(self, context):
-        super().init(context)
-        tile_collection = bpy.data.collections[self.tile_name]
-        tile_props = tile_collection.mt_tile_props
-        tile_props.collection_type = "TILE"
-        tile_props.tile_size = (self.tile_x, self.tile_y, self.tile_z)
-        tile_props.base_size = (self.base_x, self.base_y, self.base_z)
-
     def draw(self, context):
         super().draw(context)
         layout = self.layout
@@ -248,37 +232,7 @@ class MT_OT_Make_Rect_Floor_Tile(Operator, MT_Tile_Generator):
         super().execute(context)
         if not self.refresh:
             return {'PASS_THROUGH'}
-
-        self.exec(context)
-        # profile.dump_stats(splitext(__file__)[0] + '.prof')
-        return {'FINISHED'}
-
-    # @profile
-    def exec(self, context):
-        base_blueprint = self.base_blueprint
-        core_blueprint = self.main_part_blueprint
-        tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-
-        if base_blueprint == 'NONE':
-            base = spawn_empty_base(tile_props)
-        elif base_blueprint == 'OPENLOCK':
-            base = spawn_openlock_base(self, tile_props)
-        elif base_blueprint == 'PLAIN':
-            base = spawn_plain_base(self, tile_props)
-
-        if core_blueprint == 'NONE':
-            core = None
-        else:
-            core = create_plain_rect_floor_cores(self, tile_props)
-        self.finalise_tile(context, base, core)
-
-    def init(self, context):
-        super().init(context)
-        tile_collection = bpy.data.collections[self.tile_name]
-        tile_props = tile_collection.mt_tile_props
-        tile_props.collection_type = "TILE"
-        tile_props.tile_size = (self.tile_x, self.tile_y, self.tile_z)
-        tile_props.base_size = (self.base_x, self.base_y, self.base_z)
+        return self.exec(context)
 
     def draw(self, context):
         super().draw(context)
@@ -297,16 +251,18 @@ class MT_OT_Make_Rect_Floor_Tile(Operator, MT_Tile_Generator):
         redo_tile_panel_footer(self, layout)
 
 
-def spawn_plain_wall_cores(self, tile_props, base):
+@prefab_registry.register('STRAIGHT_WALL_CORE', 'PLAIN')
+def spawn_plain_wall_cores(tile_props, base):
     """Spawn plain Core.
 
     Args:
         tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+        base (bpy.types.Object): tile base
 
     Returns:
         bpy.types.Object: core
     """
-    core = spawn_wall_core(self, tile_props)
+    core = spawn_wall_core(tile_props)
     subsurf = add_subsurf_modifier(core)
 
     if tile_props.base_blueprint == 'OPENLOCK_S_WALL' and tile_props.wall_position == 'EXTERIOR':
@@ -324,7 +280,8 @@ def spawn_plain_wall_cores(self, tile_props, base):
     return core
 
 
-def spawn_openlock_wall_cores(self, tile_props, base):
+@prefab_registry.register('STRAIGHT_WALL_CORE', 'OPENLOCK')
+def spawn_openlock_wall_cores(tile_props, base):
     """Spawn OpenLOCK core.
 
     Args:
@@ -334,7 +291,7 @@ def spawn_openlock_wall_cores(self, tile_props, base):
     Returns:
         bpy.types.Object: preview core
     """
-    core = spawn_wall_core(self, tile_props)
+    core = spawn_wall_core(tile_props)
     subsurf = add_subsurf_modifier(core)
 
     if tile_props.tile_size[0] > 1:
@@ -394,7 +351,7 @@ def use_base_cutters_on_wall(base, core, *args):
     return core
 
 
-def spawn_wall_core(self, tile_props):
+def spawn_wall_core(tile_props):
     """Return the core (vertical) part of a straight wall tile."""
     cursor = bpy.context.scene.cursor
     cursor_start_loc = cursor.location.copy()
@@ -413,7 +370,9 @@ def spawn_wall_core(self, tile_props):
     native_subdivisions = get_subdivs(
         tile_props.subdivision_density, core_size)
 
-    core = draw_straight_wall_core(
+    core = cached_mesh_object(
+        tile_geometry_key('WALL_CORE', tile_props, core_size, native_subdivisions),
+        build_straight_wall_core,
         core_size,
         native_subdivisions)
 
@@ -512,15 +471,12 @@ def spawn_openlock_wall_cutters(core, base, tile_props):
         "booleans",
         "openlock.blend")
 
-    # load side cutter
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
-
     base_location = base.location.copy()
 
     cutters = []
     # left side cutters
-    left_cutter_bottom = data_to.objects[0].copy()
+    left_cutter_bottom = copy_library_objects(
+        booleans_path, ['openlock.wall.cutter.side'])[0]
     left_cutter_bottom.name = 'X Neg Bottom.' + tile_name
 
     add_object_to_collection(left_cutter_bottom, tile_name)
@@ -562,7 +518,8 @@ def spawn_openlock_wall_cutters(core, base, tile_props):
 
     # right side cutters
 
-    right_cutter_bottom = data_to.objects[0].copy()
+    right_cutter_bottom = copy_library_objects(
+        booleans_path, ['openlock.wall.cutter.side'])[0]
     right_cutter_bottom.name = 'X Pos Bottom.' + tile_name
 
     add_object_to_collection(right_cutter_bottom, tile_name)
@@ -608,7 +565,7 @@ def spawn_openlock_wall_cutters(core, base, tile_props):
     return cutters
 
 
-def create_plain_rect_floor_cores(self, tile_props, offset = 0):
+def create_plain_rect_floor_cores(tile_props, offset = 0):
     """Create preview and displacement cores.
 
     Args:
@@ -618,7 +575,7 @@ def create_plain_rect_floor_cores(self, tile_props, offset = 0):
     Returns:
         bpy.types.Object: preview core
     """
-    core = spawn_floor_core(self, tile_props, offset)
+    core = spawn_floor_core(tile_props, offset)
     subsurf = add_subsurf_modifier(core)
     textured_vertex_groups = ['Top']
     material = tile_props.floor_material
@@ -632,11 +589,42 @@ def create_plain_rect_floor_cores(self, tile_props, offset = 0):
 
     return core
 
-def spawn_s_base(self, context, tile_props):
+
+@prefab_registry.register('STRAIGHT_FLOOR_CORE', 'PLAIN')
+@prefab_registry.register('STRAIGHT_FLOOR_CORE', 'OPENLOCK')
+def spawn_rect_floor_cores(tile_props, base):
+    """Prefab builder for rectangular floor cores.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+        base (bpy.types.Object): tile base
+
+    Returns:
+        bpy.types.Object: preview core
+    """
+    return create_plain_rect_floor_cores(tile_props)
+
+
+@prefab_registry.register('STRAIGHT_BASE', 'PLAIN_S_WALL')
+@prefab_registry.register('STRAIGHT_BASE', 'OPENLOCK_S_WALL')
+def spawn_s_wall_base(tile_props):
+    """Prefab builder for S Bases.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base with the floor core parented to it
+    """
+    base, floor_core = spawn_s_base(tile_props)
+    parent_to_base(base, floor_core)
+    return base
+
+
+def spawn_s_base(tile_props):
     """Spawn an S Base.
 
     Args:
-        context (bpy.types.Context): cpntext
         tile_props (mt_tile_props): tile_props
 
     Returns:
@@ -648,26 +636,27 @@ def spawn_s_base(self, context, tile_props):
         tile_props.base_size[1] = tile_props.base_size[1] - 0.09
 
     if tile_props.base_blueprint == 'PLAIN_S_WALL':
-        base = spawn_plain_base(self, tile_props)
+        base = spawn_plain_base(tile_props)
     else:
-        base = spawn_openlock_s_base(self, tile_props, orig_base_size)
+        base = spawn_openlock_s_base(tile_props, orig_base_size)
 
     tile_props.base_size[1] = orig_base_size[1]
     orig_tile_size = [dim for dim in tile_props.tile_size]
 
     # correct for displacement material
-    if self.wall_position in ['EXTERIOR', 'SIDE']:
+    if tile_props.wall_position in ['EXTERIOR', 'SIDE']:
         tile_props.base_size[1] = tile_props.base_size[1] - 0.09
 
-    context.collection.mt_tile_props.tile_size = (
+    tile_props.tile_size = (
         tile_props.base_size[0],
         tile_props.base_size[1],
-        tile_props.base_size[2] + self.floor_thickness)
-    floor_core = create_plain_rect_floor_cores(self, tile_props)
+        tile_props.base_size[2] + tile_props.floor_thickness)
+    floor_core = create_plain_rect_floor_cores(tile_props)
     tile_props.tile_size = orig_tile_size
     return base, floor_core
 
-def spawn_openlock_s_base(self, tile_props, orig_base_size):
+
+def spawn_openlock_s_base(tile_props, orig_base_size):
     """Spawn an OpenLOCK S Base.
 
     Args:
@@ -677,14 +666,14 @@ def spawn_openlock_s_base(self, tile_props, orig_base_size):
     Returns:
         [type]: [description]
     """
-    base = spawn_plain_base(self, tile_props)
+    base = spawn_plain_base(tile_props)
     tile_props.base_size = orig_base_size
     slot_cutter = spawn_openlock_base_slot_cutter(base, tile_props)
     if slot_cutter:
         set_bool_obj_props(slot_cutter, base, tile_props, 'DIFFERENCE')
         set_bool_props(slot_cutter, base, 'DIFFERENCE')
 
-    clip_cutters = spawn_openlock_base_clip_cutters(self, base, tile_props)
+    clip_cutters = spawn_openlock_base_clip_cutters(base, tile_props)
 
     for clip_cutter in clip_cutters:
         set_bool_obj_props(clip_cutter, base, tile_props, 'DIFFERENCE')
@@ -698,7 +687,7 @@ def spawn_openlock_s_base(self, tile_props, orig_base_size):
     tile_props.base_size = orig_base_size
     return base
 
-def spawn_floor_core(self, tile_props, offset = 0):
+def spawn_floor_core(tile_props, offset = 0):
     """Spawn the core (top part) of a floor tile.
 
     Args:
@@ -717,7 +706,9 @@ def spawn_floor_core(self, tile_props, offset = 0):
     native_subdivisions = (
         get_subdivs(tile_props.subdivision_density, core_size))
 
-    core = draw_rectangular_floor_core(
+    core = cached_mesh_object(
+        tile_geometry_key('FLOOR_CORE', tile_props, core_size, native_subdivisions, offset),
+        build_rectangular_floor_core,
         core_size,
         native_subdivisions,
         0.001,
@@ -736,7 +727,8 @@ def spawn_floor_core(self, tile_props, offset = 0):
     return core
 
 
-def spawn_plain_base(self, tile_props):
+@prefab_registry.register('STRAIGHT_BASE', 'PLAIN')
+def spawn_plain_base(tile_props):
     """Spawn a plain base into the scene.
 
     Args:
@@ -750,7 +742,10 @@ def spawn_plain_base(self, tile_props):
     tile_name = tile_props.tile_name
 
     # make base
-    base = draw_cuboid(base_size)
+    base = cached_mesh_object(
+        tile_geometry_key('PLAIN_BASE', tile_props, base_size, key_props=BASE_KEY_PROPS),
+        draw_cuboid,
+        base_size)
     base.name = tile_name + '.base'
     add_object_to_collection(base, tile_name)
 
@@ -763,7 +758,8 @@ def spawn_plain_base(self, tile_props):
     return base
 
 
-def spawn_openlock_base(self, tile_props):
+@prefab_registry.register('STRAIGHT_BASE', 'OPENLOCK')
+def spawn_openlock_base(tile_props):
     """Spawn an openlock base into the scene.
 
     Args:
@@ -772,13 +768,16 @@ def spawn_openlock_base(self, tile_props):
     Returns:
         bpy.types.Object: tile base
     """
-    base = spawn_plain_base(self, tile_props)
+    base = spawn_plain_base(tile_props)
     slot_cutter = spawn_openlock_base_slot_cutter(base, tile_props)
     if slot_cutter:
         set_bool_obj_props(slot_cutter, base, tile_props, 'DIFFERENCE')
         set_bool_props(slot_cutter, base, 'DIFFERENCE')
 
-    clip_cutters = spawn_openlock_base_clip_cutters(self, base, tile_props)
+    if tile_props.clip_cutter_mode == 'JOINED':
+        clip_cutters = spawn_joined_openlock_base_clip_cutters(base, tile_props)
+    else:
+        clip_cutters = spawn_openlock_base_clip_cutters(base, tile_props)
 
     for clip_cutter in clip_cutters:
         set_bool_obj_props(clip_cutter, base, tile_props, 'DIFFERENCE')
@@ -836,28 +835,28 @@ def spawn_openlock_base_slot_cutter(base, tile_props, offset=0.236):
             "booleans",
             "rect_floor_slot_cutter.blend")
 
-        with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-            data_to.objects = [
-                'corner_xneg_yneg',
-                'corner_xneg_ypos',
-                'corner_xpos_yneg',
-                'corner_xpos_ypos',
-                'slot_cutter_a',
-                'slot_cutter_b',
-                'slot_cutter_c',
-                'base_slot_cutter_final']
-
-        for obj in data_to.objects:
+        cutters = copy_library_objects(
+            booleans_path,
+            ['corner_xneg_yneg',
+             'corner_xneg_ypos',
+             'corner_xpos_yneg',
+             'corner_xpos_ypos',
+             'slot_cutter_a',
+             'slot_cutter_b',
+             'slot_cutter_c',
+             'base_slot_cutter_final'])
+
+        for obj in cutters:
             add_object_to_collection(obj, tile_props.tile_name)
 
-        for obj in data_to.objects:
+        for obj in cutters:
             # obj.hide_set(True)
             obj.hide_viewport = True
 
-        cutter_a = data_to.objects[4]
-        cutter_b = data_to.objects[5]
-        cutter_c = data_to.objects[6]
-        cutter_d = data_to.objects[7]
+        cutter_a = cutters[4]
+        cutter_b = cutters[5]
+        cutter_c = cutters[6]
+        cutter_d = cutters[7]
 
         cutter_d.name = 'Base Slot Cutter.' + tile_props.tile_name
 
@@ -882,7 +881,53 @@ def spawn_openlock_base_slot_cutter(base, tile_props, offset=0.236):
         return cutter_d
 
 
-def spawn_openlock_base_clip_cutters(self, base, tile_props):
+def get_base_clip_cutter_sides(tile_props):
+    """Return the position of the clip cutter on each side of a rectangular OpenLOCK base.
+
+    Args:
+        tile_props (mt_tile_props): tile properties
+
+    Returns:
+        list[tuple(str, tuple(float, float, float), float, float)]: name prefix, location
+        relative to the base, z rotation and array fit length of each side's cutter
+    """
+    base_dims = tile_props.base_size
+    tile_type = tile_props.tile_type
+    exterior = tile_props.wall_position == 'EXTERIOR'
+    sides = []
+
+    if not (exterior and tile_type in ('L_WALL', 'U_WALL')):
+        # For narrow wall bases
+        if base_dims[1] < 1:
+            return [('Clip Cutter', (0.5, 0.25, 0), 0, base_dims[0] - 1)]
+
+        sides.append(('Y Neg Clip', (0.5, 0.25, 0), 0, base_dims[0] - 1))
+
+    if not (exterior and tile_type == 'U_WALL'):
+        sides.append((
+            'X Pos Clip',
+            (base_dims[0] - 0.25, 0.5, 0),
+            radians(90),
+            base_dims[1] - 1))
+
+    if not (exterior and tile_type == 'STRAIGHT_WALL'):
+        sides.append((
+            'Y Pos Clip',
+            (base_dims[0] - 0.5, base_dims[1] - 0.25, 0),
+            radians(180),
+            base_dims[0] - 1))
+
+    if not (exterior and tile_type in ('L_WALL', 'U_WALL')):
+        sides.append((
+            'X Neg Clip',
+            (0.25, base_dims[1] - 0.5, 0),
+            radians(-90),
+            base_dims[1] - 1))
+
+    return sides
+
+
+def spawn_openlock_base_clip_cutters(base, tile_props):
     """Make cutters for the openlock base clips.
 
     Args:
@@ -902,17 +947,7 @@ def spawn_openlock_base_clip_cutters(self, base, tile_props):
         return clip_cutters
 
     preferences = get_prefs()
-    cutter_file = self.get_base_socket_filename()
-
-    front_right = (
-        base_location[0] + base_dims[0],
-        base_location[1],
-        base_location[2])
-
-    front_left = (
-        base_location[0],
-        base_location[1],
-        base_location[2])
+    cutter_file = get_base_socket_filename(tile_props.base_socket_type)
 
     if cutter_file:
         booleans_path = os.path.join(
@@ -921,136 +956,133 @@ def spawn_openlock_base_clip_cutters(self, base, tile_props):
             "booleans",
             cutter_file)
 
-        with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-            data_to.objects = [
-                'openlock.wall.base.cutter.clip',
-                'openlock.wall.base.cutter.clip.cap.start',
-                'openlock.wall.base.cutter.clip.cap.end']
+        cutters = copy_library_objects(
+            booleans_path,
+            ['openlock.wall.base.cutter.clip',
+             'openlock.wall.base.cutter.clip.cap.start',
+             'openlock.wall.base.cutter.clip.cap.end'])
 
-        for obj in data_to.objects:
+        for obj in cutters:
             add_object_to_collection(obj, tile_props.tile_name)
 
-        source_cutter = data_to.objects[0]
-        cutter_start_cap = data_to.objects[1]
-        cutter_end_cap = data_to.objects[2]
+        source_cutter, cutter_start_cap, cutter_end_cap = cutters
 
         cutter_start_cap.hide_viewport = True
         cutter_end_cap.hide_viewport = True
 
-        if tile_props.tile_type == 'L_WALL' and tile_props.wall_position == 'EXTERIOR':
-            pass
-        elif tile_props.tile_type == 'U_WALL' and tile_props.wall_position == 'EXTERIOR':
-            pass
-        else:
-            y_neg_clip_cutter = source_cutter.copy()
-            # For narrow wall bases
-            if base_dims[1] < 1:
-                y_neg_clip_cutter.location = (
-                    base_location[0] + 0.5,
-                    base_location[1] + 0.25,
-                    base_location[2])
-
-                fit_length = tile_props.base_size[0] - 1
-                add_base_clip_array(
-                    cutter_start_cap,
-                    cutter_end_cap,
-                    y_neg_clip_cutter,
-                    fit_length)
-
-                y_neg_clip_cutter.name = 'Clip Cutter.' + base.name
-                clip_cutters.append(y_neg_clip_cutter)
-                bpy.data.objects.remove(source_cutter)
-
-                return clip_cutters
-
-            y_neg_clip_cutter.name = 'Y Neg Clip.' + base.name
-            # get location of bottom front left corner of tile
-            y_neg_clip_cutter.location = (
-                front_left[0] + 0.5,
-                front_left[1] + 0.25,
-                front_left[2])
-
-            fit_length = base_dims[0] - 1
-            add_base_clip_array(
-                cutter_start_cap,
-                cutter_end_cap,
-                y_neg_clip_cutter,
-                fit_length)
+        for name, location, rotation, fit_length in get_base_clip_cutter_sides(tile_props):
+            clip_cutter = source_cutter.copy()
+            clip_cutter.name = name + '.' + base.name
+            add_object_to_collection(clip_cutter, tile_props.tile_name)
 
-            clip_cutters.append(y_neg_clip_cutter)
-        if tile_props.tile_type == 'U_WALL' and tile_props.wall_position == 'EXTERIOR':
-            pass
-        else:
-            x_pos_clip_cutter = source_cutter.copy()
-            x_pos_clip_cutter.name = 'X Pos Clip.' + base.name
-            x_pos_clip_cutter.data = x_pos_clip_cutter.data.copy()
-
-            add_object_to_collection(x_pos_clip_cutter, tile_props.tile_name)
-            x_pos_clip_cutter.rotation_euler = (0, 0, radians(90))
+            clip_cutter.rotation_euler = (0, 0, rotation)
+            clip_cutter.location = base_location + Vector(location)
 
-            x_pos_clip_cutter.location = (
-                front_right[0] - 0.25,
-                front_right[1] + 0.5,
-                front_right[2])
-
-            fit_length = base_dims[1] - 1
             add_base_clip_array(
                 cutter_start_cap,
                 cutter_end_cap,
-                x_pos_clip_cutter,
+                clip_cutter,
                 fit_length)
-            clip_cutters.append(x_pos_clip_cutter)
+            clip_cutters.append(clip_cutter)
 
-        if tile_props.tile_type == 'STRAIGHT_WALL' and tile_props.wall_position == 'EXTERIOR':
-            pass
-        else:
-            y_pos_clip_cutter = source_cutter.copy()
-            y_pos_clip_cutter.name = 'Y Pos Clip.' + base.name
-            y_pos_clip_cutter.data = y_pos_clip_cutter.data.copy()
-            add_object_to_collection(y_pos_clip_cutter, tile_props.tile_name)
+        bpy.data.objects.remove(source_cutter)
+        return clip_cutters
+    return False
 
-            y_pos_clip_cutter.rotation_euler = (0, 0, radians(180))
 
-            y_pos_clip_cutter.location = (
-                front_left[0] + base_dims[0] -0.5,
-                front_left[1] + base_dims[1] - 0.25,
-                front_left[2])
+def spawn_joined_openlock_base_clip_cutters(base, tile_props):
+    """Make a single cutter for all of the openlock base clips.
 
-            fit_length = base_dims[0] - 1
-            add_base_clip_array(
-                cutter_start_cap,
-                cutter_end_cap,
-                y_pos_clip_cutter,
-                fit_length)
-            clip_cutters.append(y_pos_clip_cutter)
+    Instead of giving each side its own array modifier the arrays are baked with
+    bmesh_array, once per fit length, and joined into one mesh. The base then only has one
+    boolean to evaluate. Bases of the same size share the joined mesh.
 
-        if tile_props.tile_type == 'L_WALL' and tile_props.wall_position == 'EXTERIOR':
-            pass
-        elif tile_props.tile_type == 'U_WALL' and tile_props.wall_position == 'EXTERIOR':
-            pass
-        else:
-            x_neg_clip_cutter = source_cutter.copy()
-            x_neg_clip_cutter.name = 'X Neg Clip.' + base.name
-            x_neg_clip_cutter.data = x_neg_clip_cutter.data.copy()
-            add_object_to_collection(x_neg_clip_cutter, tile_props.tile_name)
+    Args:
+        base (bpy.types.Object): tile base
+        tile_props (mt_tile_props): tile properties
 
-            x_neg_clip_cutter.rotation_euler = (0, 0, radians(-90))
+    Returns:
+        list[bpy.types.Object]: joined clip cutter. Empty if the base is too small for clips.
+    """
+    clip_cutters = []
 
-            x_neg_clip_cutter.location = (
-                front_right[0] - base_dims[0] + 0.25,
-                front_right[1] + base_dims[1] - 0.5,
-                front_right[2])
+    # Prevent drawing of clip cutters if base is too small
+    if tile_props.base_size[0] < 1:
+        return clip_cutters
 
-            fit_length = base_dims[1] - 1
-            add_base_clip_array(
-                cutter_start_cap,
-                cutter_end_cap,
-                x_neg_clip_cutter,
-                fit_length)
-            clip_cutters.append(x_neg_clip_cutter)
-        bpy.data.objects.remove(source_cutter)
+    cutter_file = get_base_socket_filename(tile_props.base_socket_type)
+    if not cutter_file:
         return clip_cutters
-    return False
+
+    booleans_path = os.path.join(
+        get_prefs().assets_path,
+        "meshes",
+        "booleans",
+        cutter_file)
+
+    sides = get_base_clip_cutter_sides(tile_props)
+    key = (booleans_path, tuple(
+        (tuple(round(co, 6) for co in location), round(rotation, 6), round(fit_length, 6))
+        for _, location, rotation, fit_length in sides))
+    tag = repr(key)
+
+    mesh = None
+    if key in _joined_clip_cutter_meshes:
+        mesh = bpy.data.meshes.get(_joined_clip_cutter_meshes[key])
+        if mesh is not None and mesh.get(CLIP_CUTTER_PROP) != tag:
+            mesh = None
+
+    if mesh is None:
+        # source cutters are only used as templates
+        cutter, cutter_start_cap, cutter_end_cap = get_library_objects(
+            booleans_path,
+            ['openlock.wall.base.cutter.clip.001',
+             'openlock.wall.base.cutter.clip.cap.start.001',
+             'openlock.wall.base.cutter.clip.cap.end.001'])
+
+        # bake each array once and reuse it for sides of the same length.
+        # bmeshes are copied via temporary meshes as copying between bmeshes is unreliable
+        arrays = {}
+        bm = bmesh.new()
+        for _, location, rotation, fit_length in sides:
+            if fit_length not in arrays:
+                array_bm = bmesh.new()
+                array_bm.from_mesh(cutter.data)
+                array_bm = bmesh_array(
+                    source_obj=cutter,
+                    source_bm=array_bm,
+                    start_cap=cutter_start_cap,
+                    end_cap=cutter_end_cap,
+                    relative_offset_displace=(1, 0, 0),
+                    fit_type='FIT_LENGTH',
+                    fit_length=fit_length)
+                arrays[fit_length] = bpy.data.meshes.new("temp")
+                array_bm.to_mesh(arrays[fit_length])
+                array_bm.free()
+
+            vert_count = len(bm.verts)
+            bm.from_mesh(arrays[fit_length])
+            bm.verts.ensure_lookup_table()
+            bmesh.ops.transform(
+                bm,
+                matrix=Matrix.Translation(location) @ Matrix.Rotation(rotation, 4, 'Z'),
+                verts=bm.verts[vert_count:])
+
+        for array_mesh in arrays.values():
+            bpy.data.meshes.remove(array_mesh)
+
+        mesh = bpy.data.meshes.new('Clip Cutters')
+        bm.to_mesh(mesh)
+        bm.free()
+        mesh[CLIP_CUTTER_PROP] = tag
+        _joined_clip_cutter_meshes[key] = mesh.name
+
+    clip_cutter = bpy.data.objects.new('Clip Cutters.' + base.name, mesh)
+    add_object_to_collection(clip_cutter, tile_props.tile_name)
+    clip_cutter.location = base.location.copy()
+    clip_cutters.append(clip_cutter)
+    return clip_cutters
+
 
 def add_base_clip_array(cutter_start_cap, cutter_end_cap, clip_cutter, fit_length):
     """Add array for straight tile base clip.
@@ -1068,3 +1100,34 @@ def add_base_clip_array(cutter_start_cap, cutter_end_cap, clip_cutter, fit_lengt
 
     array_mod.fit_type = 'FIT_LENGTH'
     array_mod.fit_length = fit_length
+
+
+prefab_registry.register('STRAIGHT_BASE', 'NONE', spawn_empty_base)
+prefab_registry.register('STRAIGHT_WALL_CORE', 'NONE', spawn_no_prefab)
+prefab_registry.register('STRAIGHT_FLOOR_CORE', 'NONE', spawn_no_prefab)
+
+
+@prefab_registry.register('STRAIGHT_WALL', 'CUSTOM')
+def spawn_straight_wall_tile(tile_props):
+    """Spawn a straight wall tile.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base with the cores parented to it
+    """
+    return spawn_tile_parts(tile_props, 'STRAIGHT_BASE', 'STRAIGHT_WALL_CORE')
+
+
+@prefab_registry.register('RECT_FLOOR', 'CUSTOM')
+def spawn_rect_floor_tile(tile_props):
+    """Spawn a rectangular floor tile.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base with the core parented to it
+    """
+    return spawn_tile_parts(tile_props, 'STRAIGHT_BASE', 'STRAIGHT_FLOOR_CORE')
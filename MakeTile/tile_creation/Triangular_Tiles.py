@@ -24,12 +24,17 @@ from ..lib.bmturtle.helpers import (
 
 from .. lib.utils.collections import (
     add_object_to_collection)
+from .. lib.utils.library_cache import get_library_objects
 
 from .. lib.utils.utils import mode
 
 from .create_tile import (
     convert_to_displacement_core,
     spawn_empty_base,
+    spawn_no_prefab,
+    spawn_tile_parts,
+    prefab_registry,
+    get_base_socket_filename,
     set_bool_obj_props,
     set_bool_props,
     MT_Tile_Generator,
@@ -135,42 +140,12 @@ class MT_OT_Make_Triangular_Floor_Tile(Operator, MT_Tile_Generator):
         items=create_material_enums,
         name="Floor Material")
 
-    # @profile
-    def exec(self, context):
-        base_blueprint = self.base_blueprint
-        core_blueprint = self.main_part_blueprint
-        tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-
-        if base_blueprint == 'NONE':
-            base = spawn_empty_base(tile_props)
-        elif base_blueprint == 'OPENLOCK':
-            base = spawn_openlock_base(self, tile_props)
-        elif base_blueprint == 'PLAIN':
-            base = spawn_plain_base(tile_props)
-
-        if core_blueprint == 'NONE':
-            core = None
-        else:
-            core = create_plain_triangular_floor_cores(base, tile_props)
-        self.finalise_tile(context, base, core)
-
     def execute(self, context):
         """Execute the operator."""
         super().execute(context)
         if not self.refresh:
             return {'PASS_THROUGH'}
-        self.exec(context)
-        # profile.dump_stats(splitext(__file__)[0] + '.prof')
-
-        return {'FINISHED'}
-
-    def init(self, context):
-        super().init(context)
-        tile_collection = bpy.data.collections[self.tile_name]
-        tile_props = tile_collection.mt_tile_props
-        tile_props.collection_type = "TILE"
-        tile_props.tile_size = (self.tile_x, self.tile_y, self.tile_z)
-        tile_props.base_size = (self.base_x, self.base_y, self.base_z)
+        return self.exec(context)
 
     def draw(self, context):
         super().draw(context)
@@ -213,7 +188,7 @@ class MT_OT_Make_Openlock_Triangular_Base(MT_Tile_Generator, Operator):
     def execute(self, context):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_openlock_base(tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
         return{'FINISHED'}
 
 
@@ -229,7 +204,7 @@ class MT_OT_Make_Plain_Triangular_Base(MT_Tile_Generator, Operator):
     def execute(self, context):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_plain_base(tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
         return{'FINISHED'}
 
 
@@ -245,7 +220,7 @@ class MT_OT_Make_Empty_Triangular_Base(MT_Tile_Generator, Operator):
     def execute(self, context):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        spawn_empty_base(tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
         return{'FINISHED'}
 
 
@@ -263,7 +238,7 @@ class MT_OT_Make_Plain_Triangular_Floor_Core(MT_Tile_Generator, Operator):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
         base = bpy.data.objects[self.base_name]
-        create_plain_triangular_floor_cores(base, tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint, base=base)
         return{'FINISHED'}
 
 
@@ -281,7 +256,7 @@ class MT_OT_Make_Openlock_Triangular_Floor_Core(MT_Tile_Generator, Operator):
         """Execute the operator."""
         tile_props = bpy.data.collections[self.tile_name].mt_tile_props
         base = bpy.data.objects[self.base_name]
-        create_plain_triangular_floor_cores(base, tile_props)
+        prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint, base=base)
         return{'FINISHED'}
 
 
@@ -300,6 +275,7 @@ class MT_OT_Make_Empty_Triangular_Floor_Core(MT_Tile_Generator, Operator):
         return {'PASS_THROUGH'}
 
 
+@prefab_registry.register('TRIANGULAR_BASE', 'PLAIN')
 def spawn_plain_base(tile_props):
     """Spawn a plain base into the scene.
 
@@ -329,7 +305,8 @@ def spawn_plain_base(tile_props):
     return base
 
 
-def spawn_openlock_base(self, tile_props):
+@prefab_registry.register('TRIANGULAR_BASE', 'OPENLOCK')
+def spawn_openlock_base(tile_props):
     """Spawn an OpenLOCK base into the scene.
 
     Args:
@@ -351,7 +328,7 @@ def spawn_openlock_base(self, tile_props):
     add_object_to_collection(base, tile_name)
 
     clip_cutters = spawn_openlock_base_clip_cutters(
-        self, dimensions, tile_props)
+        dimensions, tile_props)
 
     for clip_cutter in clip_cutters:
         set_bool_obj_props(clip_cutter, base, tile_props, 'DIFFERENCE')
@@ -370,7 +347,7 @@ def spawn_openlock_base(self, tile_props):
 
 
 # @profile
-def spawn_openlock_base_clip_cutters(self, dimensions, tile_props):
+def spawn_openlock_base_clip_cutters(dimensions, tile_props):
     """Make cutters for the openlock base clips.
 
     Args:
@@ -407,7 +384,7 @@ def spawn_openlock_base_clip_cutters(self, dimensions, tile_props):
 
     if a or b or c >= 2:
         preferences = get_prefs()
-        cutter_file = self.get_base_socket_filename()
+        cutter_file = get_base_socket_filename(tile_props.base_socket_type)
         booleans_path = os.path.join(
             preferences.assets_path,
             "meshes",
@@ -415,15 +392,12 @@ def spawn_openlock_base_clip_cutters(self, dimensions, tile_props):
             cutter_file)
 
         cutters = []
-        with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-            data_to.objects = [
-                'openlock.wall.base.cutter.clip.001',
-                'openlock.wall.base.cutter.clip.cap.start.001',
-                'openlock.wall.base.cutter.clip.cap.end.001']
-
-        cutter = data_to.objects[0]
-        cutter_start_cap = data_to.objects[1]
-        cutter_end_cap = data_to.objects[2]
+        # source cutters are only used as templates
+        cutter, cutter_start_cap, cutter_end_cap = get_library_objects(
+            booleans_path,
+            ['openlock.wall.base.cutter.clip.001',
+             'openlock.wall.base.cutter.clip.cap.start.001',
+             'openlock.wall.base.cutter.clip.cap.end.001'])
 
         # for cutters the number of cutters and start and end location has to take into account
         # the angles of the triangle in order to prevent overlaps between cutters
@@ -618,9 +592,6 @@ def spawn_openlock_base_clip_cutters(self, dimensions, tile_props):
             bm.to_mesh(me)
             bm.free()
             cutters.append(a_cutter)
-        bpy.data.objects.remove(cutter)
-        bpy.data.objects.remove(cutter_start_cap)
-        bpy.data.objects.remove(cutter_end_cap)
 
         cursor.location = cursor_orig_loc
         cursor.rotation_euler = cursor_orig_rot
@@ -652,6 +623,21 @@ def create_plain_triangular_floor_cores(base, tile_props):
     return core
 
 
+@prefab_registry.register('TRIANGULAR_FLOOR_CORE', 'PLAIN')
+@prefab_registry.register('TRIANGULAR_FLOOR_CORE', 'OPENLOCK')
+def spawn_floor_cores(tile_props, base):
+    """Prefab builder for triangular floor cores.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+        base (bpy.types.Object): tile base
+
+    Returns:
+        bpy.types.Object: preview core
+    """
+    return create_plain_triangular_floor_cores(base, tile_props)
+
+
 def spawn_floor_core(tile_props):
     """Spawn the core (top part) of a floor tile.
 
@@ -691,3 +677,20 @@ def spawn_floor_core(tile_props):
     bpy.context.view_layer.objects.active = core
 
     return core
+
+
+prefab_registry.register('TRIANGULAR_BASE', 'NONE', spawn_empty_base)
+prefab_registry.register('TRIANGULAR_FLOOR_CORE', 'NONE', spawn_no_prefab)
+
+
+@prefab_registry.register('TRIANGULAR_FLOOR', 'CUSTOM')
+def spawn_triangular_floor_tile(tile_props):
+    """Spawn a triangular floor tile.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base with the core parented to it
+    """
+    return spawn_tile_parts(tile_props, 'TRIANGULAR_BASE', 'TRIANGULAR_FLOOR_CORE')
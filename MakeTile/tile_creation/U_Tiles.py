@@ -26,13 +26,19 @@ from ..lib.bmturtle.helpers import (
     bm_deselect_all,
     assign_verts_to_group,
     select_verts_in_bounds,
-    bm_shortest_path)
+    bm_path_edges)
 from .. utils.registration import get_prefs
 from .. lib.utils.collections import (
     add_object_to_collection)
+from .. lib.utils.library_cache import copy_library_objects
 from .create_tile import (
     convert_to_displacement_core,
     spawn_empty_base,
+    spawn_no_prefab,
+    spawn_tile_parts,
+    prefab_registry,
+    parent_to_base,
+    get_base_socket_filename,
     set_bool_obj_props,
     set_bool_props,
     load_openlock_top_peg,
@@ -170,59 +176,13 @@ class MT_OT_Make_U_Wall_Tile(MT_Tile_Generator, Operator):
         items=create_material_enums,
         name="Floor Material")
 
-    # @profile
-    def exec(self, context):
-        base_blueprint = self.base_blueprint
-        wall_blueprint = self.main_part_blueprint
-        tile_props = bpy.data.collections[self.tile_name].mt_tile_props
-        floor_core = None
-        base = None
-
-        if base_blueprint == 'NONE':
-            base = spawn_empty_base(tile_props)
-        elif base_blueprint == 'OPENLOCK':
-            base = spawn_openlock_base(self, tile_props)
-        elif base_blueprint == 'PLAIN':
-            base = spawn_plain_base(tile_props)
-        elif base_blueprint in ['OPENLOCK_S_WALL', 'PLAIN_S_WALL']:
-            base, floor_core = spawn_s_base(self, context, tile_props)
-        if not base:
-            self.delete_tile_collection(self.tile_name)
-            self.report({'INFO'}, "Could not generate base. Cancelling")
-            return {'CANCELLED'}
-
-        if wall_blueprint == 'NONE':
-            wall_core = None
-        elif wall_blueprint == 'PLAIN':
-            wall_core = spawn_plain_wall_cores(tile_props)
-        elif wall_blueprint == 'OPENLOCK':
-            wall_core = spawn_openlock_wall_cores(base, tile_props)
-
-        if wall_blueprint != 'NONE' and wall_core == None:
-            self.delete_tile_collection(self.tile_name)
-            self.report({'INFO'}, "Could not generate wall core. Cancelling.")
-            return {'CANCELLED'}
-
-        self.finalise_tile(context, base, wall_core, floor_core)
-        # profile.dump_stats(splitext(__file__)[0] + '.prof')
-        return {'FINISHED'}
-
     def execute(self, context):
         """Execute the operator."""
         super().execute(context)
         if not self.refresh:
             return {'PASS_THROUGH'}
-
         return self.exec(context)
 
-    def init(self, context):
-        super().init(context)
-        tile_collection = bpy.data.collections[self.tile_name]
-        tile_props = tile_collection.mt_tile_props
-        tile_props.collection_type = "TILE"
-        tile_props.tile_size = (self.tile_x, self.tile_y, self.tile_z)
-        tile_props.base_size = (self.base_x, self.base_y, self.base_z)
-
     def draw(self, context):
         super().draw(context)
         layout = self.layout
@@ -254,12 +214,13 @@ class MT_OT_Make_U_Wall_Tile(MT_Tile_Generator, Operator):
 
 
 # @profile
-def spawn_openlock_wall_cores(base, tile_props):
+@prefab_registry.register('U_WALL_CORE', 'OPENLOCK')
+def spawn_openlock_wall_cores(tile_props, base):
     """Spawn preview and displacement cores into scene.
 
     Args:
-        base (bpy.types.Object): tile base
         tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+        base (bpy.types.Object): tile base
 
     Returns:
         bpy.types.Object: preview core
@@ -314,13 +275,9 @@ def spawn_openlock_wall_cutters(base, tile_props):
         "openlock.blend")
 
     # load side cutter
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
-
-    for obj in data_to.objects:
-        add_object_to_collection(obj, tile_name)
-
-    cutter = data_to.objects[0]
+    cutter = copy_library_objects(
+        booleans_path, ['openlock.wall.cutter.side'])[0]
+    add_object_to_collection(cutter, tile_name)
 
     array_mod = cutter.modifiers.new('Array', 'ARRAY')
     array_mod.use_relative_offset = False
@@ -342,15 +299,12 @@ def spawn_openlock_wall_cutters(base, tile_props):
     leg_1_bottom_cutter.name = 'Leg 1 Bottom.cutter.' + tile_props.tile_name
 
     leg_1_top_cutter = leg_1_bottom_cutter.copy()
-    leg_1_top_cutter.data = leg_1_top_cutter.data.copy()
     leg_1_top_cutter.name = 'Leg 1 Top.cutter.' + tile_props.tile_name
 
     leg_2_bottom_cutter = leg_1_bottom_cutter.copy()
-    leg_2_bottom_cutter.data = leg_2_bottom_cutter.data.copy()
     leg_2_bottom_cutter.name = 'Leg 2 Bottom.cutter.' + tile_props.tile_name
 
     leg_2_top_cutter = leg_1_bottom_cutter.copy()
-    leg_2_top_cutter.data = leg_2_top_cutter.data.copy()
     leg_2_top_cutter.name = 'Leg 2 Top.cutter.' + tile_props.tile_name
 
     cutters = [
@@ -417,7 +371,7 @@ def spawn_openlock_top_pegs(core, tile_props):
     source_peg = load_openlock_top_peg(tile_props)
     pegs = []
     peg_1 = bpy.data.objects.new(
-        'Base Wall Top Peg.' + tile_props.tile_name, source_peg.data.copy())
+        'Base Wall Top Peg.' + tile_props.tile_name, source_peg.data)
     add_object_to_collection(peg_1, tile_props.tile_name)
 
     array_mod = peg_1.modifiers.new('Array', 'ARRAY')
@@ -452,7 +406,7 @@ def spawn_openlock_top_pegs(core, tile_props):
     # leg 1
     if leg_1_outer_len >= 1:
         peg_2 = bpy.data.objects.new(
-            'Leg 1 Top Peg.' + tile_props.tile_name, source_peg.data.copy())
+            'Leg 1 Top Peg.' + tile_props.tile_name, source_peg.data)
         add_object_to_collection(peg_2, tile_props.tile_name)
 
         peg_2.rotation_euler[2] = radians(-90)
@@ -492,7 +446,7 @@ def spawn_openlock_top_pegs(core, tile_props):
     # leg 2
     if leg_2_outer_len >= 1:
         peg_3 = bpy.data.objects.new(
-            'Leg 2 Top Peg.' + tile_props.tile_name, source_peg.data.copy())
+            'Leg 2 Top Peg.' + tile_props.tile_name, source_peg.data)
         add_object_to_collection(peg_3, tile_props.tile_name)
 
         if leg_2_outer_len < 4 and leg_2_outer_len >= 1:
@@ -530,11 +484,13 @@ def spawn_openlock_top_pegs(core, tile_props):
     return pegs
 
 
-def spawn_plain_wall_cores(tile_props):
+@prefab_registry.register('U_WALL_CORE', 'PLAIN')
+def spawn_plain_wall_cores(tile_props, base=None):
     """Spawn preview and displacement cores into scene.
 
     Args:
         tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+        base (bpy.types.Object, optional): tile base. Unused. Defaults to None.
 
     Returns:
         bpy.types.Object: preview core
@@ -593,6 +549,7 @@ def spawn_core(tile_props):
     return core
 
 
+@prefab_registry.register('U_BASE', 'PLAIN')
 def spawn_plain_base(tile_props):
     """Spawn a plain base into the scene.
 
@@ -620,10 +577,27 @@ def spawn_plain_base(tile_props):
 
     return base
 
-def spawn_s_base(self, context, tile_props):
+
+@prefab_registry.register('U_BASE', 'PLAIN_S_WALL')
+@prefab_registry.register('U_BASE', 'OPENLOCK_S_WALL')
+def spawn_s_wall_base(tile_props):
+    """Prefab builder for S Bases.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base with the floor core parented to it
+    """
+    base, floor_core = spawn_s_base(tile_props)
+    parent_to_base(base, floor_core)
+    return base
+
+
+def spawn_s_base(tile_props):
     orig_base_size = [dim for dim in tile_props.base_size]
     orig_tile_size = [dim for dim in tile_props.tile_size]
-    cursor = context.scene.cursor
+    cursor = bpy.context.scene.cursor
     orig_loc = cursor.location.copy()
 
     tile_props.base_size = [
@@ -632,11 +606,11 @@ def spawn_s_base(self, context, tile_props):
         tile_props.base_size[2]]
 
     tile_props.tile_size = tile_props.base_size
-    tile_props.tile_size[2] += self.floor_thickness
+    tile_props.tile_size[2] += tile_props.floor_thickness
 
     unadjusted_base_size = [dim for dim in tile_props.base_size]
 
-    if self.wall_position == 'EXTERIOR':
+    if tile_props.wall_position == 'EXTERIOR':
         tile_props.base_size[0] -= 0.18
         tile_props.base_size[1] -= 0.09
         cursor.location = (
@@ -645,11 +619,11 @@ def spawn_s_base(self, context, tile_props):
                 cursor.location[2])
 
     if tile_props.base_blueprint == 'PLAIN_S_WALL':
-        base = spawn_plain_rect_base(self, tile_props)
+        base = spawn_plain_rect_base(tile_props)
     else:
-        base = spawn_openlock_rect_s_base(self, tile_props, unadjusted_base_size)
+        base = spawn_openlock_rect_s_base(tile_props, unadjusted_base_size)
 
-    if self.wall_position in ['SIDE', 'EXTERIOR']:
+    if tile_props.wall_position in ['SIDE', 'EXTERIOR']:
         orig_loc = cursor.location.copy()
         cursor.location = (
                 orig_loc[0] + 0.09,
@@ -660,16 +634,17 @@ def spawn_s_base(self, context, tile_props):
             tile_props.tile_size[0] - 0.18,
             tile_props.tile_size[1] - 0.09,
             tile_props.tile_size[2])
-        floor_core = create_plain_rect_floor_cores(self, tile_props, 0.09)
+        floor_core = create_plain_rect_floor_cores(tile_props, 0.09)
     else:
-        floor_core = create_plain_rect_floor_cores(self, tile_props)
+        floor_core = create_plain_rect_floor_cores(tile_props)
     cursor.location = orig_loc
     tile_props.tile_size = orig_tile_size
     tile_props.base_size = orig_base_size
     return base, floor_core
 
 
-def spawn_openlock_base(self, tile_props):
+@prefab_registry.register('U_BASE', 'OPENLOCK')
+def spawn_openlock_base(tile_props):
     """Spawn OpenLOCK base into scene.
 
     Args:
@@ -697,14 +672,12 @@ def spawn_openlock_base(self, tile_props):
     set_bool_props(slot_cutter, base, 'DIFFERENCE')
 
     # clip cutters
-    clip_cutter_leg_1 = spawn_openlock_base_clip_cutter(self, tile_props)
+    clip_cutter_leg_1 = spawn_openlock_base_clip_cutter(tile_props)
     clip_cutter_leg_1.name = 'Leg 1 Clip.' + tile_props.name + '.clip_cutter'
     clip_cutter_leg_2 = clip_cutter_leg_1.copy()
     clip_cutter_leg_2.name = 'Leg 2 Clip.' + tile_props.name + '.clip_cutter'
-    clip_cutter_leg_2.data = clip_cutter_leg_2.data.copy()
     clip_cutter_x_leg = clip_cutter_leg_1.copy()
     clip_cutter_x_leg.name = 'End Wall Clip.' + tile_props.name + '.clip_cutter'
-    clip_cutter_x_leg.data = clip_cutter_x_leg.data.copy()
 
     cutters = [clip_cutter_leg_1, clip_cutter_leg_2, clip_cutter_x_leg]
 
@@ -777,24 +750,24 @@ def spawn_openlock_base_slot_cutter(tile_props):
         "booleans",
         "openlock.blend")
 
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = [
-            'openlock.u_tile.base.cutter.slot.root',
-            'openlock.u_tile.base.cutter.slot.start_cap.root',
-            'openlock.u_tile.base.cutter.slot.end_cap.root']
+    cutters = copy_library_objects(
+        booleans_path,
+        ['openlock.u_tile.base.cutter.slot.root',
+         'openlock.u_tile.base.cutter.slot.start_cap.root',
+         'openlock.u_tile.base.cutter.slot.end_cap.root'])
 
-    for obj in data_to.objects:
+    for obj in cutters:
         add_object_to_collection(obj, tile_props.tile_name)
         # obj.hide_set(True)
         obj.hide_viewport = True
 
     # The slot cutter is a 0.1 wide rectangle with an array modifier
-    slot_cutter = data_to.objects[0]
+    slot_cutter = cutters[0]
     slot_cutter.name = 'Base Slot.' + tile_props.tile_name + '.slot_cutter'
 
     # the start and end caps are both made of objects with their own modifier
-    cutter_start_cap = data_to.objects[1]
-    cutter_end_cap = data_to.objects[2]
+    cutter_start_cap = cutters[1]
+    cutter_end_cap = cutters[2]
 
     if base_socket_side == 'OUTER':
         # gap between slot end and side
@@ -838,7 +811,7 @@ def spawn_openlock_base_slot_cutter(tile_props):
     return slot_cutter
 
 
-def spawn_openlock_base_clip_cutter(self, tile_props):
+def spawn_openlock_base_clip_cutter(tile_props):
     """Spawn base clip cutter into scene.
 
     Args:
@@ -848,7 +821,7 @@ def spawn_openlock_base_clip_cutter(self, tile_props):
         bpy.types.Object: base clip cutter
     """
     preferences = get_prefs()
-    cutter_file = self.get_base_socket_filename()
+    cutter_file = get_base_socket_filename(tile_props.base_socket_type)
     booleans_path = os.path.join(
         preferences.assets_path,
         "meshes",
@@ -856,18 +829,16 @@ def spawn_openlock_base_clip_cutter(self, tile_props):
         cutter_file)
 
     # load base cutters
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = [
-            'openlock.wall.base.cutter.clip',
-            'openlock.wall.base.cutter.clip.cap.start',
-            'openlock.wall.base.cutter.clip.cap.end']
+    cutters = copy_library_objects(
+        booleans_path,
+        ['openlock.wall.base.cutter.clip',
+         'openlock.wall.base.cutter.clip.cap.start',
+         'openlock.wall.base.cutter.clip.cap.end'])
 
-    for obj in data_to.objects:
+    for obj in cutters:
         add_object_to_collection(obj, tile_props.tile_name)
 
-    clip_cutter = data_to.objects[0]
-    cutter_start_cap = data_to.objects[1]
-    cutter_end_cap = data_to.objects[2]
+    clip_cutter, cutter_start_cap, cutter_end_cap = cutters
 
     # cutter_start_cap.hide_set(True)
     # cutter_end_cap.hide_set(True)
@@ -1418,11 +1389,9 @@ def create_u_core_vert_groups_vert_lists_2(bm, dimensions, margin, vert_locs, su
         v1 = bm.verts[v1_index]
         v2 = bm.verts[v2_index]
 
-        # TODO This is really expensive. See if we can find an alternative
-        nodes = bm_shortest_path(bm, v1, v2)
-        node = nodes[v2]
+        path, _ = bm_path_edges(bm, v1, v2)
 
-        for e in node.shortest_path:
+        for e in path:
             e.select_set(True)
         bm.select_flush(True)
 
@@ -1447,10 +1416,9 @@ def create_u_core_vert_groups_vert_lists_2(bm, dimensions, margin, vert_locs, su
         v1 = bm.verts[v1_index]
         v2 = bm.verts[v2_index]
 
-        nodes = bm_shortest_path(bm, v1, v2)
-        node = nodes[v2]
+        path, _ = bm_path_edges(bm, v1, v2)
 
-        for e in node.shortest_path:
+        for e in path:
             e.select_set(True)
         bm.select_flush(True)
 
@@ -1474,10 +1442,9 @@ def create_u_core_vert_groups_vert_lists_2(bm, dimensions, margin, vert_locs, su
         v1 = bm.verts[v1_index]
         v2 = bm.verts[v2_index]
 
-        nodes = bm_shortest_path(bm, v1, v2)
-        node = nodes[v2]
+        path, _ = bm_path_edges(bm, v1, v2)
 
-        for e in node.shortest_path:
+        for e in path:
             e.select_set(True)
         bm.select_flush(True)
 
@@ -1508,3 +1475,20 @@ def create_u_core_vert_groups_vert_lists_2(bm, dimensions, margin, vert_locs, su
         vert_groups['End Wall Top'].append(bm.verts[v_index])
 
     return vert_groups
+
+
+prefab_registry.register('U_BASE', 'NONE', spawn_empty_base)
+prefab_registry.register('U_WALL_CORE', 'NONE', spawn_no_prefab)
+
+
+@prefab_registry.register('U_WALL', 'CUSTOM')
+def spawn_u_wall_tile(tile_props):
+    """Spawn a U wall tile.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+
+    Returns:
+        bpy.types.Object: base with the core parented to it
+    """
+    return spawn_tile_parts(tile_props, 'U_BASE', 'U_WALL_CORE')
@@ -34,7 +34,7 @@ from .create_tile import get_subdivs
 
 
 # @profile
-def draw_apex_base(self, tile_props, margin=0.001):
+def draw_apex_base(tile_props, margin=0.001):
     """Draw an apex style roof base."""
     #      B
     #     /|\
@@ -419,7 +419,7 @@ def draw_apex_base(self, tile_props, margin=0.001):
 
 
 # @profile
-def draw_apex_roof_top(self, tile_props, margin=0.001):
+def draw_apex_roof_top(tile_props, margin=0.001):
     """Draw an apex type roof top.
 
     Args:
@@ -0,0 +1,337 @@
+"""Headless batch generation and export of tiles from a manifest.
+
+Run from the command line with MakeTile enabled in the user preferences:
+
+    blender --background --python-expr "from MakeTile.tile_creation.batch import main; main()" \
+        -- manifest.json --export-path /path/to/stl --report report.json --workers 8
+
+or from python inside Blender:
+
+    from MakeTile.tile_creation.batch import load_manifest, generate_batch
+    results = generate_batch(bpy.context, load_manifest('manifest.json'), '/path/to/stl')
+
+A manifest is a JSON or CSV file of tile specs. Each spec is a dict containing a tile_type
+e.g. 'STRAIGHT_WALL' plus any properties of mt_scene_props to set before the tile is
+generated, e.g. base_blueprint, main_part_blueprint, tile_x, wall_material. Properties
+that aren't set use the tile type's defaults. A spec can also contain:
+
+    name: file name to export the tile as. Defaults to the tile collection name.
+    variants: number of variants to export. Defaults to 1.
+    tile_size, base_size: [x, y, z] shorthand for tile_x, tile_y, tile_z etc.
+
+A JSON manifest is either a list of specs or a dict of the form
+{"defaults": {...}, "tiles": [...]} where defaults are applied to every spec.
+In a CSV manifest each row is a spec and empty cells are ignored.
+"""
+
+import os
+import sys
+import csv
+import json
+import argparse
+from time import perf_counter
+import bpy
+from ..utils.registration import get_prefs
+from ..lib.utils.tile_defaults import tile_defaults_registry
+from . import create_tile
+from ..app_handlers import (
+    load_default_materials,
+    create_properties_on_activation)
+from ..properties.scene_props import (
+    update_scene_defaults,
+    reset_part_defaults)
+from ..operators.exporter import export_tile_variants
+from ..operators.sharded_export import export_sharded
+from ..operators.bakedisplacement import (
+    set_cycles_to_bake_mode,
+    reset_renderer_from_bake)
+
+# keys in a tile spec that aren't mt_scene_props
+SPEC_KEYS = ('tile_type', 'name', 'variants', 'tile_size', 'base_size')
+
+
+def load_manifest(filepath):
+    """Load a list of tile specs from a JSON or CSV manifest.
+
+    Args:
+        filepath (str): path to manifest
+
+    Returns:
+        list[dict]: tile specs
+    """
+    if os.path.splitext(filepath)[1].lower() == '.csv':
+        with open(filepath, newline='') as csv_file:
+            return [parse_csv_row(row) for row in csv.DictReader(csv_file)]
+
+    with open(filepath) as json_file:
+        manifest = json.load(json_file)
+
+    if isinstance(manifest, list):
+        return manifest
+
+    defaults = manifest.get('defaults', {})
+    return [{**defaults, **spec} for spec in manifest['tiles']]
+
+
+def parse_csv_row(row):
+    """Convert the values of a CSV row to python types.
+
+    Args:
+        row (dict{str: str}): row
+
+    Returns:
+        dict: tile spec
+    """
+    spec = {}
+    for key, value in row.items():
+        if key is None or value is None or value.strip() == '':
+            continue
+        try:
+            spec[key] = json.loads(value)
+        except json.JSONDecodeError:
+            spec[key] = value
+    return spec
+
+
+def apply_tile_spec(context, spec):
+    """Set mt_scene_props to the tile type defaults overridden by the spec.
+
+    Args:
+        context (bpy.context): context
+        spec (dict): tile spec
+
+    Raises:
+        ValueError: if tile_type isn't in tile_defaults.json or spec contains a key
+        that isn't in SPEC_KEYS or mt_scene_props
+    """
+    if tile_defaults_registry.get(spec['tile_type']) is None:
+        raise ValueError('Unknown tile type ' + str(spec['tile_type']))
+
+    scene_props = context.scene.mt_scene_props
+    scene_props.tile_type = spec['tile_type']
+    update_scene_defaults(scene_props, context)
+
+    # blueprints have their own defaults so set them before everything else
+    for key in ('base_blueprint', 'main_part_blueprint'):
+        if key in spec:
+            setattr(scene_props, key, spec[key])
+    reset_part_defaults(scene_props, context)
+
+    props = {}
+    for prefix in ('tile', 'base'):
+        if prefix + '_size' in spec:
+            for axis, value in zip('xyz', spec[prefix + '_size']):
+                props[prefix + '_' + axis] = value
+    props.update(
+        {key: value for key, value in spec.items() if key not in SPEC_KEYS})
+
+    for key, value in props.items():
+        if not hasattr(scene_props, key):
+            raise ValueError('Unknown tile property ' + key)
+        setattr(scene_props, key, value)
+
+
+def generate_tile(context, spec):
+    """Generate a tile from a tile spec.
+
+    The tile is built from mt_scene_props by the tile type's builder in prefab_registry
+    rather than by its operator, so no UI context is needed.
+
+    Args:
+        context (bpy.context): context
+        spec (dict): tile spec
+
+    Raises:
+        KeyError: if no tile builder is registered for the tile type
+        RuntimeError: if the tile builder doesn't create a tile
+
+    Returns:
+        bpy.types.Collection: tile collection
+    """
+    apply_tile_spec(context, spec)
+    return create_tile.generate_tile(context)
+
+
+def delete_tile(collection):
+    """Delete a tile collection, its objects and their meshes.
+
+    Args:
+        collection (bpy.types.Collection): tile collection
+    """
+    meshes = set()
+    for obj in list(collection.objects):
+        if obj.type == 'MESH':
+            meshes.add(obj.data)
+        bpy.data.objects.remove(obj, do_unlink=True)
+    bpy.data.collections.remove(collection, do_unlink=True)
+
+    for mesh in meshes:
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def generate_batch(context, specs, export_path=None, export=True, keep_tiles=False, workers=1):
+    """Generate and export a tile for each tile spec.
+
+    Errors in individual tiles are recorded in the results and don't stop the batch.
+
+    Args:
+        context (bpy.context): context
+        specs (list[dict]): tile specs. See load_manifest
+        export_path (str, optional): Folder to export to. Defaults to default_export_path preference.
+        export (bool, optional): Export tiles. Defaults to True.
+        keep_tiles (bool, optional): Keep tiles in the scene after export. Tiles are always
+        kept if export is False. Defaults to False.
+        workers (int, optional): If more than 1 all tiles are generated first and then
+        exported by this many background Blender processes. See sharded_export. Defaults to 1.
+
+    Returns:
+        list[dict]: result for each spec containing name, tile_type, generate_time,
+        export_time, files and error
+    """
+    # make sure MakeTile has finished initialising if we are running in the background
+    if create_properties_on_activation in bpy.app.handlers.depsgraph_update_pre:
+        create_properties_on_activation(None)
+    else:
+        load_default_materials(context)
+
+    if export_path is None:
+        export_path = get_prefs().default_export_path
+    if export and not os.path.exists(export_path):
+        os.makedirs(export_path)
+
+    sharded = export and workers > 1
+    export_here = export and not sharded
+
+    if export_here:
+        orig_settings = set_cycles_to_bake_mode()
+
+    results = []
+    tiles = []
+    batch_start = perf_counter()
+
+    for index, spec in enumerate(specs):
+        result = {
+            'name': spec.get('name'),
+            'tile_type': spec.get('tile_type'),
+            'generate_time': 0.0,
+            'export_time': 0.0,
+            'files': [],
+            'error': None}
+        results.append(result)
+        collection = None
+
+        try:
+            start = perf_counter()
+            collection = generate_tile(context, spec)
+            result['generate_time'] = perf_counter() - start
+            if result['name'] is None:
+                result['name'] = collection.name
+            tiles.append((result, collection.name, int(spec.get('variants', 1))))
+
+            if export_here:
+                start = perf_counter()
+                result['files'] = export_tile_variants(
+                    context,
+                    collection,
+                    export_path,
+                    int(spec.get('variants', 1)),
+                    file_name=result['name'])
+                result['export_time'] = perf_counter() - start
+        except (RuntimeError, ValueError, KeyError, TypeError) as err:
+            result['error'] = str(err)
+
+        if collection is not None and export_here and not keep_tiles:
+            delete_tile(collection)
+
+        print_result(index, len(specs), result)
+
+    if export_here:
+        reset_renderer_from_bake(orig_settings)
+
+    if sharded and tiles:
+        export_batch_sharded(context, tiles, export_path, workers, keep_tiles)
+
+    failed = len([result for result in results if result['error']])
+    print(f'Batch of {len(specs)} tiles finished in {perf_counter() - batch_start:.2f}s. {failed} failed.')
+
+    return results
+
+
+def export_batch_sharded(context, tiles, export_path, workers, keep_tiles):
+    """Export generated tiles with background worker processes and add the results to the batch results.
+
+    Args:
+        context (bpy.context): context
+        tiles (list[tuple(dict, str, int)]): batch result, tile collection name and number of variants
+        export_path (str): folder to export to
+        workers (int): number of worker processes
+        keep_tiles (bool): Keep tiles in the scene after export
+    """
+    jobs = [
+        {'collection': collection_name, 'num_variants': variants, 'file_name': result['name']}
+        for result, collection_name, variants in tiles]
+    exported = export_sharded(context, jobs, export_path, workers)
+
+    batch_results = {collection_name: result for result, collection_name, variants in tiles}
+    for item in exported:
+        result = batch_results[item['collection']]
+        result['files'].extend(item['files'])
+        result['export_time'] += item['time']
+        if item['error']:
+            result['error'] = item['error']
+
+    if not keep_tiles:
+        for result, collection_name, variants in tiles:
+            delete_tile(bpy.data.collections[collection_name])
+
+
+def print_result(index, total, result):
+    """Print progress of a batch."""
+    if result['error']:
+        print(f"[{index + 1}/{total}] {result['name']} ({result['tile_type']}) failed: {result['error']}")
+    else:
+        print(
+            f"[{index + 1}/{total}] {result['name']} ({result['tile_type']}) "
+            f"generated in {result['generate_time']:.2f}s, "
+            f"exported in {result['export_time']:.2f}s")
+
+
+def main(argv=None):
+    """Command line entry point. Arguments are read from after '--' in sys.argv.
+
+    Args:
+        argv (list[str], optional): arguments. Defaults to None.
+    """
+    if argv is None:
+        argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+
+    parser = argparse.ArgumentParser(
+        prog='blender --background --python-expr "from MakeTile.tile_creation.batch import main; main()" --',
+        description='Generate and export MakeTile tiles from a JSON or CSV manifest.')
+    parser.add_argument('manifest', help='path to JSON or CSV manifest')
+    parser.add_argument('--export-path', help='folder to export STLs to. Defaults to MakeTile export path')
+    parser.add_argument('--report', help='write per tile results and timings to this JSON file')
+    parser.add_argument('--no-export', action='store_true', help='generate tiles without exporting them')
+    parser.add_argument('--keep-tiles', action='store_true', help="don't delete tiles after export")
+    parser.add_argument('--workers', type=int, default=1, help='number of background processes to export with')
+    parser.add_argument('--save', help='save the .blend file here when finished')
+    args = parser.parse_args(argv)
+
+    context = bpy.context
+    results = generate_batch(
+        context,
+        load_manifest(args.manifest),
+        export_path=args.export_path,
+        export=not args.no_export,
+        keep_tiles=args.keep_tiles,
+        workers=args.workers)
+
+    if args.report:
+        with open(args.report, 'w') as report:
+            json.dump(results, report, indent=4)
+
+    if args.save:
+        bpy.ops.wm.save_as_mainfile(filepath=os.path.abspath(args.save))
+
+    return results
@@ -30,7 +30,7 @@ from os.path import splitext
 profile = LineProfiler()
 '''
 #@profile
-def draw_butterfly_base(self, tile_props, margin=0.001):
+def draw_butterfly_base(tile_props, margin=0.001):
     """Draw a butterfly style roof base.
 
     Args:
@@ -491,7 +491,7 @@ def draw_butterfly_base(self, tile_props, margin=0.001):
     return obj
 
 #@profile
-def draw_butterfly_roof_top(self, tile_props, margin=0.001):
+def draw_butterfly_roof_top(tile_props, margin=0.001):
     """Draw a butterfly type roof top.
 
     Args:
@@ -17,6 +17,7 @@ from ..operators.assign_reference_object import (
 from ..utils.registration import get_prefs
 
 from ..lib.utils.vertex_groups import construct_displacement_mod_vert_group
+from ..lib.utils.mesh_arrays import MeshGroupArrays
 from ..lib.utils.collections import (
     add_object_to_collection,
     create_collection,
@@ -25,14 +26,20 @@ from ..lib.utils.collections import (
 from ..lib.utils.selection import deselect_all
 from ..lib.utils.multimethod import multimethod
 from ..materials.materials import assign_mat_to_vert_group
-from ..lib.utils.utils import get_all_subclasses, get_annotations
+from ..lib.utils.utils import (
+    get_all_subclasses,
+    create_copy_plan,
+    get_copy_plan,
+    apply_copy_plan)
 from ..lib.utils.file_handling import absolute_file_paths
+from ..lib.utils.library_cache import copy_library_objects
 
 from ..enums.enums import (
     units,
-    collection_types)
+    collection_types,
+    clip_cutter_modes)
 
-from ..app_handlers import load_tile_defaults
+from ..lib.utils.tile_defaults import tile_defaults_registry
 '''
 from line_profiler import LineProfiler
 from os.path import splitext
@@ -81,48 +88,20 @@ def create_main_part_blueprint_enums(self, context):
     Returns:
         list[enum_item]: list of enum items
     """
-    enum_items = []
-
     if context is None:
-        return enum_items
-
-    scene = context.scene
-    scene_props = scene.mt_scene_props
-
-    tile_type = scene_props.tile_type
-    tile_defaults = load_tile_defaults(context)
+        return []
 
-    for default in tile_defaults:
-        if default['type'] == tile_type:
-            try:
-                for key, value in default['main_part_blueprints'].items():
-                    enum = (key, value, "")
-                    enum_items.append(enum)
-                return sorted(enum_items)
-            # some tiles such as mini bases don't have a main part
-            except KeyError:
-                pass
-    return enum_items
+    tile_type = context.scene.mt_scene_props.tile_type
+    # some tiles such as mini bases don't have a main part
+    return tile_defaults_registry.get_enum_items(tile_type, 'main_part_blueprints')
 
 
 def create_base_blueprint_enums(self, context):
-    enum_items = []
     if context is None:
-        return enum_items
+        return []
 
-    scene = context.scene
-    scene_props = scene.mt_scene_props
-
-    tile_type = scene_props.tile_type
-    tile_defaults = load_tile_defaults(context)
-
-    for default in tile_defaults:
-        if default['type'] == tile_type:
-            for key, value in default['base_blueprints'].items():
-                enum = (key, value, "")
-                enum_items.append(enum)
-            return sorted(enum_items)
-    return enum_items
+    tile_type = context.scene.mt_scene_props.tile_type
+    return tile_defaults_registry.get_enum_items(tile_type, 'base_blueprints')
 
 
 def update_scene_defaults(self, context):
@@ -133,15 +112,10 @@ def update_scene_defaults(self, context):
 def reset_scene_defaults(self, context):
     scene_props = context.scene.mt_scene_props
     tile_type = scene_props.tile_type
-    tile_defaults = load_tile_defaults(context)
-
-    for tile in tile_defaults:
-        if tile['type'] == tile_type:
-            defaults = tile['defaults']
-            for key, value in defaults.items():
-                if hasattr(scene_props, key):
-                    setattr(scene_props, key, value)
-            break
+
+    for key, value in tile_defaults_registry.get_defaults(tile_type).items():
+        if hasattr(scene_props, key):
+            setattr(scene_props, key, value)
     reset_part_defaults(scene_props, context)
 
 
@@ -150,32 +124,21 @@ def reset_part_defaults(self, context):
     tile_type = scene_props.tile_type
     base_blueprint = self.base_blueprint
     main_part_blueprint = self.main_part_blueprint
-    floor_material = self.floor_material
-    tile_defaults = load_tile_defaults(context)
-    for tile in tile_defaults:
-        if tile['type'] == tile_type:
-            defaults = tile['defaults']
-            base_defaults = defaults['base_defaults']
-            for key, value in base_defaults.items():
-                if key == base_blueprint:
-                    for k, v in value.items():
-                        setattr(self, k, v)
-                    break
-            try:
-                main_part_defaults = defaults['tile_defaults']
-                for key, value in main_part_defaults.items():
-                    if key == main_part_blueprint:
-                        for k, v in value.items():
-                            setattr(self, k, v)
-                        break
-            # some tiles such as mini bases don't have a main part
-            except KeyError:
-                pass
-            try:
-                setattr(self, 'floor_material', defaults['floor_material'])
-            except KeyError:
-                break
-            break
+    defaults = tile_defaults_registry.get_defaults(tile_type)
+
+    base_defaults = tile_defaults_registry.get_blueprint_defaults(
+        tile_type, 'base_defaults', base_blueprint)
+    for key, value in base_defaults.items():
+        setattr(self, key, value)
+
+    # some tiles such as mini bases don't have a main part
+    main_part_defaults = tile_defaults_registry.get_blueprint_defaults(
+        tile_type, 'tile_defaults', main_part_blueprint)
+    for key, value in main_part_defaults.items():
+        setattr(self, key, value)
+
+    if 'floor_material' in defaults:
+        self.floor_material = defaults['floor_material']
 
 
 # TODO: Work out why this is called twice by operator
@@ -222,28 +185,11 @@ def create_wall_position_enums(self, context):
     Returns:
         list[EnumPropertyItem]: enum items
     """
-    prefs = get_prefs()
-    enum_items = []
-
     if context is None:
-        return enum_items
-
-    scene = context.scene
-    scene_props = scene.mt_scene_props
-
-    tile_type = scene_props.tile_type
-    tile_defaults = load_tile_defaults(context)
+        return []
 
-    for default in tile_defaults:
-        if default['type'] == tile_type:
-            try:
-                for key, value in default['wall_positions'].items():
-                    enum = (key, value, "")
-                    enum_items.append(enum)
-                return sorted(enum_items)
-            except KeyError:
-                pass
-    return enum_items
+    tile_type = context.scene.mt_scene_props.tile_type
+    return tile_defaults_registry.get_enum_items(tile_type, 'wall_positions')
 
 
 class MT_OT_Reset_Tile_Defaults(Operator):
@@ -473,6 +419,13 @@ class MT_Tile_Generator:
         description="What type of base socket to use."
     )
 
+    clip_cutter_mode: EnumProperty(
+        items=clip_cutter_modes,
+        default="ARRAY",
+        name="Clip Cutters",
+        description="How to create the cutters for the base clips of rectangular OpenLOCK bases"
+    )
+
     @classmethod
     def poll(cls, context):
         """Check in object mode."""
@@ -492,14 +445,8 @@ class MT_Tile_Generator:
         self.reset_defaults = False
 
         scene_props = context.scene.mt_scene_props
-        all_annotations = get_annotations(self.__class__)
-        for key in scene_props.__annotations__.keys():
-            for k in all_annotations.keys():
-                try:
-                    if k == key:
-                        setattr(self, str(k), getattr(scene_props, str(k)))
-                except TypeError:
-                    pass
+        plan = get_copy_plan(type(scene_props), self.__class__)
+        apply_copy_plan(plan, scene_props, self)
         self.refresh = True
         return self.execute(context)
 
@@ -517,86 +464,52 @@ class MT_Tile_Generator:
 
         # reset tile defaults
         if self.reset_defaults:
-            tile_defaults = load_tile_defaults(context)
-            for tile in tile_defaults:
-                if tile['type'] == tile_type:
-                    defaults = tile['defaults']
-                    for key, value in defaults.items():
-                        setattr(self, key, value)
-                    break
-            main_part_blueprint = self.main_part_blueprint
-            base_blueprint = self.base_blueprint
-            try:
-                main_part_defaults = defaults['tile_defaults']
-                for key, value in main_part_defaults.items():
-                    if key == main_part_blueprint:
-                        for k, v in value.items():
-                            setattr(self, k, v)
-                        break
-            except KeyError:
-                pass
-            try:
-                base_defaults = defaults['base_defaults']
-                for key, value in base_defaults.items():
-                    if key == base_blueprint:
-                        for k, v in value.items():
-                            setattr(self, k, v)
-                        break
-            except KeyError:
-                pass
+            for key, value in tile_defaults_registry.get_defaults(tile_type).items():
+                setattr(self, key, value)
+
+            main_part_defaults = tile_defaults_registry.get_blueprint_defaults(
+                tile_type, 'tile_defaults', self.main_part_blueprint)
+            for key, value in main_part_defaults.items():
+                setattr(self, key, value)
+
+            base_defaults = tile_defaults_registry.get_blueprint_defaults(
+                tile_type, 'base_defaults', self.base_blueprint)
+            for key, value in base_defaults.items():
+                setattr(self, key, value)
             self.reset_defaults = False
 
         # We create tile at origin and then move it back to original location.
         # This saves us having to update the scene when we reset origins etc.
-        cursor = scene.cursor
-        self.cursor_orig_loc = cursor.location.copy()
-        self.cursor_orig_rot = cursor.rotation_euler.copy()
-        cursor.location = (0, 0, 0)
-        cursor.rotation_euler = (0, 0, 0)
-
-        # create helper object for material mapping
-        create_helper_object(context)
-
-        # Each tile is a sub collection of a 'Tiles' collection
-        collections = bpy.data.collections
-        if 'Tiles' not in collections:
-            create_collection('Tiles', scene.collection)
-        tile_collection = collections.new(scene_props.tile_type.lower())
-        collections['Tiles'].children.link(tile_collection)
-
-        # set tile_name to collection name
-        self.tile_name = tile_collection.name
+        self.cursor_orig_loc, self.cursor_orig_rot = reset_cursor(scene)
 
-        # properties are stored on the tile collection for
-        # later access by the tile constructors
-        tile_props = tile_collection.mt_tile_props
-
-        self_annotations = get_annotations(self.__class__)
         try:
-            copy_annotation_props(self, tile_props, self_annotations)
+            tile_collection = create_tile_collection(context, self)
         except TypeError as err:
             self.report({'INFO'}, str(err))
             return False
 
-        tile_props.tile_type = tile_type
-        activate_collection(tile_collection.name)
+        self.tile_name = tile_collection.name
         return True
 
+    def exec(self, context):
+        """Build the tile registered in prefab_registry for the operator's mt_type."""
+        tile_props = bpy.data.collections[self.tile_name].mt_tile_props
+        base = prefab_registry.build(tile_props, self.mt_type, self.mt_blueprint)
+        if base is None:
+            self.delete_tile_collection(self.tile_name)
+            self.report({'INFO'}, "Could not generate tile. Cancelling")
+            return {'CANCELLED'}
+
+        self.finalise_tile(context, base)
+        return {'FINISHED'}
+
     def get_base_socket_filename(self):
         """Return the filename where booleans are stored for the tile's base_socket_type.
 
         Returns:
             str: filename
         """
-        sockets = [
-            {'socket_type': 'OPENLOCK',
-             'filename': 'openlock.blend'},
-            {'socket_type': 'LASTLOCK',
-             'filename': 'lastlock.blend'}]
-        for socket in sockets:
-            if socket['socket_type'] == self.base_socket_type:
-                return socket['filename']
-        return False
+        return get_base_socket_filename(self.base_socket_type)
 
     def delete_tile_collection(self, col_name):
         """Delete the collection and any objects it contains.
@@ -628,30 +541,7 @@ class MT_Tile_Generator:
             base (bpy.types.Object): Base to parent objects to
             *args (list of bpy.types.Object)
         """
-        # assign secondary material to base if it is a mesh
-        prefs = get_prefs()
-        if base.type == 'MESH' and prefs.secondary_material not in base.material_slots:
-            base.data.materials.append(
-                bpy.data.materials[prefs.secondary_material])
-
-        # Reset location of base
-        base.location = self.cursor_orig_loc
-        cursor = context.scene.cursor
-        cursor.location = self.cursor_orig_loc
-        cursor.rotation_euler = self.cursor_orig_rot
-
-        # Parent cores to base
-        for arg in args:
-            if arg is not None:
-                arg.parent = base
-                lock_all_transforms(arg)
-
-        # deselect any currently selected objects
-        for obj in context.selected_objects:
-            obj.select_set(False)
-
-        base.select_set(True)
-        context.view_layer.objects.active = base
+        finalise_tile(context, base, self.cursor_orig_loc, self.cursor_orig_rot, *args)
 
         if self.auto_refresh is False:
             self.refresh = False
@@ -758,6 +648,157 @@ def initialise_tile_creator(context):
     return tile_name, tiles_collection, cursor_orig_loc, cursor_orig_rot
 
 
+def reset_cursor(scene):
+    """Move the 3D cursor to the origin.
+
+    Tiles are created at the origin and then moved to where the cursor was. This saves
+    us having to update the scene when we reset origins etc.
+
+    Args:
+        scene (bpy.types.Scene): scene
+
+    Returns:
+        tuple(mathutils.Vector, mathutils.Euler): original cursor location and rotation
+    """
+    cursor = scene.cursor
+    cursor_orig_loc = cursor.location.copy()
+    cursor_orig_rot = cursor.rotation_euler.copy()
+    cursor.location = (0, 0, 0)
+    cursor.rotation_euler = (0, 0, 0)
+    return cursor_orig_loc, cursor_orig_rot
+
+
+def create_tile_collection(context, source_props):
+    """Create a tile collection and store the tile properties on it.
+
+    Each tile is a sub collection of a 'Tiles' collection. Its properties are stored on
+    the collection for later access by the prefab builders.
+
+    Args:
+        context (bpy.context): context
+        source_props (MT_Tile_Generator or mt_scene_props): properties to copy to the tile
+
+    Raises:
+        TypeError: if the properties can't be copied
+
+    Returns:
+        bpy.types.Collection: tile collection
+    """
+    scene = context.scene
+    tile_type = scene.mt_scene_props.tile_type
+
+    # create helper object for material mapping
+    create_helper_object(context)
+
+    collections = bpy.data.collections
+    if 'Tiles' not in collections:
+        create_collection('Tiles', scene.collection)
+    tile_collection = collections.new(tile_type.lower())
+    collections['Tiles'].children.link(tile_collection)
+
+    tile_props = tile_collection.mt_tile_props
+    copy_annotation_props(source_props, tile_props)
+    tile_props.tile_name = tile_collection.name
+    tile_props.tile_type = tile_type
+    tile_props.collection_type = "TILE"
+    tile_props.tile_size = (tile_props.tile_x, tile_props.tile_y, tile_props.tile_z)
+    tile_props.base_size = (tile_props.base_x, tile_props.base_y, tile_props.base_z)
+
+    activate_collection(tile_collection.name)
+    return tile_collection
+
+
+def parent_to_base(base, *parts):
+    """Parent tile parts such as cores to the base and lock their transforms.
+
+    Args:
+        base (bpy.types.Object): base
+        *parts (list of bpy.types.Object): parts. None is ignored.
+    """
+    for part in parts:
+        if part is not None:
+            part.parent = base
+            lock_all_transforms(part)
+
+
+def finalise_tile(context, base, cursor_orig_loc, cursor_orig_rot, *parts):
+    """Finalise a tile.
+
+    Parents the objects passed in *parts to the base, sets the base material,
+    places the tile at the original cursor location, resets the cursor and
+    makes the base the only selected object.
+
+    Args:
+        context (bpy.context): Context
+        base (bpy.types.Object): Base to parent objects to
+        cursor_orig_loc (mathutils.Vector): original cursor location. See reset_cursor
+        cursor_orig_rot (mathutils.Euler): original cursor rotation
+        *parts (list of bpy.types.Object)
+    """
+    # assign secondary material to base if it is a mesh
+    prefs = get_prefs()
+    if base.type == 'MESH' and prefs.secondary_material not in base.material_slots:
+        base.data.materials.append(
+            bpy.data.materials[prefs.secondary_material])
+
+    # Reset location of base
+    base.location = cursor_orig_loc
+    cursor = context.scene.cursor
+    cursor.location = cursor_orig_loc
+    cursor.rotation_euler = cursor_orig_rot
+
+    parent_to_base(base, *parts)
+
+    # deselect any currently selected objects
+    for obj in context.selected_objects:
+        obj.select_set(False)
+
+    base.select_set(True)
+    context.view_layer.objects.active = base
+
+
+def generate_tile(context, source_props=None):
+    """Generate a tile without calling its operator.
+
+    Builds the tile registered in prefab_registry for the tile type in mt_scene_props,
+    so no operator context is needed and no undo steps are pushed. Used by batch scripts.
+
+    Args:
+        context (bpy.context): context
+        source_props (MT_Tile_Generator or mt_scene_props, optional): tile properties.
+        Defaults to mt_scene_props.
+
+    Raises:
+        KeyError: if no tile is registered for the tile type
+        RuntimeError: if the tile couldn't be generated
+
+    Returns:
+        bpy.types.Collection: tile collection
+    """
+    scene = context.scene
+    if source_props is None:
+        source_props = scene.mt_scene_props
+    tile_type = scene.mt_scene_props.tile_type
+    if prefab_registry.get(tile_type, 'CUSTOM') is None:
+        raise KeyError('No tile builder for ' + tile_type)
+
+    deselect_all()
+    cursor_orig_loc, cursor_orig_rot = reset_cursor(scene)
+    tile_collection = create_tile_collection(context, source_props)
+    base = prefab_registry.build(tile_collection.mt_tile_props, tile_type, 'CUSTOM')
+
+    if base is None:
+        scene.cursor.location = cursor_orig_loc
+        scene.cursor.rotation_euler = cursor_orig_rot
+        for obj in list(tile_collection.objects):
+            bpy.data.objects.remove(obj, do_unlink=True)
+        bpy.data.collections.remove(tile_collection, do_unlink=True)
+        raise RuntimeError('Failed to generate ' + tile_type)
+
+    finalise_tile(context, base, cursor_orig_loc, cursor_orig_rot)
+    return tile_collection
+
+
 def create_common_tile_props(scene_props, tile_props, tile_collection):
     """Create properties common to all tiles."""
     copy_annotation_props(scene_props, tile_props)
@@ -770,8 +811,9 @@ def create_common_tile_props(scene_props, tile_props, tile_collection):
 def copy_annotation_props(source_props, target_props, source_annotations=None, target_annotations=None):
     """Set target_props to the value of source_props.
 
-    Props must have same names and be of same type. If you want to include annotations of parent
-    class(es) set them seperately.
+    Props must have same names and be of compatible types. By default annotations of
+    the classes and their parent classes are used and the props to copy are only worked
+    out once for each pair of classes. See lib.utils.utils.get_copy_plan.
 
     Args:
         source_prop_group (class): Source class
@@ -779,19 +821,16 @@ def copy_annotation_props(source_props, target_props, source_annotations=None, t
         source_annotations (.__annotations__), optional: annotations to copy. Defaults to None.
         target_annotations (.__annotations__), optional: annotations to set. Defaults to None.
     """
-    if not source_annotations:
-        source_annotations = source_props.__annotations__
-    if not target_annotations:
-        target_annotations = target_props.__annotations__
+    if source_annotations is None and target_annotations is None:
+        plan = get_copy_plan(type(source_props), type(target_props))
+    else:
+        if source_annotations is None:
+            source_annotations = source_props.__annotations__
+        if target_annotations is None:
+            target_annotations = target_props.__annotations__
+        plan = create_copy_plan(source_annotations, target_annotations)
 
-    for key in source_annotations.keys():
-        for k in target_annotations.keys():
-            if k == key:
-                try:
-                    setattr(target_props, str(k),
-                            getattr(source_props, str(k)))
-                except TypeError:
-                    pass
+    apply_copy_plan(plan, source_props, target_props)
 
 
 def lock_all_transforms(obj):
@@ -889,8 +928,9 @@ def convert_to_displacement_core(core, textured_vertex_groups, material, subsurf
     if prim_mat.name not in core.data.materials:
         core.data.materials.append(prim_mat)
 
+    mesh_arrays = MeshGroupArrays(core)
     for group in textured_vertex_groups:
-        assign_mat_to_vert_group(group, core, prim_mat)
+        assign_mat_to_vert_group(group, core, prim_mat, mesh_arrays)
 
     # flag core as a displacement object
     core.mt_object_props.is_displacement = True
@@ -920,36 +960,132 @@ def spawn_empty_base(tile_props):
     return base
 
 
-def spawn_prefab(context, subclasses, blueprint, mt_type, **kwargs):
-    """Spawn a maketile prefab such as a base or tile core(s).
+class PrefabRegistry:
+    """Map (mt_type, mt_blueprint) to functions that build a prefab such as a base or tile core(s).
+
+    Builders take the tile properties plus any keyword arguments the prefab needs,
+    e.g. the base a core is fitted to, and return the prefab object. Whole tiles are
+    registered under (tile_type, 'CUSTOM') and return the base with the other parts
+    parented to it. Builders don't need an operator context and don't push undo steps,
+    so they are used by the tile generators and batch scripts alike. See generate_tile.
+    """
+
+    def __init__(self):
+        self.builders = {}
+
+    def register(self, mt_type, blueprint, builder=None):
+        """Register a function as the builder of a prefab.
+
+        Can be used as a decorator if builder is not passed.
+
+        Args:
+            mt_type (str): mt_type enum item e.g. 'TRIANGULAR_BASE'
+            blueprint (str): mt_blueprint enum item e.g. 'OPENLOCK'
+            builder (function, optional): builder. Defaults to None.
+
+        Returns:
+            function: builder, or decorator if builder is None
+        """
+        def decorator(builder):
+            self.builders[(mt_type, blueprint)] = builder
+            return builder
+
+        if builder is None:
+            return decorator
+        return decorator(builder)
+
+    def get(self, mt_type, blueprint):
+        """Return the builder of a prefab.
+
+        Args:
+            mt_type (str): mt_type enum item
+            blueprint (str): mt_blueprint enum item
+
+        Returns:
+            function: builder. None if no builder has been registered.
+        """
+        return self.builders.get((mt_type, blueprint))
+
+    def build(self, tile_props, mt_type, blueprint, **kwargs):
+        """Build a prefab.
+
+        Args:
+            tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+            mt_type (str): mt_type enum item
+            blueprint (str): mt_blueprint enum item
+            **kwargs (dict): Arguments to pass to builder
+
+        Raises:
+            KeyError: if no builder has been registered for mt_type and blueprint
+
+        Returns:
+            bpy.types.Object: Prefab. None if the blueprint doesn't create an object.
+        """
+        builder = self.get(mt_type, blueprint)
+        if builder is None:
+            raise KeyError('No prefab builder for ' + mt_type + ' ' + blueprint)
+        return builder(tile_props, **kwargs)
+
+
+prefab_registry = PrefabRegistry()
+
+
+def spawn_no_prefab(tile_props, **kwargs):
+    """Prefab builder for blueprints that don't create anything e.g. a 'NONE' core.
 
     Args:
-        context (bpy.context): Blender context
-        subclasses (list): list of all subclasses of MT_Tile_Generator
-        blueprint (str): mt_blueprint enum item
-        type (str): mt_type enum item
-        **kwargs (dict): Arguments to pass to operator
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
 
     Returns:
-        bpy.types.Object: Prefab
+        None
     """
-    args = []
-    for key, value in kwargs.items():
-        if isinstance(value, str):
-            value = "\"" + value + "\""
-        args.append(key + '=' + str(value))
-    arg_str = ', '.join(args)
-
-    # ensure we can only run bpy.ops in our eval statements
-    allowed_names = {k: v for k, v in bpy.__dict__.items() if k == 'ops'}
-    for subclass in subclasses:
-        if hasattr(subclass, 'mt_type') and hasattr(subclass, 'mt_blueprint'):
-            if subclass.mt_type == mt_type and subclass.mt_blueprint == blueprint:
-                eval_str = 'ops.' + subclass.bl_idname + '(' + arg_str + ')'
-                eval(eval_str, {"__builtins__": {}}, allowed_names)
+    return None
 
-    prefab = context.active_object
-    return prefab
+
+def spawn_tile_parts(tile_props, base_type, core_type):
+    """Build the base and core of a tile with the builders registered in prefab_registry.
+
+    The base is built for tile_props.base_blueprint and the core for
+    tile_props.main_part_blueprint. Core builders are passed the base.
+
+    Args:
+        tile_props (MakeTile.properties.MT_Tile_Properties): tile properties
+        base_type (str): mt_type of the base e.g. 'TRIANGULAR_BASE'
+        core_type (str): mt_type of the core e.g. 'TRIANGULAR_FLOOR_CORE'
+
+    Returns:
+        bpy.types.Object: base with the core parented to it. None if the base or core couldn't be built.
+    """
+    base = prefab_registry.build(tile_props, base_type, tile_props.base_blueprint)
+    if not base:
+        return None
+
+    core = prefab_registry.build(tile_props, core_type, tile_props.main_part_blueprint, base=base)
+    if core is None and tile_props.main_part_blueprint != 'NONE':
+        return None
+
+    parent_to_base(base, core)
+    return base
+
+
+def get_base_socket_filename(base_socket_type):
+    """Return the filename where booleans are stored for a base_socket_type.
+
+    Args:
+        base_socket_type (str): base_socket_type enum item
+
+    Returns:
+        str: filename. False if base_socket_type isn't recognised.
+    """
+    sockets = [
+        {'socket_type': 'OPENLOCK',
+         'filename': 'openlock.blend'},
+        {'socket_type': 'LASTLOCK',
+         'filename': 'lastlock.blend'}]
+    for socket in sockets:
+        if socket['socket_type'] == base_socket_type:
+            return socket['filename']
+    return False
 
 
 def load_openlock_top_peg(tile_props):
@@ -971,10 +1107,7 @@ def load_openlock_top_peg(tile_props):
         "openlock.blend")
 
     # load peg bool
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.top_peg']
-
-    peg = data_to.objects[0]
+    peg = copy_library_objects(booleans_path, ['openlock.top_peg'])[0]
     peg.name = 'Top Peg.' + tile_name
     add_object_to_collection(peg, tile_name)
 
@@ -29,7 +29,7 @@ from ..lib.bmturtle.scripts import draw_cuboid
 
 from .create_tile import get_subdivs
 
-def draw_shed_base(self, tile_props, margin=0.001):
+def draw_shed_base(tile_props, margin=0.001):
     """Draw a shed style roof base (Not sure why this style is called "shed" but hey ho)."""
     #  B
     #  |\
@@ -352,7 +352,7 @@ def draw_shed_base(self, tile_props, margin=0.001):
     return obj
 
 
-def draw_shed_roof_top(self, tile_props, margin=0.001):
+def draw_shed_roof_top(tile_props, margin=0.001):
     """Draw a shed type roof top.
 
     Args:
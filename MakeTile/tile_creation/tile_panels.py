@@ -1,5 +1,8 @@
 """Contains elements used in the creation of panels for the tile generators."""
 
+# tile types whose OpenLOCK bases can use joined clip cutters
+JOINED_CLIP_CUTTER_TILE_TYPES = ('STRAIGHT_WALL', 'RECT_FLOOR', 'CONNECTING_COLUMN')
+
 def scene_tile_panel_header(scene_props, layout, blueprints, tile_type):
     """Header for N menu tile generator panels.
 
@@ -15,6 +18,8 @@ def scene_tile_panel_header(scene_props, layout, blueprints, tile_type):
 
     if 'base_blueprint' in blueprints and 'OPENLOCK' in scene_props.base_blueprint:
         layout.prop(scene_props, 'base_socket_type')
+        if scene_props.base_blueprint == 'OPENLOCK' and scene_props.tile_type in JOINED_CLIP_CUTTER_TILE_TYPES:
+            layout.prop(scene_props, 'clip_cutter_mode')
 
     layout.label(text="Materials")
     if tile_type == 'FLOOR':
@@ -132,6 +137,8 @@ def redo_tile_panel_header(self, layout, blueprints, tile_type):
 
     if 'base_blueprint' in blueprints and 'OPENLOCK' in self.base_blueprint:
         layout.prop(self, 'base_socket_type')
+        if self.base_blueprint == 'OPENLOCK' and self.mt_type in JOINED_CLIP_CUTTER_TILE_TYPES:
+            layout.prop(self, 'clip_cutter_mode')
 
     layout.label(text='Materials')
     if tile_type == 'FLOOR':
@@ -64,6 +64,10 @@ class MT_PT_Material_Options_Panel(Panel):
         # TODO check that changing tile resolution in menu actuallly changes it.
         # layout.prop(scene_props, 'tile_resolution')
         layout.prop(scene_props, 'displacement_strength')
+        layout.prop(scene_props, 'displacement_engine')
+        layout.prop(scene_props, 'displacement_mode')
+        layout.prop(scene_props, 'tiled_bake')
+        layout.prop(scene_props, 'bake_atlas')
         obj = context.object
         material = obj.active_material
         tree = material.node_tree
@@ -1,7 +1,7 @@
 import bpy
 from bpy.types import Panel
 from bpy.props import BoolProperty, EnumProperty
-from ..app_handlers import load_tile_defaults
+from ..lib.utils.tile_defaults import tile_defaults_registry
 
 # TODO create a Layout Mode, Preview Mode switch. Add in a triangulate modifier that can be switched on and off for layout mode.
 # Layout mode should also switch everything to 0 subdivision layers and to solid shading
@@ -32,12 +32,9 @@ class MT_PT_Tile_Generator_Panel(Panel):
 
         # Display the appropriate operator based on tile_type
         tile_type = scene_props.tile_type
-        #tile_defaults = scene_props['tile_defaults']
-        tile_defaults = load_tile_defaults(context)
-
-        for default in tile_defaults:
-            if default['type'] == tile_type:
-                layout.operator(default['bl_idname'], text="MakeTile")
+        tile = tile_defaults_registry.get(tile_type)
+        if tile is not None:
+            layout.operator(tile['bl_idname'], text="MakeTile")
 
         if obj is not None and obj.type == 'MESH':
             #if obj.mt_object_props.geometry_type == 'PREVIEW':
@@ -78,6 +75,10 @@ class MT_PT_Booleans_Panel(bpy.types.Panel):
             stripped_name = cutter.name.split(seperator, 1)[0]
             layout.prop(cutter, "value", text=stripped_name)
 
+        row = layout.row()
+        row.operator('object.mt_freeze_cutters')
+        row.operator('object.mt_unfreeze_cutters')
+
 
 class MT_PT_Converter_Panel(Panel):
     '''Allows you to convert any mesh object into a MakeTile object'''
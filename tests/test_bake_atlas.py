@@ -0,0 +1,14 @@
+from MakeTile.operators.bakedisplacement import get_atlas_layout, ATLAS_MAX_SIZE
+
+
+def test_atlas_layout_fits_all_maps():
+    resolution = 1024
+    per_atlas = (ATLAS_MAX_SIZE // resolution) ** 2
+    layout = get_atlas_layout(per_atlas + 3, resolution)
+
+    assert sum(count for count, _, _ in layout) == per_atlas + 3
+    for count, columns, rows in layout:
+        assert columns * rows >= count
+        assert max(columns, rows) * resolution <= ATLAS_MAX_SIZE
+    assert layout[-1] == (3, 2, 2)
+    assert get_atlas_layout(1, 8192) == [(1, 1, 1)]
@@ -0,0 +1,62 @@
+import bpy
+from MakeTile.lib.utils.bake_cache import displacement_bake_key
+
+
+def test_bake_key_changes_with_seed_and_resolution(cube):
+    material = bpy.data.materials.new('disp_material')
+    material.use_nodes = True
+    tree = material.node_tree
+    tree.nodes.new('ShaderNodeEmission').name = 'disp_emission'
+    seed = tree.nodes.new('ShaderNodeValue')
+    seed.name = 'Seed'
+    seed.outputs[0].default_value = 1
+    cube.data.materials.append(material)
+
+    key = displacement_bake_key(cube, 1024, 10)
+    assert displacement_bake_key(cube, 1024, 10) == key
+    assert displacement_bake_key(cube, 2048, 10) != key
+
+    seed.location = (100, 100)
+    assert displacement_bake_key(cube, 1024, 10) == key
+
+    seed.outputs[0].default_value = 2
+    assert displacement_bake_key(cube, 1024, 10) != key
+
+
+def test_bake_key_changes_when_cutter_moves(cube):
+    cutter = bpy.data.objects.new('test_cutter', cube.data.copy())
+    bpy.context.layer_collection.collection.objects.link(cutter)
+    boolean = cube.modifiers.new('cutter', 'BOOLEAN')
+    boolean.object = cutter
+
+    key = displacement_bake_key(cube, 1024, 10)
+    cutter.location = (0.25, 0, 0)
+    bpy.context.view_layer.update()
+    assert displacement_bake_key(cube, 1024, 10) != key
+
+
+def test_bake_key_changes_when_cutter_is_toggled(cube):
+    cutter = bpy.data.objects.new('test_cutter', cube.data.copy())
+    bpy.context.layer_collection.collection.objects.link(cutter)
+    boolean = cube.modifiers.new('cutter', 'BOOLEAN')
+    boolean.object = cutter
+
+    key = displacement_bake_key(cube, 1024, 10)
+    # the cutter toggle in the UI only hides the boolean in the viewport
+    boolean.show_viewport = False
+    assert displacement_bake_key(cube, 1024, 10) != key
+
+
+def test_bake_key_changes_with_engine_and_texture_mapping(cube):
+    material = bpy.data.materials.new('disp_material')
+    material.use_nodes = True
+    tree = material.node_tree
+    tree.nodes.new('ShaderNodeEmission').name = 'disp_emission'
+    noise = tree.nodes.new('ShaderNodeTexNoise')
+    cube.data.materials.append(material)
+
+    key = displacement_bake_key(cube, 1024, 10, engine='CYCLES')
+    assert displacement_bake_key(cube, 1024, 10, engine='NUMPY') != key
+
+    noise.texture_mapping.scale[0] = 2
+    assert displacement_bake_key(cube, 1024, 10, engine='CYCLES') != key
@@ -0,0 +1,36 @@
+import json
+from MakeTile.tile_creation.batch import load_manifest
+
+
+def test_load_json_manifest_applies_defaults(tmp_path):
+    manifest = tmp_path / 'manifest.json'
+    manifest.write_text(json.dumps({
+        'defaults': {'tile_type': 'STRAIGHT_WALL', 'wall_material': 'Stone'},
+        'tiles': [
+            {'name': 'wall_2x1', 'tile_x': 2},
+            {'name': 'floor_2x2', 'tile_type': 'RECT_FLOOR', 'tile_size': [2, 2, 0.3]}]}))
+
+    specs = load_manifest(str(manifest))
+
+    assert specs[0] == {
+        'tile_type': 'STRAIGHT_WALL', 'wall_material': 'Stone', 'name': 'wall_2x1', 'tile_x': 2}
+    assert specs[1]['tile_type'] == 'RECT_FLOOR'
+    assert specs[1]['tile_size'] == [2, 2, 0.3]
+
+
+def test_load_csv_manifest_parses_values(tmp_path):
+    manifest = tmp_path / 'manifest.csv'
+    manifest.write_text(
+        'tile_type,name,tile_x,variants,base_size\n'
+        'STRAIGHT_WALL,wall_a,2.5,3,"[2, 0.5, 0.25]"\n'
+        'RECT_FLOOR,floor_a,,,\n')
+
+    specs = load_manifest(str(manifest))
+
+    assert specs[0] == {
+        'tile_type': 'STRAIGHT_WALL',
+        'name': 'wall_a',
+        'tile_x': 2.5,
+        'variants': 3,
+        'base_size': [2, 0.5, 0.25]}
+    assert specs[1] == {'tile_type': 'RECT_FLOOR', 'name': 'floor_a'}
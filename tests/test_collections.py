@@ -0,0 +1,36 @@
+import bpy
+from MakeTile.lib.utils.collections import (
+    add_object_to_collection,
+    get_objects_owning_collections,
+    collection_index)
+
+
+def test_get_objects_owning_collections(cube):
+    first = bpy.data.collections.new('first_tile')
+    second = bpy.data.collections.new('second_tile')
+    collection_index.invalidate()
+
+    add_object_to_collection(cube, first.name)
+    add_object_to_collection(cube, second.name)
+    add_object_to_collection(cube, second.name)
+
+    owners = get_objects_owning_collections(cube.name)
+    assert first in owners
+    assert second in owners
+    assert len(second.objects) == 1
+
+    # unlinking without invalidating the index is detected when it is read
+    first.objects.unlink(cube)
+    owners = get_objects_owning_collections(cube.name)
+    assert first not in owners
+    assert second in owners
+
+
+def test_get_objects_owning_collections_linked_directly(cube):
+    collection = bpy.data.collections.new('linked_tile')
+    collection_index.invalidate()
+    get_objects_owning_collections(cube.name)
+
+    # linking outside add_object_to_collection doesn't update the index
+    collection.objects.link(cube)
+    assert collection in get_objects_owning_collections(cube.name)
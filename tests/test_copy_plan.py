@@ -0,0 +1,31 @@
+from bpy.props import FloatProperty, IntProperty, EnumProperty
+from MakeTile.lib.utils.utils import get_copy_plan, get_annotations
+
+
+class Source:
+    tile_x: FloatProperty()
+    segments: IntProperty()
+    base_blueprint: EnumProperty(items=[('PLAIN', 'Plain', '')])
+    only_in_source: FloatProperty()
+
+
+class SourceChild(Source):
+    subdivisions: IntProperty()
+
+
+class Target:
+    tile_x: FloatProperty()
+    segments: FloatProperty()
+    base_blueprint: FloatProperty()
+    subdivisions: IntProperty()
+
+
+def test_get_annotations_includes_parents():
+    assert set(get_annotations(SourceChild)) == {
+        'tile_x', 'segments', 'base_blueprint', 'only_in_source', 'subdivisions'}
+
+
+def test_copy_plan_only_includes_compatible_props():
+    plan = get_copy_plan(SourceChild, Target)
+    assert set(plan) == {'tile_x', 'segments', 'subdivisions'}
+    assert get_copy_plan(SourceChild, Target) is plan
@@ -0,0 +1,39 @@
+import bpy
+import numpy as np
+from MakeTile.lib.utils.displaced_mesh import displace_vertices, get_image_height_map
+from MakeTile.lib.utils.height_map import create_height_map
+
+
+def test_displace_vertices_moves_verts_along_normals(cube):
+    cube.data.uv_layers.new()
+    image = bpy.data.images.new('disp_test', 8, 8, is_data=True)
+    image.pixels.foreach_set(np.full(8 * 8 * 4, 0.5, dtype=np.float32))
+    disp_mod = cube.modifiers.new('Displacement', 'DISPLACE')
+    disp_mod.strength = 0.2
+    disp_mod.mid_level = 0
+
+    mesh = cube.data.copy()
+    before = [v.co.copy() for v in mesh.vertices]
+    displace_vertices(cube, mesh, disp_mod, image)
+
+    for v, co in zip(mesh.vertices, before):
+        # cube corners move outwards along their normals by 0.5 * strength
+        assert abs((v.co - co).length - 0.1) < 1e-3
+        assert v.co.length > co.length
+
+
+def test_get_image_height_map_uses_kept_height_map(tmp_path):
+    image = bpy.data.images.new('disp_test', 8, 8, float_buffer=True, is_data=True)
+    image.pixels.foreach_set(np.full(8 * 8 * 4, 0.5, dtype=np.float32))
+    height_map_path = str(tmp_path / 'disp_test.npy')
+    height_map = create_height_map(height_map_path, 8, 8)
+    height_map[:] = 1000
+    height_map.flush()
+    del height_map
+
+    image['height_map'] = height_map_path
+    assert np.all(get_image_height_map(image) == 1000)
+
+    # a height map of the wrong size falls back to the image's pixels
+    image.scale(4, 4)
+    assert np.all(get_image_height_map(image) == 32768)
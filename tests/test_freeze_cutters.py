@@ -0,0 +1,86 @@
+import bpy
+import bmesh
+import numpy as np
+from MakeTile.operators.freeze_cutters import freeze_cutters, unfreeze_cutters
+from MakeTile.lib.utils.displaced_mesh import restore_preview_mesh, write_displaced_mesh
+from MakeTile.tile_creation.create_tile import set_bool_props
+
+
+def test_freeze_and_unfreeze_cutters(cube):
+    mesh = bpy.data.meshes.new('cutter_mesh')
+    bm = bmesh.new()
+    bmesh.ops.create_cube(bm, size=0.5)
+    bm.to_mesh(mesh)
+    bm.free()
+    cutter = bpy.data.objects.new('cutter', mesh)
+    cutter.location = (0.5, 0, 0)
+    bpy.context.layer_collection.collection.objects.link(cutter)
+    set_bool_props(cutter, cube, 'DIFFERENCE')
+
+    original = cube.data
+    assert freeze_cutters(bpy.context, [cube]) == [cube]
+    props = cube.mt_object_props
+    assert props.cutters_frozen
+    assert props.unfrozen_mesh == original
+    assert cube.data != original
+    assert len(cube.data.vertices) > len(original.vertices)
+    assert not cube.modifiers['cutter.bool'].show_viewport
+
+    # toggling a cutter re-bakes the frozen mesh without it
+    props.cutters_collection[0].value = False
+    assert props.cutters_frozen
+    assert len(cube.data.vertices) == len(original.vertices)
+
+    assert unfreeze_cutters(cube)
+    assert cube.data == original
+    assert not props.cutters_frozen
+    assert not cube.modifiers['cutter.bool'].show_viewport
+
+
+def test_toggle_cutter_on_displaced_frozen_tile(cube):
+    mesh = bpy.data.meshes.new('cutter_mesh')
+    bm = bmesh.new()
+    bmesh.ops.create_cube(bm, size=0.5)
+    bm.to_mesh(mesh)
+    bm.free()
+    cutter = bpy.data.objects.new('cutter', mesh)
+    cutter.location = (0.5, 0, 0)
+    bpy.context.layer_collection.collection.objects.link(cutter)
+    set_bool_props(cutter, cube, 'DIFFERENCE')
+
+    cube.data.uv_layers.new()
+    image = bpy.data.images.new('disp_test', 8, 8, is_data=True)
+    image.pixels.foreach_set(np.full(8 * 8 * 4, 0.5, dtype=np.float32))
+    texture = bpy.data.textures.new('disp_test', 'IMAGE')
+    texture.image = image
+    subsurf_mod = cube.modifiers.new('Subsurf', 'SUBSURF')
+    disp_mod = cube.modifiers.new('Displacement', 'DISPLACE')
+    disp_mod.texture = texture
+    props = cube.mt_object_props
+    props.subsurf_mod_name = subsurf_mod.name
+    props.disp_mod_name = disp_mod.name
+
+    original = cube.data
+    freeze_cutters(bpy.context, [cube])
+    write_displaced_mesh(cube, 1)
+    assert props.preview_mesh != original
+
+    # toggling a cutter re-bakes the preview mesh and displaces it again
+    props.cutters_collection[0].value = False
+    assert props.displacement_applied
+    assert props.unfrozen_mesh == original
+    assert len(props.preview_mesh.vertices) == len(original.vertices)
+    assert len(cube.data.vertices) > len(original.vertices)
+    assert not subsurf_mod.show_viewport
+
+    assert restore_preview_mesh(cube)
+    assert len(cube.data.vertices) == len(original.vertices)
+    assert cube.data != original
+    assert subsurf_mod.show_viewport
+
+    # unfreezing a displaced tile displaces the original mesh once
+    write_displaced_mesh(cube, 1)
+    assert unfreeze_cutters(cube)
+    assert props.displacement_applied
+    assert props.preview_mesh == original
+    assert props.unfrozen_mesh is None
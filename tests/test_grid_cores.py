@@ -0,0 +1,32 @@
+import pytest
+import bpy
+from MakeTile.lib.bmturtle.scripts import (
+    draw_straight_wall_core,
+    draw_rectangular_floor_core)
+from MakeTile.lib.bmturtle.grid_cores import (
+    build_straight_wall_core,
+    build_rectangular_floor_core)
+
+
+def group_sizes(obj):
+    sizes = {group.name: 0 for group in obj.vertex_groups}
+    for v in obj.data.vertices:
+        for g in v.groups:
+            sizes[obj.vertex_groups[g.group].name] += 1
+    return sizes
+
+
+@pytest.mark.parametrize("draw, build",
+                         [(draw_straight_wall_core, build_straight_wall_core),
+                          (draw_rectangular_floor_core, build_rectangular_floor_core)])
+def test_grid_core_matches_turtle_core(draw, build):
+    bpy.context.scene.cursor.location = (0, 0, 0)
+    dims = (2, 0.3, 1.5)
+    subdivs = (8, 2, 6)
+    turtle_core = draw(dims, subdivs)
+    grid_core = build(dims, subdivs)
+
+    assert len(grid_core.data.vertices) == len(turtle_core.data.vertices)
+    assert len(grid_core.data.edges) == len(turtle_core.data.edges)
+    assert len(grid_core.data.polygons) == len(turtle_core.data.polygons)
+    assert group_sizes(grid_core) == group_sizes(turtle_core)
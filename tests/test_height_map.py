@@ -0,0 +1,38 @@
+import struct
+import zlib
+import numpy as np
+from MakeTile.lib.utils.height_map import (
+    create_height_map,
+    open_height_map,
+    sample_height_map,
+    write_png16)
+
+
+def test_height_map_streams_to_16_bit_png(tmp_path):
+    values = np.arange(6 * 4, dtype=np.uint16).reshape(6, 4) * 2000
+    height_map = create_height_map(str(tmp_path / 'map.npy'), 4, 6)
+    height_map[:] = values
+    height_map.flush()
+    del height_map
+
+    height_map = open_height_map(str(tmp_path / 'map.npy'))
+    write_png16(str(tmp_path / 'map.png'), height_map)
+
+    data = (tmp_path / 'map.png').read_bytes()
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    assert struct.unpack('>IIB', data[16:25]) == (4, 6, 16)
+
+    # image data can be split over several IDAT chunks
+    compressed = b''
+    position = 8
+    while position < len(data):
+        length, chunk_type = struct.unpack('>I4s', data[position:position + 8])
+        if chunk_type == b'IDAT':
+            compressed += data[position + 8:position + 8 + length]
+        position += length + 12
+    rows = np.frombuffer(zlib.decompress(compressed), dtype=np.uint8).reshape(6, 9)
+    # png rows are top to bottom
+    assert np.array_equal(rows[:, 1:].copy().view('>u2')[::-1], values)
+
+    # sampling at a pixel centre returns the pixel
+    assert np.isclose(sample_height_map(height_map, np.array(((2.5 / 4, 1.5 / 6),)))[0], values[1, 2] / 65535)
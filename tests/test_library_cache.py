@@ -0,0 +1,26 @@
+import os
+import bpy
+from MakeTile.utils.registration import get_prefs
+from MakeTile.lib.utils.library_cache import (
+    copy_library_objects,
+    library_cache)
+
+
+def test_copies_share_cached_mesh():
+    booleans_path = os.path.join(
+        get_prefs().assets_path,
+        "meshes",
+        "booleans",
+        "openlock.blend")
+    library_cache.clear()
+    object_count = len(bpy.data.objects)
+
+    first = copy_library_objects(booleans_path, ['openlock.wall.cutter.side'])[0]
+    second = copy_library_objects(booleans_path, ['openlock.wall.cutter.side'])[0]
+    single = copy_library_objects(
+        booleans_path, ['openlock.wall.cutter.side'], single_user=True)[0]
+
+    # one cached source plus three copies
+    assert len(bpy.data.objects) == object_count + 4
+    assert first.data == second.data
+    assert single.data != first.data
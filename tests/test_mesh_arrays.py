@@ -0,0 +1,24 @@
+import bpy
+from MakeTile.lib.utils.mesh_arrays import MeshGroupArrays
+from MakeTile.materials.materials import assign_mat_to_vert_group, get_vert_group_material
+
+
+def test_assign_material_to_faces_in_vert_group(cube):
+    # top face of the cube
+    top_verts = [v.index for v in cube.data.vertices if v.co.z > 0]
+    group = cube.vertex_groups.new(name='Top')
+    group.add(top_verts, 1, 'ADD')
+
+    secondary = bpy.data.materials.new('secondary')
+    primary = bpy.data.materials.new('primary')
+    cube.data.materials.append(secondary)
+    cube.data.materials.append(primary)
+
+    mesh_arrays = MeshGroupArrays(cube)
+    assert sorted(mesh_arrays.get_vert_indices('Top').tolist()) == sorted(top_verts)
+    assert mesh_arrays.get_face_mask('Top').sum() == 1
+
+    assign_mat_to_vert_group('Top', cube, primary, mesh_arrays)
+
+    assert [p.material_index for p in cube.data.polygons].count(1) == 1
+    assert get_vert_group_material(group, cube) == primary
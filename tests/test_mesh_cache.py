@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+import numpy as np
+from MakeTile.lib.utils.mesh_cache import MeshCache, MeshData
+
+
+def test_mesh_cache_evicts_least_recently_used():
+    cache = MeshCache(max_bytes=100)
+    cache.put('a', SimpleNamespace(nbytes=40))
+    cache.put('b', SimpleNamespace(nbytes=40))
+    # touch a so b becomes the least recently used entry
+    assert cache.get('a') is not None
+    cache.put('c', SimpleNamespace(nbytes=40))
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+    assert cache.nbytes == 80
+    assert cache.get('b') is None
+
+
+def test_mesh_cache_skips_oversize_data():
+    cache = MeshCache(max_bytes=100)
+    cache.put('a', SimpleNamespace(nbytes=40))
+    cache.put('b', SimpleNamespace(nbytes=101))
+    assert 'b' not in cache
+    assert len(cache) == 1
+
+    # replacing an entry with oversize data drops the old entry
+    cache.put('a', SimpleNamespace(nbytes=101))
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_mesh_data_round_trip(cube):
+    mesh = cube.data
+    group = cube.vertex_groups.new(name='Top')
+    group.add([0, 1, 2], 1.0, 'REPLACE')
+    group.add([3], 0.5, 'REPLACE')
+    uv_layer = mesh.uv_layers.new(name='UVMap')
+    uvs = np.random.default_rng(0).random(len(mesh.loops) * 2).astype(np.float32)
+    uv_layer.data.foreach_set('uv', uvs)
+    attribute = mesh.attributes.new('height', 'FLOAT', 'POINT')
+    heights = np.arange(len(mesh.vertices), dtype=np.float32)
+    attribute.data.foreach_set('value', heights)
+
+    data = MeshData.from_object(cube)
+    obj = data.to_object()
+    new_mesh = obj.data
+
+    coords = np.empty(len(new_mesh.vertices) * 3, dtype=np.float32)
+    new_mesh.vertices.foreach_get('co', coords)
+    assert np.allclose(coords, data.coords)
+    assert len(new_mesh.polygons) == len(mesh.polygons)
+
+    new_group = obj.vertex_groups['Top']
+    assert [new_group.weight(i) for i in range(4)] == [1.0, 1.0, 1.0, 0.5]
+
+    new_uvs = np.empty(len(new_mesh.loops) * 2, dtype=np.float32)
+    new_mesh.uv_layers['UVMap'].data.foreach_get('uv', new_uvs)
+    assert np.allclose(new_uvs, uvs)
+
+    new_heights = np.empty(len(new_mesh.vertices), dtype=np.float32)
+    new_mesh.attributes['height'].data.foreach_get('value', new_heights)
+    assert np.array_equal(new_heights, heights)
+    assert data.nbytes >= uvs.nbytes + heights.nbytes
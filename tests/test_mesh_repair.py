@@ -0,0 +1,75 @@
+import bmesh
+import numpy as np
+from MakeTile.lib.utils.mesh_repair import (
+    mesh_from_triangles,
+    mesh_to_triangles,
+    weld_vertices,
+    remove_bad_triangles,
+    count_non_manifold_edges,
+    repair_non_manifold,
+    make_mesh_manifold)
+
+
+def bm_triangles(bm):
+    bm.verts.index_update()
+    return np.array([[v.index for v in f.verts] for f in bm.faces])
+
+
+def test_count_non_manifold_edges(bm_cube):
+    bmesh.ops.triangulate(bm_cube, faces=bm_cube.faces[:])
+    assert count_non_manifold_edges(bm_triangles(bm_cube)) == (0, 0)
+
+    bm_cube.faces.ensure_lookup_table()
+    bmesh.ops.delete(bm_cube, geom=[bm_cube.faces[0]], context='FACES_ONLY')
+    boundary, non_manifold = count_non_manifold_edges(bm_triangles(bm_cube))
+    assert boundary == 3
+    assert non_manifold == 0
+
+
+def test_weld_vertices():
+    # two triangles sharing an edge whose verts are duplicated
+    coords = np.array([(0, 0, 0), (1, 0, 0), (0, 1, 0), (1, 0, 0), (1, 1, 0), (0, 1, 1e-7)])
+    tris = np.array([(0, 1, 2), (3, 4, 5)])
+    welded_coords, welded_tris = weld_vertices(coords, tris)
+    assert len(welded_coords) == 4
+    assert len(set(welded_tris[0]) & set(welded_tris[1])) == 2
+    assert np.allclose(welded_coords[welded_tris], coords[tris], atol=1e-6)
+
+
+def test_remove_bad_triangles():
+    tris = np.array([(0, 1, 2), (2, 0, 1), (0, 0, 3), (1, 2, 3)])
+    assert remove_bad_triangles(tris).tolist() == [[0, 1, 2], [1, 2, 3]]
+
+
+def test_mesh_from_triangles():
+    coords = np.array([(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1)], dtype=np.float32)
+    tris = np.array([(0, 2, 1), (0, 1, 3), (1, 2, 3), (0, 3, 2)])
+    mesh = mesh_from_triangles(coords, tris)
+    assert len(mesh.polygons) == 4
+    assert len(mesh.edges) == 6
+
+    mesh_coords, mesh_tris = mesh_to_triangles(mesh)
+    assert np.allclose(mesh_coords, coords)
+    assert mesh_tris.tolist() == tris.tolist()
+
+
+def test_repair_fills_hole(bm_cube):
+    bm_cube.faces.ensure_lookup_table()
+    bmesh.ops.delete(bm_cube, geom=[bm_cube.faces[0]], context='FACES_ONLY')
+    assert any(e.is_boundary for e in bm_cube.edges)
+
+    assert repair_non_manifold(bm_cube)
+    assert all(e.is_manifold for e in bm_cube.edges)
+
+
+def test_make_mesh_manifold_welds_coincident_verts(bm_cube):
+    # a closed cube whose triangles don't share verts is only manifold once welded
+    bmesh.ops.triangulate(bm_cube, faces=bm_cube.faces[:])
+    tris = bm_triangles(bm_cube)
+    coords = np.array([v.co for v in bm_cube.verts])
+    mesh = mesh_from_triangles(coords[tris].reshape(-1, 3), np.arange(len(tris) * 3).reshape(-1, 3))
+    assert len(mesh.vertices) == 36
+
+    assert make_mesh_manifold(mesh)
+    assert len(mesh.vertices) == 8
+    assert all(not e.is_loose for e in mesh.edges)
@@ -0,0 +1,24 @@
+import numpy as np
+from MakeTile.lib.utils.noise import perlin, noise_texture, voronoi
+
+
+def test_perlin_is_zero_on_lattice():
+    points = np.array(((0, 0, 0), (1, 2, 3), (-4, 5, -6)), dtype=np.float32)
+    assert np.allclose(perlin(points), 0)
+
+
+def test_noise_texture_range():
+    points = np.random.RandomState(0).uniform(-10, 10, (10000, 3)).astype(np.float32)
+    value, color = noise_texture(points, detail=2, roughness=0.5, distortion=0.5)
+    assert value.shape == (10000,)
+    assert color.shape == (10000, 3)
+    assert np.all((value >= 0) & (value <= 1))
+    assert np.array_equal(color[:, 0], value)
+
+
+def test_voronoi_f2_further_than_f1():
+    points = np.random.RandomState(0).uniform(-10, 10, (10000, 3)).astype(np.float32)
+    f1, color, position = voronoi(points, 'F1')
+    f2 = voronoi(points, 'F2')[0]
+    assert np.all(f2 >= f1)
+    assert np.allclose(np.linalg.norm(position - points, axis=1), f1, atol=1e-5)
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+import pytest
+from MakeTile.lib.utils.tile_defaults import tile_defaults_registry
+from MakeTile.tile_creation import create_tile
+from MakeTile.tile_creation.create_tile import PrefabRegistry, prefab_registry
+
+
+def test_registered_builders_are_called_with_tile_props():
+    registry = PrefabRegistry()
+
+    @registry.register('TEST_BASE', 'PLAIN')
+    def spawn_base(tile_props):
+        return ('base', tile_props)
+
+    registry.register('TEST_CORE', 'PLAIN', lambda tile_props, base: ('core', base))
+
+    assert registry.build('props', 'TEST_BASE', 'PLAIN') == ('base', 'props')
+    assert registry.build('props', 'TEST_CORE', 'PLAIN', base='base') == ('core', 'base')
+    assert registry.get('TEST_BASE', 'OPENLOCK') is None
+
+    with pytest.raises(KeyError):
+        registry.build('props', 'TEST_BASE', 'OPENLOCK')
+
+
+def test_every_tile_type_has_a_tile_builder():
+    for tile in tile_defaults_registry.get_all():
+        assert prefab_registry.get(tile['type'], 'CUSTOM') is not None, tile['type']
+
+
+def test_spawn_tile_parts_builds_base_then_core(monkeypatch):
+    registry = PrefabRegistry()
+    registry.register('TEST_BASE', 'PLAIN', lambda tile_props: 'base')
+    registry.register('TEST_CORE', 'NONE', create_tile.spawn_no_prefab)
+    registry.register('TEST_CORE', 'PLAIN', lambda tile_props, base: None)
+    monkeypatch.setattr(create_tile, 'prefab_registry', registry)
+
+    tile_props = SimpleNamespace(base_blueprint='PLAIN', main_part_blueprint='NONE')
+    assert create_tile.spawn_tile_parts(tile_props, 'TEST_BASE', 'TEST_CORE') == 'base'
+
+    # a core blueprint that fails to build cancels the tile
+    tile_props.main_part_blueprint = 'PLAIN'
+    assert create_tile.spawn_tile_parts(tile_props, 'TEST_BASE', 'TEST_CORE') is None
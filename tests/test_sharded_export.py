@@ -0,0 +1,19 @@
+from MakeTile.operators.sharded_export import (
+    create_work_items,
+    shard_work_items)
+
+
+def test_variants_are_spread_across_shards():
+    jobs = [
+        {'collection': 'straight_wall', 'num_variants': 3, 'file_name': 'wall'},
+        {'collection': 'rect_floor', 'num_variants': 2}]
+    items = create_work_items(jobs)
+    shards = shard_work_items(items, 4)
+
+    assert len(items) == 5
+    assert [len(shard) for shard in shards] == [2, 1, 1, 1]
+    assert sorted(
+        (item['collection'], item['variant']) for shard in shards for item in shard) == [
+            ('rect_floor', 0), ('rect_floor', 1),
+            ('straight_wall', 0), ('straight_wall', 1), ('straight_wall', 2)]
+    assert shard_work_items(items[:1], 4) == [items[:1]]
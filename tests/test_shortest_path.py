@@ -0,0 +1,22 @@
+import bmesh
+from math import inf
+from MakeTile.lib.bmturtle.helpers import bm_path_edges
+
+
+def test_path_edges_follow_grid_edge():
+    bm = bmesh.new()
+    # 5 x 5 grid of verts 1 unit apart
+    bmesh.ops.create_grid(bm, x_segments=4, y_segments=4, size=2)
+    bm.verts.ensure_lookup_table()
+
+    corners = sorted(bm.verts, key=lambda v: (v.co.y, v.co.x))
+    v_start, v_target = corners[0], corners[4]
+    edges, length = bm_path_edges(bm, v_start, v_target)
+
+    assert len(edges) == 4
+    assert abs(length - 4) < 1e-5
+    assert all(abs(v.co.y - v_start.co.y) < 1e-5 for e in edges for v in e.verts)
+
+    lone = bm.verts.new((10, 10, 0))
+    assert bm_path_edges(bm, v_start, lone) == ([], inf)
+    bm.free()
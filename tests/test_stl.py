@@ -0,0 +1,37 @@
+import os
+import numpy as np
+import bpy
+from MakeTile.lib.utils.stl import export_object_stl, export_objects_stl, STL_TRIANGLE
+
+
+def test_export_object_stl(cube, tmp_path):
+    cube.location = (1, 2, 3)
+    filepath = str(tmp_path / 'cube.stl')
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    export_object_stl(filepath, cube, depsgraph, scale=25.4)
+
+    # 80 byte header, triangle count and 12 triangles of 50 bytes
+    assert os.path.getsize(filepath) == 84 + 12 * 50
+
+    records = np.fromfile(filepath, dtype=STL_TRIANGLE, offset=84)
+    verts = records['verts'].reshape(-1, 3)
+    assert np.allclose(verts.min(axis=0), np.array((0.5, 1.5, 2.5)) * 25.4)
+    assert np.allclose(verts.max(axis=0), np.array((1.5, 2.5, 3.5)) * 25.4)
+
+
+def test_export_objects_stl_centers_combined_mesh(cube, tmp_path):
+    other = cube.copy()
+    bpy.context.scene.collection.objects.link(other)
+    cube.location = (2, 0, 0)
+    other.location = (4, 0, 0)
+    filepath = str(tmp_path / 'cubes.stl')
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    export_objects_stl(filepath, [cube, other], depsgraph)
+
+    assert os.path.getsize(filepath) == 84 + 24 * 50
+    assert np.fromfile(filepath, dtype='<u4', count=1, offset=80)[0] == 24
+
+    records = np.fromfile(filepath, dtype=STL_TRIANGLE, offset=84)
+    verts = records['verts'].reshape(-1, 3)
+    assert np.allclose(verts.min(axis=0), (-1.5, -0.5, -0.5))
+    assert np.allclose(verts.max(axis=0), (1.5, 0.5, 0.5))
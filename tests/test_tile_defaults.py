@@ -0,0 +1,42 @@
+import os
+import json
+from MakeTile.lib.utils.tile_defaults import TileDefaultsRegistry
+
+
+def write_defaults(path, base_blueprints):
+    path.write_text(json.dumps([{
+        'type': 'STRAIGHT_WALL',
+        'bl_idname': 'object.make_straight_wall',
+        'base_blueprints': base_blueprints,
+        'defaults': {
+            'base_blueprint': 'PLAIN',
+            'base_defaults': {'PLAIN': {'base_z': 0.25}}}}]))
+
+
+def test_registry_indexes_and_caches(tmp_path):
+    path = tmp_path / 'tile_defaults.json'
+    write_defaults(path, {'PLAIN': 'Plain', 'OPENLOCK': 'OpenLOCK'})
+    registry = TileDefaultsRegistry(str(path))
+
+    assert registry.get('STRAIGHT_WALL')['bl_idname'] == 'object.make_straight_wall'
+    assert registry.get('CURVED_WALL') is None
+    assert registry.get_blueprint_defaults('STRAIGHT_WALL', 'base_defaults', 'PLAIN') == {'base_z': 0.25}
+    assert registry.get_blueprint_defaults('STRAIGHT_WALL', 'tile_defaults', 'PLAIN') == {}
+
+    items = registry.get_enum_items('STRAIGHT_WALL', 'base_blueprints')
+    assert items == [('OPENLOCK', 'OpenLOCK', ''), ('PLAIN', 'Plain', '')]
+    assert registry.get_enum_items('STRAIGHT_WALL', 'base_blueprints') is items
+    assert registry.get_enum_items('STRAIGHT_WALL', 'main_part_blueprints') == []
+
+
+def test_registry_reloads_changed_file(tmp_path):
+    path = tmp_path / 'tile_defaults.json'
+    write_defaults(path, {'PLAIN': 'Plain'})
+    registry = TileDefaultsRegistry(str(path))
+    assert len(registry.get_enum_items('STRAIGHT_WALL', 'base_blueprints')) == 1
+
+    write_defaults(path, {'PLAIN': 'Plain', 'OPENLOCK': 'OpenLOCK'})
+    mtime = registry.mtime + 10
+    os.utime(str(path), (mtime, mtime))
+
+    assert len(registry.get_enum_items('STRAIGHT_WALL', 'base_blueprints')) == 2
@@ -0,0 +1,25 @@
+import numpy as np
+from MakeTile.lib.utils.uv_raster import rasterise_uv_triangles, dilate
+
+
+def test_rasterise_covers_each_texel_once():
+    uvs = np.array((
+        ((0, 0), (1, 0), (1, 1)),
+        ((0, 0), (1, 1), (0, 1))), dtype=np.float32)
+    texels, owners, weights = rasterise_uv_triangles(uvs, 64, 32)
+
+    assert np.array_equal(texels, np.arange(64 * 32))
+    assert set(owners) == {0, 1}
+    assert np.allclose(weights.sum(axis=1), 1)
+
+
+def test_dilate_fills_margin():
+    values = np.zeros((8, 8, 3), dtype=np.float32)
+    mask = np.zeros((8, 8), dtype=bool)
+    values[4, 4] = 1
+    mask[4, 4] = True
+
+    dilated = dilate(values, mask, 2)
+
+    assert np.all(dilated[2:7, 2:7] == 1)
+    assert np.all(dilated[:2] == 0)
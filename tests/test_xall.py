@@ -0,0 +1,22 @@
+import bmesh
+from MakeTile.lib.utils.tinycad.XALL import get_intersection_dictionary
+
+
+def test_intersection_dictionary_only_contains_crossing_edges():
+    bm = bmesh.new()
+    coords = [
+        ((-1, 0, 0), (1, 0, 0)),
+        ((0, -1, 0), (0, 1, 0)),
+        ((5, 5, 0), (6, 5, 0))]
+    for a, b in coords:
+        bm.edges.new((bm.verts.new(a), bm.verts.new(b)))
+    bm.verts.index_update()
+    bm.edges.index_update()
+
+    d = get_intersection_dictionary(bm, [0, 1, 2])
+
+    assert sorted(d.keys()) == [0, 1]
+    for points in d.values():
+        assert len(points) == 3
+        assert points[1].length < 1e-5
+    bm.free()